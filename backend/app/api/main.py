@@ -11,26 +11,26 @@ from backend.app.api.routes.auth import (
 )
 # from backend.app.api.routes.bank_account import activate as bank_account_activate
 # from backend.app.api.routes.bank_account import create as create_bank_account
-# from backend.app.api.routes.bank_account import (
-#     deposit,
-#     statement,
-#     transaction_history,
-#     transfer,
-#     withdrawal,
-# )
 # from backend.app.api.routes.card import activate as activate_card
 # from backend.app.api.routes.card import block
 # from backend.app.api.routes.card import create as create_card
 # from backend.app.api.routes.card import delete as delete_card
 # from backend.app.api.routes.card import topup
-# from backend.app.api.routes.ml import api
 # from backend.app.api.routes.next_of_kin import all
 # from backend.app.api.routes.next_of_kin import create as create_next_of_kin
 # from backend.app.api.routes.next_of_kin import delete
 # from backend.app.api.routes.next_of_kin import update as update_next_of_kin
 # from backend.app.api.routes.profile import all_profiles, create, me, update, upload
-# from backend.app.api.routes.transaction import fraud_review, risk_history
+from backend.app.api.routes.bank_account import (
+    deposit,
+    statement,
+    transaction_history,
+    transfer,
+    withdrawal,
+)
+from backend.app.api.routes.ml import api
 from backend.app.api.routes.profile import create, update
+from backend.app.api.routes.transaction import fraud_review, risk_history
 
 api_router = APIRouter()
 
@@ -43,6 +43,14 @@ api_router.include_router(refresh.router)
 api_router.include_router(logout.router)
 api_router.include_router(create.router)
 api_router.include_router(update.router)
+api_router.include_router(api.router)
+api_router.include_router(fraud_review.router)
+api_router.include_router(risk_history.router)
+api_router.include_router(statement.router)
+api_router.include_router(deposit.router)
+api_router.include_router(transfer.router)
+api_router.include_router(withdrawal.router)
+api_router.include_router(transaction_history.router)
 # api_router.include_router(upload.router)
 # api_router.include_router(me.router)
 # api_router.include_router(all_profiles.router)
@@ -52,16 +60,8 @@ api_router.include_router(update.router)
 # api_router.include_router(delete.router)
 # api_router.include_router(create_bank_account.router)
 # api_router.include_router(bank_account_activate.router)
-# api_router.include_router(deposit.router)
-# api_router.include_router(transfer.router)
-# api_router.include_router(withdrawal.router)
-# api_router.include_router(transaction_history.router)
-# api_router.include_router(statement.router)
 # api_router.include_router(create_card.router)
 # api_router.include_router(activate_card.router)
 # api_router.include_router(block.router)
 # api_router.include_router(topup.router)
 # api_router.include_router(delete_card.router)
-# api_router.include_router(fraud_review.router)
-# api_router.include_router(risk_history.router)
-# api_router.include_router(api.router)
\ No newline at end of file
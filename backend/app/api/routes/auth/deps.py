@@ -5,6 +5,8 @@ from fastapi import Cookie, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.app.auth.models import User
+from backend.app.auth.revocation import token_revocation
+from backend.app.auth.token_cache import decode_auth_token
 from backend.app.core.config import settings
 from backend.app.core.db import get_session
 from backend.app.core.logging import get_logger
@@ -28,11 +30,7 @@ async def get_current_user(
         )
 
     try:
-        payload = jwt.decode(
-            access_token,
-            settings.SIGNING_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
+        payload = decode_auth_token(access_token)
         if payload.get("type") != settings.COOKIE_ACCESS_NAME:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,6 +40,15 @@ async def get_current_user(
                     "action": "Please login to access this resource",
                 },
             )
+        if await token_revocation.is_revoked(payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail={
+                    "status": "error",
+                    "message": "Token has been revoked",
+                    "action": "Please log in again",
+                },
+            )
 
         from backend.app.api.services.user_auth import user_auth_service
 
@@ -58,6 +65,8 @@ async def get_current_user(
         await user_auth_service.validate_user_status(user)
         return user
 
+    except HTTPException:
+        raise
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -3,6 +3,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from backend.app.api.services.user_auth import user_auth_service
 from backend.app.auth.schema import LoginRequestSchema, OTPVerifyRequestSchema
 from backend.app.auth.utils import create_jwt_token, set_auth_cookies
+from backend.app.core.admission import admission_control
 from backend.app.core.db import get_session
 from backend.app.core.config import settings
 from backend.app.core.logging import get_logger
@@ -11,7 +12,11 @@ logger = get_logger()
 
 router = APIRouter(prefix="/auth", tags=["Athentication"])
 
-@router.post("/login/request-otp", status_code=status.HTTP_200_OK)
+@router.post(
+    "/login/request-otp",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admission_control("login_otp"))],
+)
 async def requets_login_otp(
     login_data: LoginRequestSchema,
     session: AsyncSession = Depends(get_session)
@@ -82,7 +87,11 @@ async def requets_login_otp(
             detail={"message": "Failed to process login OTP request"},
         )
 
-@router.post("/login/verify-otp", status_code=status.HTTP_200_OK)
+@router.post(
+    "/login/verify-otp",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admission_control("verify_otp"))],
+)
 async def verify_login_otp(
     verify_data: OTPVerifyRequestSchema,
     response: Response,
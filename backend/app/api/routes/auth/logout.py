@@ -1,5 +1,9 @@
-from fastapi import APIRouter, HTTPException, Response, status
+import jwt
+from fastapi import APIRouter, Cookie, HTTPException, Response, status
+from backend.app.auth.revocation import token_revocation
+from backend.app.auth.token_cache import decode_auth_token, token_cache
 from backend.app.auth.utils import delete_auth_cookies
+from backend.app.core.config import settings
 from backend.app.core.logging import get_logger
 
 logger = get_logger()
@@ -7,11 +11,29 @@ logger = get_logger()
 router = APIRouter(prefix="/auth", tags=["Athentication"])
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout(response: Response)-> dict:
-    """Đăng Xuất bằng cách xóa cookie xác thực"""
+async def logout(
+    response: Response,
+    access_token: str | None = Cookie(None, alias=settings.COOKIE_ACCESS_NAME),
+    refresh_token: str | None = Cookie(None, alias=settings.COOKIE_REFRESH_NAME),
+)-> dict:
+    """Đăng Xuất bằng cách thu hồi token và xóa cookie xác thực"""
     try:
-        # Xoá cookie xác thực
+        # Xoá cookie xác thực trước: đăng xuất vẫn thành công khi không thu hồi được token
         delete_auth_cookies(response)
+        # Thu hồi access/refresh token để token bị lộ không dùng lại được
+        for token in (access_token, refresh_token):
+            if not token:
+                continue
+            try:
+                payload = decode_auth_token(token)
+            except jwt.InvalidTokenError:
+                # Token hết hạn hoặc không hợp lệ thì không cần thu hồi
+                continue
+            token_cache.invalidate(token)
+            try:
+                await token_revocation.revoke_token(payload)
+            except Exception as e:
+                logger.warning(f"Failed to revoke token on logout: {e}")
         logger.info("User logged out successfully")
         return{ "message": "Logged out successfully" }
     except Exception as e:
@@ -23,4 +45,4 @@ async def logout(response: Response)-> dict:
                 "message": "Failed to log out user",
                 "action": "Please try again later",
             },
-        )
\ No newline at end of file
+        )
@@ -3,6 +3,8 @@ from fastapi import APIRouter, Cookie, Depends, HTTPException, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.app.api.services.user_auth import user_auth_service
+from backend.app.auth.revocation import token_revocation
+from backend.app.auth.token_cache import decode_auth_token
 from backend.app.auth.utils import create_jwt_token, set_auth_cookies
 from backend.app.core.config import settings
 from backend.app.core.db import get_session
@@ -33,9 +35,7 @@ async def refresh_access_token(
             )
         try:
             # Decode refresh token
-            payload = jwt.decode(
-                refresh_token, settings.SIGNING_KEY, algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = decode_auth_token(refresh_token)
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,6 +68,16 @@ async def refresh_access_token(
                     "action": "Please login again",
                 },
             )
+        # Kiểm tra refresh token đã bị thu hồi (logout, đặt lại mật khẩu)
+        if await token_revocation.is_revoked(payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail={
+                    "status": "error",
+                    "message": "Refresh token has been revoked",
+                    "action": "Please login again",
+                },
+            )
         # Lấy user từ payload
         user = await user_auth_service.get_user_by_id(payload["id"], session)
         if not user:
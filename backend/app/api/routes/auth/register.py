@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.app.core.admission import admission_control
 from backend.app.core.db import get_session
 from backend.app.core.logging import get_logger
 from backend.app.auth.schema import UserCreateSchema, UserReadSchema
@@ -9,7 +10,12 @@ logger = get_logger()
 router = APIRouter(prefix="/auth")
 
 
-@router.post("/register",response_model=UserReadSchema,status_code=status.HTTP_201_CREATED,)
+@router.post(
+    "/register",
+    response_model=UserReadSchema,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admission_control("register"))],
+)
 async def register_user(user_data: UserCreateSchema, session: AsyncSession = Depends(get_session)):
     try:
         if await user_auth_service.check_user_email_exists(user_data.email, session):
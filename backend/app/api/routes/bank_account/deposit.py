@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.routes.auth.deps import CurrentUser
+from backend.app.api.services.ledger import LedgerError, deposit
+from backend.app.auth.schema import RoleChoicesSchema
+from backend.app.core.db import get_session
+from backend.app.core.logging import get_logger
+from backend.app.transaction.schema import DepositRequestSchema, PostingResultSchema
+
+logger = get_logger()
+
+router = APIRouter(prefix="/bank-account", tags=["Bank Account"])
+
+
+@router.post(
+    "/deposit", response_model=PostingResultSchema, status_code=status.HTTP_201_CREATED
+)
+async def deposit_funds(
+    deposit_data: DepositRequestSchema,
+    current_user: CurrentUser,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=64),
+) -> PostingResultSchema:
+    """Giao dịch viên nộp tiền mặt vào tài khoản của khách hàng"""
+    if not current_user.has_role(RoleChoicesSchema.TELLER):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "status": "error",
+                "message": "Only tellers can deposit funds",
+                "action": "Please contact a teller",
+            },
+        )
+    try:
+        result = await deposit(
+            account_number=deposit_data.account_number,
+            amount=deposit_data.amount,
+            description=deposit_data.description,
+            teller_id=current_user.id,
+            session=session,
+            idempotency_key=idempotency_key,
+        )
+        if result.replayed:
+            response.status_code = status.HTTP_200_OK
+        else:
+            logger.info(
+                f"Deposit {result.reference} of {result.amount} {result.currency.value} "
+                f"into account {deposit_data.account_number} by {current_user.email}"
+            )
+        return result
+
+    except LedgerError as e:
+        raise e.to_http()
+    except HTTPException as http_ex:
+        raise http_ex
+    except Exception as e:
+        logger.error(f"Failed to deposit funds by the teller {current_user.email}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "status": "error",
+                "message": "Failed to deposit funds",
+                "action": "Please try again later",
+            },
+        )
@@ -0,0 +1,139 @@
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import FileResponse
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.routes.auth.deps import CurrentUser
+from backend.app.api.services.bank_account import get_user_bank_account
+from backend.app.bank_account.schema import (
+    StatementRequestSchema,
+    StatementResponseSchema,
+    StatementStatusEnum,
+)
+from backend.app.bank_account.statement import (
+    PENDING_KEY_PREFIX,
+    StatementPeriod,
+    last_transaction_id,
+    statement_id,
+    statement_path,
+)
+from backend.app.core.config import settings
+from backend.app.core.db import get_session
+from backend.app.core.logging import get_logger
+from backend.app.core.redis_client import redis_client
+
+logger = get_logger()
+
+router = APIRouter(prefix="/bank-account", tags=["Bank Account"])
+
+_serializer = URLSafeTimedSerializer(settings.SIGNING_KEY, salt="statement-download")
+
+
+def _download_url(statement_id: str, filename: str) -> str:
+    token = _serializer.dumps({"statement_id": statement_id, "filename": filename})
+    return f"{settings.API_BASE_URL}{settings.API_V1_STR}/bank-account/statement/download?token={token}"
+
+
+def _validate_period(period: StatementRequestSchema) -> StatementPeriod:
+    today = datetime.now(timezone.utc).date()
+    days = (period.end_date - period.start_date).days + 1
+    if days < 1 or days > settings.STATEMENT_MAX_DAYS or period.start_date > today:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "status": "error",
+                "message": f"Statement period must be 1-{settings.STATEMENT_MAX_DAYS} days and start in the past",
+                "action": "Please choose a valid statement period",
+            },
+        )
+    return StatementPeriod(period.start_date, min(period.end_date, today))
+
+
+@router.post("/{account_id}/statement", response_model=StatementResponseSchema)
+async def request_statement(
+    account_id: uuid.UUID,
+    period_data: StatementRequestSchema,
+    current_user: CurrentUser,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+) -> StatementResponseSchema:
+    """
+    Sao kê đã có trong cache thì trả link tải ngay (200), chưa có thì gửi task sinh
+    PDF và trả 202; gọi lại cùng kỳ để lấy link khi worker sinh xong
+    """
+    period = _validate_period(period_data)
+    account = await get_user_bank_account(account_id, current_user.id, session)
+    conn = await session.connection()
+    sid = statement_id(account.id, period, await last_transaction_id(conn, account.id, period))
+    if statement_path(sid).exists():
+        filename = f"statement-{account.account_number}-{period.start}-{period.end}.pdf"
+        return StatementResponseSchema(
+            statement_id=sid,
+            status=StatementStatusEnum.READY,
+            download_url=_download_url(sid, filename),
+        )
+
+    pending_key = f"{PENDING_KEY_PREFIX}:{sid}"
+    if await redis_client.set(pending_key, 1, nx=True, ex=settings.STATEMENT_PENDING_TTL_SECONDS):
+        from backend.app.core.tasks.statement import generate_statement_task
+
+        try:
+            generate_statement_task.delay(
+                str(account.id), period.start.isoformat(), period.end.isoformat(), pending_key
+            )
+        except Exception as e:
+            # Không gửi được task: xóa khóa chờ để lần gọi lại gửi task mới
+            logger.error(f"Failed to enqueue statement {sid} for account {account.id}: {e}")
+            await redis_client.delete(pending_key)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "status": "error",
+                    "message": "Failed to request statement",
+                    "action": "Please try again later",
+                },
+            )
+        logger.info(f"Statement {sid} requested for account {account.id}")
+    response.status_code = status.HTTP_202_ACCEPTED
+    return StatementResponseSchema(statement_id=sid, status=StatementStatusEnum.PENDING)
+
+
+@router.get("/statement/download", response_class=FileResponse)
+async def download_statement(token: str) -> FileResponse:
+    """Tải sao kê bằng link có chữ ký và thời hạn"""
+    try:
+        payload = _serializer.loads(
+            token, max_age=settings.STATEMENT_LINK_EXPIRATION_MINUTES * 60
+        )
+    except SignatureExpired:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail={
+                "status": "error",
+                "message": "Download link has expired",
+                "action": "Please request the statement again",
+            },
+        )
+    except BadSignature:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "status": "error",
+                "message": "Invalid download link",
+                "action": "Please request the statement again",
+            },
+        )
+    path = statement_path(payload["statement_id"])
+    if not path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "status": "error",
+                "message": "Statement is no longer available",
+                "action": "Please request the statement again",
+            },
+        )
+    return FileResponse(path, media_type="application/pdf", filename=payload["filename"])
@@ -0,0 +1,90 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.routes.auth.deps import CurrentUser
+from backend.app.api.services.bank_account import get_user_bank_account
+from backend.app.api.services.transaction_history import (
+    HistoryFilter,
+    InvalidCursorError,
+    get_summary,
+    list_transactions,
+)
+from backend.app.core.config import settings
+from backend.app.core.db import get_session
+from backend.app.core.logging import get_logger
+from backend.app.transaction.schema import TransactionHistoryPageSchema
+
+logger = get_logger()
+
+router = APIRouter(prefix="/bank-account", tags=["Bank Account"])
+
+
+@router.get(
+    "/{account_id}/transactions",
+    response_model=TransactionHistoryPageSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_transaction_history(
+    account_id: uuid.UUID,
+    current_user: CurrentUser,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    min_amount: Decimal | None = Query(None, ge=0),
+    max_amount: Decimal | None = Query(None, ge=0),
+    limit: int = Query(
+        settings.TRANSACTION_HISTORY_PAGE_SIZE,
+        ge=1,
+        le=settings.TRANSACTION_HISTORY_MAX_PAGE_SIZE,
+    ),
+    cursor: str | None = None,
+    include_summary: bool = False,
+    session: AsyncSession = Depends(get_session),
+) -> TransactionHistoryPageSchema:
+    """
+    Lịch sử giao dịch của tài khoản, mới nhất trước; trang sau dùng next_cursor với
+    cùng bộ lọc. include_summary=true trả thêm tổng của cả cửa sổ lọc
+    """
+    if (start_date and end_date and start_date > end_date) or (
+        min_amount is not None and max_amount is not None and min_amount > max_amount
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "status": "error",
+                "message": "Invalid date or amount range",
+                "action": "Please make sure each range starts before it ends",
+            },
+        )
+    account = await get_user_bank_account(account_id, current_user.id, session)
+    filters = HistoryFilter(start_date, end_date, min_amount, max_amount)
+    try:
+        transactions, next_cursor = await list_transactions(
+            account.id, filters, limit, cursor, session
+        )
+        summary = await get_summary(account.id, filters, session) if include_summary else None
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "status": "error",
+                "message": "Invalid cursor",
+                "action": "Please use the next_cursor returned by the previous page",
+            },
+        )
+    except Exception as e:
+        logger.error(f"Failed to fetch transaction history of account {account.id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "status": "error",
+                "message": "Failed to fetch transaction history",
+                "action": "Please try again later",
+            },
+        )
+    return TransactionHistoryPageSchema(
+        items=transactions, next_cursor=next_cursor, summary=summary
+    )
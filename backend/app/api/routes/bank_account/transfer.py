@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.routes.auth.deps import CurrentUser
+from backend.app.api.services.ledger import LedgerError, transfer
+from backend.app.core.db import get_session
+from backend.app.core.logging import get_logger
+from backend.app.transaction.schema import PostingResultSchema, TransferRequestSchema
+
+logger = get_logger()
+
+router = APIRouter(prefix="/bank-account", tags=["Bank Account"])
+
+
+@router.post(
+    "/transfer", response_model=PostingResultSchema, status_code=status.HTTP_201_CREATED
+)
+async def transfer_funds(
+    transfer_data: TransferRequestSchema,
+    current_user: CurrentUser,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=64),
+) -> PostingResultSchema:
+    """
+    Chuyển tiền từ tài khoản của người dùng; gửi lại cùng Idempotency-Key trả về kết
+    quả của lần chuyển trước (200) thay vì chuyển thêm lần nữa
+    """
+    try:
+        result = await transfer(
+            from_account_id=transfer_data.from_account_id,
+            to_account_number=transfer_data.to_account_number,
+            amount=transfer_data.amount,
+            description=transfer_data.description,
+            user_id=current_user.id,
+            session=session,
+            idempotency_key=idempotency_key,
+        )
+        if result.replayed:
+            response.status_code = status.HTTP_200_OK
+        else:
+            logger.info(
+                f"Transfer {result.reference} of {result.amount} {result.currency.value} "
+                f"from account {transfer_data.from_account_id} by {current_user.email}"
+            )
+        return result
+
+    except LedgerError as e:
+        raise e.to_http()
+    except HTTPException as http_ex:
+        raise http_ex
+    except Exception as e:
+        logger.error(f"Failed to transfer funds for the user {current_user.email}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "status": "error",
+                "message": "Failed to transfer funds",
+                "action": "Please try again later",
+            },
+        )
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.routes.auth.deps import CurrentUser
+from backend.app.api.services.ledger import LedgerError, withdraw
+from backend.app.core.db import get_session
+from backend.app.core.logging import get_logger
+from backend.app.transaction.schema import PostingResultSchema, WithdrawalRequestSchema
+
+logger = get_logger()
+
+router = APIRouter(prefix="/bank-account", tags=["Bank Account"])
+
+
+@router.post(
+    "/withdraw", response_model=PostingResultSchema, status_code=status.HTTP_201_CREATED
+)
+async def withdraw_funds(
+    withdrawal_data: WithdrawalRequestSchema,
+    current_user: CurrentUser,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=64),
+) -> PostingResultSchema:
+    """Rút tiền từ tài khoản của người dùng"""
+    try:
+        result = await withdraw(
+            account_id=withdrawal_data.account_id,
+            amount=withdrawal_data.amount,
+            description=withdrawal_data.description,
+            user_id=current_user.id,
+            session=session,
+            idempotency_key=idempotency_key,
+        )
+        if result.replayed:
+            response.status_code = status.HTTP_200_OK
+        else:
+            logger.info(
+                f"Withdrawal {result.reference} of {result.amount} {result.currency.value} "
+                f"from account {withdrawal_data.account_id} by {current_user.email}"
+            )
+        return result
+
+    except LedgerError as e:
+        raise e.to_http()
+    except HTTPException as http_ex:
+        raise http_ex
+    except Exception as e:
+        logger.error(f"Failed to withdraw funds for the user {current_user.email}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "status": "error",
+                "message": "Failed to withdraw funds",
+                "action": "Please try again later",
+            },
+        )
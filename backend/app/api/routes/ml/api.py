@@ -0,0 +1,215 @@
+import asyncio
+import json
+import uuid
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.routes.auth.deps import CurrentUser
+from backend.app.api.services.fraud_review import enqueue_flagged
+from backend.app.api.services.fraud_scoring import resolve_server_transaction
+from backend.app.auth.models import User
+from backend.app.auth.schema import RoleChoicesSchema
+from backend.app.core.config import settings
+from backend.app.core.db import get_session
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.drift import REPORT_KEY
+from backend.app.core.ml.entity_graph import entity_graph
+from backend.app.core.ml.model_manager import fraud_model_manager
+from backend.app.core.ml.schema import FraudScoreRequestSchema, FraudScoreResponseSchema
+from backend.app.core.ml.rules import fraud_rules
+from backend.app.core.ml.scoring import ModelNotLoadedError, fraud_scorer
+from backend.app.core.ml.shadow import shadow_scorer
+from backend.app.core.redis_client import redis_client
+
+logger = get_logger()
+
+router = APIRouter(prefix="/ml", tags=["Machine Learning"])
+
+
+# Vai trò được gọi chấm điểm: nhân viên và các dịch vụ nội bộ dùng tài khoản nhân viên
+SCORING_ROLES = (
+    RoleChoicesSchema.TELLER,
+    RoleChoicesSchema.ACCOUNT_EXECUTIVE,
+    RoleChoicesSchema.BRANCH_MANAGER,
+    RoleChoicesSchema.ADMIN,
+    RoleChoicesSchema.SUPER_ADMIN,
+)
+
+
+def ensure_admin(user: User) -> None:
+    """Chỉ quản trị viên được xem và nạp lại model"""
+    if not (
+        user.has_role(RoleChoicesSchema.ADMIN)
+        or user.has_role(RoleChoicesSchema.SUPER_ADMIN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "status": "error",
+                "message": "You are not allowed to manage fraud models",
+                "action": "Please contact an administrator",
+            },
+        )
+
+
+def ensure_scoring_caller(user: User) -> None:
+    """Chấm điểm là dịch vụ nội bộ cho nhân viên, khách hàng không được gọi"""
+    if not any(user.has_role(role) for role in SCORING_ROLES):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "status": "error",
+                "message": "You are not allowed to score transactions",
+                "action": "Please contact an administrator",
+            },
+        )
+
+
+@router.post(
+    "/score",
+    response_model=FraudScoreResponseSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def score_transaction(
+    transaction: FraudScoreRequestSchema,
+    current_user: CurrentUser,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_session),
+) -> FraudScoreResponseSchema:
+    """
+    Chấm điểm gian lận cho một giao dịch. Chỉ giao dịch đã có trong sổ cái mới được
+    ghi vào trạng thái chống gian lận (vận tốc, đồ thị, lịch sử, hàng đợi review);
+    giao dịch khác chỉ được chấm thử
+    """
+    ensure_scoring_caller(current_user)
+    trusted = await resolve_server_transaction(transaction, session)
+    if trusted is not None:
+        transaction = trusted
+    try:
+        result = await fraud_scorer.score(transaction, record=trusted is not None)
+    except ModelNotLoadedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "status": "error",
+                "message": "Fraud scoring model is not available",
+                "action": "Please try again later",
+            },
+        )
+    except Exception as e:
+        logger.error(
+            f"Failed to score transaction {transaction.transaction_id}: {e}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "status": "error",
+                "message": "Failed to score transaction",
+                "action": "Please try again later",
+            },
+        )
+    # Giao dịch cần xem xét/bị chặn vào hàng đợi review sau khi đã trả kết quả; giao
+    # dịch chấm thử (không có trong sổ cái) không được đưa vào hàng đợi
+    if trusted is not None:
+        background_tasks.add_task(enqueue_flagged, transaction, result)
+    return result
+
+
+@router.get("/model", status_code=status.HTTP_200_OK)
+async def get_model_info(current_user: CurrentUser) -> dict:
+    """Phiên bản, thời gian nạp và bộ nhớ của model đang phục vụ trên worker này"""
+    ensure_admin(current_user)
+    info = fraud_model_manager.info()
+    if settings.FRAUD_SHADOW_ENABLED:
+        info["challenger"] = await shadow_scorer.info()
+    return info
+
+
+@router.post("/model/reload", status_code=status.HTTP_200_OK)
+async def reload_model(current_user: CurrentUser) -> dict:
+    """Nạp phiên bản model active ngay, không chờ chu kỳ kiểm tra"""
+    ensure_admin(current_user)
+    try:
+        await fraud_model_manager.refresh()
+        if settings.FRAUD_SHADOW_ENABLED:
+            await shadow_scorer.refresh()
+    except Exception as e:
+        logger.error(f"Failed to reload fraud model: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "status": "error",
+                "message": "Failed to reload fraud model",
+                "action": "Please check the model artifact and try again",
+            },
+        )
+    logger.info(f"Fraud model reload requested by {current_user.email}")
+    return fraud_model_manager.info()
+
+
+@router.get("/drift", status_code=status.HTTP_200_OK)
+async def get_drift_report(current_user: CurrentUser) -> dict:
+    """Báo cáo PSI/KS gần nhất của job theo dõi drift"""
+    ensure_admin(current_user)
+    raw = await redis_client.get(REPORT_KEY)
+    if raw is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "status": "error",
+                "message": "No drift report has been computed yet",
+                "action": "Please build the drift reference and wait for the next run",
+            },
+        )
+    return json.loads(raw)
+
+
+@router.get("/rules", status_code=status.HTTP_200_OK)
+async def get_rules(current_user: CurrentUser) -> dict:
+    """Bộ luật đang áp dụng trên worker này kèm số lần khớp và thời gian đánh giá"""
+    ensure_admin(current_user)
+    return fraud_rules.info()
+
+
+@router.post("/rules/reload", status_code=status.HTTP_200_OK)
+async def reload_rules(current_user: CurrentUser) -> dict:
+    """Biên dịch lại file luật ngay, không chờ chu kỳ kiểm tra"""
+    ensure_admin(current_user)
+    try:
+        await asyncio.to_thread(fraud_rules.load, True)
+    except Exception as e:
+        logger.error(f"Failed to reload fraud rules: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "status": "error",
+                "message": f"Invalid fraud rules: {e}",
+                "action": "Please fix the rules file and try again",
+            },
+        )
+    logger.info(f"Fraud rules reload requested by {current_user.email}")
+    return fraud_rules.info()
+
+
+@router.get("/graph/{user_id}", status_code=status.HTTP_200_OK)
+async def get_user_cluster(user_id: uuid.UUID, current_user: CurrentUser) -> dict:
+    """Cụm tài khoản dùng chung điện thoại, địa chỉ, nơi làm việc hoặc thiết bị"""
+    ensure_admin(current_user)
+    cluster = entity_graph.cluster(user_id)
+    if cluster is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "status": "error",
+                "message": "User is not in the entity graph",
+                "action": "Please check the user id or wait for the next sync",
+            },
+        )
+    return {
+        "user_id": str(user_id),
+        "cluster_size": cluster.size,
+        "flagged": cluster.flagged,
+        "risk": round(cluster.risk, 4),
+        "stream_position": entity_graph.graph.last_event_id,
+    }
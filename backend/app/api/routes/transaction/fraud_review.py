@@ -0,0 +1,141 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.routes.auth.deps import CurrentUser
+from backend.app.api.services.fraud_review import (
+    InvalidCursorError,
+    claim_reviews,
+    list_reviews,
+    release_review,
+    resolve_review,
+)
+from backend.app.auth.models import User
+from backend.app.auth.schema import RoleChoicesSchema
+from backend.app.core.config import settings
+from backend.app.core.db import get_session
+from backend.app.core.logging import get_logger
+from backend.app.fraud.schema import (
+    FraudReviewPageSchema,
+    FraudReviewReadSchema,
+    FraudReviewResolveSchema,
+    ReviewStatusEnum,
+)
+
+logger = get_logger()
+
+router = APIRouter(prefix="/fraud-review", tags=["Fraud Review"])
+
+# Vai trò được xem và xử lý giao dịch bị đánh dấu
+REVIEWER_ROLES = (
+    RoleChoicesSchema.ACCOUNT_EXECUTIVE,
+    RoleChoicesSchema.BRANCH_MANAGER,
+    RoleChoicesSchema.ADMIN,
+    RoleChoicesSchema.SUPER_ADMIN,
+)
+
+
+def ensure_reviewer(user: User) -> None:
+    if not any(user.has_role(role) for role in REVIEWER_ROLES):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "status": "error",
+                "message": "You are not allowed to review flagged transactions",
+                "action": "Please contact an administrator",
+            },
+        )
+
+
+def _not_claimed(review_id: uuid.UUID) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "status": "error",
+            "message": f"Review {review_id} is not claimed by you",
+            "action": "Please claim the transaction before resolving it",
+        },
+    )
+
+
+@router.get("/queue", response_model=FraudReviewPageSchema, status_code=status.HTTP_200_OK)
+async def get_review_queue(
+    current_user: CurrentUser,
+    review_status: ReviewStatusEnum = Query(ReviewStatusEnum.PENDING, alias="status"),
+    limit: int = Query(settings.FRAUD_REVIEW_PAGE_SIZE, ge=1, le=settings.FRAUD_REVIEW_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_session),
+) -> FraudReviewPageSchema:
+    """Giao dịch bị đánh dấu, điểm cao và cũ trước; trang sau dùng next_cursor"""
+    ensure_reviewer(current_user)
+    try:
+        reviews, next_cursor = await list_reviews(session, review_status, limit, cursor)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "status": "error",
+                "message": "Invalid cursor",
+                "action": "Please use the next_cursor returned by the previous page",
+            },
+        )
+    return FraudReviewPageSchema(
+        items=[FraudReviewReadSchema.model_validate(r) for r in reviews],
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("/claim", response_model=list[FraudReviewReadSchema], status_code=status.HTTP_200_OK)
+async def claim_next_reviews(
+    current_user: CurrentUser,
+    count: int = Query(1, ge=1, le=settings.FRAUD_REVIEW_MAX_CLAIM),
+    session: AsyncSession = Depends(get_session),
+) -> list[FraudReviewReadSchema]:
+    """Nhận các giao dịch rủi ro nhất chưa có ai xử lý"""
+    ensure_reviewer(current_user)
+    try:
+        reviews = await claim_reviews(current_user.id, count, session)
+    except Exception as e:
+        logger.error(f"Failed to claim reviews for {current_user.email}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "status": "error",
+                "message": "Failed to claim flagged transactions",
+                "action": "Please try again later",
+            },
+        )
+    return [FraudReviewReadSchema.model_validate(r) for r in reviews]
+
+
+@router.post("/{review_id}/resolve", response_model=FraudReviewReadSchema, status_code=status.HTTP_200_OK)
+async def resolve_flagged_review(
+    review_id: uuid.UUID,
+    resolution: FraudReviewResolveSchema,
+    current_user: CurrentUser,
+    session: AsyncSession = Depends(get_session),
+) -> FraudReviewReadSchema:
+    """Kết luận giao dịch hợp lệ hoặc gian lận"""
+    ensure_reviewer(current_user)
+    review = await resolve_review(
+        review_id, current_user.id, resolution.outcome, resolution.note, session
+    )
+    if review is None:
+        raise _not_claimed(review_id)
+    logger.info(f"Review {review_id} resolved as {resolution.outcome.value} by {current_user.email}")
+    return FraudReviewReadSchema.model_validate(review)
+
+
+@router.post("/{review_id}/release", response_model=FraudReviewReadSchema, status_code=status.HTTP_200_OK)
+async def release_flagged_review(
+    review_id: uuid.UUID,
+    current_user: CurrentUser,
+    session: AsyncSession = Depends(get_session),
+) -> FraudReviewReadSchema:
+    """Trả giao dịch về hàng đợi cho người khác nhận"""
+    ensure_reviewer(current_user)
+    review = await release_review(review_id, current_user.id, session)
+    if review is None:
+        raise _not_claimed(review_id)
+    return FraudReviewReadSchema.model_validate(review)
@@ -0,0 +1,60 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.routes.auth.deps import CurrentUser
+from backend.app.api.routes.transaction.fraud_review import ensure_reviewer
+from backend.app.api.services.risk_history import get_risk_history
+from backend.app.core.db import get_session
+from backend.app.core.logging import get_logger
+from backend.app.fraud.schema import RiskHistoryResponseSchema, RiskResolutionEnum
+
+logger = get_logger()
+
+router = APIRouter(prefix="/risk-history", tags=["Fraud Review"])
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Thời điểm không kèm múi giờ được hiểu là UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@router.get("/{user_id}", response_model=RiskHistoryResponseSchema, status_code=status.HTTP_200_OK)
+async def get_user_risk_history(
+    user_id: uuid.UUID,
+    current_user: CurrentUser,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    resolution: RiskResolutionEnum = RiskResolutionEnum.HOUR,
+    session: AsyncSession = Depends(get_session),
+) -> RiskHistoryResponseSchema:
+    """Điểm rủi ro của user theo thời gian; mặc định 30 ngày gần nhất theo giờ"""
+    ensure_reviewer(current_user)
+    end = _as_utc(end) if end else datetime.now(timezone.utc)
+    start = _as_utc(start) if start else end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "status": "error",
+                "message": "start must be before end",
+                "action": "Please choose a valid time range",
+            },
+        )
+    try:
+        points = await get_risk_history(user_id, start, end, resolution, session)
+    except Exception as e:
+        logger.error(f"Failed to fetch risk history of user {user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "status": "error",
+                "message": "Failed to fetch risk history",
+                "action": "Please try again later",
+            },
+        )
+    return RiskHistoryResponseSchema(user_id=user_id, resolution=resolution, points=points)
@@ -0,0 +1,31 @@
+import uuid
+
+from fastapi import HTTPException, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.bank_account.models import BankAccount
+from backend.app.core.logging import get_logger
+
+logger = get_logger()
+
+
+# Tài khoản ngân hàng thuộc về người dùng hiện tại, 404 nếu không có hoặc của người khác
+async def get_user_bank_account(
+    account_id: uuid.UUID, user_id: uuid.UUID, session: AsyncSession
+) -> BankAccount:
+    statement = select(BankAccount).where(
+        BankAccount.id == account_id, BankAccount.user_id == user_id
+    )
+    result = await session.exec(statement)
+    account = result.first()
+    if account is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "status": "error",
+                "message": "Bank account not found",
+                "action": "Please check the account id",
+            },
+        )
+    return account
@@ -0,0 +1,208 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.entity_graph import entity_graph
+from backend.app.core.ml.schema import (
+    FraudDecisionEnum,
+    FraudScoreRequestSchema,
+    FraudScoreResponseSchema,
+)
+from backend.app.fraud.models import FraudReview
+from backend.app.fraud.schema import ReviewOutcomeEnum, ReviewStatusEnum
+
+logger = get_logger()
+
+# Thứ tự hàng đợi, trùng với index ix_fraud_reviews_queue
+QUEUE_ORDER = (
+    FraudReview.score.desc(),
+    FraudReview.created_at,
+    FraudReview.id,
+)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(review: FraudReview) -> str:
+    """Vị trí của dòng cuối trang: (score, created_at, id)"""
+    raw = json.dumps(
+        [review.score, review.created_at.isoformat(), str(review.id)]
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, datetime, uuid.UUID]:
+    try:
+        score, created_at, review_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return float(score), datetime.fromisoformat(created_at), uuid.UUID(review_id)
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}") from e
+
+
+def _after(cursor: tuple[float, datetime, uuid.UUID]):
+    """
+    Điều kiện keyset cho thứ tự (score DESC, created_at, id). Điều kiện thừa
+    score <= :score giúp Postgres seek thẳng vào index thay vì lọc từ đầu.
+    """
+    score, created_at, review_id = cursor
+    return and_(
+        FraudReview.score <= score,
+        or_(
+            FraudReview.score < score,
+            tuple_(FraudReview.created_at, FraudReview.id) > (created_at, review_id),
+        ),
+    )
+
+
+# Đưa giao dịch bị đánh dấu vào hàng đợi, chấm lại cùng giao dịch thì bỏ qua
+async def enqueue_review(
+    request: FraudScoreRequestSchema,
+    result: FraudScoreResponseSchema,
+    session: AsyncSession,
+) -> None:
+    statement = (
+        insert(FraudReview)
+        .values(
+            id=uuid.uuid4(),
+            transaction_id=result.transaction_id,
+            user_id=request.user_id,
+            score=result.score,
+            decision=result.decision,
+            model_version=result.model_version,
+            rule_hits=result.rule_hits,
+            status=ReviewStatusEnum.PENDING,
+        )
+        .on_conflict_do_nothing(index_elements=["transaction_id"])
+    )
+    await session.exec(statement)
+    await session.commit()
+
+
+async def enqueue_flagged(
+    request: FraudScoreRequestSchema, result: FraudScoreResponseSchema
+) -> None:
+    """Chạy sau khi trả kết quả chấm điểm (BackgroundTasks), lỗi chỉ ghi log"""
+    if result.decision == FraudDecisionEnum.APPROVE:
+        return
+    from backend.app.core.db import async_session
+
+    try:
+        async with async_session() as session:
+            await enqueue_review(request, result, session)
+    except Exception as e:
+        logger.error(f"Failed to enqueue transaction {result.transaction_id} for review: {e}")
+
+
+# Một trang của hàng đợi theo keyset, không dùng OFFSET
+async def list_reviews(
+    session: AsyncSession,
+    review_status: ReviewStatusEnum,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[FraudReview], str | None]:
+    statement = select(FraudReview).where(FraudReview.status == review_status)
+    if cursor:
+        statement = statement.where(_after(decode_cursor(cursor)))
+    # Lấy dư một dòng để biết còn trang sau hay không
+    result = await session.exec(statement.order_by(*QUEUE_ORDER).limit(limit + 1))
+    reviews = list(result.all())
+    if len(reviews) <= limit:
+        return reviews, None
+    reviews = reviews[:limit]
+    return reviews, encode_cursor(reviews[-1])
+
+
+# Nhận việc: nhiều người review cùng lúc không chờ lock của nhau (SKIP LOCKED)
+async def claim_reviews(
+    reviewer_id: uuid.UUID, count: int, session: AsyncSession
+) -> list[FraudReview]:
+    ids = (
+        select(FraudReview.id)
+        .where(FraudReview.status == ReviewStatusEnum.PENDING)
+        .order_by(*QUEUE_ORDER)
+        .limit(count)
+        .with_for_update(skip_locked=True)
+    )
+    statement = (
+        update(FraudReview)
+        .where(FraudReview.id.in_(ids.scalar_subquery()))
+        .values(
+            status=ReviewStatusEnum.IN_REVIEW,
+            claimed_by=reviewer_id,
+            claimed_at=datetime.now(timezone.utc),
+        )
+        .returning(FraudReview)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.exec(statement)
+    reviews = list(result.scalars().all())
+    await session.commit()
+    # RETURNING không giữ thứ tự của subquery
+    reviews.sort(key=lambda r: (-r.score, r.created_at, r.id))
+    return reviews
+
+
+# Kết luận một giao dịch đang được chính người review này giữ
+async def resolve_review(
+    review_id: uuid.UUID,
+    reviewer_id: uuid.UUID,
+    outcome: ReviewOutcomeEnum,
+    note: str | None,
+    session: AsyncSession,
+) -> FraudReview | None:
+    statement = (
+        update(FraudReview)
+        .where(
+            FraudReview.id == review_id,
+            FraudReview.status == ReviewStatusEnum.IN_REVIEW,
+            FraudReview.claimed_by == reviewer_id,
+        )
+        .values(
+            status=ReviewStatusEnum(outcome.value),
+            resolved_at=datetime.now(timezone.utc),
+            note=note,
+        )
+        .returning(FraudReview)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.exec(statement)
+    review = result.scalars().first()
+    await session.commit()
+    if (
+        review is not None
+        and outcome == ReviewOutcomeEnum.CONFIRMED_FRAUD
+        and review.user_id is not None
+    ):
+        # Gian lận đã xác nhận làm cả cụm tài khoản liên kết rủi ro hơn
+        entity_graph.flag(review.user_id)
+    return review
+
+
+# Trả việc về hàng đợi khi người review không xử lý tiếp
+async def release_review(
+    review_id: uuid.UUID, reviewer_id: uuid.UUID, session: AsyncSession
+) -> FraudReview | None:
+    statement = (
+        update(FraudReview)
+        .where(
+            FraudReview.id == review_id,
+            FraudReview.status == ReviewStatusEnum.IN_REVIEW,
+            FraudReview.claimed_by == reviewer_id,
+        )
+        .values(status=ReviewStatusEnum.PENDING, claimed_by=None, claimed_at=None)
+        .returning(FraudReview)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.exec(statement)
+    review = result.scalars().first()
+    await session.commit()
+    return review
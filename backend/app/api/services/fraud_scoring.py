@@ -0,0 +1,34 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.bank_account.models import BankAccount
+from backend.app.core.ml.schema import FraudScoreRequestSchema
+from backend.app.transaction.models import Transaction
+
+
+# Giao dịch do chính hệ thống ghi sổ: chủ tài khoản, tài khoản, số tiền và thời điểm
+# lấy từ database thay vì tin dữ liệu người gọi gửi lên; None nếu không có giao dịch
+async def resolve_server_transaction(
+    request: FraudScoreRequestSchema, session: AsyncSession
+) -> FraudScoreRequestSchema | None:
+    result = await session.exec(
+        select(
+            Transaction.account_id,
+            Transaction.amount,
+            Transaction.created_at,
+            BankAccount.user_id,
+        )
+        .join(BankAccount, BankAccount.id == Transaction.account_id)
+        .where(Transaction.id == request.transaction_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return request.model_copy(
+        update={
+            "user_id": row.user_id,
+            "account_id": str(row.account_id),
+            "amount": float(row.amount),
+            "occurred_at": row.created_at,
+        }
+    )
@@ -0,0 +1,370 @@
+"""
+Sổ cái: mỗi lần nộp/rút/chuyển tiền là một bút toán kép ghi trong một transaction.
+Các tài khoản liên quan được khóa bằng SELECT ... FOR UPDATE theo thứ tự id, nên hai
+chuyển khoản ngược chiều A->B và B->A không thể giữ khóa chéo nhau. Sau khi khóa thì
+cập nhật số dư, ghi ledger_postings và mỗi tài khoản một dòng transactions.
+
+Deadlock/serialization failure còn sót lại (chẳng hạn khi chạy ở SERIALIZABLE) được
+thử lại với backoff có jitter. Khóa idempotency cho phép client gửi lại yêu cầu mà
+không bị ghi hai lần.
+"""
+import asyncio
+import hashlib
+import random
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.bank_account.enums import AccountStatusEnum
+from backend.app.bank_account.models import BankAccount
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.transaction.enums import (
+    TransactionDirectionEnum,
+    TransactionStatusEnum,
+    TransactionTypeEnum,
+)
+from backend.app.transaction.models import LedgerPosting, Transaction
+from backend.app.transaction.schema import PostingResultSchema
+
+logger = get_logger()
+
+# SQLSTATE được thử lại: serialization_failure, deadlock_detected
+RETRYABLE_SQLSTATES = {"40001": "serialization_failure", "40P01": "deadlock_detected"}
+
+# Số lần thử lại theo loại lỗi trong tiến trình này
+retry_counts: Counter[str] = Counter()
+
+
+class LedgerError(Exception):
+    status_code = status.HTTP_400_BAD_REQUEST
+    action = "Please check the transaction details"
+
+    def to_http(self) -> HTTPException:
+        return HTTPException(
+            status_code=self.status_code,
+            detail={"status": "error", "message": str(self), "action": self.action},
+        )
+
+
+class AccountNotFoundError(LedgerError):
+    status_code = status.HTTP_404_NOT_FOUND
+    action = "Please check the account"
+
+
+class AccountNotActiveError(LedgerError):
+    action = "Please activate the account or contact support"
+
+
+class CurrencyMismatchError(LedgerError):
+    action = "Please use accounts with the same currency"
+
+
+class InsufficientFundsError(LedgerError):
+    action = "Please check your balance"
+
+
+class IdempotencyKeyReusedError(LedgerError):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    action = "Please use a new Idempotency-Key for a different request"
+
+
+def _reference(transaction_type: TransactionTypeEnum) -> str:
+    return f"{transaction_type.value[:3].upper()}-{uuid.uuid4().hex[:20].upper()}"
+
+
+def _request_hash(
+    transaction_type: TransactionTypeEnum,
+    amount: Decimal,
+    debit_account_id: uuid.UUID | None,
+    credit_account_id: uuid.UUID | None,
+    description: str,
+) -> str:
+    raw = f"{transaction_type.value}:{amount:.2f}:{debit_account_id}:{credit_account_id}:{description}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def _account_id_by_number(account_number: str, session: AsyncSession) -> uuid.UUID:
+    result = await session.exec(
+        select(BankAccount.id).where(BankAccount.account_number == account_number)
+    )
+    account_id = result.first()
+    if account_id is None:
+        raise AccountNotFoundError(f"Bank account {account_number} not found")
+    return account_id
+
+
+async def _replay(
+    initiated_by: uuid.UUID,
+    idempotency_key: str,
+    request_hash: str,
+    account_id: uuid.UUID,
+    session: AsyncSession,
+) -> PostingResultSchema | None:
+    """Kết quả của bút toán đã ghi với cùng khóa idempotency, None nếu chưa có"""
+    result = await session.exec(
+        select(LedgerPosting).where(
+            LedgerPosting.initiated_by == initiated_by,
+            LedgerPosting.idempotency_key == idempotency_key,
+        )
+    )
+    posting = result.first()
+    if posting is None:
+        return None
+    if posting.request_hash != request_hash:
+        raise IdempotencyKeyReusedError(
+            "Idempotency-Key was already used for a different request"
+        )
+    balance_after = await session.exec(
+        select(Transaction.balance_after).where(
+            Transaction.reference == posting.reference,
+            Transaction.account_id == account_id,
+        )
+    )
+    return PostingResultSchema(
+        reference=posting.reference,
+        transaction_type=posting.transaction_type,
+        amount=posting.amount,
+        currency=posting.currency,
+        account_id=account_id,
+        balance_after=balance_after.one(),
+        created_at=posting.created_at,
+        replayed=True,
+    )
+
+
+async def _post_once(
+    session: AsyncSession,
+    *,
+    transaction_type: TransactionTypeEnum,
+    amount: Decimal,
+    description: str,
+    debit_account_id: uuid.UUID | None,
+    credit_account_id: uuid.UUID | None,
+    initiated_by: uuid.UUID,
+    owner_id: uuid.UUID | None,
+    idempotency_key: str | None,
+    account_id: uuid.UUID,
+) -> PostingResultSchema:
+    await session.connection(
+        execution_options={"isolation_level": settings.LEDGER_ISOLATION_LEVEL}
+    )
+    request_hash = _request_hash(
+        transaction_type, amount, debit_account_id, credit_account_id, description
+    )
+    if idempotency_key is not None:
+        replay = await _replay(initiated_by, idempotency_key, request_hash, account_id, session)
+        if replay is not None:
+            return replay
+
+    # Khóa theo thứ tự id: LockRows nằm trên Sort nên các hàng bị khóa lần lượt theo id
+    account_ids = sorted(i for i in (debit_account_id, credit_account_id) if i is not None)
+    result = await session.exec(
+        select(
+            BankAccount.id,
+            BankAccount.user_id,
+            BankAccount.account_status,
+            BankAccount.currency,
+            BankAccount.balance,
+        )
+        .where(BankAccount.id.in_(account_ids))
+        .order_by(BankAccount.id)
+        .with_for_update()
+    )
+    accounts = {row.id: row for row in result.all()}
+    if idempotency_key is not None:
+        # Yêu cầu trùng khóa có thể vừa commit trong lúc chờ khóa: trả lại kết quả của nó
+        # trước khi kiểm tra số dư/trạng thái đã bị chính nó thay đổi
+        replay = await _replay(initiated_by, idempotency_key, request_hash, account_id, session)
+        if replay is not None:
+            return replay
+    if len(accounts) != len(account_ids) or (
+        owner_id is not None and accounts[debit_account_id].user_id != owner_id
+    ):
+        raise AccountNotFoundError("Bank account not found")
+    for row in accounts.values():
+        if row.account_status != AccountStatusEnum.Active:
+            raise AccountNotActiveError(f"Bank account {row.id} is not active")
+    currencies = {row.currency for row in accounts.values()}
+    if len(currencies) > 1:
+        raise CurrencyMismatchError("Accounts have different currencies")
+    currency = currencies.pop()
+    if debit_account_id is not None and accounts[debit_account_id].balance < amount:
+        raise InsufficientFundsError("Insufficient funds")
+
+    now = datetime.now(timezone.utc)
+    reference = _reference(transaction_type)
+    posting = pg_insert(LedgerPosting).values(
+        id=uuid.uuid4(),
+        reference=reference,
+        transaction_type=transaction_type,
+        amount=amount,
+        currency=currency,
+        debit_account_id=debit_account_id,
+        credit_account_id=credit_account_id,
+        description=description,
+        initiated_by=initiated_by,
+        idempotency_key=idempotency_key,
+        request_hash=request_hash,
+        created_at=now,
+    )
+    if idempotency_key is not None:
+        posting = posting.on_conflict_do_nothing(constraint="uq_ledger_postings_idempotency")
+    inserted = await session.exec(posting.returning(LedgerPosting.id))
+    if inserted.first() is None:
+        # Chốt cuối của unique index: yêu cầu trùng commit sau lần kiểm tra ở trên
+        return await _replay(initiated_by, idempotency_key, request_hash, account_id, session)
+
+    balances = {}
+    lines = []
+    for locked_id in account_ids:
+        row = accounts[locked_id]
+        debit = locked_id == debit_account_id
+        balances[locked_id] = row.balance - amount if debit else row.balance + amount
+        await session.exec(
+            update(BankAccount)
+            .where(BankAccount.id == locked_id)
+            .values(balance=balances[locked_id])
+        )
+        lines.append(
+            {
+                "id": uuid.uuid4(),
+                "account_id": locked_id,
+                "reference": reference,
+                "transaction_type": transaction_type,
+                "direction": TransactionDirectionEnum.Debit if debit else TransactionDirectionEnum.Credit,
+                "amount": amount,
+                "balance_after": balances[locked_id],
+                "currency": currency,
+                "description": description,
+                "status": TransactionStatusEnum.Completed,
+                "counterparty_account_id": credit_account_id if debit else debit_account_id,
+                "created_at": now,
+            }
+        )
+    await session.exec(insert(Transaction), params=lines)
+    return PostingResultSchema(
+        reference=reference,
+        transaction_type=transaction_type,
+        amount=amount,
+        currency=currency,
+        account_id=account_id,
+        balance_after=balances[account_id],
+        created_at=now,
+    )
+
+
+async def _post(session: AsyncSession, **posting) -> PostingResultSchema:
+    """Ghi bút toán và commit, thử lại cả transaction khi gặp lỗi tạm thời"""
+    if session.in_transaction():
+        # Kết thúc transaction chỉ đọc của request (lấy user, tra số tài khoản) để bút
+        # toán chạy trong transaction riêng với mức cô lập của sổ cái
+        await session.commit()
+    attempt = 0
+    while True:
+        try:
+            result = await _post_once(session, **posting)
+            await session.commit()
+            return result
+        except DBAPIError as e:
+            await session.rollback()
+            sqlstate = getattr(e.orig, "sqlstate", None)
+            if sqlstate not in RETRYABLE_SQLSTATES or attempt >= settings.LEDGER_MAX_RETRIES:
+                raise
+            retry_counts[RETRYABLE_SQLSTATES[sqlstate]] += 1
+            attempt += 1
+            # Full jitter: các transaction vừa va chạm không thử lại cùng một lúc
+            delay = random.uniform(
+                0,
+                min(settings.LEDGER_RETRY_MAX_DELAY, settings.LEDGER_RETRY_BASE_DELAY * 2**attempt),
+            )
+            logger.warning(
+                f"Ledger posting hit {RETRYABLE_SQLSTATES[sqlstate]}, "
+                f"retry {attempt}/{settings.LEDGER_MAX_RETRIES} in {delay * 1000:.0f}ms"
+            )
+            await asyncio.sleep(delay)
+        except Exception:
+            await session.rollback()
+            raise
+
+
+# Giao dịch viên nộp tiền mặt vào tài khoản
+async def deposit(
+    account_number: str,
+    amount: Decimal,
+    description: str,
+    teller_id: uuid.UUID,
+    session: AsyncSession,
+    idempotency_key: str | None = None,
+) -> PostingResultSchema:
+    account_id = await _account_id_by_number(account_number, session)
+    return await _post(
+        session,
+        transaction_type=TransactionTypeEnum.Deposit,
+        amount=amount,
+        description=description,
+        debit_account_id=None,
+        credit_account_id=account_id,
+        initiated_by=teller_id,
+        owner_id=None,
+        idempotency_key=idempotency_key,
+        account_id=account_id,
+    )
+
+
+# Chủ tài khoản rút tiền
+async def withdraw(
+    account_id: uuid.UUID,
+    amount: Decimal,
+    description: str,
+    user_id: uuid.UUID,
+    session: AsyncSession,
+    idempotency_key: str | None = None,
+) -> PostingResultSchema:
+    return await _post(
+        session,
+        transaction_type=TransactionTypeEnum.Withdrawal,
+        amount=amount,
+        description=description,
+        debit_account_id=account_id,
+        credit_account_id=None,
+        initiated_by=user_id,
+        owner_id=user_id,
+        idempotency_key=idempotency_key,
+        account_id=account_id,
+    )
+
+
+# Chuyển tiền từ tài khoản của người dùng sang một tài khoản khác theo số tài khoản
+async def transfer(
+    from_account_id: uuid.UUID,
+    to_account_number: str,
+    amount: Decimal,
+    description: str,
+    user_id: uuid.UUID,
+    session: AsyncSession,
+    idempotency_key: str | None = None,
+) -> PostingResultSchema:
+    to_account_id = await _account_id_by_number(to_account_number, session)
+    if to_account_id == from_account_id:
+        raise LedgerError("Cannot transfer to the same account")
+    return await _post(
+        session,
+        transaction_type=TransactionTypeEnum.Transfer,
+        amount=amount,
+        description=description,
+        debit_account_id=from_account_id,
+        credit_account_id=to_account_id,
+        initiated_by=user_id,
+        owner_id=user_id,
+        idempotency_key=idempotency_key,
+        account_id=from_account_id,
+    )
@@ -6,6 +6,8 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.app.auth.models import User
 from backend.app.core.logging import get_logger
+from backend.app.core.ml.entity_graph import entity_graph
+from backend.app.core.ml.profile_cache import profile_cache
 # from backend.app.core.tasks.image_upload import upload_profile_image_task
 from backend.app.user_profile.enums import ImageTypeEnum
 from backend.app.user_profile.models import Profile
@@ -54,6 +56,9 @@ async def create_user_profile(
 
         await session.commit()
         await session.refresh(profile)
+        # Luật gian lận đọc quốc gia/thu nhập từ cache, không truy vấn DB
+        await profile_cache.put(profile)
+        await entity_graph.publish_profile(profile)
 
         logger.info(f"Created profile for user {user_id}")
         return profile
@@ -95,6 +100,8 @@ async def update_user_profile(
 
         await session.commit()
         await session.refresh(profile)
+        await profile_cache.put(profile)
+        await entity_graph.publish_profile(profile)
 
         logger.info(f"Updated profile for user {user_id}")
         return profile
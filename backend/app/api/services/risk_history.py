@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.core.config import settings
+from backend.app.core.ml.schema import FraudDecisionEnum
+from backend.app.fraud.models import RiskHistory, RiskHistoryDaily, RiskHistoryHourly
+from backend.app.fraud.schema import RiskHistoryPointSchema, RiskResolutionEnum
+
+ROLLUP_TABLES = {
+    RiskResolutionEnum.HOUR: RiskHistoryHourly,
+    RiskResolutionEnum.DAY: RiskHistoryDaily,
+}
+
+
+# Lịch sử điểm rủi ro của user trong [start, end)
+async def get_risk_history(
+    user_id: uuid.UUID,
+    start: datetime,
+    end: datetime,
+    resolution: RiskResolutionEnum,
+    session: AsyncSession,
+) -> list[RiskHistoryPointSchema]:
+    if resolution == RiskResolutionEnum.RAW:
+        # Khoảng scored_at chỉ chạm vào các phân vùng tháng liên quan
+        statement = (
+            select(RiskHistory.scored_at, RiskHistory.score, RiskHistory.decision)
+            .where(
+                RiskHistory.user_id == user_id,
+                RiskHistory.scored_at >= start,
+                RiskHistory.scored_at < end,
+            )
+            .order_by(RiskHistory.scored_at)
+            .limit(settings.FRAUD_RISK_HISTORY_MAX_RAW_POINTS)
+        )
+        result = await session.exec(statement)
+        return [
+            RiskHistoryPointSchema(
+                bucket=scored_at,
+                events=1,
+                avg_score=score,
+                max_score=score,
+                flagged=int(decision != FraudDecisionEnum.APPROVE),
+            )
+            for scored_at, score, decision in result.all()
+        ]
+
+    table = ROLLUP_TABLES[resolution]
+    statement = (
+        select(
+            table.bucket,
+            table.events,
+            (table.score_sum / func.nullif(table.events, 0)).label("avg_score"),
+            table.score_max,
+            table.flagged,
+        )
+        .where(table.user_id == user_id, table.bucket >= start, table.bucket < end)
+        .order_by(table.bucket)
+    )
+    result = await session.exec(statement)
+    return [
+        RiskHistoryPointSchema(
+            bucket=bucket,
+            events=events,
+            avg_score=avg_score or 0.0,
+            max_score=score_max,
+            flagged=flagged,
+        )
+        for bucket, events, avg_score, score_max, flagged in result.all()
+    ]
@@ -0,0 +1,175 @@
+import base64
+import hashlib
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import func, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.redis_client import redis_client
+from backend.app.transaction.enums import (
+    TransactionDirectionEnum,
+    TransactionStatusEnum,
+)
+from backend.app.transaction.models import Transaction
+from backend.app.transaction.schema import (
+    TransactionReadSchema,
+    TransactionSummarySchema,
+)
+
+logger = get_logger()
+
+SUMMARY_KEY_PREFIX = "transaction_history:summary"
+
+# Mới nhất trước; quét ngược index ix_transactions_history (account_id, created_at, id)
+HISTORY_ORDER = (Transaction.created_at.desc(), Transaction.id.desc())
+
+# Chỉ các cột có trong index để Postgres không phải đọc heap
+HISTORY_COLUMNS = (
+    Transaction.id,
+    Transaction.account_id,
+    Transaction.created_at,
+    Transaction.reference,
+    Transaction.transaction_type,
+    Transaction.direction,
+    Transaction.amount,
+    Transaction.balance_after,
+    Transaction.currency,
+    Transaction.description,
+    Transaction.status,
+    Transaction.counterparty_account_id,
+)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(transaction: TransactionReadSchema) -> str:
+    """Vị trí của giao dịch cuối trang: (created_at, id)"""
+    raw = json.dumps([transaction.created_at.isoformat(), str(transaction.id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        created_at, transaction_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), uuid.UUID(transaction_id)
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}") from e
+
+
+@dataclass(frozen=True)
+class HistoryFilter:
+    start_date: date | None = None
+    end_date: date | None = None
+    min_amount: Decimal | None = None
+    max_amount: Decimal | None = None
+
+    def conditions(self, account_id: uuid.UUID) -> list:
+        """Khoảng ngày (UTC, gồm cả ngày cuối) thành khoảng created_at trên cột khóa của index"""
+        conditions = [Transaction.account_id == account_id]
+        if self.start_date is not None:
+            conditions.append(
+                Transaction.created_at >= datetime.combine(self.start_date, time.min, tzinfo=timezone.utc)
+            )
+        if self.end_date is not None:
+            conditions.append(
+                Transaction.created_at
+                < datetime.combine(self.end_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+            )
+        if self.min_amount is not None:
+            conditions.append(Transaction.amount >= self.min_amount)
+        if self.max_amount is not None:
+            conditions.append(Transaction.amount <= self.max_amount)
+        return conditions
+
+
+# Một trang lịch sử giao dịch theo keyset, trang sâu cũng chỉ là một lần seek
+async def list_transactions(
+    account_id: uuid.UUID,
+    filters: HistoryFilter,
+    limit: int,
+    cursor: str | None,
+    session: AsyncSession,
+) -> tuple[list[TransactionReadSchema], str | None]:
+    statement = select(*HISTORY_COLUMNS).where(*filters.conditions(account_id))
+    if cursor:
+        statement = statement.where(
+            tuple_(Transaction.created_at, Transaction.id) < decode_cursor(cursor)
+        )
+    # Lấy dư một dòng để biết còn trang sau hay không
+    result = await session.exec(statement.order_by(*HISTORY_ORDER).limit(limit + 1))
+    transactions = [TransactionReadSchema.model_validate(row._mapping) for row in result.all()]
+    if len(transactions) <= limit:
+        return transactions, None
+    transactions = transactions[:limit]
+    return transactions, encode_cursor(transactions[-1])
+
+
+async def _summary_key(account_id: uuid.UUID, filters: HistoryFilter, session: AsyncSession) -> str:
+    """
+    Khóa cache gồm giao dịch mới nhất của tài khoản (một lần seek): các trang của cùng
+    cửa sổ lọc dùng chung một bản tổng, có giao dịch mới thì tự chuyển sang khóa mới
+    """
+    latest = await session.exec(
+        select(Transaction.id)
+        .where(Transaction.account_id == account_id)
+        .order_by(*HISTORY_ORDER)
+        .limit(1)
+    )
+    raw = f"{filters.start_date}:{filters.end_date}:{filters.min_amount}:{filters.max_amount}:{latest.first()}"
+    return f"{SUMMARY_KEY_PREFIX}:{account_id}:{hashlib.sha256(raw.encode()).hexdigest()[:32]}"
+
+
+async def get_summary(
+    account_id: uuid.UUID, filters: HistoryFilter, session: AsyncSession
+) -> TransactionSummarySchema:
+    key = await _summary_key(account_id, filters, session)
+    try:
+        cached = await redis_client.get(key)
+        if cached is not None:
+            return TransactionSummarySchema.model_validate_json(cached)
+    except Exception as e:
+        logger.warning(f"Failed to read transaction summary cache: {e}")
+
+    zero = Decimal("0.00")
+    result = await session.exec(
+        select(
+            func.count(),
+            func.coalesce(
+                func.sum(Transaction.amount).filter(
+                    Transaction.direction == TransactionDirectionEnum.Debit
+                ),
+                zero,
+            ),
+            func.coalesce(
+                func.sum(Transaction.amount).filter(
+                    Transaction.direction == TransactionDirectionEnum.Credit
+                ),
+                zero,
+            ),
+        ).where(
+            *filters.conditions(account_id),
+            Transaction.status == TransactionStatusEnum.Completed,
+        )
+    )
+    count, total_debit, total_credit = result.one()
+    summary = TransactionSummarySchema(
+        count=count, total_debit=total_debit, total_credit=total_credit
+    )
+    try:
+        await redis_client.set(
+            key,
+            summary.model_dump_json(),
+            ex=settings.TRANSACTION_HISTORY_SUMMARY_TTL_SECONDS,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to cache transaction summary: {e}")
+    return summary
@@ -5,6 +5,7 @@ from fastapi import HTTPException, status
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from backend.app.auth.models import User
+from backend.app.auth.revocation import token_revocation
 from backend.app.auth.schema import AccountStatusSchema, UserCreateSchema
 from backend.app.auth.utils import (
     generate_username, generate_password_hash,
@@ -78,7 +79,8 @@ class UserAuthService:
         self, plain_password: str, hashed_password: str
     ) -> bool:
         """Xác minh mật khẩu người dùng"""
-        return verify_password(plain_password, hashed_password)
+        # Argon2 tốn CPU, chạy trong thread pool để không chặn event loop
+        return await asyncio.to_thread(verify_password, plain_password, hashed_password)
     async def reset_user_state(
         self,
         user: User,
@@ -96,6 +98,14 @@ class UserAuthService:
         """
         # Lưu lại trạng thái tài khoản trước khi thay đổi
         previous_status = user.account_status
+        # Trạng thái đã sạch (job định kỳ đã dọn) -> không cần ghi vào DB
+        if (
+            user.failed_login_attempts == 0
+            and user.last_failed_login is None
+            and (not clear_otp or (not user.otp and user.otp_expiry_time is None))
+            and user.account_status != AccountStatusSchema.LOCKED
+        ):
+            return
         # Reset số lần đăng nhập sai
         user.failed_login_attempts = 0
         # Xóa thời điểm đăng nhập sai gần nhất
@@ -217,7 +227,9 @@ class UserAuthService:
         # Tạo đối tượng User mới
         new_user = User(
             username=generate_username(),                 # Sinh username tự động
-            hashed_password=generate_password_hash(password),  # Mã hóa mật khẩu
+            hashed_password=await asyncio.to_thread(
+                generate_password_hash, password
+            ),  # Mã hóa mật khẩu (chạy trong thread pool)
             is_active=False,                              # Chưa kích hoạt
             account_status=AccountStatusSchema.PENDING,   # Chờ kích hoạt
             **user_data_dict,
@@ -339,8 +351,19 @@ class UserAuthService:
             await self.validate_user_status(user)
             # Kiểm tra người dùng có đang bị khóa tạm thời do đăng nhập sai nhiều lần hay không
             await self.check_user_lockout(user, session)
-            # OTP không tồn tại hoặc không khớp
-            if not user.otp or user.otp != otp:
+            # Không có OTP đang chờ (đã dùng hoặc đã bị job định kỳ xóa khi hết hạn)
+            # -> không tính là đăng nhập sai
+            if not user.otp:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={
+                        "status": "error",
+                        "message": "OTP has expired",
+                        "action": "Please request a new OTP",
+                    },
+                )
+            # OTP không khớp
+            if user.otp != otp:
                  # Tăng số lần đăng nhập sai
                 await self.increment_failed_login_attempts(user, session)
                 raise HTTPException(
@@ -459,23 +482,45 @@ class UserAuthService:
             )
             if payload.get("type") != "password_reset":
                 raise ValueError("Invalid reset token")
-            # Lấy user ID từ payload
-            user_id = uuid.UUID(payload["id"])
-            # Lấy user kể cả khi chưa active
-            user = await self.get_user_by_id(user_id, session, include_inactive=True)
-            # Không tìm thấy user
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail={"status": "error", "message": "User not found"},
+            # Link đặt lại chỉ dùng được một lần: claim trực tiếp trên Redis thay vì
+            # hỏi bloom filter của worker (chỉ đồng bộ theo chu kỳ)
+            if not await token_revocation.claim_token(payload):
+                raise ValueError("Password reset token already used")
+            try:
+                # Lấy user ID từ payload
+                user_id = uuid.UUID(payload["id"])
+                # Lấy user kể cả khi chưa active
+                user = await self.get_user_by_id(
+                    user_id, session, include_inactive=True
+                )
+                # Không tìm thấy user
+                if not user:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail={"status": "error", "message": "User not found"},
+                    )
+                # Cập nhật pass mới
+                user.hashed_password = await asyncio.to_thread(
+                    generate_password_hash, new_password
+                )
+                # Reset trạng thái bảo mật
+                await self.reset_user_state(
+                    user, session, clear_otp=True, log_action=True
                 )
-            # Cập nhật pass mới
-            user.hashed_password = generate_password_hash(new_password)
-            # Reset trạng thái bảo mật
-            await self.reset_user_state(user, session, clear_otp=True, log_action=True)
 
-            await session.commit()
+                await session.commit()
+            except Exception:
+                # Mật khẩu chưa đổi -> link vẫn dùng lại được
+                await token_revocation.release_token(payload)
+                raise
             await session.refresh(user)
+            # Mật khẩu đã lưu: lỗi Redis khi đăng xuất các phiên cũ không làm hỏng kết quả
+            try:
+                await token_revocation.revoke_user_tokens(user.id)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to revoke existing sessions of user {user.email}: {e}"
+                )
 
             logger.info(f"Password reset successful for user {user.email}")
 
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, ClassVar
 from pydantic import computed_field
-from sqlalchemy import func, text
+from sqlalchemy import Index, func, text
 from sqlalchemy.dialects import postgresql as pg
 from sqlmodel import Column, Field, Relationship
 from backend.app.auth.schema import BaseUserSchema, RoleChoicesSchema
@@ -11,6 +11,19 @@ if TYPE_CHECKING:
 
 class User(BaseUserSchema, table=True):
     __tablename__: ClassVar[str] = "users"
+    # Index một phần cho các job dọn dẹp định kỳ, chỉ chứa các dòng cần xử lý
+    __table_args__ = (
+        Index(
+            "ix_users_otp_expiry_time",
+            "otp_expiry_time",
+            postgresql_where=text("otp_expiry_time IS NOT NULL"),
+        ),
+        Index(
+            "ix_users_last_failed_login",
+            "last_failed_login",
+            postgresql_where=text("last_failed_login IS NOT NULL"),
+        ),
+    )
 
     id: uuid.UUID = Field(
         sa_column=Column(
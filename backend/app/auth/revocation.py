@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import math
+import time
+import uuid
+from typing import Any
+
+from prometheus_client import Counter
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.redis_client import redis_client
+
+logger = get_logger()
+
+REVOCATION_BLOOM_POSITIVES = Counter(
+    "token_revocation_bloom_positives_total",
+    "Số lần bloom filter báo token có thể đã bị thu hồi (cần xác nhận với Redis)",
+)
+
+# Độ rộng mỗi bucket thời gian; danh sách thu hồi được chia theo giờ hết hạn của token
+BUCKET_SECONDS = 3600
+JTI_KEY_PREFIX = "auth:revoked:jti"
+USER_KEY_PREFIX = "auth:revoked:user"
+CLAIM_KEY_PREFIX = "auth:reset"
+
+
+def _max_token_lifetime() -> int:
+    return max(
+        settings.JWT_ACCESS_TOKEN_EXPIRATION_MINUTES * 60,
+        settings.JWT_REFRESH_TOKEN_EXPIRATION_DAYS * 24 * 60 * 60,
+        settings.PASSWORD_RESET_TOKEN_EXPIRATION_MINUTES * 60,
+    )
+
+
+def _bucket(timestamp: float) -> int:
+    return int(timestamp // BUCKET_SECONDS)
+
+
+class BloomFilter:
+    """Bloom filter đơn giản trên bytearray, dùng double hashing từ blake2b"""
+
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.001):
+        expected_items = max(expected_items, 1024)
+        self._size = math.ceil(
+            -expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)
+        )
+        self._hash_count = max(
+            1, round(self._size / expected_items * math.log(2))
+        )
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self._hash_count):
+            yield (h1 + i * h2) % self._size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class TokenRevocationStore:
+    """
+    Danh sách thu hồi token lưu trên Redis theo bucket thời gian hết hạn.
+    Mỗi worker giữ một bloom filter đồng bộ định kỳ từ Redis: token chưa bị thu hồi
+    được kiểm tra hoàn toàn trong bộ nhớ, chỉ khi bloom filter báo trùng mới gọi Redis.
+    """
+
+    def __init__(self):
+        self._bloom = BloomFilter(expected_items=0)
+        # user_id -> token phát hành trước thời điểm này đều bị thu hồi
+        self._user_revoked_before: dict[str, int] = {}
+        self._sync_task: asyncio.Task | None = None
+
+    @staticmethod
+    def _jti_key(exp: float) -> str:
+        return f"{JTI_KEY_PREFIX}:{_bucket(exp)}"
+
+    async def revoke_token(self, payload: dict[str, Any]) -> None:
+        """Thu hồi một token theo jti cho tới khi token tự hết hạn"""
+        jti = payload.get("jti")
+        exp = payload.get("exp")
+        if not jti or not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+        key = self._jti_key(exp)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.sadd(key, jti)
+            # Bucket tự xóa khi mọi token trong đó đã hết hạn
+            pipe.expireat(key, (_bucket(exp) + 1) * BUCKET_SECONDS + 60)
+            await pipe.execute()
+        self._bloom.add(jti)
+
+    async def claim_token(self, payload: dict[str, Any]) -> bool:
+        """
+        Đánh dấu token dùng một lần (link đặt lại mật khẩu) là đã dùng bằng SET NX trên
+        Redis, nguyên tử giữa mọi worker; False nếu token đã được dùng trước đó
+        """
+        jti = payload.get("jti")
+        exp = payload.get("exp")
+        if not jti or not isinstance(exp, (int, float)):
+            return False
+        return bool(
+            await redis_client.set(
+                f"{CLAIM_KEY_PREFIX}:{jti}", 1, nx=True, exat=math.ceil(exp)
+            )
+        )
+
+    async def release_token(self, payload: dict[str, Any]) -> None:
+        """Trả lại token đã claim khi thao tác dùng nó thất bại"""
+        await redis_client.delete(f"{CLAIM_KEY_PREFIX}:{payload.get('jti')}")
+
+    async def revoke_user_tokens(self, user_id: uuid.UUID | str) -> None:
+        """Thu hồi mọi token của user đã phát hành tới thời điểm hiện tại"""
+        now = time.time()
+        revoked_before = math.floor(now) + 1
+        key = f"{USER_KEY_PREFIX}:{_bucket(now)}"
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, str(user_id), revoked_before)
+            pipe.expireat(
+                key, (_bucket(now) + 1) * BUCKET_SECONDS + _max_token_lifetime()
+            )
+            await pipe.execute()
+        self._user_revoked_before[str(user_id)] = revoked_before
+
+    async def is_revoked(self, payload: dict[str, Any]) -> bool:
+        revoked_before = self._user_revoked_before.get(str(payload.get("id")))
+        if revoked_before is not None and payload.get("iat", 0) < revoked_before:
+            return True
+
+        jti = payload.get("jti")
+        if not jti or jti not in self._bloom:
+            return False
+
+        # Bloom filter có thể báo nhầm -> xác nhận với Redis
+        REVOCATION_BLOOM_POSITIVES.inc()
+        try:
+            return bool(
+                await redis_client.sismember(self._jti_key(payload["exp"]), jti)
+            )
+        except Exception as e:
+            logger.error(f"Failed to confirm token revocation, denying token: {e}")
+            return True
+
+    async def sync(self) -> None:
+        """Nạp lại bloom filter và danh sách thu hồi theo user từ các bucket còn hiệu lực"""
+        now = time.time()
+        lifetime = _max_token_lifetime()
+        jti_buckets = range(_bucket(now), _bucket(now + lifetime) + 1)
+        user_buckets = range(_bucket(now - lifetime), _bucket(now) + 1)
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for bucket in jti_buckets:
+                pipe.smembers(f"{JTI_KEY_PREFIX}:{bucket}")
+            for bucket in user_buckets:
+                pipe.hgetall(f"{USER_KEY_PREFIX}:{bucket}")
+            results = await pipe.execute()
+
+        jti_sets = results[: len(jti_buckets)]
+        user_maps = results[len(jti_buckets) :]
+
+        bloom = BloomFilter(expected_items=2 * sum(len(s) for s in jti_sets))
+        for members in jti_sets:
+            for jti in members:
+                bloom.add(jti)
+
+        user_revoked_before: dict[str, int] = {}
+        for mapping in user_maps:
+            for user_id, revoked_before in mapping.items():
+                user_revoked_before[user_id] = max(
+                    int(revoked_before), user_revoked_before.get(user_id, 0)
+                )
+
+        self._bloom = bloom
+        self._user_revoked_before = user_revoked_before
+
+    async def _run_sync_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f"Token revocation sync failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float = settings.TOKEN_REVOCATION_SYNC_SECONDS) -> None:
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._run_sync_loop(interval))
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+
+token_revocation = TokenRevocationStore()
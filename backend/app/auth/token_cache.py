@@ -0,0 +1,87 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+import jwt
+from prometheus_client import Counter
+
+from backend.app.core.config import settings
+
+JWT_CACHE_HITS = Counter("jwt_cache_hits_total", "Số lần token được lấy từ cache")
+JWT_CACHE_MISSES = Counter(
+    "jwt_cache_misses_total", "Số lần token phải giải mã và xác minh chữ ký"
+)
+
+
+class TokenCache:
+    """
+    LRU có giới hạn lưu payload JWT đã xác minh, khóa theo digest của token.
+    Payload chỉ được giữ tới thời điểm `exp` của token.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        self._entries.move_to_end(key)
+        return payload
+
+    def put(self, token: str, payload: dict[str, Any]) -> None:
+        exp = payload.get("exp")
+        # Không cache token không có thời hạn
+        if not isinstance(exp, (int, float)):
+            return
+        self._entries[self._digest(token)] = (payload, float(exp))
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        self._entries.pop(self._digest(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+token_cache = TokenCache(max_size=settings.JWT_CACHE_MAX_SIZE)
+
+
+def decode_auth_token(token: str) -> dict[str, Any]:
+    """
+    Giải mã access/refresh token ký bằng SIGNING_KEY, dùng cache để tránh
+    xác minh HMAC và parse JSON lặp lại cho cùng một token.
+    Payload trả về dùng chung giữa các request, không được sửa đổi.
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        token_cache.hits += 1
+        JWT_CACHE_HITS.inc()
+        return payload
+
+    token_cache.misses += 1
+    JWT_CACHE_MISSES.inc()
+    payload = jwt.decode(
+        token,
+        settings.SIGNING_KEY,
+        algorithms=[settings.JWT_ALGORITHM],
+    )
+    token_cache.put(token, payload)
+    return payload
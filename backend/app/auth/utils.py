@@ -72,6 +72,7 @@ def create_jwt_token(id: uuid.UUID, type: str = settings.COOKIE_ACCESS_NAME) ->
     payload = {
         "id": str(id),
         "type": type,
+        "jti": uuid.uuid4().hex,  # Định danh duy nhất, dùng để thu hồi token
         "exp": datetime.now(timezone.utc) + expire_delta,
         "iat": datetime.now(timezone.utc),
     }
@@ -140,6 +141,7 @@ def create_password_reset_token(id: uuid.UUID) -> str:
     payload = {
         "id": str(id),
         "type": "password_reset",
+        "jti": uuid.uuid4().hex,
         "exp": datetime.now(timezone.utc) + timedelta(minutes=settings.PASSWORD_RESET_TOKEN_EXPIRATION_MINUTES),
         "iat": datetime.now(timezone.utc)
     }
@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class AccountTypeEnum(str, Enum):
+    Savings = "Savings"
+    Current = "Current"
+
+
+class AccountCurrencyEnum(str, Enum):
+    VND = "VND"
+    USD = "USD"
+    EUR = "EUR"
+
+
+class AccountStatusEnum(str, Enum):
+    Active = "Active"
+    Inactive = "Inactive"
+    Frozen = "Frozen"
@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime, timezone
+from typing import ClassVar
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql as pg
+from sqlmodel import Column, Field
+
+from backend.app.bank_account.schema import BankAccountBaseSchema
+
+
+class BankAccount(BankAccountBaseSchema, table=True):
+    __tablename__: ClassVar[str] = "bank_accounts"
+
+    id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            primary_key=True,
+        ),
+        default_factory=uuid.uuid4,
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            onupdate=func.current_timestamp(),
+        ),
+    )
+    # Chủ tài khoản
+    user_id: uuid.UUID = Field(foreign_key="users.id", ondelete="CASCADE", index=True)
@@ -0,0 +1,39 @@
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+
+from sqlmodel import Field, SQLModel
+
+from backend.app.bank_account.enums import (
+    AccountCurrencyEnum,
+    AccountStatusEnum,
+    AccountTypeEnum,
+)
+
+
+# Thông tin tài khoản ngân hàng của người dùng
+class BankAccountBaseSchema(SQLModel):
+    account_name: str = Field(max_length=100)
+    account_number: str = Field(max_length=20, unique=True, index=True)
+    account_type: AccountTypeEnum
+    currency: AccountCurrencyEnum
+    account_status: AccountStatusEnum = Field(default=AccountStatusEnum.Inactive)
+    balance: Decimal = Field(default=Decimal("0.00"), max_digits=18, decimal_places=2)
+
+
+# Kỳ sao kê, tính theo ngày (bao gồm cả ngày cuối)
+class StatementRequestSchema(SQLModel):
+    start_date: date
+    end_date: date
+
+
+class StatementStatusEnum(str, Enum):
+    READY = "ready"
+    PENDING = "pending"
+
+
+class StatementResponseSchema(SQLModel):
+    statement_id: str
+    status: StatementStatusEnum
+    # Link tải có hạn, chỉ có khi sao kê đã sinh xong
+    download_url: str | None = None
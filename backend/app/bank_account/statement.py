@@ -0,0 +1,237 @@
+"""
+Sao kê tài khoản dạng PDF, sinh trong worker Celery: giao dịch được đọc theo lô qua
+server-side cursor và vẽ thẳng lên từng trang, file ghi ra tệp tạm rồi đổi tên.
+Kết quả được cache theo (tài khoản, kỳ sao kê, giao dịch cuối cùng trong kỳ) nên
+yêu cầu lặp lại trả về ngay, kỳ đang mở có giao dịch mới sẽ sinh file mới.
+"""
+import hashlib
+import os
+import pathlib
+import tempfile
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import select
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.transaction.enums import (
+    TransactionDirectionEnum,
+    TransactionStatusEnum,
+)
+from backend.app.transaction.models import Transaction
+
+logger = get_logger()
+
+PENDING_KEY_PREFIX = "statement:pending"
+
+# Cột của bảng giao dịch: (nhãn, toạ độ x, căn phải)
+COLUMNS = (
+    ("Date", 40, False),
+    ("Description", 105, False),
+    ("Reference", 290, False),
+    ("Debit", 430, True),
+    ("Credit", 495, True),
+    ("Balance", 555, True),
+)
+ROW_HEIGHT = 13
+DESCRIPTION_CHARS = 38
+
+STATEMENT_COLUMNS = (
+    Transaction.created_at,
+    Transaction.description,
+    Transaction.reference,
+    Transaction.direction,
+    Transaction.amount,
+    Transaction.balance_after,
+)
+
+
+@dataclass(frozen=True)
+class StatementPeriod:
+    start: date
+    end: date
+
+    @property
+    def bounds(self) -> tuple[datetime, datetime]:
+        """[00:00 ngày đầu, 00:00 ngày sau ngày cuối) theo UTC"""
+        return (
+            datetime.combine(self.start, time.min, tzinfo=timezone.utc),
+            datetime.combine(self.end + timedelta(days=1), time.min, tzinfo=timezone.utc),
+        )
+
+
+def statement_id(
+    account_id: uuid.UUID, period: StatementPeriod, last_transaction_id: uuid.UUID | None
+) -> str:
+    raw = f"{account_id}:{period.start}:{period.end}:{last_transaction_id}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def statement_path(statement_id: str) -> pathlib.Path:
+    return pathlib.Path(settings.STATEMENT_DIR) / f"{statement_id}.pdf"
+
+
+def _in_period(account_id: uuid.UUID, period: StatementPeriod):
+    start, end = period.bounds
+    return (
+        Transaction.account_id == account_id,
+        Transaction.status == TransactionStatusEnum.Completed,
+        Transaction.created_at >= start,
+        Transaction.created_at < end,
+    )
+
+
+async def last_transaction_id(conn, account_id: uuid.UUID, period: StatementPeriod) -> uuid.UUID | None:
+    """Giao dịch cuối cùng trong kỳ, một lần seek trên index (account_id, created_at, id)"""
+    result = await conn.execute(
+        select(Transaction.id)
+        .where(*_in_period(account_id, period))
+        .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+        .limit(1)
+    )
+    return result.scalar()
+
+
+async def opening_balance(conn, account_id: uuid.UUID, period: StatementPeriod) -> Decimal:
+    start, _ = period.bounds
+    result = await conn.execute(
+        select(Transaction.balance_after)
+        .where(
+            Transaction.account_id == account_id,
+            Transaction.status == TransactionStatusEnum.Completed,
+            Transaction.created_at < start,
+        )
+        .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+        .limit(1)
+    )
+    return result.scalar() or Decimal("0.00")
+
+
+def _money(amount: Decimal) -> str:
+    return f"{amount:,.2f}"
+
+
+class StatementRenderer:
+    """
+    Vẽ sao kê từng dòng bằng canvas của reportlab: không dựng danh sách flowable cho
+    cả tài liệu, mỗi trang được nén ngay khi kết thúc nên bộ nhớ chỉ tăng theo kích
+    thước PDF đã nén chứ không theo số giao dịch.
+    """
+
+    def __init__(self, path: str, account, period: StatementPeriod, opening: Decimal):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
+        self.width, self.height = A4
+        self.canvas = canvas.Canvas(path, pagesize=A4, pageCompression=1)
+        self.account = account
+        self.period = period
+        self.balance = opening
+        self.opening = opening
+        self.debits = Decimal("0.00")
+        self.credits = Decimal("0.00")
+        self.rows = 0
+        self.page = 0
+        self._y = 0.0
+        self._new_page()
+
+    def _new_page(self) -> None:
+        if self.page:
+            self.canvas.showPage()
+        self.page += 1
+        c = self.canvas
+        top = self.height - 40
+        c.setFont("Helvetica-Bold", 13)
+        c.drawString(40, top, f"{settings.SITE_NAME or settings.PROJECT_NAME} - Account statement")
+        c.setFont("Helvetica", 9)
+        c.drawString(40, top - 16, f"{self.account.account_name} - {self.account.account_number} ({self.account.currency.value})")
+        c.drawString(40, top - 28, f"Period: {self.period.start:%d/%m/%Y} - {self.period.end:%d/%m/%Y}")
+        c.drawRightString(self.width - 40, top, f"Page {self.page}")
+        y = top - 50
+        if self.page == 1:
+            c.drawString(40, y, f"Opening balance: {_money(self.opening)}")
+            y -= 18
+        c.setFont("Helvetica-Bold", 8)
+        for label, x, right in COLUMNS:
+            (c.drawRightString if right else c.drawString)(x, y, label)
+        c.line(40, y - 3, self.width - 40, y - 3)
+        c.setFont("Helvetica", 8)
+        self._y = y - ROW_HEIGHT - 2
+
+    def add_rows(self, rows: Iterable) -> None:
+        c = self.canvas
+        for created_at, description, reference, direction, amount, balance_after in rows:
+            if self._y < 50:
+                self._new_page()
+            debit = direction == TransactionDirectionEnum.Debit
+            if debit:
+                self.debits += amount
+            else:
+                self.credits += amount
+            self.balance = balance_after
+            y = self._y
+            c.drawString(40, y, f"{created_at:%d/%m/%Y}")
+            c.drawString(105, y, (description or "")[:DESCRIPTION_CHARS])
+            c.drawString(290, y, reference)
+            c.drawRightString(430 if debit else 495, y, _money(amount))
+            c.drawRightString(555, y, _money(balance_after))
+            self._y -= ROW_HEIGHT
+            self.rows += 1
+
+    def finish(self) -> None:
+        if self._y < 90:
+            self._new_page()
+        c = self.canvas
+        y = self._y - 10
+        c.line(40, y + 8, self.width - 40, y + 8)
+        c.setFont("Helvetica-Bold", 9)
+        c.drawString(40, y - 4, f"Transactions: {self.rows}")
+        c.drawString(40, y - 18, f"Total debits: {_money(self.debits)}")
+        c.drawString(40, y - 32, f"Total credits: {_money(self.credits)}")
+        c.drawString(40, y - 46, f"Closing balance: {_money(self.balance)}")
+        c.save()
+
+
+async def render_statement(engine, account, period: StatementPeriod, path: pathlib.Path) -> int:
+    """Ghi sao kê ra tệp tạm cùng thư mục rồi os.replace, người đọc không thấy file dở"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".pdf.tmp")
+    os.close(fd)
+    try:
+        # Server-side cursor phải nằm trong một transaction
+        async with engine.begin() as conn:
+            renderer = StatementRenderer(
+                tmp_path, account, period, await opening_balance(conn, account.id, period)
+            )
+            statement = (
+                select(*STATEMENT_COLUMNS)
+                .where(*_in_period(account.id, period))
+                .order_by(Transaction.created_at, Transaction.id)
+                .execution_options(yield_per=settings.STATEMENT_BATCH_SIZE)
+            )
+            result = await conn.stream(statement)
+            async for rows in result.partitions():
+                renderer.add_rows(rows)
+        renderer.finish()
+        os.replace(tmp_path, path)
+    except BaseException:
+        pathlib.Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return renderer.rows
+
+
+def purge_expired(now: float, ttl_seconds: float) -> int:
+    """Xóa sao kê (và tệp tạm bị bỏ dở) cũ hơn thời hạn cache"""
+    directory = pathlib.Path(settings.STATEMENT_DIR)
+    if not directory.exists():
+        return 0
+    removed = 0
+    for path in directory.iterdir():
+        if path.name.endswith((".pdf", ".pdf.tmp")) and now - path.stat().st_mtime > ttl_seconds:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
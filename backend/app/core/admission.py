@@ -0,0 +1,176 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Gauge
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+
+logger = get_logger()
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_cost", "Tổng chi phí các request đang được xử lý"
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued_requests", "Số request đang chờ được nhận xử lý"
+)
+ADMISSION_ADMITTED = Counter(
+    "admission_admitted_total", "Số request được nhận xử lý", ["route"]
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total", "Số request bị từ chối sớm", ["route", "reason"]
+)
+
+# Chi phí tương đối của từng route (đơn vị: một lần băm Argon2 ~ 2)
+ROUTE_COSTS: dict[str, int] = {
+    "login_otp": 2,
+    "register": 2,
+    "verify_otp": 1,
+}
+
+
+class AdmissionController:
+    """
+    Giới hạn đồng thời theo chi phí cho các route nặng CPU.
+    Request bị loại sớm (503 + Retry-After) khi thời gian chờ ước tính vượt ngân sách độ trễ.
+    """
+
+    def __init__(self, capacity: int, latency_budget: float):
+        self._capacity = capacity
+        self._latency_budget = latency_budget
+        self._in_use = 0
+        self._waiters: deque[tuple[int, asyncio.Future]] = deque()
+        self._queued_cost = 0
+        # Thời gian xử lý trung bình (EWMA) cho một đơn vị chi phí
+        self._unit_service_time = 0.05
+        self._admitted: dict[str, int] = {}
+        self._shed: dict[str, int] = {}
+
+    def estimate_wait(self, cost: int) -> float:
+        """Ước tính thời gian chờ (giây) nếu request với chi phí này xếp hàng ngay bây giờ"""
+        if not self._waiters and self._in_use + cost <= self._capacity:
+            return 0.0
+        backlog = self._in_use + self._queued_cost + cost - self._capacity
+        return max(0, backlog) * self._unit_service_time / self._capacity
+
+    def _record_shed(self, route: str, reason: str) -> None:
+        self._shed[route] = self._shed.get(route, 0) + 1
+        ADMISSION_SHED.labels(route=route, reason=reason).inc()
+
+    def _shed_exception(self, retry_after: float) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "status": "error",
+                "message": "Server is busy",
+                "action": "Please try again shortly",
+            },
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    def _wake_waiters(self) -> None:
+        # Đánh thức theo thứ tự FIFO, dừng khi request đầu hàng chưa đủ chỗ
+        while self._waiters:
+            cost, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self._in_use + cost > self._capacity:
+                break
+            self._waiters.popleft()
+            self._queued_cost -= cost
+            self._in_use += cost
+            future.set_result(None)
+        ADMISSION_QUEUED.set(len(self._waiters))
+        ADMISSION_IN_FLIGHT.set(self._in_use)
+
+    async def _acquire(self, route: str, cost: int) -> None:
+        if not self._waiters and self._in_use + cost <= self._capacity:
+            self._in_use += cost
+            ADMISSION_IN_FLIGHT.set(self._in_use)
+            return
+
+        estimated_wait = self.estimate_wait(cost)
+        if estimated_wait > self._latency_budget:
+            self._record_shed(route, "estimated_wait")
+            logger.warning(
+                f"Shedding {route}: estimated wait {estimated_wait:.2f}s exceeds budget"
+            )
+            raise self._shed_exception(estimated_wait)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((cost, future))
+        self._queued_cost += cost
+        ADMISSION_QUEUED.set(len(self._waiters))
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self._latency_budget)
+        except asyncio.TimeoutError:
+            if future.done():
+                # Vừa được cấp chỗ đúng lúc hết hạn -> vẫn xử lý
+                return
+            future.cancel()
+            self._queued_cost -= cost
+            self._wake_waiters()
+            self._record_shed(route, "queue_timeout")
+            raise self._shed_exception(self.estimate_wait(cost))
+        except asyncio.CancelledError:
+            # Client ngắt kết nối khi đang chờ
+            if future.done() and not future.cancelled():
+                self._release(cost)
+            else:
+                future.cancel()
+                self._queued_cost -= cost
+                self._wake_waiters()
+            raise
+
+    def _release(self, cost: int) -> None:
+        self._in_use -= cost
+        self._wake_waiters()
+
+    @asynccontextmanager
+    async def admit(self, route: str, cost: int) -> AsyncGenerator[None, None]:
+        await self._acquire(route, cost)
+        self._admitted[route] = self._admitted.get(route, 0) + 1
+        ADMISSION_ADMITTED.labels(route=route).inc()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._unit_service_time = (
+                0.8 * self._unit_service_time + 0.2 * elapsed / cost
+            )
+            self._release(cost)
+
+    def snapshot(self) -> dict:
+        return {
+            "capacity": self._capacity,
+            "in_flight_cost": self._in_use,
+            "queued": len(self._waiters),
+            "queued_cost": self._queued_cost,
+            "unit_service_time": round(self._unit_service_time, 4),
+            "admitted": dict(self._admitted),
+            "shed": dict(self._shed),
+        }
+
+
+admission_controller = AdmissionController(
+    capacity=settings.ADMISSION_CAPACITY,
+    latency_budget=settings.ADMISSION_LATENCY_BUDGET_SECONDS,
+)
+
+
+def admission_control(route: str):
+    """Dependency FastAPI giữ một suất xử lý cho route trong suốt request"""
+    cost = ROUTE_COSTS.get(route, 1)
+
+    async def dependency() -> AsyncGenerator[None, None]:
+        async with admission_controller.admit(route, cost):
+            yield
+
+    return dependency
@@ -0,0 +1,140 @@
+import math
+import time
+from typing import Callable
+
+from celery.worker import state
+from celery.worker.autoscale import Autoscaler
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.queue_metrics import read_queue_depths, read_task_durations
+
+logger = get_logger()
+
+
+class ScalingController:
+    """
+    Tính số process cần thiết từ độ sâu hàng đợi và thời gian chạy trung bình của task:
+    đủ process để xả hết backlog trong `target_drain_seconds`, nằm trong [min, max].
+    Tăng nhanh (cooldown ngắn), giảm chậm (cooldown dài) để không dao động theo từng đợt.
+    """
+
+    def __init__(
+        self,
+        min_concurrency: int,
+        max_concurrency: int,
+        target_drain_seconds: float,
+        scale_up_cooldown: float,
+        scale_down_cooldown: float,
+        default_task_seconds: float,
+        smoothing: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_drain_seconds = target_drain_seconds
+        self.scale_up_cooldown = scale_up_cooldown
+        self.scale_down_cooldown = scale_down_cooldown
+        self.smoothing = smoothing
+        self.task_seconds = default_task_seconds
+        self._clock = clock
+        self._last_scale_up = float("-inf")
+        self._last_change = float("-inf")
+
+    def observe_durations(self, total_seconds: float, count: int) -> None:
+        """Cập nhật thời gian chạy trung bình (EWMA) từ một lô task vừa hoàn thành"""
+        if count <= 0:
+            return
+        sample = total_seconds / count
+        self.task_seconds += self.smoothing * (sample - self.task_seconds)
+
+    def desired(self, depth: int, busy: int) -> int:
+        backlog = math.ceil(depth * self.task_seconds / self.target_drain_seconds)
+        return max(self.min_concurrency, min(self.max_concurrency, busy + backlog))
+
+    def decide(self, current: int, depth: int, busy: int) -> int:
+        """Trả về số process mới (bằng current nếu chưa cần hoặc chưa được đổi)"""
+        now = self._clock()
+        target = self.desired(depth, busy)
+        if target > current and now - self._last_scale_up >= self.scale_up_cooldown:
+            self._last_scale_up = self._last_change = now
+            return target
+        if target < current and now - self._last_change >= self.scale_down_cooldown:
+            # Không giảm dưới số task đang chạy
+            target = max(target, busy)
+            if target < current:
+                self._last_change = now
+                return target
+        return current
+
+
+class QueueDepthAutoscaler(Autoscaler):
+    """
+    Autoscaler của worker dựa trên số message đang chờ trên RabbitMQ thay vì
+    số request đã prefetch (mặc định của Celery chỉ thấy tối đa prefetch message).
+    Bật bằng `--autoscale=max,min`, class được chọn qua `worker_autoscaler`.
+    """
+
+    def __init__(self, pool, max_concurrency, min_concurrency=0, worker=None, **kwargs):
+        # Với event loop (prefork), Celery gọi maybe_scale sau mỗi `keepalive` giây
+        kwargs.setdefault("keepalive", settings.CELERY_AUTOSCALE_POLL_SECONDS)
+        super().__init__(pool, max_concurrency, min_concurrency, worker=worker, **kwargs)
+        self.controller = ScalingController(
+            min_concurrency=min_concurrency,
+            max_concurrency=max_concurrency,
+            target_drain_seconds=settings.CELERY_AUTOSCALE_TARGET_DRAIN_SECONDS,
+            scale_up_cooldown=settings.CELERY_AUTOSCALE_UP_COOLDOWN_SECONDS,
+            scale_down_cooldown=settings.CELERY_AUTOSCALE_DOWN_COOLDOWN_SECONDS,
+            default_task_seconds=settings.CELERY_AUTOSCALE_DEFAULT_TASK_SECONDS,
+        )
+        self._last_poll = float("-inf")
+        self._last_durations: tuple[float, int] | None = None
+
+    def _consumed_queues(self) -> tuple[str, ...]:
+        consumer = getattr(self.worker, "consumer", None)
+        task_consumer = getattr(consumer, "task_consumer", None)
+        if task_consumer is not None:
+            return tuple(queue.name for queue in task_consumer.queues)
+        return tuple(self.worker.app.amqp.queues.consume_from)
+
+    def _observe_durations(self) -> None:
+        total, count = read_task_durations().get(
+            settings.CELERY_AUTOSCALE_TASK, (0.0, 0)
+        )
+        if self._last_durations is not None:
+            last_total, last_count = self._last_durations
+            self.controller.observe_durations(total - last_total, count - last_count)
+        self._last_durations = (total, count)
+
+    def _maybe_scale(self, req=None):
+        # Celery còn gọi maybe_scale mỗi khi nhận task -> giới hạn tần suất đọc broker
+        now = time.monotonic()
+        if now - self._last_poll < settings.CELERY_AUTOSCALE_POLL_SECONDS / 2:
+            return False
+        self._last_poll = now
+
+        try:
+            self._observe_durations()
+            depth = sum(read_queue_depths(self._consumed_queues()).values())
+        except Exception as e:
+            # Không đọc được broker/Redis -> quay về cách scale mặc định của Celery
+            logger.warning(f"Autoscaler falling back to reserved requests: {e}")
+            return super()._maybe_scale(req)
+
+        procs = self.processes
+        busy = len(state.active_requests)
+        # Message đã prefetch nhưng chưa chạy cũng là backlog
+        waiting = depth + max(self.qty - busy, 0)
+        target = self.controller.decide(procs, waiting, busy)
+        if target > procs:
+            self.scale_up(target - procs)
+            return True
+        if target < procs:
+            self._shrink(procs - target)
+            return True
+        return False
+
+    def info(self):
+        info = super().info()
+        info["task_seconds"] = round(self.controller.task_seconds, 4)
+        return info
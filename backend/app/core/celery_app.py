@@ -1,6 +1,28 @@
 from celery import Celery
+from kombu import Exchange, Queue
 from backend.app.core.config import settings
 
+# Hàng đợi theo mức độ ưu tiên
+# - critical: OTP đăng nhập, cảnh báo khóa tài khoản (hết hạn sau vài phút)
+# - transactional: kích hoạt tài khoản, đặt lại mật khẩu
+# - bulk: thông báo hàng loạt, không được làm chậm hai loại trên
+CRITICAL_QUEUE = "nextgen_critical"
+TRANSACTIONAL_QUEUE = "nextgen_tasks"
+BULK_QUEUE = "nextgen_bulk"
+
+# Độ ưu tiên trong cùng một hàng đợi (RabbitMQ x-max-priority)
+MAX_PRIORITY = 10
+CRITICAL_PRIORITY = 9
+TRANSACTIONAL_PRIORITY = 5
+BULK_PRIORITY = 1
+
+
+def _queue(name: str, priority: bool = True) -> Queue:
+    # Mỗi hàng đợi có direct exchange cùng tên, giống cách Celery tự khai báo mặc định
+    arguments = {"x-max-priority": MAX_PRIORITY} if priority else None
+    return Queue(name, Exchange(name), routing_key=name, queue_arguments=arguments)
+
+
 celery_app = Celery(
     "worker",
     broker=f"amqp://{settings.RABBITMQ_USER}:{settings.RABBITMQ_PASSWORD}@{settings.RABBITMQ_HOST}:{settings.RABBITMQ_PORT}//",
@@ -14,7 +36,9 @@ celery_app.conf.update(
     accept_content=["application/json"],
     result_backend_max_retries=10,
     task_send_sent_event=True,
-    result_extended=True,
+    # Không lưu args/kwargs vào result backend (email chứa toàn bộ nội dung HTML);
+    # task nào cần kết quả tự bật, task gửi thông báo dùng ignore_result=True
+    result_extended=False,
     result_backend_always_retry=True,
     result_expiration=3600,
     task_time_limit= 5 * 60,
@@ -22,13 +46,70 @@ celery_app.conf.update(
     worker_send_task_events=True,
     task_ack_late=True,
     task_reject_on_worker_lost=True,
-    worker_prefetch_multiplier=1,
+    # Prefetch áp dụng cho cả worker nên được chỉnh theo nhóm hàng đợi mà worker tiêu thụ:
+    # worker critical giữ 1 để task khẩn không bị kẹt sau task khác, worker bulk có thể cao hơn
+    worker_prefetch_multiplier=settings.CELERY_WORKER_PREFETCH_MULTIPLIER,
     task_default_retry_delay=30,
     task_max_retries=3,
-    task_default_queue="nextgen_tasks",
+    task_default_queue=TRANSACTIONAL_QUEUE,
+    task_default_priority=TRANSACTIONAL_PRIORITY,
+    # nextgen_tasks đã tồn tại trên RabbitMQ không có x-max-priority;
+    # khai báo lại với tham số khác sẽ bị PRECONDITION_FAILED nên giữ nguyên
+    task_queues=(
+        _queue(CRITICAL_QUEUE),
+        _queue(TRANSACTIONAL_QUEUE, priority=False),
+        _queue(BULK_QUEUE),
+    ),
+    task_routes={
+        "send_email_tasks": {"queue": TRANSACTIONAL_QUEUE},
+        "backfill_fraud_scores": {"queue": BULK_QUEUE, "priority": BULK_PRIORITY},
+        "generate_statement": {"queue": BULK_QUEUE, "priority": BULK_PRIORITY},
+    },
     task_create_missing_queues=True,
+    # Job dọn dẹp định kỳ: chạy ở hàng đợi bulk, bỏ qua nếu đến lượt chạy kế tiếp mà chưa được xử lý
+    beat_schedule={
+        name: {
+            "task": name,
+            "schedule": settings.SECURITY_CLEANUP_INTERVAL_SECONDS,
+            "options": {
+                "queue": BULK_QUEUE,
+                "priority": BULK_PRIORITY,
+                "expires": settings.SECURITY_CLEANUP_INTERVAL_SECONDS,
+            },
+        }
+        for name in (
+            "unlock_expired_accounts",
+            "clear_expired_otps",
+            "reset_stale_failed_logins",
+            "release_stale_review_claims",
+        )
+    }
+    | {
+        name: {
+            "task": name,
+            "schedule": interval,
+            "options": {
+                "queue": BULK_QUEUE,
+                "priority": BULK_PRIORITY,
+                "expires": interval,
+            },
+        }
+        for name, interval in (
+            ("compute_fraud_drift", settings.FRAUD_DRIFT_INTERVAL_SECONDS),
+            ("snapshot_entity_graph", settings.FRAUD_GRAPH_SNAPSHOT_INTERVAL_SECONDS),
+            (
+                "maintain_risk_history_partitions",
+                settings.FRAUD_RISK_HISTORY_PARTITION_INTERVAL_SECONDS,
+            ),
+            ("rollup_risk_history", settings.FRAUD_RISK_ROLLUP_INTERVAL_SECONDS),
+            ("purge_expired_statements", settings.STATEMENT_PURGE_INTERVAL_SECONDS),
+        )
+    },
     worker_max_tasks_per_child=1000,
-    worker_max_memory_per_child=50000,
+    # 50MB khiến tiến trình con bị thay liên tục (mỗi lần tốn thời gian import lại)
+    worker_max_memory_per_child=settings.CELERY_WORKER_MAX_MEMORY_PER_CHILD_KB,
+    # Chỉ có hiệu lực khi worker chạy với --autoscale=max,min
+    worker_autoscaler="backend.app.core.autoscale:QueueDepthAutoscaler",
     worker_log_format="[%(asctime)s: %(levelname)s/%(processName)s] %(message)s",
     worker_task_log_format="[%(asctime)s: %(levelname)s/%(processName)s][%(task_name)s(%(task_id)s)] %(message)s",
 )
@@ -37,4 +118,4 @@ celery_app.autodiscover_tasks(
     packages=["backend.app.core.tasks"],
     related_name="tasks",
     force=True,
-)
\ No newline at end of file
+)
@@ -1,6 +1,9 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Literal
-import cloudinary
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from types import ModuleType
 
 
 class Setting(BaseSettings):
@@ -26,6 +29,7 @@ class Setting(BaseSettings):
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
 
     # RabbitMQ settings
     RABBITMQ_HOST: str = "rabbitmq"
@@ -33,6 +37,19 @@ class Setting(BaseSettings):
     RABBITMQ_USER: str = "guest"
     RABBITMQ_PASSWORD: str = "guest"
 
+    # Celery settings
+    # Số task mỗi tiến trình worker nhận trước; giữ 1 cho worker xử lý hàng đợi critical
+    CELERY_WORKER_PREFETCH_MULTIPLIER: int = 1
+    # Giới hạn bộ nhớ (KB) trước khi tiến trình con bị thay mới
+    CELERY_WORKER_MAX_MEMORY_PER_CHILD_KB: int = 200_000
+    # Autoscaler: đủ process để xả backlog trong khoảng thời gian mục tiêu
+    CELERY_AUTOSCALE_TASK: str = "send_email_tasks"
+    CELERY_AUTOSCALE_TARGET_DRAIN_SECONDS: float = 30.0
+    CELERY_AUTOSCALE_POLL_SECONDS: float = 2.0
+    CELERY_AUTOSCALE_UP_COOLDOWN_SECONDS: float = 5.0
+    CELERY_AUTOSCALE_DOWN_COOLDOWN_SECONDS: float = 60.0
+    CELERY_AUTOSCALE_DEFAULT_TASK_SECONDS: float = 1.0
+
     # User settings
     # thời gian hết hạn của mã OTP
     OTP_EXPIRATION_MINUTES: int = 2 if ENVIRONMENT == "local" else 5
@@ -40,6 +57,11 @@ class Setting(BaseSettings):
     LOGIN_ATTEMPTS: int = 3
     # thời gian khóa tài khoản sau khi vượt quá số lần thử đăng nhập.
     LOCKOUT_DURATION_MINUTES: int = 2 if ENVIRONMENT == "local" else 5
+    # Số lần đăng nhập sai được đếm lại từ đầu sau khoảng thời gian này
+    FAILED_LOGIN_WINDOW_MINUTES: int = 60
+    # Job dọn dẹp trạng thái bảo mật hết hạn (celery beat)
+    SECURITY_CLEANUP_INTERVAL_SECONDS: float = 60.0
+    SECURITY_CLEANUP_BATCH_SIZE: int = 500
     # thời gian hết hạn của token kích hoạt tài khoản
     ACTIVATION_TOKEN_EXPIRATION_MINUTES: int = 2 if ENVIRONMENT == "local" else 5
     API_BASE_URL: str = ""
@@ -51,6 +73,10 @@ class Setting(BaseSettings):
     JWT_ACCESS_TOKEN_EXPIRATION_MINUTES: int = 30 if ENVIRONMENT == "local" else 15
     # thời gian hết hạn refresh token
     JWT_REFRESH_TOKEN_EXPIRATION_DAYS: int = 1
+    # Số token đã xác minh tối đa giữ trong cache của mỗi worker
+    JWT_CACHE_MAX_SIZE: int = 10_000
+    # Chu kỳ đồng bộ danh sách token bị thu hồi từ Redis về bộ nhớ worker
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
     # Cookie settings
     COOKIE_SECURE: bool = False if ENVIRONMENT == "local" else True
     COOKIE_ACCESS_NAME: str = "access_token"
@@ -71,10 +97,160 @@ class Setting(BaseSettings):
     ALLOWED_MIME_TYPES: list[str] = ["image/jpeg", "image/png", "image/jpg"]
     MAX_FILE_SIZE: int = 5 * 1024 * 1024
     MAX_DIMENSION: int = 4096
+    # Startup settings
+    # Thời gian tối đa chờ các dịch vụ phụ thuộc khi khởi động
+    STARTUP_TIMEOUT_SECONDS: float = 90.0
+    # Thời gian tối đa cho mỗi lần kiểm tra một dịch vụ
+    STARTUP_PROBE_TIMEOUT_SECONDS: float = 5.0
+    # Các dịch vụ bắt buộc phải sẵn sàng trước khi nhận request
+    STARTUP_CRITICAL_SERVICES: list[str] = ["database", "rabbitmq"]
+    # Rate limit settings
+    RATE_LIMIT_ENABLED: bool = True
+    # Số request tối đa mỗi phút cho một IP trên mỗi route được bảo vệ
+    RATE_LIMIT_IP_PER_MINUTE: int = 20
+    # Số request tối đa mỗi phút cho một email trên mỗi route được bảo vệ
+    RATE_LIMIT_EMAIL_PER_MINUTE: int = 5
+    # Số request tối đa mỗi giây cho toàn bộ một route (tất cả client)
+    RATE_LIMIT_ROUTE_PER_SECOND: int = 50
+    # Chỉ bật khi API không nhận request trực tiếp mà chỉ qua reverse proxy (traefik):
+    # phần đầu X-Forwarded-For do client tự đặt nên không dùng được để giới hạn theo IP
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    # Số proxy tin cậy đứng trước API; IP client là mục thứ N tính từ bên phải
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 1
+    # Admission control settings
+    # Tổng chi phí tối đa được xử lý đồng thời trên mỗi worker (Argon2 ~ 2 đơn vị)
+    ADMISSION_CAPACITY: int = 8
+    # Thời gian chờ tối đa trong hàng đợi trước khi request bị từ chối (503)
+    ADMISSION_LATENCY_BUDGET_SECONDS: float = 1.0
+    # Fraud scoring settings
+    # Nguồn model: "file" (artifact joblib) hoặc "mlflow" (model registry)
+    FRAUD_MODEL_SOURCE: str = "file"
+    # File model (joblib) dùng để chấm điểm gian lận
+    FRAUD_MODEL_PATH: str = "backend/app/core/ml/artifacts/fraud_model.joblib"
+    # MLflow tracking/registry store, có thể là thư mục local dạng file:
+    MLFLOW_TRACKING_URI: str = "file:./mlruns"
+    FRAUD_MODEL_NAME: str = "fraud-detector"
+    # Alias của phiên bản đang phục vụ
+    FRAUD_MODEL_ALIAS: str = "champion"
+    # Thư mục chứa artifact joblib không nén (dùng cho mmap) chuyển từ MLflow
+    FRAUD_MODEL_CACHE_DIR: str = "backend/app/core/ml/artifacts/cache"
+    # Nạp mảng numpy của model bằng mmap để các worker dùng chung bộ nhớ
+    FRAUD_MODEL_MMAP: bool = True
+    # Chu kỳ kiểm tra phiên bản model mới (0 = tắt)
+    FRAUD_MODEL_POLL_SECONDS: float = 30.0
+    # Số giao dịch tối đa trong một micro-batch
+    FRAUD_SCORING_MAX_BATCH_SIZE: int = 64
+    # Thời gian tối đa chờ gom lô trước khi gọi model
+    FRAUD_SCORING_MAX_WAIT_SECONDS: float = 0.005
+    # Ngưỡng điểm để đưa giao dịch vào hàng đợi review / chặn giao dịch
+    FRAUD_REVIEW_THRESHOLD: float = 0.5
+    FRAUD_BLOCK_THRESHOLD: float = 0.9
+    # Lấy đặc trưng vận tốc (số giao dịch, tổng tiền theo cửa sổ) từ feature store Redis
+    FRAUD_VELOCITY_ENABLED: bool = True
+    # Chạy model challenger ở chế độ shadow (không ảnh hưởng kết quả trả về)
+    FRAUD_SHADOW_ENABLED: bool = False
+    # File / alias MLflow của model challenger
+    FRAUD_CHALLENGER_MODEL_PATH: str = "backend/app/core/ml/artifacts/challenger_model.joblib"
+    FRAUD_CHALLENGER_MODEL_ALIAS: str = "challenger"
+    # Số giao dịch tối đa chờ chấm shadow, đầy thì bỏ bớt thay vì làm chậm request
+    FRAUD_SHADOW_QUEUE_SIZE: int = 10_000
+    FRAUD_SHADOW_MAX_BATCH_SIZE: int = 256
+    # Thư mục ghi cặp điểm champion/challenger (JSON lines) và chu kỳ ghi
+    FRAUD_SHADOW_LOG_DIR: str = "backend/app/core/ml/artifacts/shadow"
+    FRAUD_SHADOW_FLUSH_SECONDS: float = 1.0
+    # Số giao dịch mỗi lô khi chấm điểm lại dữ liệu lịch sử
+    FRAUD_BACKFILL_BATCH_SIZE: int = 50_000
+    # Số tiến trình chấm điểm song song (0 = số CPU)
+    FRAUD_BACKFILL_WORKERS: int = 0
+    # Thư mục lưu checkpoint để chạy tiếp job chấm điểm lại bị gián đoạn
+    FRAUD_BACKFILL_CHECKPOINT_DIR: str = "backend/app/core/ml/artifacts/checkpoints"
+    # Luật gian lận cố định (YAML) chạy cạnh model và chu kỳ kiểm tra file luật
+    FRAUD_RULES_ENABLED: bool = True
+    FRAUD_RULES_PATH: str = "backend/app/core/ml/fraud_rules.yml"
+    FRAUD_RULES_POLL_SECONDS: float = 10.0
+    # Cache trong tiến trình cho trường hồ sơ mà luật đọc (trước khi hỏi Redis)
+    FRAUD_PROFILE_CACHE_SIZE: int = 100_000
+    FRAUD_PROFILE_CACHE_TTL_SECONDS: float = 60.0
+    # Đồ thị liên kết user qua số điện thoại, địa chỉ, nơi làm việc, thiết bị
+    FRAUD_GRAPH_ENABLED: bool = True
+    FRAUD_GRAPH_SNAPSHOT_PATH: str = "backend/app/core/ml/artifacts/entity_graph.pkl"
+    # Chu kỳ worker đọc sự kiện mới từ Redis stream và chu kỳ ghi snapshot
+    FRAUD_GRAPH_SYNC_SECONDS: float = 1.0
+    FRAUD_GRAPH_SNAPSHOT_INTERVAL_SECONDS: int = 600
+    # Thuộc tính nối quá nhiều user (công ty lớn, tòa nhà) không dùng để gộp cụm nữa
+    FRAUD_GRAPH_MAX_ATTRIBUTE_DEGREE: int = 50
+    # Số sự kiện tối đa giữ trong stream (xấp xỉ)
+    FRAUD_GRAPH_STREAM_MAXLEN: int = 1_000_000
+    # Số sự kiện tối đa chờ ghi vào stream khi Redis lỗi, quá thì bỏ sự kiện cũ nhất
+    FRAUD_GRAPH_OUTBOX_MAX_SIZE: int = 100_000
+    # Dựng lại từ bảng profile khi tỉ lệ liên kết đã cũ vượt ngưỡng
+    FRAUD_GRAPH_REBUILD_STALE_RATIO: float = 0.05
+    # Theo dõi drift đặc trưng/điểm so với phân phối tham chiếu của model
+    FRAUD_DRIFT_ENABLED: bool = True
+    FRAUD_DRIFT_REFERENCE_PATH: str = "backend/app/core/ml/artifacts/drift_reference.json"
+    # Chu kỳ đẩy histogram trong tiến trình lên Redis
+    FRAUD_DRIFT_FLUSH_SECONDS: float = 10.0
+    # Cửa sổ trượt (giờ) và chu kỳ tính báo cáo drift
+    FRAUD_DRIFT_WINDOW_HOURS: int = 24
+    FRAUD_DRIFT_INTERVAL_SECONDS: int = 900
+    # Kích thước trang mặc định/tối đa của hàng đợi review và số việc tối đa mỗi lần nhận
+    FRAUD_REVIEW_PAGE_SIZE: int = 50
+    FRAUD_REVIEW_MAX_PAGE_SIZE: int = 200
+    FRAUD_REVIEW_MAX_CLAIM: int = 20
+    # Việc đã nhận quá thời gian này mà chưa kết luận được trả về hàng đợi
+    FRAUD_REVIEW_CLAIM_TIMEOUT_MINUTES: int = 30
+    # Lịch sử điểm rủi ro theo user (bảng phân vùng theo tháng)
+    FRAUD_RISK_HISTORY_ENABLED: bool = True
+    # Chu kỳ ghi lô các lần chấm điểm và số dòng tối đa chờ ghi trong mỗi worker
+    FRAUD_RISK_HISTORY_FLUSH_SECONDS: float = 2.0
+    FRAUD_RISK_HISTORY_MAX_BUFFER: int = 50_000
+    # Số tháng tạo sẵn phân vùng, số tháng giữ lại trước khi tách phân vùng cũ
+    FRAUD_RISK_HISTORY_MONTHS_AHEAD: int = 2
+    FRAUD_RISK_HISTORY_RETENTION_MONTHS: int = 13
+    # Xóa luôn phân vùng đã tách thay vì giữ lại để lưu trữ/sao lưu
+    FRAUD_RISK_HISTORY_DROP_DETACHED: bool = False
+    FRAUD_RISK_HISTORY_PARTITION_INTERVAL_SECONDS: int = 3600
+    # Chu kỳ gộp theo giờ/ngày và độ trễ tối đa của dữ liệu ghi muộn được tính lại
+    FRAUD_RISK_ROLLUP_INTERVAL_SECONDS: int = 300
+    FRAUD_RISK_ROLLUP_LATENESS_MINUTES: int = 15
+    # Số lần chấm điểm tối đa trả về khi xem lịch sử dạng raw
+    FRAUD_RISK_HISTORY_MAX_RAW_POINTS: int = 5000
+    # Thư mục lưu sao kê PDF, phải dùng chung giữa API và worker Celery
+    STATEMENT_DIR: str = "backend/app/media/statements"
+    # Kỳ sao kê dài nhất (ngày) và số giao dịch mỗi lô đọc từ server-side cursor
+    STATEMENT_MAX_DAYS: int = 366
+    STATEMENT_BATCH_SIZE: int = 2000
+    # Thời hạn của link tải, thời gian giữ file trong cache và chu kỳ dọn file cũ
+    STATEMENT_LINK_EXPIRATION_MINUTES: int = 15
+    STATEMENT_CACHE_TTL_HOURS: int = 24
+    STATEMENT_PURGE_INTERVAL_SECONDS: int = 3600
+    # Chặn gửi trùng task khi người dùng bấm nhiều lần trong lúc đang sinh
+    STATEMENT_PENDING_TTL_SECONDS: int = 900
+    # Số giao dịch mỗi trang lịch sử (mặc định/tối đa)
+    TRANSACTION_HISTORY_PAGE_SIZE: int = 50
+    TRANSACTION_HISTORY_MAX_PAGE_SIZE: int = 200
+    # Thời gian giữ tổng của một cửa sổ lọc trong Redis; có giao dịch mới thì khóa cache đổi
+    TRANSACTION_HISTORY_SUMMARY_TTL_SECONDS: int = 600
+    # Mức cô lập của transaction ghi sổ; khóa hàng FOR UPDATE theo thứ tự id nên
+    # READ COMMITTED là đủ, REPEATABLE READ/SERIALIZABLE sẽ có thêm lỗi 40001 để thử lại
+    LEDGER_ISOLATION_LEVEL: str = "READ COMMITTED"
+    # Số lần thử lại khi gặp serialization failure/deadlock, backoff mũ có jitter (giây)
+    LEDGER_MAX_RETRIES: int = 5
+    LEDGER_RETRY_BASE_DELAY: float = 0.01
+    LEDGER_RETRY_MAX_DELAY: float = 0.5
+    # Ngưỡng PSI coi là drift
+    FRAUD_DRIFT_PSI_ALERT: float = 0.2
 settings = Setting()
-# Cấu hình Cloudinary khi khởi động ứng dụng
-cloudinary.config(
-    cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-    api_key=settings.CLOUDINARY_API_KEY,
-    api_secret=settings.CLOUDINARY_API_SECRET,
-)
\ No newline at end of file
+
+
+@lru_cache
+def get_cloudinary() -> "ModuleType":
+    """Import và cấu hình Cloudinary ở lần dùng đầu tiên thay vì lúc khởi động"""
+    import cloudinary
+
+    cloudinary.config(
+        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+        api_key=settings.CLOUDINARY_API_KEY,
+        api_secret=settings.CLOUDINARY_API_SECRET,
+    )
+    return cloudinary
\ No newline at end of file
@@ -1,4 +1,5 @@
 from jinja2 import Environment, FileSystemLoader
+from backend.app.core.celery_app import TRANSACTIONAL_PRIORITY, TRANSACTIONAL_QUEUE
 from backend.app.core.emails.config import TEMPLATES_DIR
 from backend.app.core.tasks.email import send_email_task
 from backend.app.core.logging import get_logger
@@ -17,6 +18,9 @@ class EmailTemplate:
     template_name: str
     template_name_plain: str
     subject: str
+    # Hàng đợi và độ ưu tiên của task gửi email, email khẩn ghi đè thành critical
+    queue: str = TRANSACTIONAL_QUEUE
+    priority: int = TRANSACTIONAL_PRIORITY
 
     @classmethod
     async def send_email(
@@ -40,11 +44,15 @@ class EmailTemplate:
             plain_content = plain_template.render(**context)
             # Đưa tác vụ gửi email vào Celery
             # Việc gửi email sẽ chạy ở background, không block request chính
-            task = send_email_task.delay(
-                recipients=recipients_list,
-                subject=subject_override or cls.subject,
-                html_content=html_content,
-                plain_content=plain_content,
+            task = send_email_task.apply_async(
+                kwargs={
+                    "recipients": recipients_list,
+                    "subject": subject_override or cls.subject,
+                    "html_content": html_content,
+                    "plain_content": plain_content,
+                },
+                queue=cls.queue,
+                priority=cls.priority,
             )
             # Ghi log khi tác vụ gửi email được đưa vào hàng đợi thành công
             logger.info(
@@ -1,21 +1,36 @@
-from fastapi_mail import FastMail, ConnectionConfig
-from pydantic import SecretStr
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import SecretStr
+
 from backend.app.core.config import settings
 
+if TYPE_CHECKING:
+    from fastapi_mail import FastMail
+
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
-email_config = ConnectionConfig(
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-    MAIL_PORT=settings.SMTP_PORT,
-    MAIL_SERVER=settings.SMTP_HOST,
-    MAIL_USERNAME="",
-    MAIL_PASSWORD=SecretStr(""),
-    MAIL_SSL_TLS=False,
-    MAIL_STARTTLS=False,
-    USE_CREDENTIALS=False,
-    VALIDATE_CERTS=False,
-    TEMPLATE_FOLDER=TEMPLATES_DIR,
-)
-fast_mail = FastMail(email_config)
+
+@lru_cache
+def get_fast_mail() -> "FastMail":
+    """
+    Khởi tạo FastMail ở lần gửi đầu tiên.
+    fastapi_mail kéo theo dnspython khi import, chỉ worker Celery mới cần tới nó.
+    """
+    from fastapi_mail import ConnectionConfig, FastMail
+
+    email_config = ConnectionConfig(
+        MAIL_FROM=settings.MAIL_FROM,
+        MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
+        MAIL_PORT=settings.SMTP_PORT,
+        MAIL_SERVER=settings.SMTP_HOST,
+        MAIL_USERNAME="",
+        MAIL_PASSWORD=SecretStr(""),
+        MAIL_SSL_TLS=False,
+        MAIL_STARTTLS=False,
+        USE_CREDENTIALS=False,
+        VALIDATE_CERTS=False,
+        TEMPLATE_FOLDER=TEMPLATES_DIR,
+    )
+    return FastMail(email_config)
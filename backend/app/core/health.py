@@ -220,6 +220,10 @@ class HealthCheck:
 
         return health_status
 
+    def invalidate_cache(self) -> None:
+        self._cached_status = None
+        self._last_check_time = None
+
     async def wait_for_services(self, timeout: float = 30.0) -> bool:
         try:
             start_time = datetime.now()
@@ -0,0 +1,23 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Trả về module được nạp trì hoãn: code của module chỉ chạy ở lần truy cập
+    thuộc tính đầu tiên. Dùng cho các SDK nặng (numpy, pandas, sklearn, mlflow)
+    để không làm chậm import `backend.app.main` và thời gian boot worker gunicorn.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named '{name}'")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
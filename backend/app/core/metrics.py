@@ -0,0 +1,7 @@
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+
+def metrics_response() -> Response:
+    """Xuất toàn bộ metrics của tiến trình theo định dạng Prometheus"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,358 @@
+"""
+Chấm điểm lại giao dịch lịch sử khi có model mới: đọc Parquet/CSV theo từng record
+batch bằng pyarrow, tính đặc trưng vector hóa và chấm điểm song song trên process
+pool, ghi kết quả vào bảng fraud_scores bằng COPY (hoặc file Parquet với --output).
+Checkpoint được lưu sau mỗi lô đã ghi nên job bị ngắt có thể chạy tiếp.
+
+Chạy: python -m backend.app.core.ml.backfill --input transactions/ [--output scores/]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import pathlib
+import resource
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+from backend.app.core.config import settings
+from backend.app.core.lazy_import import lazy_import
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.history import (
+    feature_columns,
+    open_dataset,
+    record_batch_features,
+)
+
+np = lazy_import("numpy")
+
+logger = get_logger()
+
+
+@dataclass
+class BackfillCheckpoint:
+    input: str
+    model_version: str
+    batch_size: int
+    batches_done: int = 0
+    rows_done: int = 0
+
+    @classmethod
+    def load(
+        cls, path: pathlib.Path, input: str, model_version: str, batch_size: int
+    ) -> "BackfillCheckpoint":
+        if not path.exists():
+            return cls(input=input, model_version=model_version, batch_size=batch_size)
+        checkpoint = cls(**json.loads(path.read_text()))
+        # Lô chỉ khớp với lần chạy trước khi cùng dữ liệu, cùng model và cùng kích thước lô
+        if (checkpoint.input, checkpoint.model_version, checkpoint.batch_size) != (
+            input,
+            model_version,
+            batch_size,
+        ):
+            raise ValueError(
+                f"Checkpoint {path} belongs to another run "
+                f"({checkpoint.input}, {checkpoint.model_version}, {checkpoint.batch_size})"
+            )
+        return checkpoint
+
+    def save(self, path: pathlib.Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(self)))
+        tmp_path.replace(path)
+
+
+@dataclass(frozen=True)
+class BackfillResult:
+    model_version: str
+    rows: int
+    batches: int
+    skipped_batches: int
+    seconds: float
+    rows_per_second: float
+    # Đỉnh RSS của tiến trình chính và của tiến trình chấm điểm lớn nhất
+    peak_rss_bytes: int
+    peak_worker_rss_bytes: int
+
+
+def default_checkpoint_path(input: str, model_version: str) -> pathlib.Path:
+    digest = hashlib.sha1(f"{input}|{model_version}".encode()).hexdigest()[:12]
+    return pathlib.Path(settings.FRAUD_BACKFILL_CHECKPOINT_DIR) / f"backfill-{digest}.json"
+
+
+# Model của tiến trình chấm điểm, nạp một lần khi tiến trình khởi động
+_model = None
+
+
+def _init_worker(artifact_path: str) -> None:
+    global _model
+    from backend.app.core.ml.model_manager import load_joblib_artifact
+
+    # mmap: các tiến trình dùng chung page cache của artifact thay vì mỗi bản một bản sao
+    _model = load_joblib_artifact(pathlib.Path(artifact_path))["model"]
+    if hasattr(_model, "n_jobs"):
+        _model.n_jobs = 1
+
+
+def score_batch(batch) -> tuple[list[str], "np.ndarray"]:
+    """Tính đặc trưng và chấm điểm một record batch trong tiến trình con"""
+    import pyarrow as pa
+
+    scores = _model.predict_proba(record_batch_features(batch))[:, 1]
+    transaction_ids = batch.column("transaction_id").cast(pa.string()).to_pylist()
+    return transaction_ids, scores
+
+
+class ParquetScoreSink:
+    """Ghi mỗi lô thành một file part-<lô>.parquet, chạy lại một lô thì ghi đè"""
+
+    def __init__(self, directory: str):
+        self.directory = pathlib.Path(directory)
+
+    async def open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def write(
+        self, index: int, transaction_ids: list[str], scores: "np.ndarray", version: str
+    ) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        from backend.app.core.ml.scoring import FRAUD_DECISIONS, RISK_LEVELS, classify_scores
+
+        levels = classify_scores(scores)
+        table = pa.table(
+            {
+                "transaction_id": transaction_ids,
+                "model_version": pa.repeat(version, len(transaction_ids)),
+                "score": scores,
+                "risk_level": np.array([r.value for r in RISK_LEVELS])[levels],
+                "decision": np.array([d.value for d in FRAUD_DECISIONS])[levels],
+            }
+        )
+        path = self.directory / f"part-{index:06d}.parquet"
+        tmp_path = path.with_suffix(".tmp")
+        await asyncio.to_thread(pq.write_table, table, tmp_path)
+        tmp_path.replace(path)
+
+    async def close(self) -> None:
+        pass
+
+
+class PostgresScoreSink:
+    """
+    COPY từng lô vào bảng tạm rồi upsert sang fraud_scores trong cùng transaction,
+    nên chạy lại một lô đã ghi (sau khi job bị ngắt) không tạo bản ghi trùng.
+    """
+
+    COLUMNS = ("transaction_id", "model_version", "score", "risk_level", "decision", "scored_at")
+
+    def __init__(self, database_url: str):
+        from sqlalchemy.engine import make_url
+
+        # asyncpg dùng DSN thuần, bỏ phần "+asyncpg" của SQLAlchemy
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._conn = None
+
+    async def open(self) -> None:
+        import asyncpg
+
+        self._conn = await asyncpg.connect(self.dsn)
+        await self._conn.execute(
+            "CREATE TEMP TABLE fraud_scores_stage "
+            "(LIKE fraud_scores INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+
+    async def write(
+        self, index: int, transaction_ids: list[str], scores: "np.ndarray", version: str
+    ) -> None:
+        from backend.app.core.ml.scoring import FRAUD_DECISIONS, RISK_LEVELS, classify_scores
+
+        # Cột enum lưu theo tên thành viên (giống SQLAlchemy Enum)
+        risk_names = [r.name for r in RISK_LEVELS]
+        decision_names = [d.name for d in FRAUD_DECISIONS]
+        scored_at = datetime.now(timezone.utc)
+        records = [
+            (
+                uuid.UUID(transaction_id),
+                version,
+                score,
+                risk_names[level],
+                decision_names[level],
+                scored_at,
+            )
+            for transaction_id, score, level in zip(
+                transaction_ids, scores.tolist(), classify_scores(scores).tolist()
+            )
+        ]
+        async with self._conn.transaction():
+            await self._conn.copy_records_to_table(
+                "fraud_scores_stage", records=records, columns=self.COLUMNS
+            )
+            await self._conn.execute(
+                """
+                INSERT INTO fraud_scores (transaction_id, model_version, score,
+                                          risk_level, decision, scored_at)
+                SELECT transaction_id, model_version, score, risk_level, decision, scored_at
+                FROM fraud_scores_stage
+                ON CONFLICT (transaction_id, model_version) DO UPDATE
+                SET score = EXCLUDED.score,
+                    risk_level = EXCLUDED.risk_level,
+                    decision = EXCLUDED.decision,
+                    scored_at = EXCLUDED.scored_at
+                """
+            )
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+
+
+def _peak_rss_bytes(who: int) -> int:
+    # ru_maxrss trên Linux tính bằng KB
+    return resource.getrusage(who).ru_maxrss * 1024
+
+
+async def run_backfill(
+    input: str,
+    sink,
+    batch_size: int,
+    workers: int,
+    max_in_flight: int,
+    checkpoint_path: pathlib.Path | None = None,
+) -> BackfillResult:
+    from backend.app.core.ml.model_manager import build_model_source
+
+    # Nạp ở tiến trình chính để có phiên bản và artifact (MLflow được chuyển sẵn sang cache)
+    model, version, artifact_path = await asyncio.to_thread(build_model_source().load)
+    del model
+    checkpoint_path = checkpoint_path or default_checkpoint_path(input, version)
+    checkpoint = BackfillCheckpoint.load(checkpoint_path, input, version, batch_size)
+
+    dataset = open_dataset(input)
+    columns = feature_columns(dataset)
+    # Đọc trước ít lô để bộ nhớ chỉ phụ thuộc batch_size * max_in_flight
+    batches = dataset.to_batches(
+        columns=columns, batch_size=batch_size, batch_readahead=1, fragment_readahead=1
+    )
+
+    loop = asyncio.get_running_loop()
+    pending: deque[tuple[int, int, asyncio.Future]] = deque()
+    rows = batches_written = skipped = 0
+    started = time.perf_counter()
+
+    async def write_oldest() -> None:
+        nonlocal rows, batches_written
+        index, count, future = pending.popleft()
+        transaction_ids, scores = await future
+        await sink.write(index, transaction_ids, scores, version)
+        # Chỉ ghi checkpoint theo thứ tự lô -> mọi lô trước batches_done đã được ghi
+        checkpoint.batches_done = index + 1
+        checkpoint.rows_done += count
+        checkpoint.save(checkpoint_path)
+        rows += count
+        batches_written += 1
+
+    await sink.open()
+    try:
+        # spawn: không fork tiến trình đang có event loop và kết nối database
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(artifact_path),),
+        ) as pool:
+            for index, batch in enumerate(batches):
+                if index < checkpoint.batches_done:
+                    skipped += 1
+                    continue
+                pending.append(
+                    (index, batch.num_rows, loop.run_in_executor(pool, score_batch, batch))
+                )
+                if len(pending) >= max_in_flight:
+                    await write_oldest()
+            while pending:
+                await write_oldest()
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+        await sink.close()
+
+    seconds = time.perf_counter() - started
+    return BackfillResult(
+        model_version=version,
+        rows=rows,
+        batches=batches_written,
+        skipped_batches=skipped,
+        seconds=round(seconds, 3),
+        rows_per_second=round(rows / seconds, 1) if seconds else 0.0,
+        peak_rss_bytes=_peak_rss_bytes(resource.RUSAGE_SELF),
+        peak_worker_rss_bytes=_peak_rss_bytes(resource.RUSAGE_CHILDREN),
+    )
+
+
+def main() -> int:
+    # Khi chạy bằng `python -m`, tiến trình con (spawn) phải tìm thấy hàm theo module thật
+    from backend.app.core.ml.backfill import (
+        ParquetScoreSink,
+        PostgresScoreSink,
+        default_checkpoint_path,
+        run_backfill,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input", required=True, help="File hoặc thư mục Parquet/CSV")
+    parser.add_argument(
+        "--output", help="Thư mục ghi điểm dạng Parquet thay vì bảng fraud_scores"
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.FRAUD_BACKFILL_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.FRAUD_BACKFILL_WORKERS)
+    parser.add_argument(
+        "--max-in-flight", type=int, default=0, help="Số lô tối đa đang xử lý (mặc định 2 x workers)"
+    )
+    parser.add_argument("--checkpoint", help="File checkpoint, mặc định theo input và model")
+    parser.add_argument("--restart", action="store_true", help="Bỏ checkpoint cũ, chạy lại từ đầu")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    max_in_flight = args.max_in_flight or 2 * workers
+    sink = (
+        ParquetScoreSink(args.output)
+        if args.output
+        else PostgresScoreSink(settings.DATABASE_URL)
+    )
+    checkpoint_path = pathlib.Path(args.checkpoint) if args.checkpoint else None
+    if args.restart:
+        if checkpoint_path is None:
+            from backend.app.core.ml.model_manager import build_model_source
+
+            checkpoint_path = default_checkpoint_path(
+                args.input, build_model_source().load()[1]
+            )
+        checkpoint_path.unlink(missing_ok=True)
+
+    try:
+        result = asyncio.run(
+            run_backfill(
+                args.input, sink, args.batch_size, workers, max_in_flight, checkpoint_path
+            )
+        )
+    except Exception as e:
+        logger.error(f"Fraud backfill failed: {e}")
+        return 1
+    print(json.dumps(asdict(result)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, Generic, Sequence, TypeVar
+
+from prometheus_client import Histogram
+
+from backend.app.core.logging import get_logger
+
+logger = get_logger()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BATCH_SIZE = Histogram(
+    "ml_micro_batch_size",
+    "Số request trong mỗi micro-batch",
+    ["batcher"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+BATCH_SECONDS = Histogram(
+    "ml_micro_batch_seconds",
+    "Thời gian xử lý một micro-batch trong executor",
+    ["batcher"],
+)
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Gom các request đến trong một cửa sổ ngắn (`max_wait_seconds`) hoặc đủ
+    `max_batch_size` phần tử thành một lô, gọi `process_batch` một lần trong executor
+    riêng rồi trả kết quả về cho từng coroutine đang chờ.
+    Trong lúc một lô đang chạy, request mới tiếp tục được gom cho lô kế tiếp.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process_batch: Callable[[list[T]], Sequence[R]],
+        executor: Executor,
+        max_batch_size: int,
+        max_wait_seconds: float,
+        max_in_flight: int = 1,
+    ):
+        self.name = name
+        self._process_batch = process_batch
+        self._executor = executor
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_seconds
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self._max_batch_size]
+            self._pending = self._pending[self._max_batch_size :]
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        # Bỏ các request đã bị hủy (client ngắt kết nối) trước khi tốn công tính
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+        items = [item for item, _ in batch]
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            try:
+                with BATCH_SECONDS.labels(self.name).time():
+                    results = await loop.run_in_executor(
+                        self._executor, self._process_batch, items
+                    )
+            except Exception as e:
+                logger.error(f"Micro-batch {self.name} failed ({len(items)} items): {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        BATCH_SIZE.labels(self.name).observe(len(items))
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def drain(self) -> None:
+        """Xử lý nốt các request đang chờ (dùng khi tắt ứng dụng)"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,350 @@
+"""
+Theo dõi drift của đặc trưng và điểm gian lận bằng PSI/KS trên histogram đã chia bin
+sẵn: mỗi lô chấm điểm chỉ cộng số đếm vào bin (trong tiến trình, định kỳ đẩy lên Redis
+theo từng giờ), job định kỳ cộng các giờ trong cửa sổ trượt rồi so với phân phối tham
+chiếu, không đọc lại dữ liệu thô.
+
+Dựng phân phối tham chiếu cho model đang active:
+python -m backend.app.core.ml.drift --input transactions.parquet   (hoặc --synthetic)
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import pathlib
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import REGISTRY, Collector
+
+from backend.app.core.config import settings
+from backend.app.core.lazy_import import lazy_import
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.features import FEATURE_NAMES
+from backend.app.core.redis_client import redis_client
+
+np = lazy_import("numpy")
+
+logger = get_logger()
+
+KEY_PREFIX = "fraud:drift"
+REPORT_KEY = f"{KEY_PREFIX}:report"
+SCORE = "score"
+
+# Tỉ lệ tối thiểu của một bin khi tính PSI, tránh log(0) với bin rỗng
+PSI_EPSILON = 1e-4
+
+
+@dataclass
+class ReferenceProfile:
+    """Biên bin (nội) và số đếm tham chiếu của từng cột; cột cuối là điểm gian lận"""
+
+    model_version: str
+    names: list[str]
+    edges: list[list[float]]
+    counts: list[list[int]]
+
+    @property
+    def id(self) -> str:
+        # Đổi biên bin -> đổi key Redis, không cộng lẫn số đếm của hai cách chia bin
+        return hashlib.sha1(json.dumps(self.edges).encode()).hexdigest()[:10]
+
+    @classmethod
+    def build(
+        cls, features: "np.ndarray", scores: "np.ndarray", model_version: str, bins: int
+    ) -> "ReferenceProfile":
+        """Biên bin theo phân vị của dữ liệu tham chiếu (cột rời rạc tự gộp bin trùng)"""
+        columns = np.column_stack([features, scores])
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        edges = [np.unique(np.quantile(column, quantiles)) for column in columns.T]
+        profile = cls(
+            model_version=model_version,
+            names=[*FEATURE_NAMES, SCORE],
+            edges=[e.tolist() for e in edges],
+            counts=[[0] * (len(e) + 1) for e in edges],
+        )
+        counts = HistogramBinner(profile).bin_counts(features, scores)
+        profile.counts = [c.tolist() for c in np.split(counts, profile_offsets(profile)[1:-1])]
+        return profile
+
+    @classmethod
+    def load(cls, path: str) -> "ReferenceProfile":
+        return cls(**json.loads(pathlib.Path(path).read_text()))
+
+    def save(self, path: str) -> None:
+        target = pathlib.Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(self)))
+        tmp_path.replace(target)
+
+
+def profile_offsets(profile: ReferenceProfile) -> "np.ndarray":
+    """Vị trí bắt đầu của từng cột trong vector số đếm phẳng (kèm tổng ở cuối)"""
+    sizes = [len(e) + 1 for e in profile.edges]
+    return np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+
+class HistogramBinner:
+    """Chuyển một lô (đặc trưng, điểm) thành vector số đếm phẳng của mọi cột"""
+
+    def __init__(self, profile: ReferenceProfile):
+        self.edges = [np.asarray(e, dtype=np.float64) for e in profile.edges]
+        self.offsets = profile_offsets(profile)
+        self.size = int(self.offsets[-1])
+
+    def bin_counts(self, features: "np.ndarray", scores: "np.ndarray") -> "np.ndarray":
+        columns = np.column_stack([features, scores])
+        flat = np.empty(columns.shape, dtype=np.int64)
+        for i, edges in enumerate(self.edges):
+            flat[:, i] = np.searchsorted(edges, columns[:, i], side="right") + self.offsets[i]
+        return np.bincount(flat.ravel(), minlength=self.size)
+
+
+def drift_statistics(
+    reference: "np.ndarray", current: "np.ndarray", offsets: "np.ndarray"
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    PSI và KS (trên CDF theo bin) của mọi cột cùng lúc từ hai vector số đếm phẳng.
+    Mỗi cột là một đoạn [offsets[i], offsets[i+1]) của vector.
+    """
+    starts = offsets[:-1]
+    sizes = np.diff(offsets)
+
+    def proportions(counts: "np.ndarray") -> "np.ndarray":
+        totals = np.add.reduceat(counts.astype(np.float64), starts)
+        return counts / np.repeat(np.maximum(totals, 1), sizes)
+
+    ref = proportions(reference)
+    cur = proportions(current)
+    ref_smoothed = np.maximum(ref, PSI_EPSILON)
+    cur_smoothed = np.maximum(cur, PSI_EPSILON)
+    psi = np.add.reduceat(
+        (cur_smoothed - ref_smoothed) * np.log(cur_smoothed / ref_smoothed), starts
+    )
+    # Tổng tỉ lệ của mỗi cột đều bằng 1 nên cumsum toàn vector về ~0 ở cuối mỗi đoạn:
+    # không cần reset theo cột để có hiệu CDF trong từng cột
+    ks = np.maximum.reduceat(np.abs(np.cumsum(ref - cur)), starts)
+    return psi, ks
+
+
+def hour_key(profile_id: str, moment: datetime) -> str:
+    return f"{KEY_PREFIX}:{profile_id}:{moment.strftime('%Y%m%d%H')}"
+
+
+class DriftAccumulator:
+    """
+    Cộng số đếm theo bin cho từng lô chấm điểm (gọi từ thread chấm điểm) và định kỳ
+    đẩy phần chênh lệch vào hash Redis của giờ hiện tại bằng HINCRBY.
+    """
+
+    def __init__(self, redis, reference_path: str, flush_seconds: float, window_hours: int):
+        self.redis = redis
+        self.reference_path = reference_path
+        self.flush_seconds = flush_seconds
+        self.window_hours = window_hours
+        self.profile: ReferenceProfile | None = None
+        self._binner: HistogramBinner | None = None
+        self._counts: "np.ndarray | None" = None
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def load_reference(self) -> bool:
+        try:
+            profile = ReferenceProfile.load(self.reference_path)
+        except FileNotFoundError:
+            logger.warning(f"No drift reference at {self.reference_path}, drift disabled")
+            return False
+        self.use_profile(profile)
+        return True
+
+    def use_profile(self, profile: ReferenceProfile) -> None:
+        binner = HistogramBinner(profile)
+        with self._lock:
+            self.profile = profile
+            self._counts = np.zeros(binner.size, dtype=np.int64)
+            self._binner = binner
+
+    def observe(self, features: "np.ndarray", scores: "np.ndarray") -> None:
+        binner = self._binner
+        if binner is None:
+            return
+        counts = binner.bin_counts(features, scores)
+        with self._lock:
+            self._counts += counts
+
+    async def flush(self) -> None:
+        if self._counts is None:
+            return
+        with self._lock:
+            counts, self._counts = self._counts, np.zeros_like(self._counts)
+        nonzero = np.flatnonzero(counts)
+        if nonzero.size == 0:
+            return
+        key = hour_key(self.profile.id, datetime.now(timezone.utc))
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for index in nonzero.tolist():
+                    pipe.hincrby(key, index, int(counts[index]))
+                pipe.expire(key, (self.window_hours + 2) * 3600)
+                await pipe.execute()
+        except Exception as e:
+            # Trả số đếm lại để lần flush sau gửi tiếp
+            with self._lock:
+                self._counts += counts
+            logger.warning(f"Failed to flush drift histograms: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        if self.load_reference() and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+def compute_drift_report(redis, profile: ReferenceProfile, window_hours: int) -> dict:
+    """Cộng histogram các giờ trong cửa sổ (client Redis đồng bộ) và so với tham chiếu"""
+    offsets = profile_offsets(profile)
+    now = datetime.now(timezone.utc)
+    pipe = redis.pipeline(transaction=False)
+    for hour in range(window_hours):
+        pipe.hgetall(hour_key(profile.id, now - timedelta(hours=hour)))
+    current = np.zeros(int(offsets[-1]), dtype=np.int64)
+    for raw in pipe.execute():
+        if raw:
+            current[np.fromiter(map(int, raw.keys()), dtype=np.int64)] += np.fromiter(
+                map(int, raw.values()), dtype=np.int64
+            )
+    reference = np.concatenate([np.asarray(c, dtype=np.int64) for c in profile.counts])
+    events = int(current[offsets[-2] :].sum())
+    psi, ks = drift_statistics(reference, current, offsets)
+    stats = {
+        name: {"psi": round(float(p), 5), "ks": round(float(k), 5)}
+        for name, p, k in zip(profile.names, psi, ks)
+    }
+    return {
+        "generated_at": now.isoformat(),
+        "reference_version": profile.model_version,
+        "window_hours": window_hours,
+        "events": events,
+        "score": stats.pop(SCORE),
+        "features": stats,
+        "drifted": [
+            name
+            for name, p in zip(profile.names, psi)
+            if events and p >= settings.FRAUD_DRIFT_PSI_ALERT
+        ],
+    }
+
+
+class DriftCollector(Collector):
+    """Xuất PSI/KS của báo cáo drift gần nhất (job ghi vào Redis) khi Prometheus scrape"""
+
+    def __init__(self):
+        self._client = None
+
+    def describe(self) -> Iterator:
+        # Khai báo tên metrics để REGISTRY.register không gọi collect() (kết nối Redis)
+        yield GaugeMetricFamily("fraud_drift_psi", "", labels=["column"])
+        yield GaugeMetricFamily("fraud_drift_ks", "", labels=["column"])
+        yield GaugeMetricFamily("fraud_drift_window_events", "")
+
+    def _read_report(self) -> dict | None:
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            )
+        raw = self._client.get(REPORT_KEY)
+        return json.loads(raw) if raw else None
+
+    def collect(self) -> Iterator:
+        psi = GaugeMetricFamily(
+            "fraud_drift_psi", "Population stability index vs. reference", labels=["column"]
+        )
+        ks = GaugeMetricFamily(
+            "fraud_drift_ks", "Binned Kolmogorov-Smirnov distance vs. reference", labels=["column"]
+        )
+        events = GaugeMetricFamily(
+            "fraud_drift_window_events", "Scored events in the drift window"
+        )
+        try:
+            report = self._read_report()
+        except Exception as e:
+            logger.warning(f"Failed to read drift report: {e}")
+            report = None
+        if report:
+            for name, stats in [*report["features"].items(), (SCORE, report["score"])]:
+                psi.add_metric([name], stats["psi"])
+                ks.add_metric([name], stats["ks"])
+            events.add_metric([], report["events"])
+        yield psi
+        yield ks
+        yield events
+
+
+drift_accumulator = DriftAccumulator(
+    redis=redis_client,
+    reference_path=settings.FRAUD_DRIFT_REFERENCE_PATH,
+    flush_seconds=settings.FRAUD_DRIFT_FLUSH_SECONDS,
+    window_hours=settings.FRAUD_DRIFT_WINDOW_HOURS,
+)
+
+REGISTRY.register(DriftCollector())
+
+
+def main() -> None:
+    from backend.app.core.ml.model_manager import build_model_source
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="File/thư mục Parquet hoặc CSV giao dịch tham chiếu")
+    source.add_argument("--synthetic", action="store_true", help="Dùng dữ liệu giả lập")
+    parser.add_argument("--rows", type=int, default=200_000, help="Số dòng tối đa")
+    parser.add_argument("--bins", type=int, default=10)
+    parser.add_argument("--output", default=settings.FRAUD_DRIFT_REFERENCE_PATH)
+    args = parser.parse_args()
+
+    model, version, _ = build_model_source().load()
+    if args.synthetic:
+        from backend.app.core.ml.synthetic import generate_transactions
+
+        features, _ = generate_transactions(args.rows, seed=11)
+    else:
+        from backend.app.core.ml.history import (
+            feature_columns,
+            open_dataset,
+            record_batch_features,
+        )
+
+        dataset = open_dataset(args.input)
+        table = dataset.head(args.rows, columns=feature_columns(dataset))
+        features = np.vstack([record_batch_features(b) for b in table.to_batches()])
+    scores = model.predict_proba(features)[:, 1]
+    profile = ReferenceProfile.build(features, scores, version, args.bins)
+    profile.save(args.output)
+    print(f"Saved drift reference for {version} ({len(features)} rows) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
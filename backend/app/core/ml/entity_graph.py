@@ -0,0 +1,568 @@
+"""
+Đồ thị liên kết thực thể để phát hiện nhóm gian lận: user được nối với số điện thoại,
+địa chỉ, nơi làm việc và thiết bị; các user dùng chung thuộc tính nằm cùng một cụm.
+Cụm được giữ bằng union-find trong bộ nhớ nên tra "cụm của user này lớn bao nhiêu, có
+bao nhiêu user bị gắn cờ" chỉ tốn vài micro giây trên đường chấm điểm.
+
+Cập nhật (hồ sơ tạo/sửa, thiết bị mới, gắn cờ) được ghi vào Redis stream và mọi worker
+áp dụng theo cùng thứ tự. Job định kỳ ghi snapshot ra đĩa để worker khởi động lại chỉ
+cần nạp snapshot rồi đọc tiếp stream. Union-find không tách được cụm, nên liên kết cũ
+(đổi số điện thoại, địa chỉ) được đếm lại và job dựng lại đồ thị từ bảng profile khi
+tỉ lệ liên kết cũ vượt ngưỡng.
+
+Dựng lại từ bảng profile: python -m backend.app.core.ml.entity_graph --rebuild
+"""
+import argparse
+import asyncio
+import hashlib
+import pathlib
+import pickle
+import re
+import time
+import uuid
+from array import array
+from dataclasses import dataclass
+from typing import Iterable
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.redis_client import redis_client
+
+logger = get_logger()
+
+STREAM_KEY = "fraud:graph:events"
+
+USER = "user"
+PHONE = "phone"
+ADDRESS = "address"
+EMPLOYER = "employer"
+DEVICE = "device"
+
+# Thuộc tính lấy từ hồ sơ; thiết bị chỉ đến từ luồng chấm điểm
+PROFILE_ATTRIBUTES: tuple[str, ...] = (PHONE, ADDRESS, EMPLOYER)
+_KIND_CODES = {PHONE: 1, ADDRESS: 2, EMPLOYER: 3, DEVICE: 4}
+_PROFILE_CODES = frozenset(_KIND_CODES[kind] for kind in PROFILE_ATTRIBUTES)
+
+SNAPSHOT_FORMAT = 1
+
+
+def _normalize(value: str | None) -> str | None:
+    if value is None:
+        return None
+    value = re.sub(r"[^\w]+", " ", str(value).lower()).strip()
+    return value or None
+
+
+def profile_attributes(profile) -> dict[str, str | None]:
+    """Giá trị chuẩn hóa của các thuộc tính hồ sơ dùng để nối user"""
+    phone = re.sub(r"\D", "", str(profile.phone_number or "")) or None
+    address = _normalize(f"{profile.address} {profile.city} {profile.country}")
+    employer = _normalize(f"{profile.employer_name} {profile.employer_city}")
+    return {PHONE: phone, ADDRESS: address, EMPLOYER: employer}
+
+
+def _node_key(kind: str, value: str) -> int:
+    # Băm về số nguyên 64 bit: dict theo int nhỏ hơn nhiều so với theo chuỗi dài
+    digest = hashlib.blake2b(f"{kind}:{value}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+@dataclass(frozen=True)
+class ClusterInfo:
+    size: int
+    flagged: int
+
+    @property
+    def risk(self) -> float:
+        return self.flagged / self.size
+
+
+class EntityGraph:
+    """
+    Union-find trên các nút user và nút thuộc tính (mảng array nén, hợp theo kích
+    thước, nén đường đi khi tìm gốc). Gốc của mỗi cụm giữ số user và số user bị gắn cờ.
+    """
+
+    def __init__(self, max_degree: int):
+        self.max_degree = max_degree
+        self._index: dict[int, int] = {}
+        self._parent = array("q")
+        self._size = array("q")
+        self._users = array("q")
+        self._flagged = array("q")
+        # Số user đã nối vào nút thuộc tính (chặn thuộc tính quá phổ biến)
+        self._degree = array("q")
+        # Nút user -> các (loại, nút thuộc tính) hiện tại của user
+        self._links: dict[int, tuple[tuple[int, int], ...]] = {}
+        self._flagged_users: set[int] = set()
+        self.link_count = 0
+        self.stale_links = 0
+        self.last_event_id = "0-0"
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    def _node(self, key: int, is_user: bool) -> int:
+        node = self._index.get(key)
+        if node is None:
+            node = len(self._parent)
+            self._index[key] = node
+            self._parent.append(node)
+            self._size.append(1)
+            self._users.append(1 if is_user else 0)
+            self._flagged.append(0)
+            self._degree.append(0)
+        return node
+
+    def _find(self, node: int) -> int:
+        parent = self._parent
+        while parent[node] != node:
+            # Path halving: trỏ nút tới ông của nó
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _union(self, a: int, b: int) -> None:
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        self._users[a] += self._users[b]
+        self._flagged[a] += self._flagged[b]
+
+    def _link(self, user: int, code: int, kind: str, value: str) -> tuple[int, int] | None:
+        attribute = self._node(_node_key(kind, value), is_user=False)
+        if self._degree[attribute] >= self.max_degree:
+            # Tên công ty lớn, địa chỉ tòa nhà... nối cả nghìn user vô can vào một cụm
+            return None
+        self._degree[attribute] += 1
+        self._union(user, attribute)
+        self.link_count += 1
+        return code, attribute
+
+    def set_profile(self, user_id: str, attributes: dict[str, str | None]) -> None:
+        """Thay thuộc tính hồ sơ của user; liên kết cũ không tách được nên chỉ đếm lại"""
+        user = self._node(_node_key(USER, user_id), is_user=True)
+        current = self._links.get(user, ())
+        kept = [link for link in current if link[0] not in _PROFILE_CODES]
+        previous = {link[1] for link in current if link[0] in _PROFILE_CODES}
+        for kind in PROFILE_ATTRIBUTES:
+            value = attributes.get(kind)
+            if not value:
+                continue
+            code = _KIND_CODES[kind]
+            node = self._index.get(_node_key(kind, value))
+            if node is not None and node in previous:
+                previous.discard(node)
+                kept.append((code, node))
+                continue
+            link = self._link(user, code, kind, value)
+            if link is not None:
+                kept.append(link)
+        self.stale_links += len(previous)
+        self._links[user] = tuple(kept)
+
+    def has_device(self, user_id: str, device_id: str) -> bool:
+        user = self._index.get(_node_key(USER, user_id))
+        device = self._index.get(_node_key(DEVICE, device_id))
+        if user is None or device is None:
+            return False
+        # Thiết bị đã đủ số user tối đa: coi như đã biết để không ghi stream lặp lại
+        if self._degree[device] >= self.max_degree:
+            return True
+        return (_KIND_CODES[DEVICE], device) in self._links.get(user, ())
+
+    def add_device(self, user_id: str, device_id: str) -> None:
+        if self.has_device(user_id, device_id):
+            return
+        user = self._node(_node_key(USER, user_id), is_user=True)
+        link = self._link(user, _KIND_CODES[DEVICE], DEVICE, device_id)
+        self._links[user] = (*self._links.get(user, ()), *([link] if link else []))
+
+    def flag(self, user_id: str) -> None:
+        user = self._node(_node_key(USER, user_id), is_user=True)
+        self._links.setdefault(user, ())
+        if user not in self._flagged_users:
+            self._flagged_users.add(user)
+            self._flagged[self._find(user)] += 1
+
+    def cluster(self, user_id: str | uuid.UUID) -> ClusterInfo | None:
+        node = self._index.get(_node_key(USER, str(user_id)))
+        if node is None:
+            return None
+        root = self._find(node)
+        return ClusterInfo(size=self._users[root], flagged=self._flagged[root])
+
+    def device_links(self) -> Iterable[tuple[int, int]]:
+        """Cặp (nút user, nút thiết bị) để giữ lại khi dựng lại từ bảng profile"""
+        code = _KIND_CODES[DEVICE]
+        for user, links in self._links.items():
+            for link in links:
+                if link[0] == code:
+                    yield user, link[1]
+
+    @property
+    def stale_ratio(self) -> float:
+        return self.stale_links / self.link_count if self.link_count else 0.0
+
+    def apply(self, fields: dict[str, str]) -> None:
+        """Áp dụng một sự kiện từ stream"""
+        op = fields.get("op")
+        if op == "profile":
+            self.set_profile(fields["user"], {k: fields.get(k) for k in PROFILE_ATTRIBUTES})
+        elif op == DEVICE:
+            self.add_device(fields["user"], fields[DEVICE])
+        elif op == "flag":
+            self.flag(fields["user"])
+
+    def save(self, path: str) -> None:
+        target = pathlib.Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((SNAPSHOT_FORMAT, self.__dict__), f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Đổi tên nguyên tử để worker không nạp phải file ghi dở
+        tmp_path.replace(target)
+
+    @classmethod
+    def load(cls, path: str) -> "EntityGraph":
+        with open(path, "rb") as f:
+            version, state = pickle.load(f)
+        if version != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported entity graph snapshot format {version}")
+        graph = cls.__new__(cls)
+        graph.__dict__.update(state)
+        return graph
+
+    @classmethod
+    def rebuild(
+        cls,
+        profiles: Iterable[tuple[str, dict[str, str | None]]],
+        max_degree: int,
+        previous: "EntityGraph | None" = None,
+    ) -> "EntityGraph":
+        """Dựng mới từ hồ sơ, giữ thiết bị và cờ từ đồ thị cũ (không có trong DB)"""
+        graph = cls(max_degree)
+        for user_id, attributes in profiles:
+            graph.set_profile(user_id, attributes)
+        if previous is not None:
+            keys = {node: key for key, node in previous._index.items()}
+            for user, device in previous.device_links():
+                graph._relink(keys[user], keys[device], _KIND_CODES[DEVICE])
+            for user in previous._flagged_users:
+                node = graph._node(keys[user], is_user=True)
+                graph._links.setdefault(node, ())
+                if node not in graph._flagged_users:
+                    graph._flagged_users.add(node)
+                    graph._flagged[graph._find(node)] += 1
+        return graph
+
+    def _relink(self, user_key: int, attribute_key: int, code: int) -> None:
+        user = self._node(user_key, is_user=True)
+        attribute = self._node(attribute_key, is_user=False)
+        if self._degree[attribute] >= self.max_degree:
+            return
+        self._degree[attribute] += 1
+        self._union(user, attribute)
+        self.link_count += 1
+        self._links[user] = (*self._links.get(user, ()), (code, attribute))
+
+
+def _profile_event(profile) -> dict[str, str]:
+    attributes = profile_attributes(profile)
+    return {
+        "op": "profile",
+        "user": str(profile.user_id),
+        **{kind: value for kind, value in attributes.items() if value},
+    }
+
+
+class EntityGraphService:
+    """
+    Đồ thị của một worker API: nạp snapshot khi khởi động, đọc tiếp stream định kỳ.
+    Thiết bị mới và cờ gian lận được gom lại và ghi vào stream ở vòng đồng bộ kế tiếp,
+    không chặn request chấm điểm. Khi job ghi snapshot mới (nhất là khi dựng lại để tách
+    các cụm đã cũ), worker nạp lại snapshot thay vì giữ union-find cũ tới lúc khởi động lại.
+    """
+
+    def __init__(
+        self,
+        redis,
+        snapshot_path: str,
+        sync_seconds: float,
+        max_degree: int,
+        stream_maxlen: int,
+        outbox_max_size: int,
+    ):
+        self.redis = redis
+        self.snapshot_path = snapshot_path
+        self.sync_seconds = sync_seconds
+        self.stream_maxlen = stream_maxlen
+        self.outbox_max_size = outbox_max_size
+        self.graph = EntityGraph(max_degree)
+        self._outbox: list[dict[str, str]] = []
+        # mtime của snapshot đã nạp, để biết khi job ghi snapshot mới
+        self._snapshot_mtime: int | None = None
+        self._task: asyncio.Task | None = None
+
+    def cluster(self, user_id: uuid.UUID | str) -> ClusterInfo | None:
+        return self.graph.cluster(user_id)
+
+    def observe_device(self, user_id: uuid.UUID | str, device_id: str) -> None:
+        # Chỉ ghi stream lần đầu thấy cặp user/thiết bị
+        if not self.graph.has_device(str(user_id), device_id):
+            self._outbox.append({"op": DEVICE, "user": str(user_id), DEVICE: device_id})
+
+    def flag(self, user_id: uuid.UUID | str) -> None:
+        self._outbox.append({"op": "flag", "user": str(user_id)})
+
+    async def publish_profile(self, profile) -> None:
+        """Gọi sau khi hồ sơ được lưu; lỗi Redis không làm hỏng request"""
+        try:
+            await self.redis.xadd(
+                STREAM_KEY, _profile_event(profile), maxlen=self.stream_maxlen, approximate=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish profile links of {profile.user_id}: {e}")
+
+    async def sync(self) -> int:
+        """Ghi sự kiện đang chờ rồi áp dụng mọi sự kiện mới trong stream"""
+        if self._outbox:
+            events, self._outbox = self._outbox, []
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for fields in events:
+                        pipe.xadd(STREAM_KEY, fields, maxlen=self.stream_maxlen, approximate=True)
+                    await pipe.execute()
+            except Exception:
+                # Trả sự kiện lại đầu hàng chờ để lần sync sau gửi tiếp; gửi lặp phần đã
+                # ghi được là vô hại vì thêm thiết bị/gắn cờ lần hai là no-op
+                self._outbox = events + self._outbox
+                overflow = len(self._outbox) - self.outbox_max_size
+                if overflow > 0:
+                    del self._outbox[:overflow]
+                    logger.error(f"Entity graph outbox full, dropped {overflow} oldest events")
+                raise
+        return await self._read_stream(self.graph)
+
+    async def _read_stream(self, graph: EntityGraph) -> int:
+        applied = 0
+        while True:
+            reply = await self.redis.xread({STREAM_KEY: graph.last_event_id}, count=1000)
+            if not reply:
+                return applied
+            entries = reply[0][1]
+            for event_id, fields in entries:
+                graph.apply(fields)
+                graph.last_event_id = event_id
+            applied += len(entries)
+            if len(entries) < 1000:
+                return applied
+
+    def _current_snapshot_mtime(self) -> int | None:
+        try:
+            return pathlib.Path(self.snapshot_path).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def load_snapshot(self) -> None:
+        mtime = self._current_snapshot_mtime()
+        try:
+            self.graph = EntityGraph.load(self.snapshot_path)
+        except FileNotFoundError:
+            logger.warning(f"No entity graph snapshot at {self.snapshot_path}")
+            return
+        self._snapshot_mtime = mtime
+        logger.info(
+            f"Entity graph snapshot loaded: {len(self.graph)} users, "
+            f"stream position {self.graph.last_event_id}"
+        )
+
+    async def reload_snapshot(self) -> bool:
+        """Thay đồ thị bằng snapshot mới trên đĩa (nếu có), không lùi vị trí trong stream"""
+        mtime = self._current_snapshot_mtime()
+        if mtime is None or mtime == self._snapshot_mtime:
+            return False
+        # Ghi nhận trước: snapshot lỗi không bị nạp lại ở mọi vòng
+        self._snapshot_mtime = mtime
+        graph = await asyncio.to_thread(EntityGraph.load, self.snapshot_path)
+        # Đọc tiếp stream cho snapshot tới hết, vượt qua vị trí worker đã áp dụng
+        await self._read_stream(graph)
+        if _stream_id(graph.last_event_id) < _stream_id(self.graph.last_event_id):
+            return False
+        self.graph = graph
+        logger.info(
+            f"Entity graph snapshot reloaded: {len(graph)} users, "
+            f"stream position {graph.last_event_id}"
+        )
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reload_snapshot()
+            except Exception as e:
+                logger.warning(f"Entity graph snapshot reload failed: {e}")
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f"Entity graph sync failed: {e}")
+            await asyncio.sleep(self.sync_seconds)
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            await asyncio.to_thread(self.load_snapshot)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.sync()
+        except Exception as e:
+            logger.warning(f"Failed to flush entity graph events: {e}")
+
+
+async def _scan_profiles(batch_size: int = 5000) -> list[tuple[str, dict[str, str | None]]]:
+    """Đọc thuộc tính liên kết của toàn bộ bảng profile bằng server-side cursor"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+    from sqlmodel import select
+
+    from backend.app.core.model_registry import load_models
+    from backend.app.user_profile.models import Profile
+
+    # Nạp toàn bộ models để relationship Profile.user được cấu hình đầy đủ
+    load_models()
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    statement = select(
+        Profile.user_id,
+        Profile.phone_number,
+        Profile.address,
+        Profile.city,
+        Profile.country,
+        Profile.employer_name,
+        Profile.employer_city,
+    ).execution_options(yield_per=batch_size)
+    profiles = []
+    try:
+        async with engine.connect() as conn:
+            result = await conn.stream(statement)
+            async for rows in result.partitions():
+                profiles.extend((str(row.user_id), profile_attributes(row)) for row in rows)
+    finally:
+        await engine.dispose()
+    return profiles
+
+
+def _replay(graph: EntityGraph, client) -> int:
+    applied = 0
+    while True:
+        reply = client.xread({STREAM_KEY: graph.last_event_id}, count=10_000)
+        if not reply:
+            return applied
+        for event_id, fields in reply[0][1]:
+            graph.apply(fields)
+            graph.last_event_id = event_id
+            applied += 1
+
+
+def refresh_snapshot(client, rebuild: bool = False) -> EntityGraph:
+    """
+    Cập nhật snapshot trên đĩa: nạp snapshot cũ và đọc tiếp stream, hoặc dựng lại từ
+    bảng profile khi được yêu cầu, chưa có snapshot, stream đã bị cắt qua vị trí của
+    snapshot hay tỉ lệ liên kết cũ vượt FRAUD_GRAPH_REBUILD_STALE_RATIO.
+    """
+    path = settings.FRAUD_GRAPH_SNAPSHOT_PATH
+    previous = None
+    try:
+        previous = EntityGraph.load(path)
+    except FileNotFoundError:
+        rebuild = True
+    if previous is not None and not rebuild:
+        if _trimmed_past(client, previous.last_event_id):
+            logger.warning("Entity graph stream was trimmed past the snapshot, rebuilding")
+            rebuild = True
+        elif previous.stale_ratio > settings.FRAUD_GRAPH_REBUILD_STALE_RATIO:
+            rebuild = True
+
+    started = time.perf_counter()
+    if rebuild:
+        # Lấy vị trí stream trước khi quét: sự kiện trong lúc quét được đọc lại sau đó,
+        # áp dụng lại hồ sơ không đổi là no-op
+        last_id = client.xinfo_stream(STREAM_KEY)["last-generated-id"] if client.exists(
+            STREAM_KEY
+        ) else "0-0"
+        profiles = asyncio.run(_scan_profiles())
+        graph = EntityGraph.rebuild(
+            profiles, settings.FRAUD_GRAPH_MAX_ATTRIBUTE_DEGREE, previous
+        )
+        graph.last_event_id = last_id
+    else:
+        graph = previous
+    applied = _replay(graph, client)
+    graph.save(path)
+    logger.info(
+        f"Entity graph snapshot {'rebuilt' if rebuild else 'refreshed'}: {len(graph)} users, "
+        f"{applied} stream events, {time.perf_counter() - started:.1f}s"
+    )
+    return graph
+
+
+def _stream_id(event_id: str) -> tuple[int, int]:
+    milliseconds, sequence = event_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+def _trimmed_past(client, last_event_id: str) -> bool:
+    """Sự kiện sau vị trí của snapshot có thể đã bị MAXLEN cắt mất hay không"""
+    if not client.exists(STREAM_KEY):
+        return False
+    info = client.xinfo_stream(STREAM_KEY)
+    if last_event_id == "0-0":
+        # Snapshot chưa đọc sự kiện nào: mất dữ liệu nếu stream đã từng bị cắt
+        return info.get("entries-added", info["length"]) > info["length"]
+    # Chính sự kiện cuối snapshot đã đọc cũng bị cắt -> có thể mất các sự kiện sau nó
+    first = info["first-entry"]
+    return first is not None and _stream_id(first[0]) > _stream_id(last_event_id)
+
+
+entity_graph = EntityGraphService(
+    redis=redis_client,
+    snapshot_path=settings.FRAUD_GRAPH_SNAPSHOT_PATH,
+    sync_seconds=settings.FRAUD_GRAPH_SYNC_SECONDS,
+    max_degree=settings.FRAUD_GRAPH_MAX_ATTRIBUTE_DEGREE,
+    stream_maxlen=settings.FRAUD_GRAPH_STREAM_MAXLEN,
+    outbox_max_size=settings.FRAUD_GRAPH_OUTBOX_MAX_SIZE,
+)
+
+
+def main() -> None:
+    import redis
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rebuild", action="store_true", help="Dựng lại từ bảng profile")
+    args = parser.parse_args()
+    client = redis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        decode_responses=True,
+    )
+    try:
+        graph = refresh_snapshot(client, rebuild=args.rebuild)
+    finally:
+        client.close()
+    print(f"Entity graph: {len(graph)} users, stale ratio {graph.stale_ratio:.3f}")
+
+
+if __name__ == "__main__":
+    main()
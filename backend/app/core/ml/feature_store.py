@@ -0,0 +1,359 @@
+"""
+Feature store cửa sổ trượt cho đặc trưng vận tốc giao dịch (số giao dịch, tổng tiền
+trong 1 phút / 1 giờ / 24 giờ, số người nhận khác nhau trong 24 giờ) theo tài khoản
+và thiết bị, cập nhật tăng dần trên Redis mỗi khi có giao dịch.
+
+Dựng lại trạng thái từ dữ liệu lịch sử (Parquet/CSV):
+python -m backend.app.core.ml.feature_store --input transactions.parquet
+"""
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterable
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.schema import FraudScoreRequestSchema
+from backend.app.core.redis_client import redis_client
+
+logger = get_logger()
+
+KEY_PREFIX = "fraud:velocity"
+
+# Tên cửa sổ -> độ dài (giây), thứ tự cố định theo kết quả của script
+VELOCITY_WINDOWS: dict[str, int] = {"1m": 60, "1h": 3600, "24h": 86400}
+RECIPIENT_WINDOW_SECONDS = 86400
+
+# Loại thực thể được theo dõi
+ACCOUNT = "account"
+DEVICE = "device"
+
+# Cập nhật và đọc cửa sổ trượt của một thực thể trong một lần gọi Redis
+# KEYS[1]: zset sự kiện (score = thời điểm ms, member = "<id>:<số tiền theo xu>")
+# KEYS[2]: hash tổng hợp (n:<w>, s:<w> = số giao dịch, tổng tiền trong cửa sổ w ms;
+#          c:<w> = mốc đã trừ khỏi cửa sổ; wm = thời điểm lớn nhất đã thấy)
+# KEYS[3]: zset người nhận (score = lần nhận gần nhất)
+# ARGV: ts_ms, số tiền (xu), id giao dịch, người nhận, ghi (1/0), cửa sổ người nhận (ms),
+#       ttl (ms), rồi độ dài các cửa sổ (ms)
+# Mỗi sự kiện chỉ được cộng một lần và trừ một lần cho mỗi cửa sổ -> O(1) khấu hao,
+# trả về {n_1, s_1, n_2, s_2, ..., số người nhận} TRƯỚC khi cộng giao dịch hiện tại
+VELOCITY_SCRIPT = """
+local ts = tonumber(ARGV[1])
+local member = ARGV[3] .. ':' .. ARGV[2]
+local record = ARGV[5] == '1'
+local recipient_window = tonumber(ARGV[6])
+local ttl = tonumber(ARGV[7])
+
+local watermark = tonumber(redis.call('HGET', KEYS[2], 'wm'))
+if watermark == nil or ts > watermark then
+    watermark = ts
+end
+
+local result = {}
+local max_window = recipient_window
+for i = 8, #ARGV do
+    local w = ARGV[i]
+    local window = tonumber(w)
+    if window > max_window then
+        max_window = window
+    end
+    local cutoff = watermark - window
+    local cursor = tonumber(redis.call('HGET', KEYS[2], 'c:' .. w))
+    if cursor == nil or cursor < cutoff then
+        local lower = cursor == nil and '-inf' or '(' .. cursor
+        local expired = redis.call('ZRANGEBYSCORE', KEYS[1], lower, cutoff)
+        if #expired > 0 then
+            local removed = 0
+            for _, old in ipairs(expired) do
+                removed = removed + tonumber(string.match(old, ':(-?%d+)$'))
+            end
+            redis.call('HINCRBY', KEYS[2], 'n:' .. w, -#expired)
+            redis.call('HINCRBY', KEYS[2], 's:' .. w, -removed)
+        end
+        redis.call('HSET', KEYS[2], 'c:' .. w, cutoff)
+    end
+    local stats = redis.call('HMGET', KEYS[2], 'n:' .. w, 's:' .. w)
+    result[#result + 1] = tonumber(stats[1]) or 0
+    result[#result + 1] = tonumber(stats[2]) or 0
+end
+
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', watermark - recipient_window)
+result[#result + 1] = redis.call('ZCARD', KEYS[3])
+
+-- Sự kiện quá cũ so với mọi cửa sổ hoặc đã ghi rồi (gửi lại) thì bỏ qua
+if record and ts > watermark - max_window and not redis.call('ZSCORE', KEYS[1], member) then
+    for i = 8, #ARGV do
+        local w = ARGV[i]
+        if ts > watermark - tonumber(w) then
+            redis.call('HINCRBY', KEYS[2], 'n:' .. w, 1)
+            redis.call('HINCRBY', KEYS[2], 's:' .. w, ARGV[2])
+        end
+    end
+    redis.call('ZADD', KEYS[1], ts, member)
+    if ARGV[4] ~= '' and ts > watermark - recipient_window then
+        redis.call('ZADD', KEYS[3], 'GT', ts, ARGV[4])
+    end
+end
+
+redis.call('HSET', KEYS[2], 'wm', watermark)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', watermark - max_window)
+for i = 1, 3 do
+    redis.call('PEXPIRE', KEYS[i], ttl)
+end
+return result
+"""
+
+
+@dataclass(frozen=True)
+class VelocitySnapshot:
+    txn_count_1m: int = 0
+    amount_sum_1m: float = 0.0
+    txn_count_1h: int = 0
+    amount_sum_1h: float = 0.0
+    txn_count_24h: int = 0
+    amount_sum_24h: float = 0.0
+    distinct_recipients_24h: int = 0
+
+    @classmethod
+    def from_reply(cls, reply: list) -> "VelocitySnapshot":
+        values = [int(v) for v in reply]
+        fields = {}
+        for i, name in enumerate(VELOCITY_WINDOWS):
+            fields[f"txn_count_{name}"] = values[2 * i]
+            fields[f"amount_sum_{name}"] = values[2 * i + 1] / 100
+        return cls(**fields, distinct_recipients_24h=values[-1])
+
+
+@dataclass(frozen=True)
+class VelocityEvent:
+    transaction_id: str
+    account_id: str | None
+    device_id: str | None
+    amount: float
+    occurred_at: datetime
+    recipient_id: str | None = None
+
+    @classmethod
+    def from_request(cls, request: FraudScoreRequestSchema) -> "VelocityEvent":
+        return cls(
+            transaction_id=str(request.transaction_id),
+            account_id=request.account_id,
+            device_id=request.device_id,
+            amount=request.amount,
+            occurred_at=request.occurred_at or datetime.now(timezone.utc),
+            recipient_id=request.recipient_id,
+        )
+
+    def entities(self) -> list[tuple[str, str]]:
+        return [
+            (kind, entity_id)
+            for kind, entity_id in ((ACCOUNT, self.account_id), (DEVICE, self.device_id))
+            if entity_id
+        ]
+
+
+def _to_ms(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+class VelocityFeatureStore:
+    """
+    Mỗi thực thể (tài khoản, thiết bị) giữ bộ đếm và tổng tiền đang chạy cho từng
+    cửa sổ; sự kiện hết hạn được trừ ra theo con trỏ nên đọc đặc trưng không cần
+    quét lại lịch sử hay chạy truy vấn tổng hợp trên database.
+    """
+
+    def __init__(self, redis, prefix: str = KEY_PREFIX):
+        self.redis = redis
+        self.prefix = prefix
+        self._script = redis.register_script(VELOCITY_SCRIPT)
+        self._windows_ms = [seconds * 1000 for seconds in VELOCITY_WINDOWS.values()]
+        self._ttl_ms = (max(VELOCITY_WINDOWS.values()) + 3600) * 1000
+
+    def _keys(self, kind: str, entity_id: str) -> list[str]:
+        base = f"{self.prefix}:{kind}:{{{entity_id}}}"
+        return [f"{base}:events", f"{base}:agg", f"{base}:recipients"]
+
+    def _args(self, ts_ms: int, event: VelocityEvent | None = None) -> list:
+        return [
+            ts_ms,
+            round(event.amount * 100) if event else 0,
+            event.transaction_id if event else "",
+            (event.recipient_id or "") if event else "",
+            1 if event else 0,
+            RECIPIENT_WINDOW_SECONDS * 1000,
+            self._ttl_ms,
+            *self._windows_ms,
+        ]
+
+    async def observe(self, event: VelocityEvent) -> dict[str, VelocitySnapshot]:
+        """Ghi giao dịch và trả về đặc trưng của từng thực thể trước giao dịch này"""
+        entities = event.entities()
+        if not entities:
+            return {}
+        ts_ms = _to_ms(event.occurred_at)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for kind, entity_id in entities:
+                await self._script(
+                    keys=self._keys(kind, entity_id),
+                    args=self._args(ts_ms, event),
+                    client=pipe,
+                )
+            replies = await pipe.execute()
+        return {
+            kind: VelocitySnapshot.from_reply(reply)
+            for (kind, _), reply in zip(entities, replies)
+        }
+
+    async def read(
+        self, kind: str, entity_id: str, now: datetime | None = None
+    ) -> VelocitySnapshot:
+        """Đọc đặc trưng hiện tại mà không ghi sự kiện"""
+        ts_ms = _to_ms(now or datetime.now(timezone.utc))
+        reply = await self._script(
+            keys=self._keys(kind, entity_id), args=self._args(ts_ms)
+        )
+        return VelocitySnapshot.from_reply(reply)
+
+    async def enrich(
+        self, request: FraudScoreRequestSchema, record: bool = True
+    ) -> FraudScoreRequestSchema:
+        """
+        Điền đặc trưng vận tốc của tài khoản vào request từ feature store; record=False
+        chỉ đọc, không ghi giao dịch vào bộ đếm của tài khoản/thiết bị.
+        Redis lỗi -> giữ nguyên giá trị client gửi lên, không chặn việc chấm điểm.
+        """
+        if not settings.FRAUD_VELOCITY_ENABLED or not request.account_id:
+            return request
+        try:
+            if record:
+                account = (await self.observe(VelocityEvent.from_request(request)))[ACCOUNT]
+            else:
+                account = await self.read(ACCOUNT, request.account_id)
+        except Exception as e:
+            logger.warning(f"Velocity features unavailable, using request values: {e}")
+            return request
+        return request.model_copy(
+            update={
+                "txn_count_1h": account.txn_count_1h,
+                "txn_count_24h": account.txn_count_24h,
+                "amount_sum_24h": account.amount_sum_24h,
+                "distinct_recipients_24h": account.distinct_recipients_24h,
+            }
+        )
+
+    async def clear(self, entities: Iterable[tuple[str, str]]) -> None:
+        keys = [key for kind, entity_id in entities for key in self._keys(kind, entity_id)]
+        for start in range(0, len(keys), 1000):
+            await self.redis.delete(*keys[start : start + 1000])
+
+    async def backfill(
+        self, events: AsyncIterator[list[VelocityEvent]] | Iterable[list[VelocityEvent]]
+    ) -> int:
+        """
+        Phát lại các lô sự kiện lịch sử (đã sắp theo thời gian) bằng pipeline.
+        Trạng thái cũ của các thực thể xuất hiện trong dữ liệu bị xóa trước khi ghi.
+        """
+        cleared: set[tuple[str, str]] = set()
+        total = 0
+
+        async def replay(batch: list[VelocityEvent]) -> None:
+            nonlocal total
+            fresh = {e for event in batch for e in event.entities()} - cleared
+            if fresh:
+                await self.clear(fresh)
+                cleared.update(fresh)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for event in batch:
+                    ts_ms = _to_ms(event.occurred_at)
+                    for kind, entity_id in event.entities():
+                        await self._script(
+                            keys=self._keys(kind, entity_id),
+                            args=self._args(ts_ms, event),
+                            client=pipe,
+                        )
+                await pipe.execute()
+            total += len(batch)
+
+        if hasattr(events, "__aiter__"):
+            async for batch in events:
+                await replay(batch)
+        else:
+            for batch in events:
+                await replay(batch)
+        return total
+
+
+def read_history(
+    path: str, since: datetime, batch_size: int = 10_000
+) -> Iterable[list[VelocityEvent]]:
+    """
+    Đọc giao dịch từ Parquet/CSV (cột: transaction_id, account_id, device_id, amount,
+    occurred_at, recipient_id) bằng pyarrow, chỉ giữ phần còn nằm trong cửa sổ dài nhất.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    from backend.app.core.ml.history import open_dataset
+
+    dataset = open_dataset(path)
+    columns = [
+        name
+        for name in (
+            "transaction_id",
+            "account_id",
+            "device_id",
+            "amount",
+            "occurred_at",
+            "recipient_id",
+        )
+        if name in dataset.schema.names
+    ]
+    occurred_at = ds.field("occurred_at").cast(pa.timestamp("us", tz="UTC"))
+    table = dataset.to_table(
+        columns=columns, filter=occurred_at >= pa.scalar(since, pa.timestamp("us", tz="UTC"))
+    )
+    table = table.sort_by("occurred_at")
+    for record_batch in table.to_batches(max_chunksize=batch_size):
+        rows = record_batch.to_pydict()
+        count = record_batch.num_rows
+        yield [
+            VelocityEvent(
+                transaction_id=str(rows["transaction_id"][i]),
+                account_id=rows["account_id"][i],
+                device_id=rows.get("device_id", [None] * count)[i],
+                amount=float(rows["amount"][i]),
+                occurred_at=rows["occurred_at"][i],
+                recipient_id=rows.get("recipient_id", [None] * count)[i],
+            )
+            for i in range(count)
+        ]
+
+
+velocity_store = VelocityFeatureStore(redis_client)
+
+
+async def _backfill_main(args: argparse.Namespace) -> None:
+    now = datetime.fromisoformat(args.now) if args.now else datetime.now(timezone.utc)
+    since = now - timedelta(seconds=max(*VELOCITY_WINDOWS.values(), RECIPIENT_WINDOW_SECONDS))
+    started = time.perf_counter()
+    total = await velocity_store.backfill(read_history(args.input, since, args.batch_size))
+    elapsed = time.perf_counter() - started
+    print(f"Replayed {total} transactions since {since.isoformat()} in {elapsed:.1f}s")
+    await redis_client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input", required=True, help="File Parquet/CSV giao dịch lịch sử")
+    parser.add_argument("--now", help="Mốc thời gian hiện tại (ISO 8601), mặc định là bây giờ")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    asyncio.run(_backfill_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Đọc file giao dịch lịch sử (Parquet hoặc CSV, một file hoặc cả thư mục) bằng pyarrow"""
+import pathlib
+
+from backend.app.core.ml.features import OPTIONAL_NUMERIC_COLUMNS, build_feature_matrix
+
+# Cột bắt buộc để tính đặc trưng và ghi điểm
+REQUIRED_COLUMNS: tuple[str, ...] = (
+    "transaction_id",
+    "amount",
+    "transaction_type",
+    "occurred_at",
+)
+
+
+def open_dataset(path: str):
+    import pyarrow.dataset as ds
+
+    source = pathlib.Path(path)
+    files = [p for p in source.rglob("*") if p.is_file()] if source.is_dir() else [source]
+    suffixes = {p.suffix for p in files}
+    return ds.dataset(path, format="csv" if suffixes == {".csv"} else "parquet")
+
+
+def feature_columns(dataset) -> list[str]:
+    """Các cột cần đọc để tính đặc trưng, báo lỗi nếu thiếu cột bắt buộc"""
+    names = dataset.schema.names
+    missing = [name for name in REQUIRED_COLUMNS if name not in names]
+    if missing:
+        raise ValueError(f"Transaction data is missing columns {missing}")
+    return [name for name in (*REQUIRED_COLUMNS, *OPTIONAL_NUMERIC_COLUMNS) if name in names]
+
+
+def occurred_at_micros(column) -> "object":
+    """Cột occurred_at -> mảng int64 micro giây từ epoch (UTC)"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if not pa.types.is_timestamp(column.type):
+        column = pc.cast(column, pa.timestamp("us", tz="UTC"))
+    elif column.type.tz is None:
+        column = pc.assume_timezone(column, "UTC")
+    return pc.cast(column, pa.timestamp("us", tz="UTC")).cast(pa.int64()).to_numpy(
+        zero_copy_only=False
+    )
+
+
+def record_batch_features(batch) -> "object":
+    """Ma trận đặc trưng (theo FEATURE_NAMES) của một record batch giao dịch"""
+    import pyarrow as pa
+
+    columns = {
+        "amount": batch.column("amount").to_numpy(zero_copy_only=False),
+        "transaction_type": batch.column("transaction_type").to_numpy(zero_copy_only=False),
+        "occurred_at": occurred_at_micros(batch.column("occurred_at")),
+    }
+    for name in OPTIONAL_NUMERIC_COLUMNS:
+        if name in batch.schema.names:
+            # Giá trị null -> NaN -> 0 trong build_feature_matrix
+            columns[name] = (
+                batch.column(name).cast(pa.float64()).to_numpy(zero_copy_only=False)
+            )
+    return build_feature_matrix(columns, batch.num_rows)
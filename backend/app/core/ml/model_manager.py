@@ -0,0 +1,292 @@
+import asyncio
+import os
+import pathlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+from prometheus_client import Gauge, Info
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.features import FEATURE_NAMES
+
+logger = get_logger()
+
+# role: "champion" (chấm điểm thật) hoặc "challenger" (chạy shadow)
+MODEL_INFO = Info("fraud_model", "Model gian lận đang phục vụ", ["role"])
+MODEL_LOAD_SECONDS = Gauge(
+    "fraud_model_load_seconds", "Thời gian nạp model gần nhất", ["role"]
+)
+MODEL_MEMORY_BYTES = Gauge(
+    "fraud_model_memory_bytes", "Mức tăng RSS khi nạp model gần nhất", ["role"]
+)
+
+
+def _rss_bytes() -> int:
+    """Bộ nhớ thường trú của tiến trình hiện tại (Linux), 0 nếu không đọc được"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    model: Any
+    version: str
+    source: str
+    loaded_at: datetime
+    load_seconds: float
+    # Mức tăng RSS khi nạp (xấp xỉ, phần mmap chỉ tính khi trang được đọc)
+    memory_bytes: int
+    artifact_bytes: int
+    mmap: bool
+
+
+class ModelSource(Protocol):
+    name: str
+
+    def fingerprint(self) -> str | None:
+        """Định danh rẻ của phiên bản đang active, None nếu chưa có model"""
+
+    def load(self) -> tuple[Any, str, pathlib.Path]:
+        """Nạp model, trả về (model, version, đường dẫn artifact joblib)"""
+
+
+def load_joblib_artifact(path: pathlib.Path) -> dict:
+    import joblib
+
+    # mmap_mode="r": mảng numpy lớn được ánh xạ từ file, các worker dùng chung
+    # page cache của hệ điều hành thay vì mỗi worker giữ một bản sao
+    mmap_mode = "r" if settings.FRAUD_MODEL_MMAP else None
+    artifact = joblib.load(path, mmap_mode=mmap_mode)
+    if tuple(artifact["feature_names"]) != FEATURE_NAMES:
+        raise ValueError(
+            f"Model features {artifact['feature_names']} do not match {FEATURE_NAMES}"
+        )
+    return artifact
+
+
+class FileModelSource:
+    """Artifact joblib trên đĩa ({"model", "version", "feature_names"})"""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = pathlib.Path(path)
+
+    def fingerprint(self) -> str | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def load(self) -> tuple[Any, str, pathlib.Path]:
+        artifact = load_joblib_artifact(self.path)
+        return artifact["model"], artifact["version"], self.path
+
+
+class MlflowModelSource:
+    """
+    Model đã đăng ký trong MLflow (kể cả tracking store dạng file local),
+    phiên bản active được chọn qua alias. Mỗi phiên bản được chuyển một lần sang
+    file joblib không nén trong thư mục cache để có thể nạp bằng mmap.
+    """
+
+    name = "mlflow"
+
+    def __init__(self, tracking_uri: str, model_name: str, alias: str, cache_dir: str):
+        self.tracking_uri = tracking_uri
+        self.model_name = model_name
+        self.alias = alias
+        self.cache_dir = pathlib.Path(cache_dir)
+
+    def _client(self):
+        from mlflow.tracking import MlflowClient
+
+        return MlflowClient(tracking_uri=self.tracking_uri, registry_uri=self.tracking_uri)
+
+    def _active_version(self):
+        from mlflow.exceptions import MlflowException
+
+        try:
+            return self._client().get_model_version_by_alias(self.model_name, self.alias)
+        except MlflowException:
+            return None
+
+    def fingerprint(self) -> str | None:
+        version = self._active_version()
+        return None if version is None else str(version.version)
+
+    def load(self) -> tuple[Any, str, pathlib.Path]:
+        version = self._active_version()
+        if version is None:
+            raise FileNotFoundError(
+                f"No MLflow model {self.model_name}@{self.alias} registered"
+            )
+        label = f"{self.model_name}-v{version.version}"
+        cache_path = self.cache_dir / f"{label}.joblib"
+        if not cache_path.exists():
+            import joblib
+            import mlflow.sklearn
+
+            model = mlflow.sklearn.load_model(
+                f"models:/{self.model_name}/{version.version}"
+            )
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            joblib.dump(
+                {"model": model, "version": label, "feature_names": FEATURE_NAMES},
+                tmp_path,
+            )
+            # Đổi tên nguyên tử để worker khác không đọc phải file ghi dở
+            tmp_path.replace(cache_path)
+        artifact = load_joblib_artifact(cache_path)
+        return artifact["model"], artifact["version"], cache_path
+
+
+class ModelManager:
+    """
+    Giữ model đang active cho cả tiến trình: nạp một lần, kiểm tra phiên bản mới ở
+    background và hoán đổi nguyên tử (gán một tham chiếu) khi nạp xong, request đang
+    chạy vẫn dùng model cũ cho đến hết lô của nó.
+    """
+
+    def __init__(
+        self, source: ModelSource, poll_seconds: float, role: str = "champion"
+    ):
+        self.source = source
+        self.poll_seconds = poll_seconds
+        self.role = role
+        self._current: LoadedModel | None = None
+        self._fingerprint: str | None = None
+        self._load_lock = threading.Lock()
+        self._poll_task: asyncio.Task | None = None
+
+    @property
+    def current(self) -> LoadedModel | None:
+        return self._current
+
+    def load(self, force: bool = False) -> LoadedModel | None:
+        """Nạp model nếu phiên bản active đã thay đổi (chạy đồng bộ, gọi trong thread)"""
+        with self._load_lock:
+            fingerprint = self.source.fingerprint()
+            if fingerprint is None:
+                if self._current is None:
+                    logger.warning(
+                        f"No {self.role} fraud model available from {self.source.name}"
+                    )
+                return self._current
+            if not force and fingerprint == self._fingerprint:
+                return self._current
+
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            model, version, artifact_path = self.source.load()
+            # Lô nhỏ: chi phí chia việc cho nhiều thread lớn hơn thời gian tính
+            if hasattr(model, "n_jobs"):
+                model.n_jobs = 1
+            loaded = LoadedModel(
+                model=model,
+                version=version,
+                source=self.source.name,
+                loaded_at=datetime.now(timezone.utc),
+                load_seconds=round(time.perf_counter() - started, 4),
+                memory_bytes=max(_rss_bytes() - rss_before, 0),
+                artifact_bytes=artifact_path.stat().st_size,
+                mmap=settings.FRAUD_MODEL_MMAP,
+            )
+            previous = self._current
+            self._current = loaded
+            MODEL_INFO.labels(self.role).info(
+                {"version": version, "source": self.source.name}
+            )
+            MODEL_LOAD_SECONDS.labels(self.role).set(loaded.load_seconds)
+            MODEL_MEMORY_BYTES.labels(self.role).set(loaded.memory_bytes)
+            self._fingerprint = fingerprint
+            logger.info(
+                f"Fraud {self.role} model {version} loaded in {loaded.load_seconds}s "
+                f"(previous: {previous.version if previous else None})"
+            )
+            return loaded
+
+    async def refresh(self, force: bool = False) -> LoadedModel | None:
+        return await asyncio.to_thread(self.load, force)
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Giữ model cũ nếu phiên bản mới lỗi
+                logger.error(f"Failed to refresh {self.role} fraud model: {e}")
+
+    def start(self) -> None:
+        if self.poll_seconds > 0 and (self._poll_task is None or self._poll_task.done()):
+            self._poll_task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+
+    def info(self) -> dict[str, Any]:
+        current = self._current
+        if current is None:
+            return {
+                "loaded": False,
+                "role": self.role,
+                "source": self.source.name,
+                "pid": os.getpid(),
+            }
+        return {
+            "loaded": True,
+            "role": self.role,
+            "version": current.version,
+            "source": current.source,
+            "loaded_at": current.loaded_at.isoformat(),
+            "load_seconds": current.load_seconds,
+            "memory_bytes": current.memory_bytes,
+            "artifact_bytes": current.artifact_bytes,
+            "mmap": current.mmap,
+            "pid": os.getpid(),
+        }
+
+
+def build_model_source(
+    path: str | None = None, alias: str | None = None
+) -> ModelSource:
+    """Nguồn model theo FRAUD_MODEL_SOURCE; path/alias dùng cho model challenger"""
+    if settings.FRAUD_MODEL_SOURCE == "mlflow":
+        return MlflowModelSource(
+            tracking_uri=settings.MLFLOW_TRACKING_URI,
+            model_name=settings.FRAUD_MODEL_NAME,
+            alias=alias or settings.FRAUD_MODEL_ALIAS,
+            cache_dir=settings.FRAUD_MODEL_CACHE_DIR,
+        )
+    return FileModelSource(path or settings.FRAUD_MODEL_PATH)
+
+
+fraud_model_manager = ModelManager(
+    source=build_model_source(),
+    poll_seconds=settings.FRAUD_MODEL_POLL_SECONDS,
+)
+
+challenger_model_manager = ModelManager(
+    source=build_model_source(
+        path=settings.FRAUD_CHALLENGER_MODEL_PATH,
+        alias=settings.FRAUD_CHALLENGER_MODEL_ALIAS,
+    ),
+    poll_seconds=settings.FRAUD_MODEL_POLL_SECONDS,
+    role="challenger",
+)
@@ -0,0 +1,109 @@
+"""
+Cache các trường hồ sơ mà luật gian lận cần (quốc gia, thu nhập năm) để đường chấm
+điểm không phải truy vấn bảng profile: bộ nhớ tiến trình (TTL ngắn) -> hash Redis.
+Redis được ghi khi tạo/cập nhật hồ sơ và nạp sẵn bằng:
+python -m backend.app.core.ml.profile_cache
+"""
+import asyncio
+import uuid
+
+from cachetools import TTLCache
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.redis_client import redis_client
+
+logger = get_logger()
+
+KEY_PREFIX = "fraud:profile"
+
+# Trường hồ sơ được phép dùng trong luật (profile.<field>)
+PROFILE_FIELDS: tuple[str, ...] = ("country", "annual_income")
+
+# Đánh dấu user không có hồ sơ trong cache cục bộ, tránh hỏi lại Redis liên tục
+_MISSING: dict = {}
+
+
+def _key(user_id: uuid.UUID | str) -> str:
+    return f"{KEY_PREFIX}:{user_id}"
+
+
+def _encode(profile) -> dict[str, str]:
+    return {field: str(getattr(profile, field)) for field in PROFILE_FIELDS}
+
+
+def _decode(raw: dict[str, str]) -> dict:
+    return {"country": raw["country"], "annual_income": float(raw["annual_income"])}
+
+
+class ProfileCache:
+    def __init__(self, redis, maxsize: int, ttl_seconds: float):
+        self.redis = redis
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+
+    async def get(self, user_id: uuid.UUID | str) -> dict | None:
+        """Trường hồ sơ của user, None nếu chưa có trong cache hoặc Redis lỗi"""
+        key = str(user_id)
+        facts = self._local.get(key)
+        if facts is None:
+            try:
+                raw = await self.redis.hgetall(_key(key))
+            except Exception as e:
+                logger.warning(f"Failed to read cached profile of {key}: {e}")
+                return None
+            facts = _decode(raw) if raw else _MISSING
+            self._local[key] = facts
+        return facts or None
+
+    async def put(self, profile) -> None:
+        """Ghi đè cache sau khi hồ sơ được lưu; lỗi cache không làm hỏng request"""
+        key = str(profile.user_id)
+        try:
+            await self.redis.hset(_key(key), mapping=_encode(profile))
+        except Exception as e:
+            logger.warning(f"Failed to cache profile of {key}: {e}")
+        self._local.pop(key, None)
+
+    async def warm(self, session, batch_size: int = 5000) -> int:
+        """Nạp toàn bộ bảng profile vào Redis theo từng lô (server-side cursor)"""
+        from sqlmodel import select
+
+        from backend.app.user_profile.models import Profile
+
+        statement = select(Profile.user_id, *(getattr(Profile, f) for f in PROFILE_FIELDS))
+        result = await session.stream(statement.execution_options(yield_per=batch_size))
+        count = 0
+        async for rows in result.partitions():
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for row in rows:
+                    pipe.hset(_key(row.user_id), mapping=_encode(row))
+                await pipe.execute()
+            count += len(rows)
+        return count
+
+
+profile_cache = ProfileCache(
+    redis=redis_client,
+    maxsize=settings.FRAUD_PROFILE_CACHE_SIZE,
+    ttl_seconds=settings.FRAUD_PROFILE_CACHE_TTL_SECONDS,
+)
+
+
+async def _warm() -> None:
+    from backend.app.core.db import async_session
+    from backend.app.core.redis_client import close_redis
+
+    try:
+        async with async_session() as session:
+            count = await profile_cache.warm(session)
+    finally:
+        await close_redis()
+    print(f"Cached {count} profiles")
+
+
+def main() -> None:
+    asyncio.run(_warm())
+
+
+if __name__ == "__main__":
+    main()
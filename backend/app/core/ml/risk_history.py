@@ -0,0 +1,256 @@
+"""
+Lịch sử điểm rủi ro theo user: bảng risk_history phân vùng RANGE theo tháng, mỗi
+tháng một bảng con risk_history_yYYYYmMM. Job định kỳ tạo trước phân vùng các
+tháng tới, tách (DETACH) phân vùng quá hạn lưu trữ và gộp dần sang bảng theo
+giờ/ngày để biểu đồ lịch sử chỉ đọc vài nghìn dòng.
+
+Worker API không ghi từng lần chấm điểm mà gom vào bộ đệm và ghi theo lô.
+"""
+import asyncio
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.schema import FraudDecisionEnum
+from backend.app.fraud.models import RiskHistory
+
+logger = get_logger()
+
+PARENT_TABLE = "risk_history"
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+# Gộp lại toàn bộ giờ trong khoảng [since, until): ghi đè nên chạy lại không sai số liệu
+ROLLUP_HOURLY_SQL = text(
+    """
+    INSERT INTO risk_history_hourly (user_id, bucket, events, score_sum, score_max, flagged)
+    SELECT user_id, date_trunc('hour', scored_at, 'UTC'), count(*), sum(score),
+           max(score), count(*) FILTER (WHERE decision <> 'APPROVE')
+    FROM risk_history
+    WHERE scored_at >= :since AND scored_at < :until
+    GROUP BY 1, 2
+    ON CONFLICT (user_id, bucket) DO UPDATE SET
+        events = excluded.events,
+        score_sum = excluded.score_sum,
+        score_max = excluded.score_max,
+        flagged = excluded.flagged
+    """
+)
+
+# Ngày được gộp từ bảng giờ, chỉ cho các user có giờ vừa gộp lại (seek theo khóa chính)
+ROLLUP_DAILY_SQL = text(
+    """
+    WITH touched AS (
+        SELECT DISTINCT user_id FROM risk_history_hourly
+        WHERE bucket >= :since AND bucket < :until
+    )
+    INSERT INTO risk_history_daily (user_id, bucket, events, score_sum, score_max, flagged)
+    SELECT h.user_id, date_trunc('day', h.bucket, 'UTC'), sum(h.events), sum(h.score_sum),
+           max(h.score_max), sum(h.flagged)
+    FROM risk_history_hourly h JOIN touched USING (user_id)
+    WHERE h.bucket >= :day AND h.bucket < :until
+    GROUP BY 1, 2
+    ON CONFLICT (user_id, bucket) DO UPDATE SET
+        events = excluded.events,
+        score_sum = excluded.score_sum,
+        score_max = excluded.score_max,
+        flagged = excluded.flagged
+    """
+)
+
+
+def month_start(moment: datetime, offset: int = 0) -> datetime:
+    """Đầu tháng (UTC) của moment, dịch thêm offset tháng"""
+    index = moment.year * 12 + moment.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> datetime | None:
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+
+
+def create_partition_sql(month: datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{month_start(month, 1).isoformat()}')"
+    )
+
+
+async def attached_partitions(conn) -> list[str]:
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(CAST(:parent AS text)) "
+            # Phân vùng đang DETACH CONCURRENTLY dở dang vẫn còn trong pg_inherits
+            "AND NOT i.inhdetachpending"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return sorted(row[0] for row in result)
+
+
+async def maintain_partitions(
+    engine, now: datetime, months_ahead: int, retention_months: int, drop_detached: bool
+) -> tuple[list[str], list[str]]:
+    """
+    Tạo phân vùng từ tháng hiện tại tới months_ahead tháng sau, tách các phân vùng
+    kết thúc trước cửa sổ lưu trữ. DETACH CONCURRENTLY không chặn ghi vào bảng cha
+    nhưng không chạy được trong transaction -> dùng kết nối autocommit.
+    """
+    created = []
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        existing = set(await attached_partitions(conn))
+        for offset in range(months_ahead + 1):
+            month = month_start(now, offset)
+            if partition_name(month) not in existing:
+                await conn.execute(text(create_partition_sql(month)))
+                created.append(partition_name(month))
+
+        cutoff = month_start(now, -retention_months)
+        detached = []
+        for name in sorted(existing):
+            month = partition_month(name)
+            if month is None or month_start(month, 1) > cutoff:
+                continue
+            await conn.execute(
+                text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name} CONCURRENTLY")
+            )
+            if drop_detached:
+                await conn.execute(text(f"DROP TABLE {name}"))
+            detached.append(name)
+        if detached:
+            # Số liệu theo giờ giữ cùng thời hạn với dữ liệu gốc, theo ngày giữ lâu dài
+            await conn.execute(
+                text("DELETE FROM risk_history_hourly WHERE bucket < :cutoff"),
+                {"cutoff": cutoff},
+            )
+    return created, detached
+
+
+def _floor_hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+async def rollup(engine, now: datetime, lateness: timedelta) -> tuple[datetime, int]:
+    """
+    Gộp tăng dần: chỉ tính lại từ giờ mới nhất đã gộp (trừ đi độ trễ cho phép của
+    dữ liệu ghi muộn) tới hiện tại, mỗi lần chạy chỉ quét vài giờ dữ liệu gốc.
+    """
+    async with engine.begin() as conn:
+        latest = (
+            await conn.execute(text("SELECT max(bucket) FROM risk_history_hourly"))
+        ).scalar()
+        if latest is None:
+            # Lần đầu: gộp từ phân vùng cũ nhất còn gắn vào bảng cha
+            months = [partition_month(n) for n in await attached_partitions(conn)]
+            months = [m for m in months if m is not None]
+            if not months:
+                return now, 0
+            since = min(months)
+        else:
+            since = _floor_hour(min(latest, now) - lateness)
+        until = _floor_hour(now) + timedelta(hours=1)
+        hourly = await conn.execute(ROLLUP_HOURLY_SQL, {"since": since, "until": until})
+        await conn.execute(
+            ROLLUP_DAILY_SQL,
+            {"since": since, "day": since.replace(hour=0), "until": until},
+        )
+    return since, hourly.rowcount
+
+
+class RiskHistoryRecorder:
+    """
+    Gom các lần chấm điểm trong tiến trình và ghi vào risk_history theo lô
+    (executemany), không thêm một lượt ghi DB vào mỗi request chấm điểm.
+    """
+
+    def __init__(self, flush_seconds: float, max_buffer: int, engine=None):
+        self.flush_seconds = flush_seconds
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._engine = engine
+        self._buffer: list[dict] = []
+        self._task: asyncio.Task | None = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from backend.app.core.db import engine
+
+            self._engine = engine
+        return self._engine
+
+    def record(
+        self,
+        user_id: uuid.UUID,
+        transaction_id: uuid.UUID,
+        score: float,
+        decision: FraudDecisionEnum,
+        model_version: str,
+    ) -> None:
+        if len(self._buffer) >= self.max_buffer:
+            # DB chậm/lỗi kéo dài: bỏ bớt thay vì để bộ nhớ tăng mãi
+            self.dropped += 1
+            return
+        self._buffer.append(
+            {
+                "user_id": user_id,
+                "transaction_id": transaction_id,
+                "scored_at": datetime.now(timezone.utc),
+                "score": score,
+                "decision": decision,
+                "model_version": model_version,
+            }
+        )
+
+    async def flush(self) -> int:
+        rows, self._buffer = self._buffer, []
+        if not rows:
+            return 0
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(insert(RiskHistory), rows)
+        except Exception as e:
+            # Trả lại bộ đệm để lần sau ghi tiếp (giới hạn bởi max_buffer)
+            self._buffer[:0] = rows[: self.max_buffer - len(self._buffer)]
+            logger.warning(f"Failed to write {len(rows)} risk history rows: {e}")
+            return 0
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+risk_history_recorder = RiskHistoryRecorder(
+    flush_seconds=settings.FRAUD_RISK_HISTORY_FLUSH_SECONDS,
+    max_buffer=settings.FRAUD_RISK_HISTORY_MAX_BUFFER,
+)
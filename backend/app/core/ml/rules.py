@@ -0,0 +1,390 @@
+"""
+Luật gian lận cố định chạy cạnh điểm của model. Mỗi luật là một biểu thức Python
+rút gọn trên đặc trưng của giao dịch, ví dụ:
+
+    amount > 5000 and is_new_device and country != profile.country
+
+Biểu thức được kiểm tra theo danh sách node AST cho phép rồi biên dịch một lần thành
+bytecode (lambda trên dict đặc trưng), không duyệt cây luật cho từng giao dịch. File
+luật (YAML) được theo dõi và nạp lại khi thay đổi; file lỗi thì giữ bộ luật cũ.
+"""
+import ast
+import asyncio
+import pathlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from prometheus_client.core import CounterMetricFamily
+from prometheus_client.registry import REGISTRY, Collector
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.entity_graph import ClusterInfo
+from backend.app.core.ml.features import FEATURE_NAMES
+from backend.app.core.ml.profile_cache import PROFILE_FIELDS
+from backend.app.core.ml.schema import FraudDecisionEnum, FraudScoreRequestSchema
+
+logger = get_logger()
+
+# Trường của request có thể vắng mặt: luật dùng tới mà thiếu giá trị thì không khớp
+NULLABLE_FACTS: tuple[str, ...] = ("account_id", "device_id", "recipient_id", "country")
+
+# Cụm trong đồ thị liên kết thực thể: số user và số user bị gắn cờ (1/0 nếu chưa biết)
+CLUSTER_FACTS: tuple[str, ...] = ("cluster_size", "cluster_flagged", "cluster_risk")
+
+# Tên được dùng trong biểu thức luật (ngoài profile.<field>)
+RULE_FACTS: frozenset[str] = frozenset(
+    (*FEATURE_NAMES, *NULLABLE_FACTS, *CLUSTER_FACTS, "transaction_type", "score")
+)
+
+RULE_ACTIONS = (FraudDecisionEnum.REVIEW, FraudDecisionEnum.BLOCK)
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.USub,
+    ast.UAdd,
+    ast.BinOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Mod,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.Name,
+    ast.Attribute,
+    ast.Constant,
+    ast.Tuple,
+    ast.List,
+    ast.Load,
+)
+
+
+class RuleCompileError(ValueError):
+    pass
+
+
+@dataclass(slots=True)
+class RuleCounters:
+    """Số đếm cộng dồn của một luật, giữ nguyên qua các lần nạp lại file"""
+
+    hits: int = 0
+    errors: int = 0
+    nanoseconds: int = 0
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    description: str
+    action: FraudDecisionEnum
+    expression: str
+    predicate: Callable[[dict, dict | None], Any]
+    uses_profile: bool
+    counters: RuleCounters = field(compare=False)
+
+
+class _RuleTransformer(ast.NodeTransformer):
+    """Đổi `name` -> f["name"] và `profile.x` -> p["x"], ghi lại tên đã dùng"""
+
+    def __init__(self):
+        self.facts: set[str] = set()
+        self.profile_fields: set[str] = set()
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id not in RULE_FACTS:
+            raise RuleCompileError(f"Unknown name {node.id!r}")
+        self.facts.add(node.id)
+        return ast.Subscript(
+            value=ast.Name("f", ast.Load()), slice=ast.Constant(node.id), ctx=ast.Load()
+        )
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        if not (isinstance(node.value, ast.Name) and node.value.id == "profile"):
+            raise RuleCompileError("Only profile.<field> attributes are allowed")
+        if node.attr not in PROFILE_FIELDS:
+            raise RuleCompileError(f"Unknown profile field {node.attr!r}")
+        self.profile_fields.add(node.attr)
+        return ast.Subscript(
+            value=ast.Name("p", ast.Load()), slice=ast.Constant(node.attr), ctx=ast.Load()
+        )
+
+
+def compile_rule(definition: dict, counters: RuleCounters | None = None) -> Rule:
+    """Kiểm tra và biên dịch một định nghĩa luật {id, when, action, description}"""
+    rule_id = definition.get("id")
+    expression = definition.get("when")
+    if not rule_id or not isinstance(expression, str):
+        raise RuleCompileError(f"Rule {definition!r} needs an id and a when expression")
+    try:
+        action = FraudDecisionEnum(definition.get("action", FraudDecisionEnum.REVIEW))
+    except ValueError:
+        raise RuleCompileError(f"Rule {rule_id}: unknown action {definition.get('action')!r}")
+    if action not in RULE_ACTIONS:
+        raise RuleCompileError(f"Rule {rule_id}: action must be review or block")
+
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise RuleCompileError(f"Rule {rule_id}: {e.msg}")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise RuleCompileError(f"Rule {rule_id}: {type(node).__name__} is not allowed")
+        if isinstance(node, ast.Constant) and not isinstance(
+            node.value, (str, int, float, bool, type(None))
+        ):
+            raise RuleCompileError(f"Rule {rule_id}: unsupported constant {node.value!r}")
+
+    transformer = _RuleTransformer()
+    try:
+        body = transformer.visit(tree.body)
+    except RuleCompileError as e:
+        raise RuleCompileError(f"Rule {rule_id}: {e}")
+
+    # Chặn trước giá trị thiếu để biểu thức không phải tự xử lý None
+    guards: list[ast.expr] = [
+        ast.Compare(
+            left=ast.Subscript(
+                value=ast.Name("f", ast.Load()), slice=ast.Constant(name), ctx=ast.Load()
+            ),
+            ops=[ast.IsNot()],
+            comparators=[ast.Constant(None)],
+        )
+        for name in sorted(transformer.facts & set(NULLABLE_FACTS))
+    ]
+    if transformer.profile_fields:
+        guards.insert(
+            0,
+            ast.Compare(
+                left=ast.Name("p", ast.Load()),
+                ops=[ast.IsNot()],
+                comparators=[ast.Constant(None)],
+            ),
+        )
+    if guards:
+        body = ast.BoolOp(op=ast.And(), values=[*guards, body])
+
+    arguments = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg("f"), ast.arg("p")],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    lambda_tree = ast.fix_missing_locations(
+        ast.Expression(body=ast.Lambda(args=arguments, body=body))
+    )
+    code = compile(lambda_tree, filename=f"<rule {rule_id}>", mode="eval")
+    predicate = eval(code, {"__builtins__": {}})
+    return Rule(
+        id=rule_id,
+        description=definition.get("description", ""),
+        action=action,
+        expression=expression,
+        predicate=predicate,
+        uses_profile=bool(transformer.profile_fields),
+        counters=counters or RuleCounters(),
+    )
+
+
+def build_facts(
+    request: FraudScoreRequestSchema,
+    features: list[float],
+    score: float,
+    cluster: ClusterInfo | None = None,
+) -> dict[str, Any]:
+    """Dict đặc trưng mà luật đọc: vector đặc trưng của model, điểm và trường thô"""
+    facts = dict(zip(FEATURE_NAMES, features))
+    facts["score"] = score
+    facts["transaction_type"] = request.transaction_type.value
+    for name in NULLABLE_FACTS:
+        facts[name] = getattr(request, name)
+    facts["cluster_size"] = cluster.size if cluster else 1
+    facts["cluster_flagged"] = cluster.flagged if cluster else 0
+    facts["cluster_risk"] = cluster.risk if cluster else 0.0
+    return facts
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    version: str
+    rules: tuple[Rule, ...]
+
+    @property
+    def uses_profile(self) -> bool:
+        return any(rule.uses_profile for rule in self.rules)
+
+
+class RulesEngine:
+    """
+    Giữ bộ luật đang áp dụng cho cả tiến trình, kiểm tra file luật định kỳ và hoán
+    đổi nguyên tử khi biên dịch xong. Số lần khớp và thời gian đánh giá được cộng dồn
+    theo từng luật.
+    """
+
+    def __init__(self, path: str, poll_seconds: float):
+        self.path = pathlib.Path(path)
+        self.poll_seconds = poll_seconds
+        self.ruleset = RuleSet(version="empty", rules=())
+        self.evaluations = 0
+        self._counters: dict[str, RuleCounters] = {}
+        self._fingerprint: str | None = None
+        self._load_lock = threading.Lock()
+        self._poll_task: asyncio.Task | None = None
+
+    def _read_fingerprint(self) -> str | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def parse(self, text: str, version: str) -> RuleSet:
+        import yaml
+
+        document = yaml.safe_load(text) or {}
+        rules: list[Rule] = []
+        for definition in document.get("rules") or []:
+            if not definition.get("enabled", True):
+                continue
+            rule_id = definition.get("id")
+            if any(rule.id == rule_id for rule in rules):
+                raise RuleCompileError(f"Duplicate rule id {rule_id!r}")
+            counters = self._counters.get(rule_id) or RuleCounters()
+            rules.append(compile_rule(definition, counters))
+        return RuleSet(version=str(document.get("version", version)), rules=tuple(rules))
+
+    def load(self, force: bool = False) -> RuleSet:
+        """Biên dịch lại nếu file luật đã thay đổi; lỗi thì ném ra, bộ luật cũ giữ nguyên"""
+        with self._load_lock:
+            fingerprint = self._read_fingerprint()
+            if fingerprint is None:
+                if self._fingerprint is None:
+                    logger.warning(f"No fraud rules file at {self.path}")
+                return self.ruleset
+            if not force and fingerprint == self._fingerprint:
+                return self.ruleset
+            ruleset = self.parse(self.path.read_text(), fingerprint)
+            for rule in ruleset.rules:
+                self._counters[rule.id] = rule.counters
+            self.ruleset = ruleset
+            self._fingerprint = fingerprint
+            logger.info(f"Loaded {len(ruleset.rules)} fraud rules ({ruleset.version})")
+            return ruleset
+
+    def evaluate(self, facts: dict[str, Any], profile: dict | None) -> list[Rule]:
+        """Các luật khớp với giao dịch; luật lỗi khi chạy được tính là không khớp"""
+        hits = []
+        clock = time.perf_counter_ns
+        for rule in self.ruleset.rules:
+            counters = rule.counters
+            started = clock()
+            try:
+                matched = rule.predicate(facts, profile)
+            except Exception:
+                matched = False
+                counters.errors += 1
+            counters.nanoseconds += clock() - started
+            if matched:
+                counters.hits += 1
+                hits.append(rule)
+        self.evaluations += 1
+        return hits
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await asyncio.to_thread(self.load)
+            except Exception as e:
+                logger.error(f"Failed to reload fraud rules, keeping previous set: {e}")
+
+    def start(self) -> None:
+        if self.poll_seconds > 0 and (self._poll_task is None or self._poll_task.done()):
+            self._poll_task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+
+    def info(self) -> dict[str, Any]:
+        evaluations = self.evaluations
+        return {
+            "version": self.ruleset.version,
+            "path": str(self.path),
+            "evaluations": evaluations,
+            "rules": [
+                {
+                    "id": rule.id,
+                    "description": rule.description,
+                    "action": rule.action,
+                    "when": rule.expression,
+                    "hits": rule.counters.hits,
+                    "errors": rule.counters.errors,
+                    "avg_microseconds": round(
+                        rule.counters.nanoseconds / evaluations / 1000, 3
+                    )
+                    if evaluations
+                    else 0.0,
+                }
+                for rule in self.ruleset.rules
+            ],
+        }
+
+
+class RulesCollector(Collector):
+    """Xuất số lần khớp, lỗi và tổng thời gian đánh giá của từng luật"""
+
+    def __init__(self, engine: RulesEngine):
+        self.engine = engine
+
+    def collect(self) -> Iterator:
+        hits = CounterMetricFamily(
+            "fraud_rule_hits", "Số giao dịch khớp luật", labels=["rule"]
+        )
+        errors = CounterMetricFamily(
+            "fraud_rule_errors", "Số lần luật lỗi khi đánh giá", labels=["rule"]
+        )
+        seconds = CounterMetricFamily(
+            "fraud_rule_evaluation_seconds",
+            "Tổng thời gian đánh giá luật",
+            labels=["rule"],
+        )
+        for rule_id, counters in list(self.engine._counters.items()):
+            hits.add_metric([rule_id], counters.hits)
+            errors.add_metric([rule_id], counters.errors)
+            seconds.add_metric([rule_id], counters.nanoseconds / 1e9)
+        yield hits
+        yield errors
+        yield seconds
+        yield CounterMetricFamily(
+            "fraud_rule_evaluations",
+            "Số giao dịch đã chạy qua bộ luật",
+            value=self.engine.evaluations,
+        )
+
+
+fraud_rules = RulesEngine(
+    path=settings.FRAUD_RULES_PATH, poll_seconds=settings.FRAUD_RULES_POLL_SECONDS
+)
+
+REGISTRY.register(RulesCollector(fraud_rules))
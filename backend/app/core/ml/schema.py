@@ -0,0 +1,62 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from sqlmodel import Field, SQLModel
+
+
+# Loại giao dịch được chấm điểm gian lận
+class TransactionTypeEnum(str, Enum):
+    DEPOSIT = "deposit"
+    WITHDRAWAL = "withdrawal"
+    TRANSFER = "transfer"
+    CARD_PAYMENT = "card_payment"
+
+
+# Mức độ rủi ro suy ra từ điểm gian lận
+class RiskLevelEnum(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+
+# Quyết định xử lý giao dịch
+class FraudDecisionEnum(str, Enum):
+    APPROVE = "approve"
+    REVIEW = "review"
+    BLOCK = "block"
+
+
+# Dữ liệu giao dịch gửi lên để chấm điểm
+class FraudScoreRequestSchema(SQLModel):
+    transaction_id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    # Chủ tài khoản, dùng để đọc hồ sơ (quốc gia, thu nhập) cho luật gian lận
+    user_id: uuid.UUID | None = None
+    account_id: str | None = None
+    device_id: str | None = None
+    amount: float = Field(gt=0)
+    transaction_type: TransactionTypeEnum
+    occurred_at: datetime | None = None
+    recipient_id: str | None = None
+    # Quốc gia phát sinh giao dịch (IP / đơn vị chấp nhận thẻ)
+    country: str | None = None
+    is_international: bool = False
+    is_new_device: bool = False
+    account_age_days: int = Field(default=0, ge=0)
+    # Đặc trưng vận tốc; để trống nếu chưa tính sẵn
+    txn_count_1h: int = Field(default=0, ge=0)
+    txn_count_24h: int = Field(default=0, ge=0)
+    amount_sum_24h: float = Field(default=0.0, ge=0)
+    distinct_recipients_24h: int = Field(default=0, ge=0)
+    avg_amount_30d: float = Field(default=0.0, ge=0)
+
+
+# Kết quả chấm điểm
+class FraudScoreResponseSchema(SQLModel):
+    transaction_id: uuid.UUID
+    score: float
+    risk_level: RiskLevelEnum
+    decision: FraudDecisionEnum
+    model_version: str
+    # Id các luật cố định khớp với giao dịch
+    rule_hits: list[str] = Field(default_factory=list)
@@ -0,0 +1,200 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.app.core.config import settings
+from backend.app.core.lazy_import import lazy_import
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.batcher import MicroBatcher
+from backend.app.core.ml.drift import DriftAccumulator, drift_accumulator
+from backend.app.core.ml.entity_graph import EntityGraphService, entity_graph
+from backend.app.core.ml.feature_store import VelocityFeatureStore, velocity_store
+from backend.app.core.ml.features import build_feature_row
+from backend.app.core.ml.model_manager import ModelManager, fraud_model_manager
+from backend.app.core.ml.profile_cache import ProfileCache, profile_cache
+from backend.app.core.ml.risk_history import RiskHistoryRecorder, risk_history_recorder
+from backend.app.core.ml.rules import RulesEngine, build_facts, fraud_rules
+from backend.app.core.ml.shadow import ShadowScorer, shadow_scorer
+from backend.app.core.ml.schema import (
+    FraudDecisionEnum,
+    FraudScoreRequestSchema,
+    FraudScoreResponseSchema,
+    RiskLevelEnum,
+)
+
+np = lazy_import("numpy")
+
+logger = get_logger()
+
+
+class ModelNotLoadedError(RuntimeError):
+    pass
+
+
+# Thứ tự tăng dần theo điểm, dùng chung cho classify_scores
+RISK_LEVELS = (RiskLevelEnum.LOW, RiskLevelEnum.MEDIUM, RiskLevelEnum.HIGH)
+FRAUD_DECISIONS = (
+    FraudDecisionEnum.APPROVE,
+    FraudDecisionEnum.REVIEW,
+    FraudDecisionEnum.BLOCK,
+)
+
+
+def classify_score(score: float) -> tuple[RiskLevelEnum, FraudDecisionEnum]:
+    """Suy ra mức rủi ro và quyết định từ điểm gian lận"""
+    if score >= settings.FRAUD_BLOCK_THRESHOLD:
+        return RiskLevelEnum.HIGH, FraudDecisionEnum.BLOCK
+    if score >= settings.FRAUD_REVIEW_THRESHOLD:
+        return RiskLevelEnum.MEDIUM, FraudDecisionEnum.REVIEW
+    return RiskLevelEnum.LOW, FraudDecisionEnum.APPROVE
+
+
+def classify_scores(scores: "np.ndarray") -> "np.ndarray":
+    """
+    Phiên bản vector hóa của classify_score: trả về chỉ số 0/1/2 trong
+    RISK_LEVELS và FRAUD_DECISIONS cho cả lô điểm
+    """
+    return (scores >= settings.FRAUD_REVIEW_THRESHOLD).astype(np.int8) + (
+        scores >= settings.FRAUD_BLOCK_THRESHOLD
+    )
+
+
+class FraudScorer:
+    """
+    Chấm điểm gian lận theo micro-batch: các request đồng thời được gom lại và
+    `predict_proba` chỉ được gọi một lần cho cả lô trong một thread riêng,
+    event loop không bị chặn bởi tính toán của model.
+    """
+
+    def __init__(
+        self,
+        manager: ModelManager,
+        max_batch_size: int,
+        max_wait_seconds: float,
+        feature_store: VelocityFeatureStore | None = None,
+        shadow: ShadowScorer | None = None,
+        drift: DriftAccumulator | None = None,
+        rules: RulesEngine | None = None,
+        profiles: ProfileCache | None = None,
+        graph: EntityGraphService | None = None,
+        history: RiskHistoryRecorder | None = None,
+    ):
+        self.manager = manager
+        self.feature_store = feature_store
+        self.shadow = shadow
+        self.drift = drift
+        self.rules = rules
+        self.profiles = profiles
+        self.graph = graph
+        self.history = history
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="fraud-scoring"
+        )
+        self._batcher: MicroBatcher[list[float], tuple[float, str]] = MicroBatcher(
+            "fraud_scoring",
+            self._predict,
+            self._executor,
+            max_batch_size=max_batch_size,
+            max_wait_seconds=max_wait_seconds,
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self.manager.current is not None
+
+    def _predict(self, rows: list[list[float]]) -> list[tuple[float, str]]:
+        # Lấy model một lần cho cả lô: hoán đổi model giữa chừng không ảnh hưởng lô này
+        current = self.manager.current
+        if current is None:
+            raise ModelNotLoadedError("Fraud model is not loaded")
+        features = np.asarray(rows, dtype=np.float64)
+        probabilities = current.model.predict_proba(features)[:, 1]
+        if self.drift is not None:
+            # Chỉ cộng số đếm theo bin cho cả lô, vài micro giây
+            self.drift.observe(features, probabilities)
+        return [(float(p), current.version) for p in probabilities]
+
+    async def score(
+        self, request: FraudScoreRequestSchema, record: bool = False
+    ) -> FraudScoreResponseSchema:
+        """
+        record=True chỉ dành cho giao dịch do hệ thống ghi sổ (id người dùng, tài khoản
+        đã lấy từ database): khi đó mới ghi trạng thái theo các id trong request
+        """
+        if not self.ready:
+            raise ModelNotLoadedError("Fraud model is not loaded")
+        if self.feature_store is not None:
+            request = await self.feature_store.enrich(request, record)
+        features = build_feature_row(request)
+        # Đọc hồ sơ từ cache song song với lúc chờ model, không cộng thêm độ trễ
+        (score, version), profile = await asyncio.gather(
+            self._batcher.submit(features), self._profile(request)
+        )
+        if self.shadow is not None:
+            # Chỉ đưa vào hàng đợi, challenger được chấm sau khi request đã trả về
+            self.shadow.submit(request.transaction_id, features, score, version)
+        risk_level, decision = classify_score(score)
+        cluster = None
+        if self.graph is not None and request.user_id is not None:
+            cluster = self.graph.cluster(request.user_id)
+            # Liên kết thiết bị chỉ từ giao dịch của sổ cái, id do người gọi gửi lên có
+            # thể gắn thiết bị của kẻ gian vào cụm của nạn nhân
+            if record and request.device_id:
+                self.graph.observe_device(request.user_id, request.device_id)
+        rule_hits = []
+        if self.rules is not None:
+            facts = build_facts(request, features, score, cluster)
+            rule_hits = self.rules.evaluate(facts, profile)
+            for rule in rule_hits:
+                # Luật chỉ nâng mức quyết định của model, không hạ
+                if FRAUD_DECISIONS.index(rule.action) > FRAUD_DECISIONS.index(decision):
+                    decision = rule.action
+            # Mức rủi ro đi cùng quyết định cuối, không giữ mức của riêng model
+            risk_level = RISK_LEVELS[FRAUD_DECISIONS.index(decision)]
+        if (
+            record
+            and self.graph is not None
+            and request.user_id is not None
+            and decision == FraudDecisionEnum.BLOCK
+        ):
+            # Cụm chứa user bị chặn trở nên rủi ro hơn với mọi thành viên khác
+            self.graph.flag(request.user_id)
+        if record and self.history is not None and request.user_id is not None:
+            self.history.record(
+                request.user_id, request.transaction_id, score, decision, version
+            )
+        return FraudScoreResponseSchema(
+            transaction_id=request.transaction_id,
+            score=score,
+            risk_level=risk_level,
+            decision=decision,
+            model_version=version,
+            rule_hits=[rule.id for rule in rule_hits],
+        )
+
+    async def _profile(self, request: FraudScoreRequestSchema) -> dict | None:
+        if (
+            self.rules is None
+            or self.profiles is None
+            or request.user_id is None
+            or not self.rules.ruleset.uses_profile
+        ):
+            return None
+        return await self.profiles.get(request.user_id)
+
+    async def close(self) -> None:
+        await self._batcher.drain()
+        self._executor.shutdown(wait=False)
+
+
+fraud_scorer = FraudScorer(
+    manager=fraud_model_manager,
+    max_batch_size=settings.FRAUD_SCORING_MAX_BATCH_SIZE,
+    max_wait_seconds=settings.FRAUD_SCORING_MAX_WAIT_SECONDS,
+    feature_store=velocity_store,
+    shadow=shadow_scorer if settings.FRAUD_SHADOW_ENABLED else None,
+    drift=drift_accumulator if settings.FRAUD_DRIFT_ENABLED else None,
+    rules=fraud_rules if settings.FRAUD_RULES_ENABLED else None,
+    profiles=profile_cache,
+    graph=entity_graph if settings.FRAUD_GRAPH_ENABLED else None,
+    history=risk_history_recorder if settings.FRAUD_RISK_HISTORY_ENABLED else None,
+)
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import pathlib
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Any
+
+from prometheus_client import Counter, Histogram
+
+from backend.app.core.config import settings
+from backend.app.core.lazy_import import lazy_import
+from backend.app.core.logging import get_logger
+from backend.app.core.ml.model_manager import ModelManager, challenger_model_manager
+
+np = lazy_import("numpy")
+
+logger = get_logger()
+
+SHADOW_SCORED = Counter("fraud_shadow_scored_total", "Số giao dịch đã chấm shadow")
+SHADOW_DROPPED = Counter(
+    "fraud_shadow_dropped_total",
+    "Số giao dịch bỏ qua chấm shadow (hàng đợi đầy, chưa có model hoặc lỗi)",
+)
+SHADOW_SCORE_DIFF = Histogram(
+    "fraud_shadow_score_diff",
+    "Chênh lệch tuyệt đối giữa điểm champion và challenger",
+    buckets=(0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0),
+)
+
+
+# Model challenger của tiến trình con, nạp khi tiến trình khởi động
+_challenger: ModelManager | None = None
+_checked_at = 0.0
+
+
+def _init_challenger(source, poll_seconds: float) -> None:
+    global _challenger, _checked_at
+    # Tiến trình shadow nhường CPU cho tiến trình API
+    try:
+        os.setpriority(os.PRIO_PROCESS, 0, 19)
+    except (AttributeError, OSError):
+        pass
+    _challenger = ModelManager(source, poll_seconds=poll_seconds, role="challenger")
+    _checked_at = time.monotonic()
+    try:
+        _challenger.load()
+    except Exception as e:
+        # Lỗi ở initializer làm hỏng cả pool: ghi log, lần kiểm tra sau nạp lại
+        logger.error(f"Failed to load challenger fraud model: {e}")
+
+
+def _predict_challenger(rows: list[list[float]]) -> tuple[list[float], str] | None:
+    global _checked_at
+    # Không có event loop trong tiến trình con: kiểm tra phiên bản mới khi chấm lô
+    if (
+        _challenger.poll_seconds > 0
+        and time.monotonic() - _checked_at >= _challenger.poll_seconds
+    ):
+        _checked_at = time.monotonic()
+        try:
+            _challenger.load()
+        except Exception as e:
+            logger.error(f"Failed to refresh challenger fraud model: {e}")
+    current = _challenger.current
+    if current is None:
+        return None
+    scores = current.model.predict_proba(np.asarray(rows, dtype=np.float64))[:, 1]
+    return scores.tolist(), current.version
+
+
+def _refresh_challenger(force: bool) -> dict[str, Any]:
+    _challenger.load(force)
+    return _challenger.info()
+
+
+def _challenger_info() -> dict[str, Any]:
+    return _challenger.info()
+
+
+class ShadowScorer:
+    """
+    Chấm điểm model challenger trên lưu lượng thật mà không nằm trên đường đi của
+    request: `submit` chỉ đưa đặc trưng vào hàng đợi giới hạn (đầy thì bỏ), một task
+    nền gom lô, chấm trong tiến trình con riêng có độ ưu tiên thấp (không tranh GIL
+    với request) và ghi cặp điểm champion/challenger ra file JSON lines theo từng đợt.
+    Model challenger chỉ nạp trong tiến trình con; `manager` cho biết nguồn model và
+    chu kỳ kiểm tra phiên bản mới.
+    """
+
+    def __init__(
+        self,
+        manager: ModelManager,
+        queue_size: int,
+        max_batch_size: int,
+        log_dir: str,
+        flush_seconds: float,
+    ):
+        self.manager = manager
+        self.queue_size = queue_size
+        self.max_batch_size = max_batch_size
+        self.log_dir = pathlib.Path(log_dir)
+        self.flush_seconds = flush_seconds
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._executor: ProcessPoolExecutor | None = None
+        self._lines: list[str] = []
+
+    def submit(
+        self,
+        transaction_id: uuid.UUID,
+        features: list[float],
+        champion_score: float,
+        champion_version: str,
+    ) -> None:
+        """Không chờ, không ném lỗi: request thật không bao giờ bị chậm vì shadow"""
+        if self._queue is None:
+            return
+        try:
+            self._queue.put_nowait(
+                (transaction_id, features, champion_score, champion_version)
+            )
+        except asyncio.QueueFull:
+            SHADOW_DROPPED.inc()
+
+    def _start_executor(self) -> None:
+        # spawn: không fork tiến trình đang có event loop và kết nối database
+        self._executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_challenger,
+            initargs=(self.manager.source, self.manager.poll_seconds),
+        )
+
+    async def _call(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        except BrokenProcessPool:
+            # Tiến trình con chết (OOM...): tạo lại pool cho lần sau
+            logger.error("Shadow scoring process died, restarting it")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._start_executor()
+            raise
+
+    async def info(self) -> dict[str, Any]:
+        """Thông tin model challenger đang nạp trong tiến trình shadow"""
+        if self._executor is None:
+            return self.manager.info()
+        return await self._call(_challenger_info)
+
+    async def refresh(self, force: bool = False) -> dict[str, Any]:
+        if self._executor is None:
+            return self.manager.info()
+        return await self._call(_refresh_challenger, force)
+
+    def _log_path(self) -> pathlib.Path:
+        # Mỗi worker một file để các lần ghi không xen lẫn nhau
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        return self.log_dir / f"shadow-{day}-{os.getpid()}.jsonl"
+
+    def _append(self, lines: list[str]) -> None:
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._log_path(), "a") as f:
+            f.write("".join(lines))
+
+    async def _flush(self) -> None:
+        if not self._lines:
+            return
+        lines, self._lines = self._lines, []
+        try:
+            await asyncio.to_thread(self._append, lines)
+        except OSError as e:
+            logger.error(f"Failed to write {len(lines)} shadow scores: {e}")
+
+    async def _score(self, batch: list[tuple]) -> None:
+        try:
+            result = await self._call(_predict_challenger, [item[1] for item in batch])
+        except Exception as e:
+            logger.error(f"Challenger model failed on {len(batch)} transactions: {e}")
+            result = None
+        if result is None:
+            SHADOW_DROPPED.inc(len(batch))
+            return
+
+        scores, version = result
+        logged_at = datetime.now(timezone.utc).isoformat()
+        for (transaction_id, features, champion_score, champion_version), score in zip(
+            batch, scores
+        ):
+            SHADOW_SCORE_DIFF.observe(abs(score - champion_score))
+            self._lines.append(
+                json.dumps(
+                    {
+                        "transaction_id": str(transaction_id),
+                        "logged_at": logged_at,
+                        "champion_version": champion_version,
+                        "champion_score": champion_score,
+                        "challenger_version": version,
+                        "challenger_score": score,
+                        "features": features,
+                    }
+                )
+                + "\n"
+            )
+        SHADOW_SCORED.inc(len(batch))
+
+    async def _run(self) -> None:
+        try:
+            # Khởi động tiến trình con và nạp model trước giao dịch đầu tiên
+            await self._call(_challenger_info)
+        except Exception as e:
+            logger.error(f"Failed to start shadow scoring process: {e}")
+        last_flush = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        self._queue.get(), timeout=self.flush_seconds
+                    )
+                except asyncio.TimeoutError:
+                    item = None
+                if item is not None:
+                    batch = [item]
+                    while len(batch) < self.max_batch_size and not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                    await self._score(batch)
+                if time.monotonic() - last_flush >= self.flush_seconds:
+                    await self._flush()
+                    last_flush = time.monotonic()
+        finally:
+            # Ghi nốt phần đã chấm khi tắt
+            if self._lines:
+                self._append(self._lines)
+                self._lines = []
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._start_executor()
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        queue, self._queue = self._queue, None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if queue is not None and queue.qsize():
+            SHADOW_DROPPED.inc(queue.qsize())
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+shadow_scorer = ShadowScorer(
+    manager=challenger_model_manager,
+    queue_size=settings.FRAUD_SHADOW_QUEUE_SIZE,
+    max_batch_size=settings.FRAUD_SHADOW_MAX_BATCH_SIZE,
+    log_dir=settings.FRAUD_SHADOW_LOG_DIR,
+    flush_seconds=settings.FRAUD_SHADOW_FLUSH_SECONDS,
+)
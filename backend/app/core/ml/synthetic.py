@@ -0,0 +1,141 @@
+"""
+Sinh dữ liệu giao dịch giả lập và huấn luyện model gian lận mẫu cho môi trường
+local và benchmark (chưa có dữ liệu thật trong repo).
+
+Chạy: python -m backend.app.core.ml.synthetic [--rows 50000] [--output path]
+"""
+import argparse
+import pathlib
+
+from backend.app.core.config import settings
+from backend.app.core.lazy_import import lazy_import
+from backend.app.core.ml.features import FEATURE_NAMES
+
+np = lazy_import("numpy")
+
+SYNTHETIC_MODEL_VERSION = "synthetic-1"
+
+
+def generate_transactions(
+    rows: int, fraud_rate: float = 0.02, seed: int = 42
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """Trả về (X, y) với các cột theo FEATURE_NAMES"""
+    rng = np.random.default_rng(seed)
+    y = (rng.random(rows) < fraud_rate).astype(np.int64)
+    fraud = y == 1
+
+    amount = rng.lognormal(mean=4.0, sigma=1.0, size=rows)
+    amount[fraud] *= rng.uniform(3, 15, size=fraud.sum())
+    hour = rng.integers(0, 24, size=rows).astype(np.float64)
+    hour[fraud] = rng.choice([0, 1, 2, 3, 4, 23], size=fraud.sum())
+    day = rng.integers(0, 7, size=rows).astype(np.float64)
+    international = (rng.random(rows) < np.where(fraud, 0.45, 0.05)).astype(np.float64)
+    new_device = (rng.random(rows) < np.where(fraud, 0.6, 0.08)).astype(np.float64)
+    txn_type = rng.choice(4, size=rows, p=[0.2, 0.25, 0.35, 0.2])
+    txn_type[fraud] = rng.choice([1, 2], size=fraud.sum())
+    age = rng.integers(1, 3650, size=rows).astype(np.float64)
+    age[fraud] = rng.integers(0, 60, size=fraud.sum())
+    count_1h = rng.poisson(np.where(fraud, 5, 0.5)).astype(np.float64)
+    count_24h = count_1h + rng.poisson(np.where(fraud, 12, 3)).astype(np.float64)
+    avg_30d = rng.lognormal(mean=4.0, sigma=0.6, size=rows)
+    sum_24h = count_24h * amount * rng.uniform(0.3, 1.0, size=rows)
+    recipients = np.minimum(count_24h, rng.poisson(np.where(fraud, 6, 1)))
+
+    X = np.column_stack(
+        [
+            amount,
+            np.log1p(amount),
+            hour,
+            day,
+            international,
+            new_device,
+            (txn_type == 2).astype(np.float64),
+            (txn_type == 1).astype(np.float64),
+            age,
+            count_1h,
+            count_24h,
+            sum_24h,
+            recipients.astype(np.float64),
+            amount / avg_30d,
+        ]
+    )
+    assert X.shape[1] == len(FEATURE_NAMES)
+    return X, y
+
+
+def train_model(rows: int = 50_000, seed: int = 42, n_estimators: int = 100):
+    """Huấn luyện RandomForest trên dữ liệu giả lập"""
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y = generate_transactions(rows, seed=seed)
+    model = RandomForestClassifier(
+        n_estimators=n_estimators,
+        max_depth=10,
+        class_weight="balanced",
+        n_jobs=-1,
+        random_state=seed,
+    )
+    model.fit(X, y)
+    return model
+
+
+def save_artifact(model, path: pathlib.Path, version: str) -> None:
+    """Lưu model kèm phiên bản và danh sách đặc trưng để kiểm tra khi nạp"""
+    import joblib
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    joblib.dump(
+        {"model": model, "version": version, "feature_names": FEATURE_NAMES}, tmp_path
+    )
+    # Đổi tên nguyên tử để model manager không nạp phải file ghi dở
+    tmp_path.replace(path)
+
+
+def register_mlflow_model(model, tracking_uri: str, name: str, alias: str) -> str:
+    """Log model vào MLflow registry (store local dạng file được) và gắn alias"""
+    import mlflow
+    import mlflow.sklearn
+    from mlflow.tracking import MlflowClient
+
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_registry_uri(tracking_uri)
+    with mlflow.start_run(run_name="synthetic-fraud-model"):
+        info = mlflow.sklearn.log_model(model, "model", registered_model_name=name)
+    version = str(info.registered_model_version)
+    client = MlflowClient(tracking_uri=tracking_uri, registry_uri=tracking_uri)
+    client.set_registered_model_alias(name, alias, version)
+    return version
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=settings.FRAUD_MODEL_PATH)
+    parser.add_argument(
+        "--mlflow",
+        action="store_true",
+        help="Đăng ký vào MLflow registry thay vì ghi file joblib",
+    )
+    args = parser.parse_args()
+
+    model = train_model(args.rows, args.seed)
+    if args.mlflow:
+        version = register_mlflow_model(
+            model,
+            settings.MLFLOW_TRACKING_URI,
+            settings.FRAUD_MODEL_NAME,
+            settings.FRAUD_MODEL_ALIAS,
+        )
+        print(
+            f"Registered {settings.FRAUD_MODEL_NAME} v{version} "
+            f"as @{settings.FRAUD_MODEL_ALIAS} in {settings.MLFLOW_TRACKING_URI}"
+        )
+        return
+    save_artifact(model, pathlib.Path(args.output), SYNTHETIC_MODEL_VERSION)
+    print(f"Saved synthetic fraud model to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
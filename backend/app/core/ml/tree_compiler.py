@@ -0,0 +1,225 @@
+"""
+Biên dịch model cây (RandomForest, ExtraTrees, DecisionTree, GradientBoosting nhị phân)
+đã huấn luyện thành các mảng NumPy phẳng và bộ đánh giá vector hóa, không cần
+scikit-learn khi suy luận. Kết quả `predict_proba` trùng từng bit với scikit-learn
+(forest so với n_jobs=1, thứ tự cộng dồn theo từng cây).
+
+Chạy: python -m backend.app.core.ml.tree_compiler --input model.joblib --output compiled.joblib
+"""
+import argparse
+import pathlib
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+from backend.app.core.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+# Cách gộp kết quả của các cây
+FOREST = "forest"
+GRADIENT_BOOSTING = "gradient_boosting"
+SINGLE_TREE = "tree"
+
+
+@dataclass
+class CompiledTreeEnsemble:
+    """
+    Toàn bộ node của mọi cây nằm trong các mảng nối liền nhau. Node lá trỏ cả hai
+    nhánh về chính nó nên mọi mẫu đi đúng `max_depth` bước cùng lúc, không cần rẽ
+    nhánh theo từng mẫu. Chỉ gồm mảng NumPy và số -> nạp được bằng joblib mmap_mode="r".
+    """
+
+    kind: str
+    classes_: Any
+    n_features_in_: int
+    feature: Any  # intp (n_nodes,), node lá dùng 0
+    threshold: Any  # float64 (n_nodes,)
+    # intp (2 * n_nodes,): children[2*i] là nhánh trái, children[2*i + 1] là nhánh phải
+    children: Any
+    missing_go_to_left: Any  # bool (n_nodes,)
+    value: Any  # float64 (n_nodes, n_classes), (n_nodes, 1) với boosting
+    roots: Any  # intp (n_trees,)
+    max_depth: int
+    learning_rate: float = 1.0
+    baseline: float = 0.0
+
+    def apply(self, X) -> "np.ndarray":
+        """Chỉ số node lá của từng mẫu trên từng cây, shape (n_trees, n_samples)"""
+        # scikit-learn ép X về float32 rồi so sánh với threshold float64
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has shape {X.shape}, expected (n_samples, {self.n_features_in_})"
+            )
+        flat = X.ravel()
+        row_offsets = np.arange(X.shape[0], dtype=np.intp) * X.shape[1]
+        has_nan = bool(np.isnan(flat).any())
+        node = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            x = np.take(flat, row_offsets + np.take(self.feature, node))
+            # NaN <= threshold luôn False -> mặc định đi nhánh phải
+            go_right = ~(x <= np.take(self.threshold, node))
+            if has_nan:
+                go_right &= ~(np.isnan(x) & np.take(self.missing_go_to_left, node))
+            node = np.take(self.children, 2 * node + go_right)
+        return node
+
+    def predict_proba(self, X) -> "np.ndarray":
+        values = np.take(self.value, self.apply(X), axis=0)  # (n_trees, n_samples, n_out)
+        if self.kind == SINGLE_TREE:
+            return values[0]
+        if self.kind == FOREST:
+            # cumsum cộng tuần tự theo thứ tự cây, giống vòng lặp `out += proba` của sklearn
+            proba = np.cumsum(values, axis=0)[-1]
+            proba /= self.roots.shape[0]
+            return proba
+        # Gradient boosting nhị phân: raw = baseline + lr*v_1 + lr*v_2 + ...
+        steps = np.empty((values.shape[0] + 1, values.shape[1]), dtype=np.float64)
+        steps[0] = self.baseline
+        np.multiply(self.learning_rate, values[:, :, 0], out=steps[1:])
+        raw = np.cumsum(steps, axis=0)[-1]
+        from scipy.special import expit
+
+        proba = np.empty((raw.shape[0], 2), dtype=np.float64)
+        proba[:, 1] = expit(raw)
+        proba[:, 0] = 1 - proba[:, 1]
+        return proba
+
+    def predict(self, X) -> "np.ndarray":
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def _flatten_trees(trees: list, value_of) -> dict[str, Any]:
+    features, thresholds, children, missing, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for tree in trees:
+        node_ids = np.arange(offset, offset + tree.node_count, dtype=np.intp)
+        is_leaf = tree.children_left == -1
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        left = np.where(is_leaf, node_ids, tree.children_left + offset)
+        right = np.where(is_leaf, node_ids, tree.children_right + offset)
+        children.append(np.stack([left, right], axis=1).ravel())
+        missing.append(np.asarray(tree.missing_go_to_left, dtype=bool))
+        values.append(value_of(tree))
+        roots.append(offset)
+        max_depth = max(max_depth, tree.max_depth)
+        offset += tree.node_count
+    return {
+        "feature": np.concatenate(features).astype(np.intp),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "children": np.concatenate(children).astype(np.intp),
+        "missing_go_to_left": np.concatenate(missing),
+        "value": np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+        "roots": np.asarray(roots, dtype=np.intp),
+        "max_depth": int(max_depth),
+    }
+
+
+def compile_model(model) -> CompiledTreeEnsemble:
+    """Biên dịch model scikit-learn đã huấn luyện (chỉ cần sklearn ở bước này)"""
+    from sklearn.ensemble import (
+        ExtraTreesClassifier,
+        GradientBoostingClassifier,
+        RandomForestClassifier,
+    )
+    from sklearn.tree import DecisionTreeClassifier
+
+    if isinstance(model, CompiledTreeEnsemble):
+        return model
+
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)):
+        if model.n_outputs_ != 1:
+            raise NotImplementedError("Multi-output tree models are not supported")
+        n_classes = int(model.n_classes_)
+        trees = (
+            [model.tree_]
+            if isinstance(model, DecisionTreeClassifier)
+            else [estimator.tree_ for estimator in model.estimators_]
+        )
+        arrays = _flatten_trees(trees, lambda tree: tree.value[:, 0, :n_classes])
+        kind = SINGLE_TREE if isinstance(model, DecisionTreeClassifier) else FOREST
+        return CompiledTreeEnsemble(
+            kind=kind,
+            classes_=model.classes_,
+            n_features_in_=int(model.n_features_in_),
+            **arrays,
+        )
+
+    if isinstance(model, GradientBoostingClassifier):
+        if model.n_classes_ != 2:
+            raise NotImplementedError("Only binary GradientBoostingClassifier is supported")
+        if model.init_ == "zero":
+            baseline = 0.0
+        else:
+            # init_ (mặc định là prior) cho cùng một giá trị với mọi mẫu
+            probe = np.zeros((1, model.n_features_in_), dtype=np.float32)
+            baseline = float(model._raw_predict_init(probe)[0, 0])
+        trees = [stage[0].tree_ for stage in model.estimators_]
+        arrays = _flatten_trees(trees, lambda tree: tree.value[:, 0, :1])
+        return CompiledTreeEnsemble(
+            kind=GRADIENT_BOOSTING,
+            classes_=model.classes_,
+            n_features_in_=int(model.n_features_in_),
+            learning_rate=float(model.learning_rate),
+            baseline=baseline,
+            **arrays,
+        )
+
+    raise NotImplementedError(f"Cannot compile model of type {type(model).__name__}")
+
+
+def verify_compiled(model, compiled: CompiledTreeEnsemble, X) -> None:
+    """Báo lỗi nếu kết quả của model biên dịch khác scikit-learn dù chỉ một bit"""
+    n_jobs = getattr(model, "n_jobs", None)
+    if n_jobs is not None:
+        model.n_jobs = 1
+    try:
+        expected = model.predict_proba(X)
+    finally:
+        if n_jobs is not None:
+            model.n_jobs = n_jobs
+    actual = compiled.predict_proba(X)
+    if not np.array_equal(expected, actual):
+        mismatched = int((expected != actual).any(axis=1).sum())
+        raise AssertionError(f"Compiled model differs from predict_proba on {mismatched} rows")
+
+
+def main() -> int:
+    import joblib
+
+    from backend.app.core.ml.synthetic import generate_transactions
+    # Khi chạy bằng `python -m`, lớp trong __main__ sẽ được pickle sai đường dẫn module
+    from backend.app.core.ml.tree_compiler import compile_model, verify_compiled
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input", required=True, help="Artifact joblib của model sklearn")
+    parser.add_argument("--output", required=True, help="Nơi ghi artifact đã biên dịch")
+    parser.add_argument("--verify-rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    artifact = joblib.load(args.input)
+    compiled = compile_model(artifact["model"])
+    X, _ = generate_transactions(args.verify_rows, seed=123)
+    try:
+        verify_compiled(artifact["model"], compiled, X)
+    except AssertionError as e:
+        print(f"FAIL: {e}", file=sys.stderr)
+        return 1
+
+    output = pathlib.Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix(".tmp")
+    joblib.dump({**artifact, "model": compiled, "version": f"{artifact['version']}+compiled"}, tmp_path)
+    tmp_path.replace(output)
+    print(
+        f"Compiled {type(artifact['model']).__name__} "
+        f"({compiled.roots.shape[0]} trees, {compiled.feature.shape[0]} nodes) to {output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# File được sinh tự động bởi `python -m backend.app.core.model_registry --write`
+# Không sửa tay. Chạy lại lệnh trên mỗi khi thêm hoặc xóa một file models.py
+MODEL_MODULES: tuple[str, ...] = (
+    "backend.app.auth.models",
+    "backend.app.bank_account.models",
+    "backend.app.fraud.models",
+    "backend.app.transaction.models",
+    "backend.app.user_profile.models",
+)
@@ -1,11 +1,22 @@
+import argparse
 import importlib
 import os
 import pathlib
+import sys
 
 from backend.app.core.logging import get_logger
 
 logger = get_logger()
 
+# File manifest được sinh tự động, liệt kê sẵn các module models
+MANIFEST_PATH = pathlib.Path(__file__).parent / "model_manifest.py"
+
+MANIFEST_TEMPLATE = '''# File được sinh tự động bởi `python -m backend.app.core.model_registry --write`
+# Không sửa tay. Chạy lại lệnh trên mỗi khi thêm hoặc xóa một file models.py
+MODEL_MODULES: tuple[str, ...] = (
+{entries})
+'''
+
 # Hàm phát hiện toàn bộ các file models.py trong dự án
 def discover_models() -> list[str]:
     models_modules = []
@@ -32,14 +43,75 @@ def discover_models() -> list[str]:
             logger.debug(f"Discovered models file in: {full_module_path}")
 
             models_modules.append(full_module_path)
-    return models_modules
+    return sorted(models_modules)
 
-# Import toàn bộ các module model đã được phát hiện
-def load_models() -> None:
+# Đọc danh sách module models từ manifest, trả về None nếu chưa sinh manifest
+def read_manifest() -> list[str] | None:
+    try:
+        from backend.app.core.model_manifest import MODEL_MODULES
+    except ImportError:
+        return None
+    return list(MODEL_MODULES)
+
+# Sinh lại manifest từ kết quả quét thư mục
+def write_manifest() -> list[str]:
     modules = discover_models()
+    entries = "".join(f'    "{module}",\n' for module in modules)
+    MANIFEST_PATH.write_text(MANIFEST_TEMPLATE.format(entries=entries))
+    logger.info(f"Wrote model manifest with {len(modules)} modules")
+    return modules
+
+# So sánh manifest với kết quả quét, trả về danh sách khác biệt (rỗng nếu khớp)
+def check_manifest() -> list[str]:
+    manifest = read_manifest()
+    if manifest is None:
+        return ["model manifest is missing"]
+    discovered = set(discover_models())
+    listed = set(manifest)
+    problems = [f"missing from manifest: {m}" for m in sorted(discovered - listed)]
+    problems += [f"stale manifest entry: {m}" for m in sorted(listed - discovered)]
+    return problems
+
+# Import toàn bộ các module model đã được phát hiện
+def load_models(use_manifest: bool = True) -> None:
+    modules = read_manifest() if use_manifest else None
+    if modules is None:
+        # Chưa có manifest -> quay về quét thư mục như cũ
+        modules = discover_models()
     for module_path in modules:
         try:
             importlib.import_module(module_path)
             logger.debug(f"Imported module {module_path}")
         except ImportError as e:
-            logger.error(f"Failed to import module {module_path}: {e}")
\ No newline at end of file
+            logger.error(f"Failed to import module {module_path}: {e}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Quản lý manifest các module models")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--write", action="store_true", help="Sinh lại manifest")
+    group.add_argument(
+        "--check", action="store_true", help="Báo lỗi nếu manifest đã lỗi thời"
+    )
+    args = parser.parse_args()
+
+    if args.write:
+        for module in write_manifest():
+            print(module)
+        return 0
+
+    problems = check_manifest()
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if problems:
+        print(
+            "Run `python -m backend.app.core.model_registry --write` to regenerate",
+            file=sys.stderr,
+        )
+        return 1
+    print("Model manifest is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import time
+from typing import Iterator
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from prometheus_client.core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    HistogramMetricFamily,
+    SummaryMetricFamily,
+)
+from prometheus_client.registry import REGISTRY, Collector
+
+from backend.app.core.celery_app import (
+    BULK_QUEUE,
+    CRITICAL_QUEUE,
+    TRANSACTIONAL_QUEUE,
+    celery_app,
+)
+from backend.app.core.logging import get_logger
+
+logger = get_logger()
+
+MONITORED_QUEUES = (CRITICAL_QUEUE, TRANSACTIONAL_QUEUE, BULK_QUEUE)
+
+# Mốc (giây) của histogram độ trễ từ lúc publish đến lúc worker bắt đầu chạy task
+LAG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# Histogram được cộng dồn trong Redis vì mỗi tiến trình worker là một process riêng,
+# API đọc lại và xuất ra /metrics
+LAG_KEY_PREFIX = "celery:queue_lag"
+
+ENQUEUED_AT_HEADER = "enqueued_at"
+
+# Bộ đếm kết quả của các task ignore_result, thay cho việc ghi từng kết quả vào backend
+TASK_STATUS_KEY = "celery:task_status"
+
+# Tổng thời gian chạy và số lần chạy của từng task, dùng cho metrics và autoscaler
+TASK_DURATION_KEY = "celery:task_duration"
+
+# Thời điểm bắt đầu của các task đang chạy trong tiến trình hiện tại
+_task_started: dict[str, float] = {}
+
+
+def lag_key(queue: str) -> str:
+    return f"{LAG_KEY_PREFIX}:{queue}"
+
+
+def bucket_field(lag: float) -> str:
+    for bound in LAG_BUCKETS:
+        if lag <= bound:
+            return str(bound)
+    return "+Inf"
+
+
+# Đánh dấu thời điểm publish vào header của message
+@before_task_publish.connect
+def stamp_enqueued_at(headers: dict | None = None, **kwargs) -> None:
+    if headers is not None:
+        headers.setdefault(ENQUEUED_AT_HEADER, time.time())
+
+
+def record_queue_lag(queue: str, lag: float) -> None:
+    """Cộng một mẫu độ trễ vào histogram của hàng đợi"""
+    key = lag_key(queue)
+    pipe = celery_app.backend.client.pipeline(transaction=False)
+    pipe.hincrby(key, bucket_field(lag), 1)
+    pipe.hincrby(key, "count", 1)
+    pipe.hincrbyfloat(key, "sum", lag)
+    pipe.execute()
+
+
+def record_task_status(task_name: str, status: str) -> None:
+    """Tăng bộ đếm kết quả (sent/failed/...) của một task"""
+    try:
+        celery_app.backend.client.hincrby(TASK_STATUS_KEY, f"{task_name}:{status}", 1)
+    except Exception as e:
+        logger.warning(f"Failed to record status {status} for {task_name}: {e}")
+
+
+def read_queue_depths(queues: tuple[str, ...] = MONITORED_QUEUES) -> dict[str, int]:
+    """Đọc số message đang chờ của từng hàng đợi trên broker"""
+    depths: dict[str, int] = {}
+    with celery_app.connection_or_acquire() as conn:
+        channel = conn.default_channel
+        for queue in queues:
+            try:
+                # passive=True: chỉ đọc thông tin, không tạo hàng đợi
+                _, message_count, _ = channel.queue_declare(queue=queue, passive=True)
+                depths[queue] = message_count
+            except Exception as e:
+                logger.warning(f"Failed to read depth of queue {queue}: {e}")
+                channel = conn.channel()
+    return depths
+
+
+def read_task_durations() -> dict[str, tuple[float, int]]:
+    """Trả về (tổng thời gian, số lần chạy) cộng dồn của từng task"""
+    raw = celery_app.backend.client.hgetall(TASK_DURATION_KEY)
+    totals: dict[str, list[float]] = {}
+    for field, value in raw.items():
+        field = field.decode() if isinstance(field, bytes) else field
+        task_name, _, kind = field.rpartition(":")
+        entry = totals.setdefault(task_name, [0.0, 0])
+        if kind == "sum":
+            entry[0] = float(value)
+        elif kind == "count":
+            entry[1] = int(value)
+    return {name: (total, int(count)) for name, (total, count) in totals.items()}
+
+
+@task_prerun.connect
+def observe_queue_lag(task=None, task_id: str | None = None, **kwargs) -> None:
+    if task_id:
+        _task_started[task_id] = time.monotonic()
+    request = getattr(task, "request", None)
+    enqueued_at = getattr(request, ENQUEUED_AT_HEADER, None)
+    if enqueued_at is None:
+        return
+    delivery_info = getattr(request, "delivery_info", None) or {}
+    queue = delivery_info.get("routing_key") or TRANSACTIONAL_QUEUE
+    try:
+        record_queue_lag(queue, max(time.time() - float(enqueued_at), 0.0))
+    except Exception as e:
+        # Metrics không được làm hỏng task
+        logger.warning(f"Failed to record queue lag for {queue}: {e}")
+
+
+@task_postrun.connect
+def observe_task_duration(task=None, task_id: str | None = None, **kwargs) -> None:
+    started = _task_started.pop(task_id, None) if task_id else None
+    if started is None or task is None:
+        return
+    duration = time.monotonic() - started
+    try:
+        pipe = celery_app.backend.client.pipeline(transaction=False)
+        pipe.hincrbyfloat(TASK_DURATION_KEY, f"{task.name}:sum", duration)
+        pipe.hincrby(TASK_DURATION_KEY, f"{task.name}:count", 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record duration of {task.name}: {e}")
+
+
+class CeleryQueueCollector(Collector):
+    """Xuất độ sâu và histogram độ trễ của từng hàng đợi Celery khi Prometheus scrape"""
+
+    def __init__(self, queues: tuple[str, ...] = MONITORED_QUEUES):
+        self._queues = queues
+
+    def describe(self) -> Iterator:
+        # Khai báo tên metrics để REGISTRY.register không gọi collect() (kết nối broker)
+        yield GaugeMetricFamily("celery_queue_depth", "", labels=["queue"])
+        yield HistogramMetricFamily("celery_queue_lag_seconds", "", labels=["queue"])
+        yield CounterMetricFamily("celery_task_outcomes", "", labels=["task", "status"])
+        yield SummaryMetricFamily("celery_task_duration_seconds", "", labels=["task"])
+
+    def _queue_depths(self) -> dict[str, int]:
+        return read_queue_depths(self._queues)
+
+    def _lag_histograms(self) -> dict[str, dict[str, str]]:
+        pipe = celery_app.backend.client.pipeline(transaction=False)
+        for queue in self._queues:
+            pipe.hgetall(lag_key(queue))
+        return dict(zip(self._queues, pipe.execute()))
+
+    def collect(self) -> Iterator:
+        depth = GaugeMetricFamily(
+            "celery_queue_depth",
+            "Messages waiting in a Celery queue",
+            labels=["queue"],
+        )
+        try:
+            for queue, count in self._queue_depths().items():
+                depth.add_metric([queue], count)
+        except Exception as e:
+            logger.warning(f"Failed to collect Celery queue depths: {e}")
+        yield depth
+
+        lag = HistogramMetricFamily(
+            "celery_queue_lag_seconds",
+            "Time between task publish and worker start",
+            labels=["queue"],
+        )
+        try:
+            histograms = self._lag_histograms()
+        except Exception as e:
+            logger.warning(f"Failed to collect Celery queue lag: {e}")
+            histograms = {}
+        for queue, raw in histograms.items():
+            if not raw:
+                continue
+            values = {
+                (k.decode() if isinstance(k, bytes) else k): float(v)
+                for k, v in raw.items()
+            }
+            cumulative = 0.0
+            buckets = []
+            for bound in LAG_BUCKETS:
+                cumulative += values.get(str(bound), 0.0)
+                buckets.append((str(bound), cumulative))
+            buckets.append(("+Inf", values.get("count", 0.0)))
+            lag.add_metric([queue], buckets, values.get("sum", 0.0))
+        yield lag
+
+        outcomes = CounterMetricFamily(
+            "celery_task_outcomes",
+            "Outcomes of fire-and-forget Celery tasks",
+            labels=["task", "status"],
+        )
+        try:
+            counts = celery_app.backend.client.hgetall(TASK_STATUS_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to collect Celery task outcomes: {e}")
+            counts = {}
+        for field, value in counts.items():
+            field = field.decode() if isinstance(field, bytes) else field
+            task_name, _, status = field.rpartition(":")
+            outcomes.add_metric([task_name, status], float(value))
+        yield outcomes
+
+        durations = SummaryMetricFamily(
+            "celery_task_duration_seconds",
+            "Celery task run time",
+            labels=["task"],
+        )
+        try:
+            for task_name, (total, count) in read_task_durations().items():
+                durations.add_metric([task_name], count, total)
+        except Exception as e:
+            logger.warning(f"Failed to collect Celery task durations: {e}")
+        yield durations
+
+
+queue_collector = CeleryQueueCollector()
+REGISTRY.register(queue_collector)
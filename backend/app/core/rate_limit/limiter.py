@@ -0,0 +1,213 @@
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.redis_client import redis_client
+
+logger = get_logger()
+
+# Token bucket nguyên tử cho nhiều key trong một lần gọi Redis
+# KEYS: các bucket cần kiểm tra (ip, email, route)
+# ARGV[1]: thời điểm hiện tại (ms), ARGV[2]: số token tiêu thụ
+# ARGV[2i + 1], ARGV[2i + 2]: sức chứa và tốc độ nạp (token/ms) của KEYS[i]
+# Chỉ trừ token khi TẤT CẢ bucket đều đủ, trả về {allowed, retry_after_ms}
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local tokens = {}
+local retry_after = 0
+
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[2 * i + 1])
+    local rate = tonumber(ARGV[2 * i + 2])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local current = tonumber(state[1])
+    local last = tonumber(state[2])
+    if current == nil or last == nil then
+        current = capacity
+        last = now
+    end
+    current = math.min(capacity, current + math.max(0, now - last) * rate)
+    tokens[i] = current
+    if current < cost then
+        local wait = math.ceil((cost - current) / rate)
+        if wait > retry_after then
+            retry_after = wait
+        end
+    end
+end
+
+if retry_after > 0 then
+    return {0, retry_after}
+end
+
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[2 * i + 1])
+    local rate = tonumber(ARGV[2 * i + 2])
+    redis.call('HSET', KEYS[i], 'tokens', tokens[i] - cost, 'ts', now)
+    redis.call('PEXPIRE', KEYS[i], math.ceil(capacity / rate))
+end
+
+return {1, 0}
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    capacity: int
+    period_seconds: float
+
+    @property
+    def rate_per_ms(self) -> float:
+        return self.capacity / (self.period_seconds * 1000)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    name: str
+    ip: Limit
+    email: Limit | None
+    route: Limit
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+class LocalPreFilter:
+    """Bộ lọc token bucket trong tiến trình, chặn flood trước khi gọi Redis"""
+
+    def __init__(self, max_keys: int = 10_000):
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._blocked_until: dict[str, float] = {}
+        self._max_keys = max_keys
+
+    def check(self, keys: list[tuple[str, Limit]], now: float) -> RateLimitResult:
+        # Key đã bị Redis từ chối gần đây -> từ chối ngay, không gọi Redis
+        retry_after = 0.0
+        for key, _ in keys:
+            until = self._blocked_until.get(key)
+            if until is None:
+                continue
+            if until <= now:
+                del self._blocked_until[key]
+                continue
+            retry_after = max(retry_after, until - now)
+        if retry_after > 0:
+            return RateLimitResult(allowed=False, retry_after=retry_after)
+
+        # Mỗi worker chỉ thấy một phần lưu lượng, nên bucket cục bộ hết token
+        # đồng nghĩa bucket toàn cục trên Redis chắc chắn cũng đã hết
+        refilled = []
+        for key, limit in keys:
+            tokens, last = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(
+                limit.capacity, tokens + (now - last) * limit.capacity / limit.period_seconds
+            )
+            refilled.append(tokens)
+            if tokens < 1:
+                wait = (1 - tokens) * limit.period_seconds / limit.capacity
+                retry_after = max(retry_after, wait)
+        if retry_after > 0:
+            return RateLimitResult(allowed=False, retry_after=retry_after)
+
+        for (key, _), tokens in zip(keys, refilled):
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)
+        return RateLimitResult(allowed=True)
+
+    def block(self, keys: list[tuple[str, Limit]], until: float) -> None:
+        if len(self._blocked_until) >= self._max_keys:
+            self._blocked_until.clear()
+        for key, _ in keys:
+            self._blocked_until[key] = until
+
+
+class RateLimiter:
+    def __init__(self, rules: dict[str, RateLimitRule]):
+        self.rules = rules
+        self._local = LocalPreFilter()
+        self._script = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    @staticmethod
+    def _hash_email(email: str) -> str:
+        # Không lưu email dạng rõ trong Redis
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+    def _build_keys(
+        self, rule: RateLimitRule, ip: str, email: str | None
+    ) -> list[tuple[str, Limit]]:
+        keys = [
+            (f"rl:{rule.name}:ip:{ip}", rule.ip),
+            (f"rl:{rule.name}:route", rule.route),
+        ]
+        if email and rule.email is not None:
+            keys.append((f"rl:{rule.name}:email:{self._hash_email(email)}", rule.email))
+        return keys
+
+    async def hit(
+        self, rule: RateLimitRule, ip: str, email: str | None = None
+    ) -> RateLimitResult:
+        """Kiểm tra và tiêu thụ một token cho request (ip, email, route)"""
+        keys = self._build_keys(rule, ip, email)
+        now = time.monotonic()
+
+        local_result = self._local.check(keys, now)
+        if not local_result.allowed:
+            return local_result
+
+        args: list[float | int] = [int(time.time() * 1000), 1]
+        for _, limit in keys:
+            args.extend([limit.capacity, limit.rate_per_ms])
+        try:
+            allowed, retry_after_ms = await self._script(
+                keys=[key for key, _ in keys], args=args
+            )
+        except Exception as e:
+            # Redis lỗi -> cho qua, bộ lọc cục bộ vẫn giới hạn theo từng worker
+            logger.warning(f"Rate limit check skipped, Redis unavailable: {e}")
+            return RateLimitResult(allowed=True)
+
+        if int(allowed) == 1:
+            return RateLimitResult(allowed=True)
+
+        retry_after = int(retry_after_ms) / 1000
+        self._local.block(keys, now + retry_after)
+        return RateLimitResult(allowed=False, retry_after=retry_after)
+
+
+def _default_rules() -> dict[str, RateLimitRule]:
+    ip_limit = Limit(settings.RATE_LIMIT_IP_PER_MINUTE, 60)
+    email_limit = Limit(settings.RATE_LIMIT_EMAIL_PER_MINUTE, 60)
+    route_limit = Limit(settings.RATE_LIMIT_ROUTE_PER_SECOND, 1)
+    prefix = f"{settings.API_V1_STR}/auth"
+
+    return {
+        f"{prefix}/login/request-otp": RateLimitRule(
+            "login_otp", ip_limit, email_limit, route_limit
+        ),
+        f"{prefix}/register": RateLimitRule(
+            "register", ip_limit, email_limit, route_limit
+        ),
+        f"{prefix}/request-password-reset": RateLimitRule(
+            "password_reset", ip_limit, email_limit, route_limit
+        ),
+        f"{prefix}/resend-activation-link": RateLimitRule(
+            "resend_activation", ip_limit, email_limit, route_limit
+        ),
+    }
+
+
+def retry_after_header(retry_after: float) -> str:
+    return str(max(1, math.ceil(retry_after)))
+
+
+rate_limiter = RateLimiter(_default_rules())
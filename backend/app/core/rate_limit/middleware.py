@@ -0,0 +1,121 @@
+import json
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.rate_limit.limiter import (
+    RateLimiter,
+    rate_limiter,
+    retry_after_header,
+)
+
+logger = get_logger()
+
+# Body của các route auth rất nhỏ, không đọc quá giới hạn này để lấy email
+MAX_BODY_BYTES = 16 * 1024
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI giới hạn tần suất cho các route auth tốn kém (Argon2, gửi email).
+    Request bị từ chối trả về 429 trước khi tới router, nên không chạm DB hay bộ băm.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not settings.RATE_LIMIT_ENABLED
+            or scope["type"] != "http"
+            or scope["method"] != "POST"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.limiter.rules.get(scope["path"].rstrip("/"))
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        body, more_body = await self._read_body(receive)
+        result = await self.limiter.hit(
+            rule, self._client_ip(scope), self._extract_email(body)
+        )
+
+        if not result.allowed:
+            logger.warning(f"Rate limit exceeded on {scope['path']}")
+            response = JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={
+                    "detail": {
+                        "status": "error",
+                        "message": "Too many requests",
+                        "action": "Please wait before trying again",
+                    }
+                },
+                headers={"Retry-After": retry_after_header(result.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        # Phát lại body đã đọc cho ứng dụng phía sau
+        replayed = False
+
+        async def replay_receive() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": more_body}
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> tuple[bytes, bool]:
+        chunks: list[bytes] = []
+        size = 0
+        more_body = True
+        while more_body and size <= MAX_BODY_BYTES:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            size += len(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks), more_body
+
+    @staticmethod
+    def _extract_email(body: bytes) -> str | None:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return None
+        if isinstance(data, dict) and isinstance(data.get("email"), str):
+            return data["email"]
+        return None
+
+    @staticmethod
+    def _client_ip(scope: Scope) -> str:
+        """
+        Mỗi proxy nối thêm địa chỉ nó nhận request vào cuối X-Forwarded-For, nên chỉ
+        các mục bên phải là đáng tin: lấy mục thứ RATE_LIMIT_TRUSTED_PROXY_HOPS từ phải
+        """
+        hops = settings.RATE_LIMIT_TRUSTED_PROXY_HOPS
+        if settings.RATE_LIMIT_TRUST_FORWARDED_FOR and hops > 0:
+            forwarded = [
+                entry.strip()
+                for name, value in scope.get("headers", [])
+                if name == b"x-forwarded-for"
+                for entry in value.decode("latin-1").split(",")
+                if entry.strip()
+            ]
+            if len(forwarded) >= hops:
+                return forwarded[-hops]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
@@ -0,0 +1,19 @@
+import redis.asyncio as aioredis
+
+from backend.app.core.config import settings
+
+# Client Redis bất đồng bộ dùng chung cho toàn bộ ứng dụng
+# Kết nối chỉ được mở khi có lệnh đầu tiên, nên import module này không tốn chi phí mạng
+redis_client = aioredis.Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    decode_responses=True,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+)
+
+
+async def close_redis() -> None:
+    """Đóng pool kết nối Redis khi ứng dụng tắt"""
+    await redis_client.aclose()
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 
+from backend.app.core.celery_app import CRITICAL_PRIORITY, CRITICAL_QUEUE
 from backend.app.core.config import settings
 from backend.app.core.emails.base import EmailTemplate
 
@@ -8,6 +9,9 @@ class AccountLockoutEmail(EmailTemplate):
     template_name = "account_lockout.html"
     template_name_plain = "account_lockout.txt"
     subject = "Account Security Alert - Temporary Lock"
+    # OTP/khóa tài khoản hết hạn sau vài phút -> hàng đợi critical
+    queue = CRITICAL_QUEUE
+    priority = CRITICAL_PRIORITY
 
 # Gửi email thông báo khóa tài khoản do đăng nhập sai nhiều lần
 async def send_account_lockout_email(email: str, lockout_time: datetime) -> None:
@@ -1,3 +1,4 @@
+from backend.app.core.celery_app import CRITICAL_PRIORITY, CRITICAL_QUEUE
 from backend.app.core.config import settings
 from backend.app.core.emails.base import EmailTemplate
 
@@ -6,6 +7,9 @@ class LoginOTPEmail(EmailTemplate):
     template_name = "login_otp.html"
     template_name_plain = "login_otp.txt"
     subject = "Your Login OTP"
+    # OTP/khóa tài khoản hết hạn sau vài phút -> hàng đợi critical
+    queue = CRITICAL_QUEUE
+    priority = CRITICAL_PRIORITY
 
 
 async def send_login_otp_email(email: str, otp: str) -> None:
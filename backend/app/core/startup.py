@@ -0,0 +1,189 @@
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator
+
+from sqlalchemy import text
+
+from backend.app.core.celery_app import celery_app
+from backend.app.core.config import settings
+from backend.app.core.db import engine
+from backend.app.core.logging import get_logger
+from backend.app.core.redis_client import redis_client
+
+logger = get_logger()
+
+
+async def probe_database() -> bool:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return True
+
+
+async def probe_redis() -> bool:
+    return bool(await redis_client.ping())
+
+
+def _ping_broker() -> bool:
+    conn = celery_app.connection()
+    try:
+        conn.ensure_connection(
+            max_retries=1, timeout=settings.STARTUP_PROBE_TIMEOUT_SECONDS
+        )
+        return True
+    finally:
+        conn.close()
+
+
+async def probe_rabbitmq() -> bool:
+    # kombu là thư viện đồng bộ -> chạy trong thread để không chặn các probe khác
+    return await asyncio.to_thread(_ping_broker)
+
+
+@dataclass
+class ProbeResult:
+    name: str
+    critical: bool
+    healthy: bool = False
+    attempts: int = 0
+    elapsed: float = 0.0
+    last_error: str | None = None
+
+
+class StartupOrchestrator:
+    """
+    Kiểm tra song song các dịch vụ phụ thuộc khi khởi động, mỗi dịch vụ tự retry
+    với exponential backoff và không dùng cache của health checker.
+    Ứng dụng sẵn sàng ngay khi các dịch vụ critical phản hồi; dịch vụ còn lại
+    tiếp tục được kiểm tra ở background.
+    """
+
+    def __init__(
+        self,
+        probes: dict[str, Callable[[], Awaitable[bool]]],
+        critical: set[str],
+        timeout: float,
+        attempt_timeout: float,
+        initial_backoff: float = 0.25,
+        max_backoff: float = 5.0,
+    ):
+        self._probes = probes
+        self._critical = critical
+        self._timeout = timeout
+        self._attempt_timeout = attempt_timeout
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+        self._background: list[asyncio.Task] = []
+        self.results: dict[str, ProbeResult] = {}
+        self.timings: dict[str, float] = {}
+        self.ready = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Ghi lại thời gian thực thi của một giai đoạn khởi động"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(time.perf_counter() - started, 4)
+
+    async def _probe(self, name: str, deadline: float) -> bool:
+        result = self.results[name]
+        check = self._probes[name]
+        backoff = self._initial_backoff
+        started = time.perf_counter()
+
+        while True:
+            result.attempts += 1
+            attempt_timeout = min(
+                self._attempt_timeout, max(deadline - time.monotonic(), 0.01)
+            )
+            try:
+                async with asyncio.timeout(attempt_timeout):
+                    if await check():
+                        result.healthy = True
+                        result.last_error = None
+                        result.elapsed = round(time.perf_counter() - started, 4)
+                        logger.info(
+                            f"Service {name} ready after {result.attempts} attempts "
+                            f"({result.elapsed}s)"
+                        )
+                        return True
+                result.last_error = "check returned False"
+            except asyncio.TimeoutError:
+                result.last_error = f"timeout after {attempt_timeout:.2f}s"
+            except Exception as e:
+                result.last_error = str(e)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                result.elapsed = round(time.perf_counter() - started, 4)
+                logger.error(
+                    f"Service {name} not ready after {result.attempts} attempts: "
+                    f"{result.last_error}"
+                )
+                return False
+            # Full jitter để các worker không retry cùng lúc
+            await asyncio.sleep(min(remaining, random.uniform(0, backoff)))
+            backoff = min(backoff * 2, self._max_backoff)
+
+    async def run(self) -> bool:
+        """Chạy các probe song song, trả về True khi mọi dịch vụ critical đã sẵn sàng"""
+        deadline = time.monotonic() + self._timeout
+        self.results = {
+            name: ProbeResult(name=name, critical=name in self._critical)
+            for name in self._probes
+        }
+        tasks = {
+            name: asyncio.create_task(self._probe(name, deadline))
+            for name in self._probes
+        }
+
+        with self.phase("critical_services"):
+            critical_results = await asyncio.gather(
+                *(task for name, task in tasks.items() if name in self._critical)
+            )
+        self.ready = all(critical_results)
+
+        self._background = [
+            task for name, task in tasks.items() if name not in self._critical
+        ]
+        if not self.ready:
+            await self.shutdown()
+        return self.ready
+
+    async def shutdown(self) -> None:
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self._background = []
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "timings": dict(self.timings),
+            "services": {
+                name: {
+                    "healthy": result.healthy,
+                    "critical": result.critical,
+                    "attempts": result.attempts,
+                    "elapsed": result.elapsed,
+                    "last_error": result.last_error,
+                }
+                for name, result in self.results.items()
+            },
+        }
+
+
+startup_orchestrator = StartupOrchestrator(
+    probes={
+        "database": probe_database,
+        "redis": probe_redis,
+        "rabbitmq": probe_rabbitmq,
+    },
+    critical=set(settings.STARTUP_CRITICAL_SERVICES),
+    timeout=settings.STARTUP_TIMEOUT_SECONDS,
+    attempt_timeout=settings.STARTUP_PROBE_TIMEOUT_SECONDS,
+)
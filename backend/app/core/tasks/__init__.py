@@ -1,3 +1,32 @@
+# Đăng ký signal đo độ trễ hàng đợi cho cả tiến trình API lẫn worker
+from backend.app.core import queue_metrics  # noqa: F401
 from .email import send_email_task
+from .fraud import (
+    backfill_fraud_scores_task,
+    compute_fraud_drift_task,
+    maintain_risk_history_partitions_task,
+    rollup_risk_history_task,
+    snapshot_entity_graph_task,
+)
+from .maintenance import (
+    clear_expired_otps_task,
+    release_stale_review_claims_task,
+    reset_stale_failed_logins_task,
+    unlock_expired_accounts_task,
+)
+from .statement import generate_statement_task, purge_expired_statements_task
 
-__all__ = ["send_email_task"]
\ No newline at end of file
+__all__ = [
+    "send_email_task",
+    "unlock_expired_accounts_task",
+    "clear_expired_otps_task",
+    "reset_stale_failed_logins_task",
+    "release_stale_review_claims_task",
+    "backfill_fraud_scores_task",
+    "compute_fraud_drift_task",
+    "snapshot_entity_graph_task",
+    "maintain_risk_history_partitions_task",
+    "rollup_risk_history_task",
+    "generate_statement_task",
+    "purge_expired_statements_task",
+]
@@ -1,14 +1,38 @@
 import asyncio
-from fastapi_mail import MessageSchema, MessageType, MultipartSubtypeEnum
+from celery.signals import worker_process_init
 from backend.app.core.celery_app import celery_app
-from backend.app.core.emails.config import fast_mail
+from backend.app.core.emails.config import get_fast_mail
 from backend.app.core.logging import get_logger
+from backend.app.core import queue_metrics
 
 logger= get_logger()
 
+# Bản ghi trạng thái gửi gọn nhẹ theo task id, thay cho kết quả đầy đủ trong result backend
+EMAIL_STATUS_KEY_PREFIX = "email:status"
+EMAIL_STATUS_TTL_SECONDS = 24 * 3600
+
+
+def record_email_status(task_id: str | None, status: str) -> None:
+    queue_metrics.record_task_status("send_email_tasks", status)
+    if not task_id:
+        return
+    try:
+        celery_app.backend.client.set(
+            f"{EMAIL_STATUS_KEY_PREFIX}:{task_id}", status, ex=EMAIL_STATUS_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record email status for task {task_id}: {e}")
+
+# Worker khởi tạo sẵn FastMail để email đầu tiên không phải chờ import
+@worker_process_init.connect
+def init_fast_mail(**kwargs) -> None:
+    get_fast_mail()
+
 @celery_app.task(
     name="send_email_tasks",
     bind=True,
+    # Task gửi thông báo: không ghi kết quả vào Redis, trạng thái lưu qua record_email_status
+    ignore_result=True,
     max_retries=3,
     soft_time_limit=60,
     autoretry_for=(Exception,),
@@ -20,6 +44,9 @@ def send_email_task(
     self, *, recipients: list[str], subject: str, html_content: str, plain_content: str
 ) -> bool:
     try:
+        # Import trong task để tiến trình API không phải tải fastapi_mail
+        from fastapi_mail import MessageSchema, MessageType, MultipartSubtypeEnum
+
         message = MessageSchema(
             subject=subject,
             recipients=recipients,
@@ -28,10 +55,12 @@ def send_email_task(
             alternative_body=plain_content,
             multipart_subtype=MultipartSubtypeEnum.alternative,
         )
-        asyncio.run(fast_mail.send_message(message))
+        asyncio.run(get_fast_mail().send_message(message))
         logger.info(f"Email successfully sent to {recipients} with subject {subject}")
+        record_email_status(self.request.id, "sent")
         return True
     except Exception as e:
         logger.error(f"Failed to send email to {recipients}: Error: {str(e)}")
+        record_email_status(self.request.id, "failed")
         return False
     
\ No newline at end of file
@@ -0,0 +1,147 @@
+import subprocess
+import sys
+
+from backend.app.core.celery_app import celery_app
+from backend.app.core.logging import get_logger
+
+logger = get_logger()
+
+
+@celery_app.task(name="backfill_fraud_scores", ignore_result=True)
+def backfill_fraud_scores_task(
+    input_path: str,
+    output: str | None = None,
+    batch_size: int | None = None,
+    workers: int | None = None,
+) -> None:
+    """
+    Chấm điểm lại giao dịch lịch sử bằng model đang active. Tiến trình con của
+    worker Celery là daemon nên không tạo được process pool -> chạy CLI trong một
+    tiến trình riêng. Chạy lại task sẽ tiếp tục từ checkpoint của lần trước.
+    """
+    command = [sys.executable, "-m", "backend.app.core.ml.backfill", "--input", input_path]
+    if output:
+        command += ["--output", output]
+    if batch_size:
+        command += ["--batch-size", str(batch_size)]
+    if workers:
+        command += ["--workers", str(workers)]
+
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        logger.error(f"Fraud backfill of {input_path} failed: {completed.stderr[-2000:]}")
+        raise RuntimeError(f"Fraud backfill of {input_path} failed")
+    logger.info(f"Fraud backfill of {input_path} finished: {completed.stdout.strip()}")
+
+
+@celery_app.task(name="compute_fraud_drift", ignore_result=True)
+def compute_fraud_drift_task() -> None:
+    """
+    So histogram đặc trưng/điểm của cửa sổ trượt với phân phối tham chiếu, ghi báo
+    cáo vào Redis để endpoint và Prometheus đọc. Chỉ đọc vài hash Redis theo giờ.
+    """
+    import json
+
+    import redis
+
+    from backend.app.core.config import settings
+    from backend.app.core.ml.drift import REPORT_KEY, ReferenceProfile, compute_drift_report
+
+    try:
+        profile = ReferenceProfile.load(settings.FRAUD_DRIFT_REFERENCE_PATH)
+    except FileNotFoundError:
+        logger.warning("No drift reference profile, skipping drift report")
+        return
+    client = redis.Redis(
+        host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB
+    )
+    try:
+        report = compute_drift_report(client, profile, settings.FRAUD_DRIFT_WINDOW_HOURS)
+        client.set(REPORT_KEY, json.dumps(report))
+    finally:
+        client.close()
+    if report["drifted"]:
+        logger.warning(f"Fraud model drift detected on {report['drifted']}")
+    logger.info(f"Fraud drift report over {report['events']} events written")
+
+
+@celery_app.task(name="snapshot_entity_graph", ignore_result=True)
+def snapshot_entity_graph_task(rebuild: bool = False) -> None:
+    """
+    Đọc tiếp stream sự kiện vào snapshot đồ thị liên kết thực thể trên đĩa (dựng lại
+    từ bảng profile khi cần) để worker API khởi động lại nhanh.
+    """
+    import redis
+
+    from backend.app.core.config import settings
+    from backend.app.core.ml.entity_graph import refresh_snapshot
+
+    client = redis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        decode_responses=True,
+    )
+    try:
+        refresh_snapshot(client, rebuild=rebuild)
+    finally:
+        client.close()
+
+
+def _run_risk_history_job(job) -> None:
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from backend.app.core.config import settings
+
+    async def run() -> None:
+        engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+        try:
+            await job(engine)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+@celery_app.task(name="maintain_risk_history_partitions", ignore_result=True)
+def maintain_risk_history_partitions_task() -> None:
+    """Tạo trước phân vùng các tháng tới và tách phân vùng quá hạn lưu trữ"""
+    from datetime import datetime, timezone
+
+    from backend.app.core.config import settings
+    from backend.app.core.ml.risk_history import maintain_partitions
+
+    async def job(engine) -> None:
+        created, detached = await maintain_partitions(
+            engine,
+            datetime.now(timezone.utc),
+            months_ahead=settings.FRAUD_RISK_HISTORY_MONTHS_AHEAD,
+            retention_months=settings.FRAUD_RISK_HISTORY_RETENTION_MONTHS,
+            drop_detached=settings.FRAUD_RISK_HISTORY_DROP_DETACHED,
+        )
+        if created or detached:
+            logger.info(f"Risk history partitions created {created}, detached {detached}")
+
+    _run_risk_history_job(job)
+
+
+@celery_app.task(name="rollup_risk_history", ignore_result=True)
+def rollup_risk_history_task() -> None:
+    """Gộp các giờ mới của lịch sử rủi ro sang bảng theo giờ/ngày"""
+    from datetime import datetime, timedelta, timezone
+
+    from backend.app.core.config import settings
+    from backend.app.core.ml.risk_history import rollup
+
+    async def job(engine) -> None:
+        since, buckets = await rollup(
+            engine,
+            datetime.now(timezone.utc),
+            timedelta(minutes=settings.FRAUD_RISK_ROLLUP_LATENESS_MINUTES),
+        )
+        logger.info(f"Risk history rolled up {buckets} hourly buckets since {since}")
+
+    _run_risk_history_job(job)
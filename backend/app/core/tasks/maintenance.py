@@ -0,0 +1,152 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import Update, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.app.auth.models import User
+from backend.app.auth.schema import AccountStatusSchema
+from backend.app.core.celery_app import celery_app
+from backend.app.core.config import settings
+from backend.app.core.logging import get_logger
+from backend.app.core.model_registry import load_models
+from backend.app.fraud.models import FraudReview
+from backend.app.fraud.schema import ReviewStatusEnum
+
+logger = get_logger()
+
+
+def unlock_expired_accounts_statement(now: datetime, limit: int) -> Update:
+    """Mở khóa các tài khoản đã hết thời gian khóa, giống check_user_lockout"""
+    cutoff = now - timedelta(minutes=settings.LOCKOUT_DURATION_MINUTES)
+    ids = (
+        select(User.id)
+        .where(
+            User.account_status == AccountStatusSchema.LOCKED,
+            User.last_failed_login <= cutoff,
+        )
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(User)
+        .where(User.id.in_(ids.scalar_subquery()))
+        .values(
+            account_status=AccountStatusSchema.ACTIVE,
+            failed_login_attempts=0,
+            last_failed_login=None,
+        )
+    )
+
+
+def clear_expired_otps_statement(now: datetime, limit: int) -> Update:
+    """Xóa các OTP đã hết hạn"""
+    ids = (
+        select(User.id)
+        .where(User.otp_expiry_time < now)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(User)
+        .where(User.id.in_(ids.scalar_subquery()))
+        .values(otp="", otp_expiry_time=None)
+    )
+
+
+def reset_stale_failed_logins_statement(now: datetime, limit: int) -> Update:
+    """Đếm lại số lần đăng nhập sai của tài khoản không bị khóa sau một khoảng thời gian"""
+    cutoff = now - timedelta(minutes=settings.FAILED_LOGIN_WINDOW_MINUTES)
+    ids = (
+        select(User.id)
+        .where(
+            User.account_status != AccountStatusSchema.LOCKED,
+            User.last_failed_login <= cutoff,
+        )
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(User)
+        .where(User.id.in_(ids.scalar_subquery()))
+        .values(failed_login_attempts=0, last_failed_login=None)
+    )
+
+
+def release_stale_review_claims_statement(now: datetime, limit: int) -> Update:
+    """Trả về hàng đợi các giao dịch đã nhận review quá lâu mà chưa kết luận"""
+    cutoff = now - timedelta(minutes=settings.FRAUD_REVIEW_CLAIM_TIMEOUT_MINUTES)
+    ids = (
+        select(FraudReview.id)
+        .where(
+            FraudReview.status == ReviewStatusEnum.IN_REVIEW,
+            FraudReview.claimed_at <= cutoff,
+        )
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(FraudReview)
+        .where(FraudReview.id.in_(ids.scalar_subquery()))
+        .values(status=ReviewStatusEnum.PENDING, claimed_by=None, claimed_at=None)
+    )
+
+
+async def run_in_batches(
+    build_statement: Callable[[datetime, int], Update],
+    batch_size: int,
+) -> int:
+    """
+    Chạy UPDATE theo từng lô, mỗi lô một transaction ngắn để không giữ lock lâu.
+    SKIP LOCKED bỏ qua các dòng đang bị luồng đăng nhập khóa.
+    """
+    # Nạp toàn bộ models để relationship User.profile được cấu hình đầy đủ
+    load_models()
+    # Mỗi lần chạy task có event loop riêng -> không dùng lại pool của engine chung
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    total = 0
+    try:
+        now = datetime.now(timezone.utc)
+        while True:
+            async with engine.begin() as conn:
+                result = await conn.execute(build_statement(now, batch_size))
+            total += result.rowcount
+            if result.rowcount < batch_size:
+                return total
+    finally:
+        await engine.dispose()
+
+
+def _run_cleanup(name: str, build_statement: Callable[[datetime, int], Update]) -> int:
+    updated = asyncio.run(
+        run_in_batches(build_statement, settings.SECURITY_CLEANUP_BATCH_SIZE)
+    )
+    if updated:
+        logger.info(f"{name}: updated {updated} rows")
+    return updated
+
+
+@celery_app.task(name="unlock_expired_accounts", ignore_result=True)
+def unlock_expired_accounts_task() -> int:
+    return _run_cleanup("unlock_expired_accounts", unlock_expired_accounts_statement)
+
+
+@celery_app.task(name="clear_expired_otps", ignore_result=True)
+def clear_expired_otps_task() -> int:
+    return _run_cleanup("clear_expired_otps", clear_expired_otps_statement)
+
+
+@celery_app.task(name="reset_stale_failed_logins", ignore_result=True)
+def reset_stale_failed_logins_task() -> int:
+    return _run_cleanup(
+        "reset_stale_failed_logins", reset_stale_failed_logins_statement
+    )
+
+
+@celery_app.task(name="release_stale_review_claims", ignore_result=True)
+def release_stale_review_claims_task() -> int:
+    return _run_cleanup(
+        "release_stale_review_claims", release_stale_review_claims_statement
+    )
@@ -0,0 +1,82 @@
+from backend.app.core.celery_app import celery_app
+from backend.app.core.logging import get_logger
+
+logger = get_logger()
+
+
+@celery_app.task(
+    name="generate_statement",
+    ignore_result=True,
+    # Sao kê cả năm của tài khoản nhiều giao dịch có thể vượt giới hạn mặc định 5 phút
+    soft_time_limit=15 * 60,
+    time_limit=16 * 60,
+)
+def generate_statement_task(
+    account_id: str, start_date: str, end_date: str, pending_key: str
+) -> None:
+    """
+    Sinh sao kê PDF cho một kỳ; bỏ qua nếu file của đúng giao dịch cuối cùng trong
+    kỳ đã có. pending_key được xóa khi xong để API biết cần gửi lại nếu lỗi.
+    """
+    import asyncio
+    import uuid
+    from datetime import date
+
+    import redis
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from backend.app.bank_account.models import BankAccount
+    from backend.app.bank_account.statement import (
+        StatementPeriod,
+        last_transaction_id,
+        render_statement,
+        statement_id,
+        statement_path,
+    )
+    from backend.app.core.config import settings
+
+    period = StatementPeriod(date.fromisoformat(start_date), date.fromisoformat(end_date))
+
+    async def run() -> None:
+        engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+        try:
+            async with engine.connect() as conn:
+                account = (
+                    await conn.execute(
+                        select(BankAccount).where(BankAccount.id == uuid.UUID(account_id))
+                    )
+                ).first()
+                if account is None:
+                    logger.warning(f"Statement requested for missing account {account_id}")
+                    return
+                last_id = await last_transaction_id(conn, account.id, period)
+            path = statement_path(statement_id(account.id, period, last_id))
+            if path.exists():
+                return
+            rows = await render_statement(engine, account, period, path)
+            logger.info(f"Statement {path.name} for account {account_id}: {rows} transactions")
+        finally:
+            await engine.dispose()
+
+    client = redis.Redis(
+        host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB
+    )
+    try:
+        asyncio.run(run())
+    finally:
+        client.delete(pending_key)
+        client.close()
+
+
+@celery_app.task(name="purge_expired_statements", ignore_result=True)
+def purge_expired_statements_task() -> None:
+    import time
+
+    from backend.app.bank_account.statement import purge_expired
+    from backend.app.core.config import settings
+
+    removed = purge_expired(time.time(), settings.STATEMENT_CACHE_TTL_HOURS * 3600)
+    if removed:
+        logger.info(f"Removed {removed} expired statements")
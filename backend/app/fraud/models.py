@@ -0,0 +1,122 @@
+import uuid
+from datetime import datetime, timezone
+from typing import ClassVar
+
+from sqlalchemy import Index, String, text
+from sqlalchemy.dialects import postgresql as pg
+from sqlmodel import Column, Field
+
+from backend.app.fraud.schema import (
+    FraudReviewBaseSchema,
+    FraudScoreBaseSchema,
+    ReviewStatusEnum,
+    RiskHistoryBaseSchema,
+    RiskRollupBaseSchema,
+)
+
+
+class FraudScore(FraudScoreBaseSchema, table=True):
+    __tablename__: ClassVar[str] = "fraud_scores"
+
+    # Khóa chính (giao dịch, phiên bản model): chấm lại cùng model thì ghi đè,
+    # model mới được lưu song song để so sánh
+    transaction_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), primary_key=True)
+    )
+    model_version: str = Field(primary_key=True, max_length=100)
+    scored_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=text("CURRENT_TIMESTAMP"),
+        ),
+    )
+
+
+class FraudReview(FraudReviewBaseSchema, table=True):
+    __tablename__: ClassVar[str] = "fraud_reviews"
+    # Thứ tự lấy việc: điểm cao trước, cũ trước; id để phân trang keyset không trùng
+    __table_args__ = (
+        Index(
+            "ix_fraud_reviews_queue",
+            "status",
+            text("score DESC"),
+            "created_at",
+            "id",
+        ),
+    )
+
+    id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), primary_key=True),
+        default_factory=uuid.uuid4,
+    )
+    # Mỗi giao dịch chỉ vào hàng đợi một lần
+    transaction_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), nullable=False, unique=True)
+    )
+    status: ReviewStatusEnum = Field(default=ReviewStatusEnum.PENDING)
+    rule_hits: list[str] = Field(
+        default_factory=list,
+        sa_column=Column(pg.ARRAY(String(100)), nullable=False, server_default="{}"),
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    # Người review đang giữ giao dịch
+    claimed_by: uuid.UUID | None = Field(default=None)
+    claimed_at: datetime | None = Field(
+        default=None, sa_column=Column(pg.TIMESTAMP(timezone=True))
+    )
+    resolved_at: datetime | None = Field(
+        default=None, sa_column=Column(pg.TIMESTAMP(timezone=True))
+    )
+    note: str | None = Field(default=None, max_length=1000)
+
+
+class RiskHistory(RiskHistoryBaseSchema, table=True):
+    """
+    Bảng cha phân vùng RANGE theo tháng của scored_at; các bảng con
+    risk_history_yYYYYmMM được tạo/tách bởi backend.app.core.ml.risk_history
+    """
+
+    __tablename__: ClassVar[str] = "risk_history"
+    __table_args__ = (
+        # BRIN trên scored_at: job gộp quét theo khoảng thời gian, index rất nhỏ
+        Index("ix_risk_history_scored_at", "scored_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (scored_at)"},
+    )
+
+    # Khóa chính phải chứa cột phân vùng
+    user_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), primary_key=True)
+    )
+    scored_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=True), primary_key=True)
+    )
+    transaction_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), primary_key=True)
+    )
+
+
+class RiskHistoryHourly(RiskRollupBaseSchema, table=True):
+    __tablename__: ClassVar[str] = "risk_history_hourly"
+    # Job gộp tìm mốc giờ mới nhất và xóa giờ đã hết hạn lưu trữ
+    __table_args__ = (Index("ix_risk_history_hourly_bucket", "bucket"),)
+
+    bucket: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=True), primary_key=True)
+    )
+
+
+class RiskHistoryDaily(RiskRollupBaseSchema, table=True):
+    __tablename__: ClassVar[str] = "risk_history_daily"
+
+    bucket: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=True), primary_key=True)
+    )
@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from sqlmodel import Field, SQLModel
+
+from backend.app.core.ml.schema import FraudDecisionEnum, RiskLevelEnum
+
+
+# Điểm gian lận của một giao dịch theo một phiên bản model
+class FraudScoreBaseSchema(SQLModel):
+    transaction_id: uuid.UUID
+    model_version: str = Field(max_length=100)
+    score: float = Field(ge=0, le=1)
+    risk_level: RiskLevelEnum
+    decision: FraudDecisionEnum
+
+
+# Trạng thái của giao dịch trong hàng đợi review
+class ReviewStatusEnum(str, Enum):
+    PENDING = "pending"
+    IN_REVIEW = "in_review"
+    APPROVED = "approved"
+    CONFIRMED_FRAUD = "confirmed_fraud"
+
+
+# Kết luận của người review
+class ReviewOutcomeEnum(str, Enum):
+    APPROVED = "approved"
+    CONFIRMED_FRAUD = "confirmed_fraud"
+
+
+# Giao dịch bị model/luật đánh dấu cần người xem xét
+class FraudReviewBaseSchema(SQLModel):
+    transaction_id: uuid.UUID
+    user_id: uuid.UUID | None = None
+    score: float = Field(ge=0, le=1)
+    decision: FraudDecisionEnum
+    model_version: str = Field(max_length=100)
+
+
+class FraudReviewReadSchema(FraudReviewBaseSchema):
+    id: uuid.UUID
+    status: ReviewStatusEnum
+    rule_hits: list[str]
+    created_at: datetime
+    claimed_by: uuid.UUID | None
+    claimed_at: datetime | None
+    resolved_at: datetime | None
+    note: str | None
+
+
+# Một trang của hàng đợi, next_cursor rỗng khi đã hết
+class FraudReviewPageSchema(SQLModel):
+    items: list[FraudReviewReadSchema]
+    next_cursor: str | None = None
+
+
+class FraudReviewResolveSchema(SQLModel):
+    outcome: ReviewOutcomeEnum
+    note: str | None = Field(default=None, max_length=1000)
+
+
+# Độ phân giải của lịch sử rủi ro: từng lần chấm điểm hoặc bảng gộp theo giờ/ngày
+class RiskResolutionEnum(str, Enum):
+    RAW = "raw"
+    HOUR = "hour"
+    DAY = "day"
+
+
+# Một lần chấm điểm của user, lưu trong bảng phân vùng theo tháng
+class RiskHistoryBaseSchema(SQLModel):
+    user_id: uuid.UUID
+    transaction_id: uuid.UUID
+    scored_at: datetime
+    score: float = Field(ge=0, le=1)
+    decision: FraudDecisionEnum
+    model_version: str = Field(max_length=100)
+
+
+# Số liệu gộp của một user trong một giờ/ngày
+class RiskRollupBaseSchema(SQLModel):
+    user_id: uuid.UUID = Field(primary_key=True)
+    bucket: datetime = Field(primary_key=True)
+    events: int
+    score_sum: float
+    score_max: float
+    flagged: int
+
+
+class RiskHistoryPointSchema(SQLModel):
+    bucket: datetime
+    events: int
+    avg_score: float
+    max_score: float
+    flagged: int
+
+
+class RiskHistoryResponseSchema(SQLModel):
+    user_id: uuid.UUID
+    resolution: RiskResolutionEnum
+    points: list[RiskHistoryPointSchema]
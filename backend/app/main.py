@@ -1,75 +1,93 @@
-import asyncio
-import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, status
 from fastapi.responses import JSONResponse
 
 from backend.app.api.main import api_router
+from backend.app.auth.revocation import token_revocation
 from backend.app.core.config import settings
-from backend.app.core.db import engine, init_db
+from backend.app.core.db import engine
 from backend.app.core.health import ServiceStatus, health_checker
 from backend.app.core.logging import get_logger
-# from backend.app.core.rate_limit.middleware import RateLimitMiddleware
+from backend.app.core.metrics import metrics_response
+from backend.app.core.ml.drift import drift_accumulator
+from backend.app.core.ml.entity_graph import entity_graph
+from backend.app.core.ml.risk_history import risk_history_recorder
+from backend.app.core.ml.model_manager import fraud_model_manager
+from backend.app.core.ml.rules import fraud_rules
+from backend.app.core.ml.scoring import fraud_scorer
+from backend.app.core.ml.shadow import shadow_scorer
+from backend.app.core.rate_limit.middleware import RateLimitMiddleware
+from backend.app.core.redis_client import close_redis
+from backend.app.core.startup import startup_orchestrator
 
 logger = get_logger()
 
 
-async def startup_health_check(timeout: float = 90.0) -> bool:
-    try:
-        async with asyncio.timeout(timeout):
-            retry_intervals = [1, 2, 5, 10, 15]
-            start_time = time.time()
-
-            while True:
-                is_healthy = await health_checker.wait_for_services()
-                if is_healthy:
-                    return True
-                elapsed = time.time() - start_time
-                if elapsed >= timeout:
-                    logger.error("Services failed health check during startup")
-                    return False
-                wait_time = retry_intervals[
-                    min(len(retry_intervals) - 1, int(elapsed / 10))
-                ]
-                logger.warning(
-                    f"Services not healthy, waiting {wait_time}s before retry"
-                )
-                await asyncio.sleep(wait_time)
-    except asyncio.TimeoutError:
-        logger.error(f"Health check timed out after {timeout} seconds")
-        return False
-    except Exception as e:
-        logger.error(f"Error during startup health check: {e}")
-        return False
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     try:
-        await init_db()
-        logger.info("Database initialized successfully")
-
-        await health_checker.add_service("database", health_checker.check_database)
-        await health_checker.add_service("celery", health_checker.check_celery)
-        await health_checker.add_service("redis", health_checker.check_redis)
-
-        if not await startup_health_check():
-            raise RuntimeError("Critical services failed to start")
-
-        logger.info("All services initialized and healthy")
+        with startup_orchestrator.phase("total"):
+            # Kiểm tra song song Postgres, Redis, RabbitMQ (không dùng cache health check)
+            if not await startup_orchestrator.run():
+                raise RuntimeError("Critical services failed to start")
+
+            with startup_orchestrator.phase("register_services"):
+                await health_checker.add_service(
+                    "database", health_checker.check_database
+                )
+                await health_checker.add_service("celery", health_checker.check_celery)
+                await health_checker.add_service("redis", health_checker.check_redis)
+                health_checker.invalidate_cache()
+
+            with startup_orchestrator.phase("background_tasks"):
+                token_revocation.start()
+
+            with startup_orchestrator.phase("fraud_model"):
+                # Thiếu model không chặn khởi động, endpoint chấm điểm trả 503.
+                # Khi gunicorn preload, model đã được nạp ở master -> không nạp lại
+                try:
+                    await fraud_model_manager.refresh()
+                except Exception as e:
+                    logger.error(f"Failed to load fraud model: {e}")
+                fraud_model_manager.start()
+                if settings.FRAUD_SHADOW_ENABLED:
+                    # Model challenger được nạp trong tiến trình shadow, không nạp ở đây
+                    shadow_scorer.start()
+                if settings.FRAUD_DRIFT_ENABLED:
+                    drift_accumulator.start()
+                if settings.FRAUD_RULES_ENABLED:
+                    try:
+                        fraud_rules.load()
+                    except Exception as e:
+                        logger.error(f"Failed to load fraud rules: {e}")
+                    fraud_rules.start()
+                if settings.FRAUD_GRAPH_ENABLED:
+                    await entity_graph.start()
+                if settings.FRAUD_RISK_HISTORY_ENABLED:
+                    risk_history_recorder.start()
+
+        logger.info(f"Application ready: {startup_orchestrator.report()}")
         yield
     except Exception as e:
         logger.error(f"Application startup failed: {e}")
-        await engine.dispose()
-        await health_checker.cleanup()
         raise
     finally:
         logger.info("Shutting down")
+        await startup_orchestrator.shutdown()
+        await token_revocation.stop()
+        await fraud_scorer.close()
+        await shadow_scorer.close()
+        await drift_accumulator.close()
+        await fraud_rules.stop()
+        await entity_graph.stop()
+        # Ghi nốt lịch sử rủi ro còn trong bộ đệm trước khi đóng engine
+        await risk_history_recorder.close()
+        await fraud_model_manager.stop()
         await engine.dispose()
         await health_checker.cleanup()
-    await init_db()
-    yield
+        await close_redis()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -102,5 +120,21 @@ async def health_check():
         )
 
 
-# app.add_middleware(RateLimitMiddleware)
+@app.get("/health/ready", response_model=dict)
+async def readiness_check():
+    """Trạng thái sẵn sàng và thời gian từng giai đoạn khởi động"""
+    report = startup_orchestrator.report()
+    status_code = (
+        status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    return JSONResponse(status_code=status_code, content=report)
+
+
+# Hàm đồng bộ để collector hàng đợi Celery (gọi broker/Redis) chạy trong threadpool
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
+
+
+app.add_middleware(RateLimitMiddleware)
 app.include_router(api_router, prefix=settings.API_V1_STR)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class TransactionTypeEnum(str, Enum):
+    Deposit = "Deposit"
+    Withdrawal = "Withdrawal"
+    Transfer = "Transfer"
+
+
+# Chiều của dòng bút toán trên tài khoản: Debit trừ tiền, Credit cộng tiền
+class TransactionDirectionEnum(str, Enum):
+    Debit = "Debit"
+    Credit = "Credit"
+
+
+class TransactionStatusEnum(str, Enum):
+    Pending = "Pending"
+    Completed = "Completed"
+    Failed = "Failed"
@@ -0,0 +1,81 @@
+import uuid
+from datetime import datetime, timezone
+from typing import ClassVar
+
+from sqlalchemy import Index, UniqueConstraint, text
+from sqlalchemy.dialects import postgresql as pg
+from sqlmodel import Column, Field
+
+from backend.app.transaction.schema import (
+    LedgerPostingBaseSchema,
+    TransactionBaseSchema,
+)
+
+HISTORY_INCLUDE = [
+    "reference",
+    "transaction_type",
+    "direction",
+    "amount",
+    "balance_after",
+    "currency",
+    "description",
+    "status",
+    "counterparty_account_id",
+]
+
+
+class Transaction(TransactionBaseSchema, table=True):
+    __tablename__: ClassVar[str] = "transactions"
+    # Sao kê và lịch sử giao dịch đọc theo tài khoản, theo thời gian. Các cột còn lại
+    # nằm trong INCLUDE để trang lịch sử (kể cả khi lọc theo số tiền) là index-only scan
+    __table_args__ = (
+        Index(
+            "ix_transactions_history",
+            "account_id",
+            "created_at",
+            "id",
+            postgresql_include=HISTORY_INCLUDE,
+        ),
+    )
+
+    id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            primary_key=True,
+        ),
+        default_factory=uuid.uuid4,
+    )
+    account_id: uuid.UUID = Field(foreign_key="bank_accounts.id", ondelete="CASCADE")
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=text("CURRENT_TIMESTAMP"),
+        ),
+    )
+
+
+class LedgerPosting(LedgerPostingBaseSchema, table=True):
+    __tablename__: ClassVar[str] = "ledger_postings"
+    __table_args__ = (
+        UniqueConstraint(
+            "initiated_by", "idempotency_key", name="uq_ledger_postings_idempotency"
+        ),
+    )
+
+    id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            primary_key=True,
+        ),
+        default_factory=uuid.uuid4,
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=text("CURRENT_TIMESTAMP"),
+        ),
+    )
@@ -0,0 +1,95 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlmodel import Field, SQLModel
+
+from backend.app.bank_account.enums import AccountCurrencyEnum
+from backend.app.transaction.enums import (
+    TransactionDirectionEnum,
+    TransactionStatusEnum,
+    TransactionTypeEnum,
+)
+
+
+# Một dòng bút toán trên một tài khoản; các dòng của cùng nghiệp vụ chung reference
+class TransactionBaseSchema(SQLModel):
+    reference: str = Field(max_length=40, index=True)
+    transaction_type: TransactionTypeEnum
+    direction: TransactionDirectionEnum
+    amount: Decimal = Field(gt=0, max_digits=18, decimal_places=2)
+    # Số dư tài khoản ngay sau dòng này
+    balance_after: Decimal = Field(max_digits=18, decimal_places=2)
+    currency: AccountCurrencyEnum
+    description: str = Field(default="", max_length=255)
+    status: TransactionStatusEnum = Field(default=TransactionStatusEnum.Completed)
+    # Tài khoản đối ứng của giao dịch chuyển khoản
+    counterparty_account_id: uuid.UUID | None = None
+
+
+class TransactionReadSchema(TransactionBaseSchema):
+    id: uuid.UUID
+    account_id: uuid.UUID
+    created_at: datetime
+
+
+# Tổng của cả cửa sổ lọc (khoảng ngày, khoảng số tiền), không chỉ của trang hiện tại
+class TransactionSummarySchema(SQLModel):
+    count: int
+    total_debit: Decimal
+    total_credit: Decimal
+
+
+class TransactionHistoryPageSchema(SQLModel):
+    items: list[TransactionReadSchema]
+    next_cursor: str | None = None
+    summary: TransactionSummarySchema | None = None
+
+
+# Bút toán kép của một nghiệp vụ: tiền rời debit_account sang credit_account, None là
+# quỹ tiền mặt bên ngoài hệ thống (nộp/rút tại quầy)
+class LedgerPostingBaseSchema(SQLModel):
+    reference: str = Field(max_length=40, unique=True)
+    transaction_type: TransactionTypeEnum
+    amount: Decimal = Field(gt=0, max_digits=18, decimal_places=2)
+    currency: AccountCurrencyEnum
+    debit_account_id: uuid.UUID | None = None
+    credit_account_id: uuid.UUID | None = None
+    description: str = Field(default="", max_length=255)
+    # Người thực hiện; khóa idempotency là duy nhất theo từng người
+    initiated_by: uuid.UUID
+    idempotency_key: str | None = Field(default=None, max_length=64)
+    # Băm nội dung yêu cầu: cùng khóa nhưng khác nội dung thì từ chối
+    request_hash: str = Field(max_length=64)
+
+
+class DepositRequestSchema(SQLModel):
+    account_number: str = Field(max_length=20)
+    amount: Decimal = Field(gt=0, max_digits=18, decimal_places=2)
+    description: str = Field(default="", max_length=255)
+
+
+class WithdrawalRequestSchema(SQLModel):
+    account_id: uuid.UUID
+    amount: Decimal = Field(gt=0, max_digits=18, decimal_places=2)
+    description: str = Field(default="", max_length=255)
+
+
+class TransferRequestSchema(SQLModel):
+    from_account_id: uuid.UUID
+    to_account_number: str = Field(max_length=20)
+    amount: Decimal = Field(gt=0, max_digits=18, decimal_places=2)
+    description: str = Field(default="", max_length=255)
+
+
+class PostingResultSchema(SQLModel):
+    reference: str
+    transaction_type: TransactionTypeEnum
+    amount: Decimal
+    currency: AccountCurrencyEnum
+    # Tài khoản của người gọi và số dư của nó sau bút toán
+    account_id: uuid.UUID
+    balance_after: Decimal
+    created_at: datetime
+    # True khi trả lại kết quả cũ của cùng khóa idempotency
+    replayed: bool = False
@@ -0,0 +1,150 @@
+"""
+Mô phỏng thời gian xả hàng đợi email khi có đợt tải đột biến.
+
+Message thật được publish vào broker in-memory của kombu (`memory://`), worker được
+mô phỏng theo đồng hồ ảo: mỗi process lấy một message và bận trong thời gian chạy
+ngẫu nhiên của task. So sánh concurrency cố định với ScalingController.
+
+Chạy: python -m backend.benchmarks.celery_autoscale [--burst 600] [--task-seconds 1.2]
+"""
+import argparse
+import random
+from dataclasses import dataclass
+
+from kombu import Connection, Exchange, Queue
+
+from backend.app.core.autoscale import ScalingController
+from backend.app.core.config import settings
+
+QUEUE_NAME = "nextgen_bulk"
+TICK_SECONDS = 0.5
+
+
+@dataclass
+class SimulationResult:
+    label: str
+    drain_seconds: float
+    process_seconds: float
+    peak_processes: int
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def publish(conn: Connection, queue: Queue, count: int) -> None:
+    producer = conn.Producer()
+    for i in range(count):
+        producer.publish(
+            {"task": "send_email_tasks", "id": i},
+            exchange=queue.exchange,
+            routing_key=queue.routing_key,
+            declare=[queue],
+        )
+
+
+def queue_depth(conn: Connection, name: str) -> int:
+    _, message_count, _ = conn.default_channel.queue_declare(queue=name, passive=True)
+    return message_count
+
+
+def simulate(
+    label: str,
+    bursts: list[tuple[float, int]],
+    task_seconds: float,
+    min_concurrency: int,
+    max_concurrency: int,
+    autoscale: bool,
+    seed: int,
+) -> SimulationResult:
+    rng = random.Random(seed)
+    clock = Clock()
+    controller = ScalingController(
+        min_concurrency=min_concurrency,
+        max_concurrency=max_concurrency,
+        target_drain_seconds=settings.CELERY_AUTOSCALE_TARGET_DRAIN_SECONDS,
+        scale_up_cooldown=settings.CELERY_AUTOSCALE_UP_COOLDOWN_SECONDS,
+        scale_down_cooldown=settings.CELERY_AUTOSCALE_DOWN_COOLDOWN_SECONDS,
+        default_task_seconds=settings.CELERY_AUTOSCALE_DEFAULT_TASK_SECONDS,
+        clock=clock,
+    )
+    queue = Queue(QUEUE_NAME, Exchange(QUEUE_NAME), routing_key=QUEUE_NAME)
+    pending_bursts = sorted(bursts)
+    last_burst_at = pending_bursts[-1][0]
+    processes = min_concurrency if autoscale else max_concurrency
+    # (thời điểm xong, thời gian chạy) của từng process đang chạy task
+    running: list[tuple[float, float]] = []
+    process_seconds = 0.0
+    peak = processes
+    next_poll = 0.0
+
+    with Connection("memory://") as conn:
+        queue(conn.default_channel).declare()
+        simple = conn.SimpleQueue(queue)
+        while True:
+            while pending_bursts and pending_bursts[0][0] <= clock.now:
+                publish(conn, queue, pending_bursts.pop(0)[1])
+
+            completed = [d for end, d in running if end <= clock.now]
+            running = [(end, d) for end, d in running if end > clock.now]
+            controller.observe_durations(sum(completed), len(completed))
+
+            depth = queue_depth(conn, QUEUE_NAME)
+            if autoscale and clock.now >= next_poll:
+                next_poll = clock.now + settings.CELERY_AUTOSCALE_POLL_SECONDS
+                processes = controller.decide(processes, depth, len(running))
+                peak = max(peak, processes)
+
+            while len(running) < processes and depth > 0:
+                message = simple.get(block=False)
+                message.ack()
+                duration = rng.expovariate(1 / task_seconds)
+                running.append((clock.now + duration, duration))
+                depth -= 1
+
+            if not running and depth == 0 and clock.now >= last_burst_at:
+                break
+            process_seconds += processes * TICK_SECONDS
+            clock.now += TICK_SECONDS
+        simple.close()
+
+    return SimulationResult(label, clock.now, process_seconds, peak)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", type=int, default=600)
+    parser.add_argument("--second-burst", type=int, default=300)
+    parser.add_argument("--task-seconds", type=float, default=1.2)
+    parser.add_argument("--min", type=int, default=2)
+    parser.add_argument("--max", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    bursts = [(0.0, args.burst), (120.0, args.second_burst)]
+    scenarios = [
+        (f"fixed concurrency={args.min}", args.min, args.min, False),
+        (f"fixed concurrency={args.max}", args.max, args.max, False),
+        (f"autoscale {args.max},{args.min}", args.min, args.max, True),
+    ]
+    print(
+        f"bursts={bursts} mean task={args.task_seconds}s "
+        f"target drain={settings.CELERY_AUTOSCALE_TARGET_DRAIN_SECONDS}s"
+    )
+    print(f"{'scenario':<26}{'drain (s)':>12}{'process-s':>12}{'peak':>6}")
+    for label, low, high, autoscale in scenarios:
+        result = simulate(
+            label, bursts, args.task_seconds, low, high, autoscale, args.seed
+        )
+        print(
+            f"{result.label:<26}{result.drain_seconds:>12.1f}"
+            f"{result.process_seconds:>12.0f}{result.peak_processes:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Kiểm tra và đo đồ thị liên kết thực thể: cụm của union-find phải khớp với BFS trên
+đồ thị user-thuộc tính, hai worker đồng bộ qua Redis stream (fakeredis) phải thấy cùng
+cụm, dựng lại sau khi đổi hồ sơ phải tách cụm cũ; rồi đo thời gian dựng, tra cụm,
+ghi/nạp snapshot.
+
+Chạy: python -m backend.benchmarks.entity_graph [--profiles 200000] [--rings 2000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict, deque
+from types import SimpleNamespace
+
+import fakeredis
+
+from backend.app.core.ml.entity_graph import (
+    ADDRESS,
+    DEVICE,
+    EMPLOYER,
+    PHONE,
+    PROFILE_ATTRIBUTES,
+    EntityGraph,
+    EntityGraphService,
+)
+
+
+def generate_profiles(
+    count: int, rings: int, rng: random.Random
+) -> list[tuple[str, dict[str, str]]]:
+    """Phần lớn user có thuộc tính riêng; nhóm gian lận dùng chung điện thoại/địa chỉ"""
+    profiles = []
+    for i in range(count):
+        attributes = {
+            PHONE: f"849{i:08d}",
+            ADDRESS: f"{i} street {i % 97} hanoi vietnam",
+            # Vài công ty lớn có rất nhiều nhân viên
+            EMPLOYER: f"employer {rng.randrange(count // 3) if rng.random() < 0.7 else rng.randrange(5)}",
+        }
+        if i < rings * 5:
+            ring = i // 5
+            shared = rng.choice([PHONE, ADDRESS])
+            attributes[shared] = f"ring-{ring}-{shared}"
+        profiles.append((f"user-{i}", attributes))
+    return profiles
+
+
+def expected_sizes(
+    events: list[tuple[str, str, str]], max_degree: int
+) -> dict[str, int]:
+    """BFS trên cạnh user-thuộc tính, thuộc tính chỉ nhận max_degree user đầu tiên"""
+    members: dict[tuple[str, str], list[str]] = defaultdict(list)
+    adjacency: dict[str, set[tuple[str, str]]] = defaultdict(set)
+    for user, kind, value in events:
+        attribute = (kind, value)
+        adjacency.setdefault(user, set())
+        if user in members[attribute] or len(members[attribute]) >= max_degree:
+            continue
+        members[attribute].append(user)
+        adjacency[user].add(attribute)
+
+    sizes: dict[str, int] = {}
+    for start in adjacency:
+        if start in sizes:
+            continue
+        component, queue, seen = [start], deque([start]), {start}
+        while queue:
+            user = queue.popleft()
+            for attribute in adjacency[user]:
+                for other in members[attribute]:
+                    if other not in seen:
+                        seen.add(other)
+                        component.append(other)
+                        queue.append(other)
+        for user in component:
+            sizes[user] = len(component)
+    return sizes
+
+
+def check_against_bfs(graph: EntityGraph, events: list[tuple[str, str, str]]) -> None:
+    expected = expected_sizes(events, graph.max_degree)
+    for user, size in expected.items():
+        got = graph.cluster(user).size
+        if got != size:
+            raise AssertionError(f"{user}: cluster size {got} != {size}")
+
+
+async def check_stream_sync(rng: random.Random) -> None:
+    server = fakeredis.FakeServer()
+    writer = EntityGraphService(
+        fakeredis.aioredis.FakeRedis(server=server, decode_responses=True), "", 1, 50, 10_000, 10_000
+    )
+    reader = EntityGraphService(
+        fakeredis.aioredis.FakeRedis(server=server, decode_responses=True), "", 1, 50, 10_000, 10_000
+    )
+    for i in range(200):
+        await writer.publish_profile(
+            SimpleNamespace(
+                user_id=f"u{i}",
+                phone_number=f"+84 90{i % 40:05d}",
+                address=f"{i} Le Loi",
+                city="Hue",
+                country="Vietnam",
+                employer_name=f"Shop {i}",
+                employer_city="Hue",
+            )
+        )
+        writer.observe_device(f"u{i}", f"dev-{rng.randrange(150)}")
+        if i % 50 == 0:
+            writer.flag(f"u{i}")
+    await writer.sync()
+    await reader.sync()
+    for i in range(200):
+        assert writer.cluster(f"u{i}") == reader.cluster(f"u{i}"), i
+    print(f"stream sync: two workers agree on {len(reader.graph)} users")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=200_000)
+    parser.add_argument("--rings", type=int, default=2_000)
+    parser.add_argument("--max-degree", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    profiles = generate_profiles(args.profiles, args.rings, rng)
+    devices = [(f"user-{rng.randrange(args.profiles)}", f"dev-{rng.randrange(args.profiles)}") for _ in range(args.profiles // 2)]
+
+    started = time.perf_counter()
+    graph = EntityGraph.rebuild(profiles, args.max_degree)
+    for user, device in devices:
+        graph.add_device(user, device)
+    build = time.perf_counter() - started
+    print(f"build: {len(graph)} users, {graph.link_count} links in {build:.2f}s")
+
+    events = [(u, kind, a[kind]) for u, a in profiles for kind in PROFILE_ATTRIBUTES]
+    events += [(u, DEVICE, d) for u, d in devices]
+    check_against_bfs(graph, events)
+    ring_sizes = [graph.cluster(f"user-{i * 5}").size for i in range(args.rings)]
+    print(f"correctness: matches BFS; planted rings have median cluster size {sorted(ring_sizes)[len(ring_sizes) // 2]}")
+
+    users = [f"user-{rng.randrange(args.profiles)}" for _ in range(100_000)]
+    started = time.perf_counter()
+    for user in users:
+        graph.cluster(user)
+    print(f"lookup: {(time.perf_counter() - started) / len(users) * 1e6:.2f}us per cluster()")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.pkl")
+        started = time.perf_counter()
+        graph.save(path)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        loaded = EntityGraph.load(path)
+        load = time.perf_counter() - started
+        print(
+            f"snapshot: {os.path.getsize(path) / 1e6:.1f}MB, save {saved:.2f}s, "
+            f"load {load:.2f}s (vs {build:.2f}s rebuild)"
+        )
+        assert all(loaded.cluster(u) == graph.cluster(u) for u in users[:1000])
+
+    # Đổi số điện thoại của nhóm: union-find giữ liên kết cũ tới khi dựng lại
+    changed = dict(profiles)
+    for i in range(0, args.rings * 5):
+        user = f"user-{i}"
+        attributes = {**changed[user], PHONE: f"new-{i}", ADDRESS: f"new address {i}"}
+        changed[user] = attributes
+        graph.set_profile(user, attributes)
+    print(f"after profile changes: stale ratio {graph.stale_ratio:.3f}, ring cluster still {graph.cluster('user-0').size}")
+    rebuilt = EntityGraph.rebuild(changed.items(), args.max_degree, previous=graph)
+    check_against_bfs(
+        rebuilt,
+        [(u, kind, a[kind]) for u, a in changed.items() for kind in PROFILE_ATTRIBUTES]
+        + [(u, DEVICE, d) for u, d in devices],
+    )
+    print(f"rebuild: stale links dropped, ring cluster now {rebuilt.cluster('user-0').size}, devices kept")
+
+    asyncio.run(check_stream_sync(rng))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Đo thông lượng (rows/s), đỉnh bộ nhớ và khả năng chạy tiếp từ checkpoint của job
+chấm điểm lại giao dịch lịch sử trên dữ liệu Parquet giả lập, ghi kết quả ra Parquet.
+
+Chạy: python -m backend.benchmarks.fraud_backfill [--rows 1000000] [--workers 1 4]
+"""
+import argparse
+import asyncio
+import pathlib
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from backend.app.core.config import settings
+from backend.app.core.ml.backfill import ParquetScoreSink, run_backfill
+from backend.app.core.ml.schema import TransactionTypeEnum
+from backend.app.core.ml.synthetic import SYNTHETIC_MODEL_VERSION, save_artifact, train_model
+
+
+class InterruptedSink(ParquetScoreSink):
+    """Giả lập job bị ngắt sau một số lô"""
+
+    def __init__(self, directory: str, fail_after: int):
+        super().__init__(directory)
+        self.fail_after = fail_after
+
+    async def write(self, index, transaction_ids, scores, version) -> None:
+        if self.fail_after == 0:
+            raise RuntimeError("simulated crash")
+        self.fail_after -= 1
+        await super().write(index, transaction_ids, scores, version)
+
+
+def write_transactions(directory: pathlib.Path, rows: int, files: int) -> None:
+    rng = np.random.default_rng(3)
+    types = np.array([t.value for t in TransactionTypeEnum])
+    start = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp() * 1_000_000)
+    per_file = rows // files
+    for i in range(files):
+        n = per_file
+        table = pa.table(
+            {
+                "transaction_id": [f"{i:08x}-0000-4000-8000-{j:012x}" for j in range(n)],
+                "amount": rng.lognormal(4, 1, n).round(2),
+                "transaction_type": types[rng.integers(0, len(types), n)],
+                "occurred_at": pa.array(
+                    start + rng.integers(0, 180 * 86_400_000_000, n), pa.timestamp("us", tz="UTC")
+                ),
+                "is_international": rng.random(n) < 0.05,
+                "account_age_days": rng.integers(0, 3650, n),
+                "txn_count_1h": rng.poisson(0.5, n),
+                "txn_count_24h": rng.poisson(3, n),
+                "amount_sum_24h": rng.lognormal(5, 1, n),
+                "avg_amount_30d": rng.lognormal(4, 0.6, n),
+            }
+        )
+        pq.write_table(table, directory / f"transactions-{i:03d}.parquet", row_group_size=100_000)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        data = root / "transactions"
+        data.mkdir()
+        write_transactions(data, args.rows, args.files)
+        model_path = root / "model.joblib"
+        save_artifact(train_model(rows=20_000, n_estimators=args.trees), model_path, SYNTHETIC_MODEL_VERSION)
+        settings.FRAUD_MODEL_SOURCE = "file"
+        settings.FRAUD_MODEL_PATH = str(model_path)
+        print(f"{args.rows} rows in {args.files} files, batch size {args.batch_size}")
+
+        for workers in args.workers:
+            output = root / f"scores-{workers}"
+            result = await run_backfill(
+                str(data),
+                ParquetScoreSink(str(output)),
+                args.batch_size,
+                workers,
+                2 * workers,
+                root / f"checkpoint-{workers}.json",
+            )
+            print(
+                f"workers={workers:<3}{result.rows_per_second:>12.0f} rows/s"
+                f"{result.peak_rss_bytes / 2**20:>10.0f} MiB main"
+                f"{result.peak_worker_rss_bytes / 2**20:>10.0f} MiB worker"
+            )
+
+        # Ngắt sau 3 lô rồi chạy tiếp: tổng số dòng phải đúng bằng dữ liệu vào
+        output = root / "scores-resume"
+        checkpoint = root / "checkpoint-resume.json"
+        try:
+            await run_backfill(
+                str(data), InterruptedSink(str(output), 3), args.batch_size, 2, 2, checkpoint
+            )
+        except RuntimeError:
+            pass
+        result = await run_backfill(
+            str(data), ParquetScoreSink(str(output)), args.batch_size, 2, 4, checkpoint
+        )
+        written = ds.dataset(output).count_rows()
+        print(
+            f"resume: skipped {result.skipped_batches} batches, scored {result.rows} more rows, "
+            f"{written}/{args.rows} rows written"
+        )
+        assert written == args.rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
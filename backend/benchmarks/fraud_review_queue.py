@@ -0,0 +1,215 @@
+"""
+Đo hàng đợi review giao dịch bị đánh dấu với nhiều người review đồng thời: mỗi
+người nhận việc (SKIP LOCKED), "xem" một lúc rồi kết luận. So với FOR UPDATE thường
+(người sau chờ lock của người trước), kiểm tra không giao dịch nào bị nhận hai lần,
+rồi so phân trang keyset với OFFSET ở trang sâu.
+
+Chạy trong schema tạm (xóa khi xong) trên DATABASE_URL:
+python -m backend.benchmarks.fraud_review_queue [--items 20000] [--reviewers 1 8 32]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.services.fraud_review import (
+    QUEUE_ORDER,
+    claim_reviews,
+    list_reviews,
+    resolve_review,
+)
+from backend.app.core.config import settings
+from backend.app.core.ml.schema import FraudDecisionEnum
+from backend.app.fraud.models import FraudReview
+from backend.app.fraud.schema import ReviewOutcomeEnum, ReviewStatusEnum
+
+SCHEMA = "fraud_review_benchmark"
+
+
+async def plain_claim(reviewer_id: uuid.UUID, count: int, session: AsyncSession) -> list[FraudReview]:
+    """Cùng truy vấn nhưng không SKIP LOCKED: các người review xếp hàng chờ nhau"""
+    ids = (
+        select(FraudReview.id)
+        .where(FraudReview.status == ReviewStatusEnum.PENDING)
+        .order_by(*QUEUE_ORDER)
+        .limit(count)
+        .with_for_update()
+    )
+    statement = (
+        update(FraudReview)
+        .where(FraudReview.id.in_(ids.scalar_subquery()))
+        .values(
+            status=ReviewStatusEnum.IN_REVIEW,
+            claimed_by=reviewer_id,
+            claimed_at=datetime.now(timezone.utc),
+        )
+        .returning(FraudReview)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.exec(statement)
+    reviews = list(result.scalars().all())
+    await session.commit()
+    return reviews
+
+
+async def seed(sessionmaker, items: int, rng: random.Random) -> None:
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "transaction_id": uuid.uuid4(),
+            "user_id": None,
+            "score": round(rng.betavariate(2, 5), 4),
+            "decision": FraudDecisionEnum.REVIEW,
+            "model_version": "benchmark",
+            "rule_hits": [],
+            "status": ReviewStatusEnum.PENDING,
+            "created_at": now - timedelta(seconds=rng.randrange(86_400)),
+        }
+        for _ in range(items)
+    ]
+    async with sessionmaker() as session:
+        await session.exec(text("TRUNCATE fraud_reviews"))
+        for start in range(0, items, 5000):
+            await session.exec(FraudReview.__table__.insert(), params=rows[start : start + 5000])
+        await session.commit()
+        await session.exec(text("ANALYZE fraud_reviews"))
+
+
+async def run_reviewers(sessionmaker, reviewers: int, batch: int, think_ms: float, claim) -> dict:
+    claimed: list[uuid.UUID] = []
+    latencies: list[float] = []
+    empty_claims = 0
+
+    async def reviewer() -> None:
+        nonlocal empty_claims
+        reviewer_id = uuid.uuid4()
+        async with sessionmaker() as session:
+            while True:
+                started = time.perf_counter()
+                reviews = await claim(reviewer_id, batch, session)
+                latencies.append(time.perf_counter() - started)
+                if not reviews:
+                    # Hàng đợi có thể vẫn còn việc nhưng các dòng đầu đã bị người khác nhận
+                    empty_claims += 1
+                    pending = await session.exec(
+                        select(FraudReview.id)
+                        .where(FraudReview.status == ReviewStatusEnum.PENDING)
+                        .limit(1)
+                    )
+                    if pending.first() is None:
+                        return
+                    continue
+                for review in reviews:
+                    claimed.append(review.id)
+                    await asyncio.sleep(think_ms / 1000)
+                    await resolve_review(
+                        review.id, reviewer_id, ReviewOutcomeEnum.APPROVED, None, session
+                    )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(reviewer() for _ in range(reviewers)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "resolved": len(claimed),
+        "duplicates": len(claimed) - len(set(claimed)),
+        "per_second": len(claimed) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "empty_claims": empty_claims,
+    }
+
+
+async def compare_paging(sessionmaker, page_size: int, depth: int) -> None:
+    async with sessionmaker() as session:
+        await session.exec(text("UPDATE fraud_reviews SET status = 'PENDING'"))
+        await session.commit()
+
+        cursor = None
+        for _ in range(depth):
+            _, cursor = await list_reviews(session, ReviewStatusEnum.PENDING, page_size, cursor)
+        started = time.perf_counter()
+        keyset_page, _ = await list_reviews(session, ReviewStatusEnum.PENDING, page_size, cursor)
+        keyset_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        result = await session.exec(
+            select(FraudReview)
+            .where(FraudReview.status == ReviewStatusEnum.PENDING)
+            .order_by(*QUEUE_ORDER)
+            .offset(depth * page_size)
+            .limit(page_size)
+        )
+        offset_page = list(result.all())
+        offset_ms = (time.perf_counter() - started) * 1000
+        assert [r.id for r in keyset_page] == [r.id for r in offset_page]
+
+        plan = await session.exec(
+            text(
+                "EXPLAIN SELECT id FROM fraud_reviews WHERE status = 'PENDING' "
+                "ORDER BY score DESC, created_at, id LIMIT 20 FOR UPDATE SKIP LOCKED"
+            )
+        )
+        uses_index = any("ix_fraud_reviews_queue" in row[0] for row in plan.all())
+    print(
+        f"page {depth + 1} of {page_size}: keyset {keyset_ms:.2f}ms, "
+        f"OFFSET {offset_ms:.2f}ms; claim query uses queue index: {uses_index}"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    admin = create_async_engine(settings.DATABASE_URL)
+    async with admin.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        pool_size=max(args.reviewers) + 2,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(FraudReview.metadata.create_all, tables=[FraudReview.__table__])
+
+        rng = random.Random(args.seed)
+        for mode, claim in (("skip locked", claim_reviews), ("for update", plain_claim)):
+            for reviewers in args.reviewers:
+                await seed(sessionmaker, args.items, rng)
+                stats = await run_reviewers(sessionmaker, reviewers, args.batch, args.think_ms, claim)
+                assert stats["resolved"] == args.items and stats["duplicates"] == 0, stats
+                print(
+                    f"{mode:>11} x{reviewers:<3} {stats['per_second']:8.0f} reviews/s  "
+                    f"claim p50 {stats['p50_ms']:6.2f}ms p99 {stats['p99_ms']:7.2f}ms  "
+                    f"empty claims {stats['empty_claims']}"
+                )
+        await compare_paging(sessionmaker, args.page_size, args.items // args.page_size // 2)
+    finally:
+        await engine.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await admin.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--reviewers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--batch", type=int, default=5, help="Số việc mỗi lần nhận")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Thời gian xem mỗi giao dịch")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=5)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Kiểm tra và đo bộ luật gian lận: kết quả của luật đã biên dịch phải khớp với cách
+duyệt cây biểu thức cho từng giao dịch, file luật được nạp lại khi đổi (file lỗi giữ
+bộ luật cũ), rồi so thời gian đánh giá mỗi giao dịch và độ trễ đọc hồ sơ từ cache.
+
+Chạy: python -m backend.benchmarks.fraud_rules [--rules 50] [--events 20000]
+"""
+import argparse
+import ast
+import asyncio
+import operator
+import os
+import random
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+
+import fakeredis
+import yaml
+
+from backend.app.core.ml.features import FEATURE_NAMES
+from backend.app.core.ml.profile_cache import ProfileCache
+from backend.app.core.ml.rules import NULLABLE_FACTS, RuleCompileError, RulesEngine
+from backend.app.core.ml.synthetic import generate_transactions
+
+COUNTRIES = ("VN", "US", "SG", "NG", "DE")
+
+_OPERATORS = {
+    ast.And: all,
+    ast.Or: any,
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def interpret(node: ast.AST, facts: dict, profile: dict | None):
+    """Duyệt cây biểu thức cho từng giao dịch (cách làm luật biên dịch thay thế)"""
+    if isinstance(node, ast.BoolOp):
+        values = (interpret(v, facts, profile) for v in node.values)
+        return _OPERATORS[type(node.op)](values)
+    if isinstance(node, ast.UnaryOp):
+        return _OPERATORS[type(node.op)](interpret(node.operand, facts, profile))
+    if isinstance(node, ast.BinOp):
+        return _OPERATORS[type(node.op)](
+            interpret(node.left, facts, profile), interpret(node.right, facts, profile)
+        )
+    if isinstance(node, ast.Compare):
+        left = interpret(node.left, facts, profile)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = interpret(comparator, facts, profile)
+            if not _OPERATORS[type(op)](left, right):
+                return False
+            left = right
+        return True
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return tuple(interpret(e, facts, profile) for e in node.elts)
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Attribute):
+        return profile[node.attr]
+    return facts[node.id]
+
+
+def parse_rules(rules: list[dict]) -> list[tuple[str, ast.AST, set[str]]]:
+    parsed = []
+    for rule in rules:
+        tree = ast.parse(rule["when"], mode="eval").body
+        names = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+        parsed.append((rule["id"], tree, names))
+    return parsed
+
+
+def expected_hits(
+    parsed: list[tuple[str, ast.AST, set[str]]], facts: dict, profile: dict | None
+) -> list[str]:
+    hits = []
+    for rule_id, tree, names in parsed:
+        if any(facts.get(n) is None for n in names & set(NULLABLE_FACTS)):
+            continue
+        if "profile" in names and profile is None:
+            continue
+        if interpret(tree, facts, profile):
+            hits.append(rule_id)
+    return hits
+
+
+def generate_rules(count: int, rng: random.Random) -> list[dict]:
+    templates = [
+        "amount > {amount} and is_new_device and country != profile.country",
+        "account_age_days < {days} and amount > profile.annual_income / {months}",
+        "is_transfer and txn_count_1h >= {count} and distinct_recipients_24h >= {recipients}",
+        "score > {score} or (amount_to_avg_ratio > {ratio} and not is_international)",
+        "country in ('NG', 'KP') and transaction_type == 'transfer' and amount > {amount}",
+        "hour_of_day < 5 and amount_sum_24h > {amount} * 3",
+    ]
+    return [
+        {
+            "id": f"rule_{i}",
+            "action": rng.choice(["review", "block"]),
+            "when": rng.choice(templates).format(
+                amount=rng.choice([100, 500, 2000]),
+                days=rng.choice([30, 365]),
+                months=rng.choice([1, 12]),
+                count=rng.choice([2, 5]),
+                recipients=rng.choice([2, 8]),
+                score=rng.choice([0.3, 0.7]),
+                ratio=rng.choice([2, 5]),
+            ),
+        }
+        for i in range(count)
+    ]
+
+
+def generate_events(count: int, rng: random.Random) -> list[tuple[dict, dict | None]]:
+    features, _ = generate_transactions(count, seed=rng.randrange(1000))
+    events = []
+    for row in features.tolist():
+        facts = dict(zip(FEATURE_NAMES, row))
+        facts["score"] = rng.random()
+        facts["transaction_type"] = "transfer" if facts["is_transfer"] else "card_payment"
+        facts["country"] = rng.choice([None, *COUNTRIES])
+        facts.update(account_id="acc-1", device_id=None, recipient_id=None)
+        profile = rng.choice(
+            [None, {"country": rng.choice(COUNTRIES), "annual_income": rng.choice([6e3, 6e4])}]
+        )
+        events.append((facts, profile))
+    return events
+
+
+def check_reload(path: str, rules: list[dict]) -> RulesEngine:
+    engine = RulesEngine(path, poll_seconds=0)
+    with open(path, "w") as f:
+        yaml.safe_dump({"version": "v1", "rules": rules[:1]}, f)
+    assert engine.load().version == "v1"
+
+    with open(path, "w") as f:
+        yaml.safe_dump({"version": "v2", "rules": rules}, f)
+    # Một số hệ thống file chỉ lưu mtime tới mức giây -> đảm bảo fingerprint đổi
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    assert engine.load().version == "v2" and len(engine.ruleset.rules) == len(rules)
+
+    with open(path, "w") as f:
+        yaml.safe_dump({"version": "bad", "rules": [{"id": "x", "when": "__import__('os')"}]}, f)
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 2_000_000_000))
+    try:
+        engine.load()
+        raise AssertionError("invalid rules file was accepted")
+    except RuleCompileError:
+        pass
+    assert engine.ruleset.version == "v2"
+    print(f"reload: v1 -> v2 picked up, invalid file rejected, still on {engine.ruleset.version}")
+    return engine
+
+
+async def profile_cache_latency(lookups: int) -> None:
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    cache = ProfileCache(redis, maxsize=10_000, ttl_seconds=60)
+    users = [uuid.uuid4() for _ in range(100)]
+    for user_id in users:
+        await cache.put(SimpleNamespace(user_id=user_id, country="VN", annual_income=6e4))
+
+    started = time.perf_counter()
+    for user_id in users:
+        assert (await cache.get(user_id))["country"] == "VN"
+    redis_us = (time.perf_counter() - started) / len(users) * 1e6
+    started = time.perf_counter()
+    for i in range(lookups):
+        await cache.get(users[i % len(users)])
+    local_us = (time.perf_counter() - started) / lookups * 1e6
+    print(f"profile cache: {redis_us:.1f}us per Redis miss (fakeredis), {local_us:.2f}us per local hit")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, default=50)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rules = generate_rules(args.rules, rng)
+    events = generate_events(args.events, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = check_reload(os.path.join(tmp, "rules.yml"), rules)
+
+    parsed = parse_rules(rules)
+    total_hits = 0
+    for facts, profile in events:
+        got = [rule.id for rule in engine.evaluate(facts, profile)]
+        expected = expected_hits(parsed, facts, profile)
+        if got != expected:
+            raise AssertionError(f"{facts} {profile}: {got} != {expected}")
+        total_hits += len(got)
+    print(f"correctness: {len(events)} events x {len(rules)} rules, {total_hits} hits match")
+
+    started = time.perf_counter()
+    for facts, profile in events:
+        expected_hits(parsed, facts, profile)
+    interpreted = (time.perf_counter() - started) / len(events) * 1e6
+    started = time.perf_counter()
+    for facts, profile in events:
+        engine.evaluate(facts, profile)
+    compiled = (time.perf_counter() - started) / len(events) * 1e6
+    print(
+        f"per event with {len(rules)} rules: interpreted {interpreted:.1f}us, "
+        f"compiled {compiled:.1f}us (incl. per-rule timing)"
+    )
+    slowest = max(engine.info()["rules"], key=lambda r: r["avg_microseconds"])
+    print(f"slowest rule: {slowest['id']} {slowest['avg_microseconds']}us ({slowest['when']})")
+
+    asyncio.run(profile_cache_latency(args.events))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+So sánh chấm điểm gian lận từng request (predict_proba mỗi giao dịch) với micro-batch.
+
+Huấn luyện model giả lập, bắn `--requests` request đồng thời vào event loop và đo
+thông lượng cùng độ trễ p50/p99 ở mỗi chế độ.
+
+Chạy: python -m backend.benchmarks.fraud_scoring [--requests 2000] [--batch-size 64]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from backend.app.core.ml.batcher import MicroBatcher
+from backend.app.core.ml.synthetic import generate_transactions, train_model
+
+
+async def run(submit, rows: list[list[float]], concurrency: int) -> list[float]:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(row: list[float]) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await submit(row)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(row) for row in rows))
+    return latencies
+
+
+def report(label: str, latencies: list[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{label:<22}{len(latencies) / elapsed:>10.0f} req/s"
+        f"{p50:>10.2f} ms p50{p99:>10.2f} ms p99"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    model = train_model(rows=20_000, n_estimators=args.trees)
+    model.n_jobs = 1
+    X, _ = generate_transactions(args.requests, seed=7)
+    rows = X.tolist()
+    executor = ThreadPoolExecutor(max_workers=1)
+    loop = asyncio.get_running_loop()
+
+    def predict(batch: list[list[float]]) -> list[float]:
+        return model.predict_proba(np.asarray(batch))[:, 1].tolist()
+
+    async def single(row: list[float]) -> float:
+        return (await loop.run_in_executor(executor, predict, [row]))[0]
+
+    batcher = MicroBatcher(
+        "benchmark",
+        predict,
+        executor,
+        max_batch_size=args.batch_size,
+        max_wait_seconds=args.wait_ms / 1000,
+    )
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.trees} trees")
+    for label, submit in (("per-request", single), ("micro-batched", batcher.submit)):
+        started = time.perf_counter()
+        latencies = await run(submit, rows, args.concurrency)
+        report(label, latencies, time.perf_counter() - started)
+    executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--wait-ms", type=float, default=5.0)
+    parser.add_argument("--trees", type=int, default=100)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
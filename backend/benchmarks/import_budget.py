@@ -0,0 +1,86 @@
+"""
+Kiểm tra ngân sách thời gian import của `backend.app.main` bằng `python -X importtime`.
+
+In ra các module tốn thời gian import nhất và thoát với mã lỗi 1 khi:
+- thời gian import nguội (trung vị qua nhiều lần chạy) vượt ngưỡng, hoặc
+- một SDK nặng bị import trên đường import của API.
+
+Chạy: python -m backend.benchmarks.import_budget [--budget 1.5] [--top 25]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+TARGET_MODULE = "backend.app.main"
+
+# Các module chỉ được import khi thực sự dùng tới (lazy_import / import trong hàm)
+FORBIDDEN_MODULES = (
+    "cloudinary",
+    "fastapi_mail",
+    "mlflow",
+    "pandas",
+    "sklearn",
+    "matplotlib",
+    "scipy",
+    "pyarrow",
+    "reportlab",
+)
+
+DEFAULT_BUDGET_SECONDS = float(os.environ.get("IMPORT_BUDGET_SECONDS", "1.5"))
+
+
+def run_importtime(module: str) -> list[tuple[str, int, int]]:
+    """Trả về danh sách (module, self_us, cumulative_us) cho một lần import nguội"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    runs = [run_importtime(TARGET_MODULE) for _ in range(args.runs)]
+    totals = [
+        next(cum for name, _, cum in rows if name == TARGET_MODULE) / 1e6
+        for rows in runs
+    ]
+    total = statistics.median(totals)
+    rows = runs[-1]
+
+    print(f"Largest import costs (self time) for {TARGET_MODULE}:")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[1])[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms self {cumulative_us / 1000:9.1f} ms cum  {name}")
+
+    failed = False
+    imported = {name for name, _, _ in rows}
+    leaked = [m for m in FORBIDDEN_MODULES if m in imported]
+    if leaked:
+        failed = True
+        print(f"\nFAIL: heavy modules imported eagerly: {', '.join(leaked)}")
+
+    print(f"\nCold import of {TARGET_MODULE}: {total:.3f}s (budget {args.budget:.3f}s)")
+    if total > args.budget:
+        failed = True
+        print("FAIL: import time budget exceeded")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+So sánh chi phí jwt.decode với tra cứu TokenCache.
+
+Chạy: python -m backend.benchmarks.jwt_cache
+"""
+import timeit
+import uuid
+
+import jwt
+
+from backend.app.auth.token_cache import TokenCache
+from backend.app.auth.utils import create_jwt_token
+from backend.app.core.config import settings
+
+ITERATIONS = 100_000
+
+
+def main() -> None:
+    token = create_jwt_token(uuid.uuid4())
+    cache = TokenCache(max_size=settings.JWT_CACHE_MAX_SIZE)
+    cache.put(
+        token,
+        jwt.decode(token, settings.SIGNING_KEY, algorithms=[settings.JWT_ALGORITHM]),
+    )
+
+    decode_time = timeit.timeit(
+        lambda: jwt.decode(
+            token, settings.SIGNING_KEY, algorithms=[settings.JWT_ALGORITHM]
+        ),
+        number=ITERATIONS,
+    )
+    lookup_time = timeit.timeit(lambda: cache.get(token), number=ITERATIONS)
+
+    decode_us = decode_time / ITERATIONS * 1e6
+    lookup_us = lookup_time / ITERATIONS * 1e6
+    print(f"jwt.decode:        {decode_us:8.2f} us/op")
+    print(f"TokenCache.get:    {lookup_us:8.2f} us/op")
+    print(f"speedup:           {decode_us / lookup_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Đo sổ cái khi nhiều worker cùng chuyển tiền giữa một nhóm nhỏ tài khoản "nóng":
+transfers/s, tỉ lệ deadlock và độ trễ p50/p99 của dịch vụ ledger (khóa theo thứ tự
+id, thử lại có jitter). Đối chiếu với cách khóa ngây thơ: khóa tài khoản nguồn rồi
+mới tới tài khoản đích, không thử lại. Sau mỗi lượt kiểm tra tổng tiền không đổi,
+bút toán cân và số dư từng tài khoản khớp với các dòng giao dịch. Cuối cùng gửi
+đồng thời cùng một Idempotency-Key, kiểm tra chỉ ghi đúng một lần.
+
+Chạy trong schema tạm (xóa khi xong) trên DATABASE_URL:
+python -m backend.benchmarks.ledger_transfers [--accounts 10] [--workers 8 32] [--seconds 10]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.services import ledger
+from backend.app.auth.models import User
+from backend.app.auth.schema import (
+    AccountStatusSchema,
+    RoleChoicesSchema,
+    SecurityQuestionsSchema,
+)
+from backend.app.bank_account.enums import (
+    AccountCurrencyEnum,
+    AccountStatusEnum,
+    AccountTypeEnum,
+)
+from backend.app.bank_account.models import BankAccount
+from backend.app.core.config import settings
+from backend.app.core.model_registry import load_models
+from backend.app.transaction.models import LedgerPosting, Transaction
+
+SCHEMA = "ledger_benchmark"
+OPENING_BALANCE = Decimal("1000000.00")
+
+LOCK_SQL = text("SELECT balance FROM bank_accounts WHERE id = :id FOR UPDATE")
+MOVE_SQL = text("UPDATE bank_accounts SET balance = balance + :delta WHERE id = :id")
+
+# Số dư mỗi tài khoản phải bằng số dư đầu + credit - debit trên các dòng giao dịch
+MISMATCH_SQL = text(
+    """
+    SELECT count(*) FROM bank_accounts a
+    LEFT JOIN (
+        SELECT account_id,
+               sum(CASE WHEN direction = 'Credit' THEN amount ELSE -amount END) AS net
+        FROM transactions GROUP BY account_id
+    ) t ON t.account_id = a.id
+    WHERE a.balance <> :opening + coalesce(t.net, 0)
+    """
+)
+
+
+async def seed(sessionmaker, accounts: int) -> tuple[uuid.UUID, list[tuple[uuid.UUID, str]]]:
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "account_name": f"Benchmark {i}",
+            "account_number": f"{i:010d}",
+            "account_type": AccountTypeEnum.Current,
+            "currency": AccountCurrencyEnum.VND,
+            "account_status": AccountStatusEnum.Active,
+            "balance": OPENING_BALANCE,
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(accounts)
+    ]
+    async with sessionmaker() as session:
+        await session.exec(
+            insert(User.__table__).values(
+                id=user_id,
+                email="ledger-benchmark@example.com",
+                first_name="Ledger",
+                last_name="Benchmark",
+                id_no=1,
+                is_active=True,
+                is_superuser=False,
+                security_question=SecurityQuestionsSchema.BIRTH_CITY,
+                security_answer="benchmark",
+                account_status=AccountStatusSchema.ACTIVE,
+                role=RoleChoicesSchema.CUSTOMER,
+                hashed_password="",
+                failed_login_attempts=0,
+                otp="",
+                updated_at=now,
+            )
+        )
+        await session.exec(insert(BankAccount.__table__), params=rows)
+        await session.commit()
+    return user_id, [(row["id"], row["account_number"]) for row in rows]
+
+
+async def reset(sessionmaker) -> None:
+    async with sessionmaker() as session:
+        await session.exec(text("TRUNCATE transactions, ledger_postings"))
+        await session.exec(
+            text("UPDATE bank_accounts SET balance = :opening"), params={"opening": OPENING_BALANCE}
+        )
+        await session.commit()
+
+
+async def verify(sessionmaker, accounts: int, ledger_lines: bool) -> None:
+    async with sessionmaker() as session:
+        total = (await session.exec(text("SELECT sum(balance) FROM bank_accounts"))).one()[0]
+        assert total == OPENING_BALANCE * accounts, f"money was created or lost: {total}"
+        if ledger_lines:
+            unbalanced = await session.exec(
+                text(
+                    "SELECT count(*) FROM (SELECT reference FROM transactions GROUP BY reference "
+                    "HAVING sum(CASE WHEN direction = 'Credit' THEN amount ELSE -amount END) <> 0 "
+                    "OR count(*) <> 2) r"
+                )
+            )
+            assert unbalanced.one()[0] == 0, "unbalanced postings"
+            mismatched = await session.exec(MISMATCH_SQL, params={"opening": OPENING_BALANCE})
+            assert mismatched.one()[0] == 0, "balances do not match transaction lines"
+
+
+def ordered_transfer(user_id: uuid.UUID):
+    async def run(source, destination, amount: Decimal, session: AsyncSession) -> str:
+        try:
+            await ledger.transfer(source[0], destination[1], amount, "benchmark", user_id, session)
+            return "ok"
+        except ledger.InsufficientFundsError:
+            return "insufficient"
+        except DBAPIError as e:
+            # Hết số lần thử lại
+            return "deadlock" if getattr(e.orig, "sqlstate", None) == "40P01" else "failed"
+
+    return run
+
+
+async def unordered_transfer(source, destination, amount: Decimal, session: AsyncSession) -> str:
+    """Khóa nguồn trước, đích sau: A->B và B->A cùng lúc sẽ chờ chéo nhau"""
+    try:
+        balance = (await session.exec(LOCK_SQL, params={"id": source[0]})).one()[0]
+        await session.exec(LOCK_SQL, params={"id": destination[0]})
+        if balance < amount:
+            await session.rollback()
+            return "insufficient"
+        await session.exec(MOVE_SQL, params={"id": source[0], "delta": -amount})
+        await session.exec(MOVE_SQL, params={"id": destination[0], "delta": amount})
+        await session.commit()
+        return "ok"
+    except DBAPIError as e:
+        await session.rollback()
+        return "deadlock" if getattr(e.orig, "sqlstate", None) == "40P01" else "failed"
+
+
+async def run_workers(sessionmaker, accounts, workers: int, seconds: float, transfer) -> dict:
+    outcomes: Counter[str] = Counter()
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+
+    async def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        async with sessionmaker() as session:
+            while time.perf_counter() < deadline:
+                source, destination = rng.sample(accounts, 2)
+                amount = Decimal(rng.randrange(100, 10_000)) / 100
+                started = time.perf_counter()
+                outcomes[await transfer(source, destination, amount, session)] += 1
+                latencies.append(time.perf_counter() - started)
+
+    retries_before = Counter(ledger.retry_counts)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(workers)))
+    elapsed = time.perf_counter() - started
+    retries = Counter(ledger.retry_counts)
+    retries.subtract(retries_before)
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "elapsed": elapsed,
+        "outcomes": outcomes,
+        "attempts": sum(outcomes.values()) + sum(retries.values()),
+        "retries": +retries,
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+def report(name: str, workers: int, stats: dict) -> None:
+    outcomes = stats["outcomes"]
+    deadlocks = outcomes["deadlock"] + stats["retries"]["deadlock_detected"]
+    print(
+        f"{name:>9} {workers:>3} workers: {outcomes['ok'] / stats['elapsed']:8,.0f} transfers/s, "
+        f"deadlocks {deadlocks} ({deadlocks / max(stats['attempts'], 1):.2%}), "
+        f"retries {dict(stats['retries']) or 0}, failed {outcomes['deadlock'] + outcomes['failed']}, "
+        f"p50 {stats['p50']:.1f}ms p99 {stats['p99']:.1f}ms"
+    )
+
+
+async def idempotency_check(sessionmaker, user_id, accounts, requests: int) -> None:
+    source, destination = accounts[0], accounts[1]
+
+    async def send() -> bool:
+        async with sessionmaker() as session:
+            result = await ledger.transfer(
+                source[0], destination[1], Decimal("10.00"), "retry", user_id, session,
+                idempotency_key="benchmark-key",
+            )
+            return result.replayed
+
+    replayed = await asyncio.gather(*(send() for _ in range(requests)))
+    async with sessionmaker() as session:
+        postings = await session.exec(
+            text("SELECT count(*) FROM ledger_postings WHERE idempotency_key = 'benchmark-key'")
+        )
+        assert postings.one()[0] == 1, "idempotent request was posted more than once"
+    print(f"idempotency: {requests} concurrent requests with one key -> 1 posting, {sum(replayed)} replayed")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    load_models()
+    admin = create_async_engine(settings.DATABASE_URL)
+    async with admin.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        pool_size=max(args.workers),
+        max_overflow=0,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                BankAccount.metadata.create_all,
+                tables=[
+                    User.__table__,
+                    BankAccount.__table__,
+                    Transaction.__table__,
+                    LedgerPosting.__table__,
+                ],
+            )
+        user_id, accounts = await seed(sessionmaker, args.accounts)
+        print(
+            f"{args.accounts} hot accounts, {args.seconds:.0f}s per run, "
+            f"isolation {settings.LEDGER_ISOLATION_LEVEL}"
+        )
+        for workers in args.workers:
+            await reset(sessionmaker)
+            stats = await run_workers(
+                sessionmaker, accounts, workers, args.seconds, ordered_transfer(user_id)
+            )
+            await verify(sessionmaker, args.accounts, ledger_lines=True)
+            report("ledger", workers, stats)
+
+            await reset(sessionmaker)
+            stats = await run_workers(sessionmaker, accounts, workers, args.seconds, unordered_transfer)
+            await verify(sessionmaker, args.accounts, ledger_lines=False)
+            report("unordered", workers, stats)
+
+        await reset(sessionmaker)
+        await idempotency_check(sessionmaker, user_id, accounts, max(args.workers))
+    finally:
+        await engine.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await admin.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
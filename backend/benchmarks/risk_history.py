@@ -0,0 +1,167 @@
+"""
+Đo lịch sử rủi ro phân vùng theo tháng: sinh vài triệu lần chấm điểm trải trên nhiều
+tháng, gộp lần đầu rồi gộp tăng dần sau khi có dữ liệu mới, kiểm tra số liệu gộp
+khớp với dữ liệu gốc, so biểu đồ 90 ngày đọc từ bảng gộp với GROUP BY trên dữ liệu
+gốc, kiểm tra truy vấn theo khoảng chỉ chạm phân vùng liên quan và tách phân vùng cũ.
+
+Chạy trong schema tạm (xóa khi xong) trên DATABASE_URL:
+python -m backend.benchmarks.risk_history [--rows 2000000] [--users 2000] [--months 6]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.services.risk_history import get_risk_history
+from backend.app.core.config import settings
+from backend.app.core.ml.risk_history import (
+    attached_partitions,
+    create_partition_sql,
+    maintain_partitions,
+    month_start,
+    rollup,
+)
+from backend.app.fraud.models import RiskHistory, RiskHistoryDaily, RiskHistoryHourly
+from backend.app.fraud.schema import RiskResolutionEnum
+
+SCHEMA = "risk_history_benchmark"
+
+GENERATE_SQL = text(
+    """
+    INSERT INTO risk_history (user_id, transaction_id, scored_at, score, decision, model_version)
+    SELECT ('00000000-0000-0000-0000-' || lpad(to_hex(g % CAST(:users AS integer)), 12, '0'))::uuid,
+           gen_random_uuid(),
+           CAST(:start AS timestamptz)
+               + random() * (CAST(:end AS timestamptz) - CAST(:start AS timestamptz)),
+           power(random(), 3),
+           (CASE WHEN random() < 0.03 THEN 'BLOCK' WHEN random() < 0.1 THEN 'REVIEW'
+                 ELSE 'APPROVE' END)::frauddecisionenum,
+           'benchmark'
+    FROM generate_series(1, CAST(:rows AS integer)) g
+    """
+)
+
+RAW_CHART_SQL = text(
+    """
+    SELECT date_trunc('day', scored_at, 'UTC') AS bucket, count(*), avg(score), max(score)
+    FROM risk_history
+    WHERE user_id = :user_id AND scored_at >= :start AND scored_at < :end
+    GROUP BY 1 ORDER BY 1
+    """
+)
+
+
+def user_uuid(index: int) -> uuid.UUID:
+    return uuid.UUID(f"00000000-0000-0000-0000-{index:012x}")
+
+
+async def timed(coro) -> tuple[object, float]:
+    started = time.perf_counter()
+    result = await coro
+    return result, (time.perf_counter() - started) * 1000
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    admin = create_async_engine(settings.DATABASE_URL)
+    async with admin.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    now = datetime.now(timezone.utc)
+    first = month_start(now, -(args.months - 1))
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                RiskHistory.metadata.create_all,
+                tables=[RiskHistory.__table__, RiskHistoryHourly.__table__, RiskHistoryDaily.__table__],
+            )
+            for offset in range(args.months):
+                await conn.execute(text(create_partition_sql(month_start(first, offset))))
+        created, _ = await maintain_partitions(engine, now, 2, args.months + 1, False)
+        print(f"partitions: {args.months} historical + created ahead {created}")
+
+        started = time.perf_counter()
+        async with engine.begin() as conn:
+            await conn.execute(
+                GENERATE_SQL,
+                {"users": args.users, "rows": args.rows, "start": first, "end": now - timedelta(hours=2)},
+            )
+            await conn.execute(text("ANALYZE risk_history"))
+        print(f"generated {args.rows} scores for {args.users} users in {time.perf_counter() - started:.1f}s")
+
+        (_, buckets), full_ms = await timed(rollup(engine, now, timedelta(minutes=15)))
+        print(f"initial rollup: {buckets} hourly buckets in {full_ms / 1000:.1f}s")
+
+        # Dữ liệu mới trong giờ gần nhất: lần gộp sau chỉ quét vài giờ cuối
+        async with engine.begin() as conn:
+            await conn.execute(
+                GENERATE_SQL,
+                {"users": args.users, "rows": args.rows // 1000, "start": now - timedelta(minutes=50), "end": now},
+            )
+        (since, buckets), incremental_ms = await timed(rollup(engine, now, timedelta(minutes=15)))
+        print(f"incremental rollup: {buckets} hourly buckets since {since:%Y-%m-%d %H:%M} in {incremental_ms:.0f}ms")
+
+        user_id = user_uuid(7)
+        start = now - timedelta(days=90)
+        async with sessionmaker() as session:
+            raw = (await session.exec(RAW_CHART_SQL, params={"user_id": user_id, "start": start, "end": now})).all()
+            (daily, daily_ms) = await timed(get_risk_history(user_id, start, now, RiskResolutionEnum.DAY, session))
+            (hourly, hourly_ms) = await timed(get_risk_history(user_id, start, now, RiskResolutionEnum.HOUR, session))
+            _, raw_ms = await timed(session.exec(RAW_CHART_SQL, params={"user_id": user_id, "start": start, "end": now}))
+
+            # Ngày đầu cửa sổ bị cắt giữa ngày ở dữ liệu gốc -> so từ ngày thứ hai
+            expected = {row[0]: (row[1], round(row[3], 6)) for row in raw[1:]}
+            got = {p.bucket: (p.events, round(p.max_score, 6)) for p in daily if p.bucket in expected}
+            assert got == expected, "daily rollup does not match raw scores"
+            print(
+                f"90-day chart for one user: daily rollup {len(daily)} rows {daily_ms:.1f}ms, "
+                f"hourly rollup {len(hourly)} rows {hourly_ms:.1f}ms, "
+                f"raw GROUP BY over {sum(r[1] for r in raw)} rows {raw_ms:.1f}ms (matches)"
+            )
+
+            plan = await session.exec(
+                text(
+                    "EXPLAIN SELECT * FROM risk_history WHERE user_id = :user_id "
+                    "AND scored_at >= :start AND scored_at < :end"
+                ),
+                params={"user_id": user_id, "start": now - timedelta(days=20), "end": now},
+            )
+            scanned = {
+                line.split(" on ")[1].split()[0]
+                for (line,) in plan.all()
+                if " on risk_history_y" in line
+            }
+            print(f"20-day raw query touches partitions {sorted(scanned)}")
+
+        async with engine.connect() as conn:
+            before = await attached_partitions(conn)
+        _, detached = await maintain_partitions(engine, now, 2, args.months - 2, False)
+        async with engine.connect() as conn:
+            after = await attached_partitions(conn)
+        print(f"retention {args.months - 2} months: detached {detached}, {len(before)} -> {len(after)} attached")
+    finally:
+        await engine.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await admin.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--months", type=int, default=6)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+So sánh độ trễ chấm điểm khi chỉ có champion và khi bật shadow challenger (chấm trong
+tiến trình con), đồng thời kiểm tra mọi giao dịch được chấm shadow đều được ghi cặp
+điểm ra file. Lỗi nếu p99 khi bật shadow tăng quá --max-p99-increase so với champion.
+
+Chạy: python -m backend.benchmarks.shadow_scoring [--requests 5000] [--concurrency 100]
+"""
+import argparse
+import asyncio
+import json
+import pathlib
+import tempfile
+import time
+
+from backend.app.core.ml.model_manager import FileModelSource, ModelManager
+from backend.app.core.ml.schema import FraudScoreRequestSchema
+from backend.app.core.ml.scoring import FraudScorer
+from backend.app.core.ml.shadow import SHADOW_DROPPED, SHADOW_SCORED, ShadowScorer
+from backend.app.core.ml.synthetic import save_artifact, train_model
+from backend.benchmarks.fraud_scoring import report
+
+
+def p99(latencies: list[float]) -> float:
+    return sorted(latencies)[int(len(latencies) * 0.99) - 1] * 1000
+
+
+def build_requests(count: int) -> list[FraudScoreRequestSchema]:
+    return [
+        FraudScoreRequestSchema(
+            amount=10 + (i % 500) * 3.7,
+            transaction_type="transfer" if i % 3 else "card_payment",
+            is_international=i % 11 == 0,
+            account_age_days=i % 900,
+            txn_count_1h=i % 4,
+            txn_count_24h=i % 13,
+        )
+        for i in range(count)
+    ]
+
+
+async def run(scorer: FraudScorer, requests, concurrency: int) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(request) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await scorer.score(request)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(r) for r in requests))
+    return latencies, time.perf_counter() - started
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        save_artifact(train_model(rows=20_000, n_estimators=args.trees), root / "champion.joblib", "champion-1")
+        save_artifact(
+            train_model(rows=20_000, seed=7, n_estimators=args.trees),
+            root / "challenger.joblib",
+            "challenger-1",
+        )
+        champion = ModelManager(FileModelSource(str(root / "champion.joblib")), poll_seconds=0)
+        challenger = ModelManager(
+            FileModelSource(str(root / "challenger.joblib")), poll_seconds=0, role="challenger"
+        )
+        # Challenger chỉ nạp trong tiến trình shadow
+        champion.load()
+        requests = build_requests(args.requests)
+
+        baseline = FraudScorer(champion, max_batch_size=64, max_wait_seconds=0.005)
+        await run(baseline, requests[:500], args.concurrency)  # làm nóng
+        latencies, elapsed = await run(baseline, requests, args.concurrency)
+        report("champion only", latencies, elapsed)
+        baseline_p99 = p99(latencies)
+        await baseline.close()
+
+        shadow = ShadowScorer(
+            challenger,
+            queue_size=args.queue_size,
+            max_batch_size=256,
+            log_dir=str(root / "shadow"),
+            flush_seconds=0.2,
+        )
+        shadow.start()
+        # Chờ tiến trình shadow khởi động và nạp model, không tính vào độ trễ
+        while (await shadow.info())["loaded"] is False:
+            await asyncio.sleep(0.1)
+        shadowed = FraudScorer(champion, max_batch_size=64, max_wait_seconds=0.005, shadow=shadow)
+        scored_before = SHADOW_SCORED._value.get()
+        dropped_before = SHADOW_DROPPED._value.get()
+        latencies, elapsed = await run(shadowed, requests, args.concurrency)
+        report("champion + shadow", latencies, elapsed)
+        shadow_p99 = p99(latencies)
+        # Chờ tiến trình shadow chấm hết rồi tắt (ghi nốt log)
+        while (
+            SHADOW_SCORED._value.get() - scored_before
+            + SHADOW_DROPPED._value.get() - dropped_before
+            < len(requests)
+        ):
+            await asyncio.sleep(0.05)
+        await shadowed.close()
+        await shadow.close()
+
+        rows = [
+            json.loads(line)
+            for path in (root / "shadow").glob("*.jsonl")
+            for line in path.read_text().splitlines()
+        ]
+        dropped = int(SHADOW_DROPPED._value.get() - dropped_before)
+        print(f"shadow log: {len(rows)} paired scores, {dropped} dropped")
+        assert len(rows) + dropped == len(requests)
+        assert all(r["challenger_version"] == "challenger-1" for r in rows)
+        increase = shadow_p99 / baseline_p99 - 1
+        print(f"p99 with shadow: {increase:+.1%} (limit {args.max_p99_increase:+.0%})")
+        assert increase <= args.max_p99_increase, "shadow scoring slows down the request path"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--max-p99-increase", type=float, default=0.10)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Đo thời gian import nguội (mỗi lần chạy một tiến trình Python mới) của ứng dụng
+và của môi trường migration.
+
+Chạy: python -m backend.benchmarks.startup_time [--runs 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+TARGETS: dict[str, str] = {
+    "backend.app.main": "import backend.app.main",
+    "migrations env (scan)": (
+        "import alembic.context, sqlmodel;"
+        "from backend.app.core.model_registry import load_models;"
+        "load_models(use_manifest=False)"
+    ),
+    "migrations env (manifest)": (
+        "import alembic.context, sqlmodel;"
+        "from backend.app.core.model_registry import load_models;"
+        "load_models()"
+    ),
+    "migrations env (upgrade, lazy)": (
+        "import alembic.context, sqlmodel;"
+        "import backend.app.core.model_registry"
+    ),
+}
+
+
+def measure(code: str, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = statistics.median(measure("pass", args.runs))
+    print(f"{'target':<34}{'median':>10}{'min':>10}   (interpreter: {baseline:.3f}s)")
+    for name, code in TARGETS.items():
+        timings = measure(code, args.runs)
+        print(
+            f"{name:<34}{statistics.median(timings):>9.3f}s{min(timings):>9.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Đo sinh sao kê PDF: vẽ từng dòng lên canvas theo lô (cách worker làm) so với dựng
+cả bảng platypus trong bộ nhớ rồi mới build, theo thời gian và đỉnh bộ nhớ Python
+(tracemalloc làm chậm ~20 lần nên đo riêng, cùng số dòng cho cả hai cách); rồi đo
+đường cache hit (tính statement_id + kiểm tra file) mà API đi qua.
+
+Chạy: python -m backend.benchmarks.statement_pdf [--rows 10000 100000] [--compare-rows 2000 8000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from backend.app.bank_account.enums import AccountCurrencyEnum
+from backend.app.bank_account.statement import (
+    StatementPeriod,
+    StatementRenderer,
+    statement_id,
+    statement_path,
+)
+from backend.app.core.config import settings
+from backend.app.transaction.enums import TransactionDirectionEnum
+
+ACCOUNT = SimpleNamespace(
+    id=uuid.uuid4(),
+    account_name="Nguyen Van A",
+    account_number="0123456789",
+    currency=AccountCurrencyEnum.VND,
+)
+PERIOD = StatementPeriod(date(2025, 1, 1), date(2025, 12, 31))
+
+
+def generate_batches(rows: int, batch_size: int, seed: int):
+    """Giống result.partitions(): trả từng lô, không giữ toàn bộ giao dịch"""
+    rng = random.Random(seed)
+    balance = Decimal("1000000.00")
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    step = timedelta(days=365) / rows
+    batch = []
+    for i in range(rows):
+        amount = Decimal(rng.randrange(100, 5_000_000)) / 100
+        debit = rng.random() < 0.5 and balance > amount
+        balance += -amount if debit else amount
+        batch.append(
+            (
+                start + step * i,
+                rng.choice(["Card payment", "Transfer to savings", "ATM withdrawal", "Salary"]),
+                f"TX{i:010d}",
+                TransactionDirectionEnum.Debit if debit else TransactionDirectionEnum.Credit,
+                amount,
+                balance,
+            )
+        )
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def peak_memory(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def render_streaming(path: str, rows: int) -> None:
+    renderer = StatementRenderer(path, ACCOUNT, PERIOD, Decimal("1000000.00"))
+    for batch in generate_batches(rows, settings.STATEMENT_BATCH_SIZE, seed=1):
+        renderer.add_rows(batch)
+    renderer.finish()
+
+
+def render_platypus(path: str, rows: int) -> None:
+    """Cách làm trong request: nạp hết giao dịch, dựng một bảng lớn rồi build"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import LongTable, SimpleDocTemplate
+
+    data = [["Date", "Description", "Reference", "Debit", "Credit", "Balance"]]
+    for batch in generate_batches(rows, rows, seed=1):
+        for created_at, description, reference, direction, amount, balance in batch:
+            debit = direction == TransactionDirectionEnum.Debit
+            data.append(
+                [
+                    f"{created_at:%d/%m/%Y}",
+                    description,
+                    reference,
+                    f"{amount:,.2f}" if debit else "",
+                    "" if debit else f"{amount:,.2f}",
+                    f"{balance:,.2f}",
+                ]
+            )
+    SimpleDocTemplate(path, pagesize=A4).build([LongTable(data, repeatRows=1)])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--compare-rows", type=int, nargs="+", default=[2_000, 8_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "statement.pdf")
+        for rows in args.rows:
+            elapsed = timed(lambda: render_streaming(path, rows))
+            print(
+                f"streaming canvas {rows:>7} rows: {elapsed:6.2f}s "
+                f"({rows / elapsed:,.0f} rows/s), file {os.path.getsize(path) / 1e6:.1f}MB"
+            )
+        for rows in args.compare_rows:
+            streaming = (timed(lambda: render_streaming(path, rows)), peak_memory(lambda: render_streaming(path, rows)))
+            platypus = (timed(lambda: render_platypus(path, rows)), peak_memory(lambda: render_platypus(path, rows)))
+            print(
+                f"{rows:>7} rows: streaming {streaming[0]:5.2f}s peak {streaming[1]:5.1f}MB | "
+                f"platypus table {platypus[0]:5.2f}s peak {platypus[1]:5.1f}MB"
+            )
+
+        settings.STATEMENT_DIR = tmp
+        last_transaction_id = uuid.uuid4()
+        os.replace(path, statement_path(statement_id(ACCOUNT.id, PERIOD, last_transaction_id)))
+        lookups = 10_000
+        started = time.perf_counter()
+        for _ in range(lookups):
+            assert statement_path(statement_id(ACCOUNT.id, PERIOD, last_transaction_id)).exists()
+        print(f"cache hit check: {(time.perf_counter() - started) / lookups * 1e6:.1f}us (+ one index seek for the last transaction id)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Đo lịch sử giao dịch của một tài khoản có vài trăm nghìn giao dịch (giữa nhiều tài
+khoản khác): p50/p99 của trang đầu, trang sâu theo cursor, lọc theo khoảng số tiền
+và khoảng ngày, so với OFFSET ở cùng độ sâu. Kiểm tra đi hết các trang theo cursor
+không sót/trùng dòng, trang là index-only scan trên ix_transactions_history, và tổng
+của cửa sổ lọc khi tính lần đầu so với khi lấy từ cache.
+
+Chạy trong schema tạm (xóa khi xong) trên DATABASE_URL:
+python -m backend.benchmarks.transaction_history [--rows 200000] [--other-accounts 200] [--requests 500]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api.services.transaction_history import (
+    HISTORY_COLUMNS,
+    HISTORY_ORDER,
+    HistoryFilter,
+    get_summary,
+    list_transactions,
+)
+from backend.app.auth.models import User
+from backend.app.auth.schema import (
+    AccountStatusSchema,
+    RoleChoicesSchema,
+    SecurityQuestionsSchema,
+)
+from backend.app.bank_account.enums import (
+    AccountCurrencyEnum,
+    AccountStatusEnum,
+    AccountTypeEnum,
+)
+from backend.app.bank_account.models import BankAccount
+from backend.app.core.config import settings
+from backend.app.core.model_registry import load_models
+from backend.app.transaction.models import Transaction
+
+SCHEMA = "transaction_history_benchmark"
+TARGET_P99_MS = 20.0
+HISTORY_DAYS = 730
+
+# Giao dịch rải đều trong HISTORY_DAYS ngày, số tiền lệch về phía nhỏ như thực tế
+GENERATE_SQL = text(
+    """
+    INSERT INTO transactions (id, account_id, created_at, reference, transaction_type,
+        direction, amount, balance_after, currency, description, status)
+    SELECT gen_random_uuid(),
+           (CAST(:accounts AS uuid[]))[1 + floor(random() * cardinality(CAST(:accounts AS uuid[])))::int],
+           now() - random() * make_interval(days => CAST(:days AS integer)),
+           'TRA-' || upper(substr(md5(random()::text), 1, 20)),
+           'Transfer', (CASE WHEN random() < 0.5 THEN 'Debit' ELSE 'Credit' END)::transactiondirectionenum,
+           round((power(random(), 4) * 50000000 + 1000)::numeric, 2),
+           round((random() * 100000000)::numeric, 2),
+           'VND', 'Card payment', 'Completed'
+    FROM generate_series(1, CAST(:rows AS integer))
+    """
+)
+
+
+def quantiles(latencies: list[float]) -> tuple[float, float]:
+    cuts = statistics.quantiles(latencies, n=100)
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+async def measure(sessionmaker, calls) -> tuple[float, float]:
+    latencies = []
+    async with sessionmaker() as session:
+        for call in calls:
+            started = time.perf_counter()
+            await call(session)
+            latencies.append(time.perf_counter() - started)
+            # Mỗi request API dùng một transaction ngắn
+            await session.commit()
+    return quantiles(latencies)
+
+
+def report(name: str, p50: float, p99: float) -> None:
+    verdict = "ok" if p99 < TARGET_P99_MS else "over target"
+    print(f"{name:<34} p50 {p50:6.2f}ms  p99 {p99:6.2f}ms  ({verdict})")
+
+
+async def seed(sessionmaker, engine, rows: int, other_accounts: int) -> uuid.UUID:
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    accounts = [uuid.uuid4() for _ in range(other_accounts + 1)]
+    async with sessionmaker() as session:
+        await session.exec(
+            insert(User.__table__).values(
+                id=user_id,
+                email="history-benchmark@example.com",
+                first_name="History",
+                last_name="Benchmark",
+                id_no=1,
+                is_active=True,
+                is_superuser=False,
+                security_question=SecurityQuestionsSchema.BIRTH_CITY,
+                security_answer="benchmark",
+                account_status=AccountStatusSchema.ACTIVE,
+                role=RoleChoicesSchema.CUSTOMER,
+                hashed_password="",
+                failed_login_attempts=0,
+                otp="",
+                updated_at=now,
+            )
+        )
+        await session.exec(
+            insert(BankAccount.__table__),
+            params=[
+                {
+                    "id": account_id,
+                    "account_name": f"Benchmark {i}",
+                    "account_number": f"{i:010d}",
+                    "account_type": AccountTypeEnum.Current,
+                    "currency": AccountCurrencyEnum.VND,
+                    "account_status": AccountStatusEnum.Active,
+                    "balance": Decimal("0.00"),
+                    "user_id": user_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i, account_id in enumerate(accounts)
+            ],
+        )
+        # Tài khoản đo có rows giao dịch, các tài khoản khác chia nhau rows * 2
+        await session.exec(GENERATE_SQL, params={"rows": rows, "days": HISTORY_DAYS, "accounts": accounts[:1]})
+        await session.exec(GENERATE_SQL, params={"rows": rows * 2, "days": HISTORY_DAYS, "accounts": accounts[1:]})
+        await session.commit()
+    # VACUUM cập nhật visibility map, cần cho index-only scan; không chạy được trong transaction
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE transactions"))
+    return accounts[0]
+
+
+async def walk_all_pages(sessionmaker, account_id: uuid.UUID, limit: int) -> list[str]:
+    cursors, seen, cursor = [], set(), None
+    async with sessionmaker() as session:
+        while True:
+            page, cursor = await list_transactions(account_id, HistoryFilter(), limit, cursor, session)
+            ids = {t.id for t in page}
+            assert not ids & seen, "a transaction appeared on two pages"
+            seen |= ids
+            if cursor is None:
+                break
+            cursors.append(cursor)
+        total = (
+            await session.exec(
+                text("SELECT count(*) FROM transactions WHERE account_id = :id"), params={"id": account_id}
+            )
+        ).one()[0]
+    assert len(seen) == total, f"walked {len(seen)} of {total} transactions"
+    return cursors
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    load_models()
+    admin = create_async_engine(settings.DATABASE_URL)
+    async with admin.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    rng = random.Random(7)
+    limit = settings.TRANSACTION_HISTORY_PAGE_SIZE
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                BankAccount.metadata.create_all,
+                tables=[User.__table__, BankAccount.__table__, Transaction.__table__],
+            )
+        started = time.perf_counter()
+        account_id = await seed(sessionmaker, engine, args.rows, args.other_accounts)
+        print(
+            f"seeded {args.rows} transactions for the measured account and {args.rows * 2} "
+            f"for {args.other_accounts} others in {time.perf_counter() - started:.1f}s"
+        )
+
+        started = time.perf_counter()
+        cursors = await walk_all_pages(sessionmaker, account_id, limit)
+        print(f"walked {len(cursors) + 1} pages of {limit} in {time.perf_counter() - started:.1f}s, no gaps or duplicates")
+
+        now = datetime.now(timezone.utc).date()
+        report(
+            "first page",
+            *await measure(
+                sessionmaker,
+                [lambda s: list_transactions(account_id, HistoryFilter(), limit, None, s)] * args.requests,
+            ),
+        )
+        sample = [rng.choice(cursors) for _ in range(args.requests)]
+        report(
+            "random deep page (keyset)",
+            *await measure(
+                sessionmaker,
+                [lambda s, c=c: list_transactions(account_id, HistoryFilter(), limit, c, s) for c in sample],
+            ),
+        )
+
+        async def offset_page(session, offset: int):
+            statement = (
+                select(*HISTORY_COLUMNS)
+                .where(Transaction.account_id == account_id)
+                .order_by(*HISTORY_ORDER)
+                .offset(offset)
+                .limit(limit + 1)
+            )
+            return (await session.exec(statement)).all()
+
+        offsets = [(cursors.index(c) + 1) * limit for c in sample]
+        report(
+            "random deep page (OFFSET)",
+            *await measure(sessionmaker, [lambda s, o=o: offset_page(s, o) for o in offsets]),
+        )
+
+        # Khoảng số tiền lớn chỉ gồm vài phần trăm giao dịch: phải lọc qua nhiều dòng index
+        amount_filter = HistoryFilter(min_amount=Decimal("20000000"), max_amount=Decimal("40000000"))
+        report(
+            "amount filter, first page",
+            *await measure(
+                sessionmaker,
+                [lambda s: list_transactions(account_id, amount_filter, limit, None, s)] * args.requests,
+            ),
+        )
+        windows = []
+        for _ in range(args.requests):
+            start = now - timedelta(days=rng.randrange(30, HISTORY_DAYS))
+            windows.append(HistoryFilter(start_date=start, end_date=start + timedelta(days=30)))
+        report(
+            "random 30-day window, first page",
+            *await measure(
+                sessionmaker,
+                [lambda s, f=f: list_transactions(account_id, f, limit, None, s) for f in windows],
+            ),
+        )
+
+        cold = await measure(sessionmaker, [lambda s, f=f: get_summary(account_id, f, s) for f in windows[:100]])
+        warm = await measure(sessionmaker, [lambda s, f=f: get_summary(account_id, f, s) for f in windows[:100]])
+        report("30-day summary, computed", *cold)
+        report("30-day summary, cached", *warm)
+        full = HistoryFilter()
+        async with sessionmaker() as session:
+            started = time.perf_counter()
+            summary = await get_summary(account_id, full, session)
+            elapsed = (time.perf_counter() - started) * 1000
+        print(f"whole-history summary ({summary.count} transactions) computed in {elapsed:.1f}ms")
+
+        async with sessionmaker() as session:
+            deep = sample[0]
+            page, _ = await list_transactions(account_id, HistoryFilter(), limit, deep, session)
+            plan = await session.exec(
+                text(
+                    "EXPLAIN (ANALYZE, BUFFERS) SELECT id, account_id, created_at, reference, "
+                    "transaction_type, direction, amount, balance_after, currency, description, "
+                    "status, counterparty_account_id FROM transactions WHERE account_id = :id "
+                    "AND (created_at, id) < (CAST(:created_at AS timestamptz), CAST(:tid AS uuid)) ORDER BY created_at DESC, id DESC "
+                    "LIMIT :limit"
+                ),
+                params={
+                    "id": account_id,
+                    "created_at": page[0].created_at,
+                    "tid": page[0].id,
+                    "limit": limit + 1,
+                },
+            )
+            lines = [line for (line,) in plan.all()]
+        scan = next(line.strip() for line in lines if "Scan" in line)
+        heap = next((line.strip() for line in lines if "Heap Fetches" in line), "Heap Fetches: n/a")
+        print(f"deep page plan: {scan.lstrip('-> ').split('  (')[0]}, {heap}")
+    finally:
+        await engine.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await admin.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--other-accounts", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=500)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
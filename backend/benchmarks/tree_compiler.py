@@ -0,0 +1,69 @@
+"""
+So sánh độ trễ predict_proba của scikit-learn với model cây đã biên dịch sang NumPy,
+cho một giao dịch và cho lô lớn, sau khi kiểm tra kết quả trùng từng bit.
+
+Chạy: python -m backend.benchmarks.tree_compiler [--trees 100] [--repeat 200]
+"""
+import argparse
+import statistics
+import time
+
+from sklearn.ensemble import GradientBoostingClassifier
+
+from backend.app.core.ml.synthetic import generate_transactions, train_model
+from backend.app.core.ml.tree_compiler import compile_model, verify_compiled
+
+
+def measure(predict, X, repeat: int) -> list[float]:
+    predict(X)  # làm nóng
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        predict(X)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(label: str, timings: list[float], rows: int) -> None:
+    timings = sorted(timings)
+    p50 = statistics.median(timings) * 1000
+    p99 = timings[max(int(len(timings) * 0.99) - 1, 0)] * 1000
+    print(
+        f"{label:<28}{p50:>10.3f} ms p50{p99:>10.3f} ms p99"
+        f"{rows / statistics.median(timings):>12.0f} rows/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    X_train, y_train = generate_transactions(20_000, seed=1)
+    forest = train_model(rows=20_000, n_estimators=args.trees)
+    forest.n_jobs = 1
+    boosting = GradientBoostingClassifier(n_estimators=args.trees, random_state=0)
+    boosting.fit(X_train, y_train)
+
+    X, _ = generate_transactions(max(args.batch_size, 20_000), seed=7)
+    for name, model in (("RandomForest", forest), ("GradientBoosting", boosting)):
+        compiled = compile_model(model)
+        verify_compiled(model, compiled, X)
+        print(
+            f"\n{name}: {compiled.roots.shape[0]} trees, "
+            f"{compiled.feature.shape[0]} nodes, bit-identical on {len(X)} rows"
+        )
+        for rows, repeat in ((1, args.repeat), (args.batch_size, max(args.repeat // 10, 5))):
+            batch = X[:rows]
+            report(f"sklearn batch={rows}", measure(model.predict_proba, batch, repeat), rows)
+            report(
+                f"compiled batch={rows}",
+                measure(compiled.predict_proba, batch, repeat),
+                rows,
+            )
+
+
+if __name__ == "__main__":
+    main()
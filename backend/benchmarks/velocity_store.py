@@ -0,0 +1,147 @@
+"""
+Kiểm tra feature store vận tốc trên fakeredis: so sánh kết quả cửa sổ trượt với cách
+tính trực tiếp trên toàn bộ lịch sử (kể cả giao dịch gửi lại và dựng lại từ Parquet),
+rồi đo thông lượng ghi/đọc của script.
+
+Chạy: python -m backend.benchmarks.velocity_store [--events 20000] [--accounts 50]
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+
+from backend.app.core.ml.feature_store import (
+    ACCOUNT,
+    DEVICE,
+    RECIPIENT_WINDOW_SECONDS,
+    VELOCITY_WINDOWS,
+    VelocityEvent,
+    VelocityFeatureStore,
+    VelocitySnapshot,
+    read_history,
+)
+
+
+def expected_snapshot(
+    history: list[VelocityEvent], watermark: datetime
+) -> VelocitySnapshot:
+    """Tính trực tiếp trên toàn bộ giao dịch đã ghi của một thực thể"""
+    fields = {}
+    for name, seconds in VELOCITY_WINDOWS.items():
+        cutoff = watermark - timedelta(seconds=seconds)
+        in_window = [e for e in history if e.occurred_at > cutoff]
+        fields[f"txn_count_{name}"] = len(in_window)
+        fields[f"amount_sum_{name}"] = sum(round(e.amount * 100) for e in in_window) / 100
+    cutoff = watermark - timedelta(seconds=RECIPIENT_WINDOW_SECONDS)
+    recipients = {e.recipient_id for e in history if e.recipient_id and e.occurred_at > cutoff}
+    return VelocitySnapshot(**fields, distinct_recipients_24h=len(recipients))
+
+
+def generate_events(count: int, accounts: int, seed: int) -> list[VelocityEvent]:
+    rng = random.Random(seed)
+    moment = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    events = []
+    for i in range(count):
+        # Khoảng cách ngẫu nhiên để cửa sổ 1 phút, 1 giờ và 24 giờ đều có sự kiện hết hạn
+        moment += timedelta(milliseconds=rng.choice([0, 250, 5_000, 60_000, 900_000]))
+        account = rng.randrange(accounts)
+        events.append(
+            VelocityEvent(
+                transaction_id=f"txn-{i}",
+                account_id=f"acc-{account}",
+                device_id=f"dev-{account % 7}",
+                amount=round(rng.lognormvariate(4, 1), 2),
+                occurred_at=moment,
+                recipient_id=rng.choice([None, *(f"rcp-{j}" for j in range(20))]),
+            )
+        )
+    return events
+
+
+async def check_streaming(store: VelocityFeatureStore, events: list[VelocityEvent]) -> None:
+    history: dict[tuple[str, str], list[VelocityEvent]] = {}
+    watermarks: dict[tuple[str, str], datetime] = {}
+    for i, event in enumerate(events):
+        snapshots = await store.observe(event)
+        for kind, entity_id in event.entities():
+            key = (kind, entity_id)
+            watermark = max(watermarks.get(key, event.occurred_at), event.occurred_at)
+            expected = expected_snapshot(history.get(key, []), watermark)
+            if snapshots[kind] != expected:
+                raise AssertionError(
+                    f"event {i} {key}: got {asdict(snapshots[kind])}, expected {asdict(expected)}"
+                )
+            history.setdefault(key, []).append(event)
+            watermarks[key] = watermark
+        # Giao dịch gửi lại không được tính hai lần
+        if i % 97 == 0:
+            await store.observe(event)
+
+
+async def check_backfill(
+    store: VelocityFeatureStore, events: list[VelocityEvent], now: datetime
+) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pylist([asdict(e) for e in reversed(events)])
+    with tempfile.NamedTemporaryFile(suffix=".parquet") as f:
+        pq.write_table(table, f.name)
+        since = now - timedelta(seconds=max(VELOCITY_WINDOWS.values()))
+        await store.backfill(read_history(f.name, since, batch_size=1000))
+
+    entities = {e for event in events for e in event.entities()}
+    for kind, entity_id in entities:
+        history = [
+            e for e in events if (kind == ACCOUNT and e.account_id == entity_id)
+            or (kind == DEVICE and e.device_id == entity_id)
+        ]
+        watermark = max(max(e.occurred_at for e in history), now)
+        expected = expected_snapshot(history, watermark)
+        actual = await store.read(kind, entity_id, now)
+        if actual != expected:
+            raise AssertionError(f"backfill {kind}:{entity_id}: {actual} != {expected}")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    events = generate_events(args.events, args.accounts, args.seed)
+    now = events[-1].occurred_at
+
+    store = VelocityFeatureStore(fakeredis.aioredis.FakeRedis(decode_responses=True))
+    started = time.perf_counter()
+    await check_streaming(store, events)
+    print(f"streaming: {len(events)} events match brute force in {time.perf_counter() - started:.1f}s")
+
+    store = VelocityFeatureStore(fakeredis.aioredis.FakeRedis(decode_responses=True))
+    await check_backfill(store, events, now)
+    print("backfill: rebuilt state matches brute force for every account and device")
+
+    store = VelocityFeatureStore(fakeredis.aioredis.FakeRedis(decode_responses=True))
+    started = time.perf_counter()
+    for event in events[: args.throughput_events]:
+        await store.observe(event)
+    elapsed = time.perf_counter() - started
+    print(f"observe: {args.throughput_events / elapsed:.0f} events/s on fakeredis")
+    started = time.perf_counter()
+    for i in range(args.throughput_events):
+        await store.read(ACCOUNT, f"acc-{i % args.accounts}", now)
+    elapsed = time.perf_counter() - started
+    print(f"read: {args.throughput_events / elapsed:.0f} reads/s on fakeredis")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--throughput-events", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
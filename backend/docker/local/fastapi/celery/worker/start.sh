@@ -8,5 +8,11 @@ set -o pipefail
 
 # python -c "from backend.app.core.ml.cleanup import cleanup_mlflow_runs; cleanup_mlflow_runs()"
 
-exec watchfiles --filter python celery.__main__.main --args '-A backend.app.core.celery_app worker  -l INFO'
-#-Q nextgen_tasks,ml_tasks
\ No newline at end of file
+# Celery đọc các hàng đợi trong -Q lần lượt (round-robin), thứ tự không phải độ ưu tiên,
+# nên worker chính không nhận nextgen_bulk để job bulk không chiếm chỗ của task khẩn;
+# hàng đợi bulk có worker riêng (celeryworker-bulk trong local.yml, CELERY_QUEUES=nextgen_bulk)
+CELERY_QUEUES="${CELERY_QUEUES:-nextgen_critical,nextgen_tasks}"
+# Số process tối đa,tối thiểu; autoscaler dựa trên độ sâu hàng đợi
+CELERY_AUTOSCALE="${CELERY_AUTOSCALE:-8,2}"
+
+exec watchfiles --filter python celery.__main__.main --args "-A backend.app.core.celery_app worker -l INFO -Q ${CELERY_QUEUES} --autoscale=${CELERY_AUTOSCALE}"
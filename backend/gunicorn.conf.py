@@ -0,0 +1,26 @@
+# Cấu hình gunicorn cho môi trường production:
+# gunicorn -c backend/gunicorn.conf.py backend.app.main:app
+import gc
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+# Nạp app (và model gian lận) một lần ở master trước khi fork,
+# các worker dùng chung trang bộ nhớ theo cơ chế copy-on-write
+preload_app = True
+
+
+def when_ready(server):
+    from backend.app.core.ml.model_manager import fraud_model_manager
+
+    # Model challenger chỉ nạp trong tiến trình shadow của từng worker
+    try:
+        loaded = fraud_model_manager.load()
+        if loaded is not None:
+            server.log.info(f"Preloaded champion fraud model {loaded.version}")
+    except Exception as e:
+        server.log.error(f"Failed to preload champion fraud model: {e}")
+    # Đưa các object hiện có ra khỏi GC để lần thu gom ở worker không ghi vào
+    # các trang dùng chung (làm mất lợi ích copy-on-write)
+    gc.freeze()
@@ -1,4 +1,5 @@
 import asyncio
+import re
 from logging.config import fileConfig
 
 from sqlalchemy import pool
@@ -11,11 +12,26 @@ from backend.app.core.config import settings
 from backend.app.core.model_registry import load_models
 from sqlmodel import SQLModel
 
-load_models()
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+
+def needs_model_metadata() -> bool:
+    """Chỉ autogenerate và check cần metadata của models.
+
+    upgrade/downgrade/current chạy các file migration bằng op.*,
+    nên bỏ qua việc import toàn bộ models để lệnh khởi động nhanh hơn.
+    """
+    cmd_opts = config.cmd_opts
+    if cmd_opts is None:
+        return True
+    if getattr(cmd_opts, "autogenerate", False):
+        return True
+    cmd = getattr(cmd_opts, "cmd", None)
+    return bool(cmd) and getattr(cmd[0], "__name__", "") == "check"
+
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -29,7 +45,11 @@ config.set_main_option(
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = SQLModel.metadata
+if needs_model_metadata():
+    load_models()
+    target_metadata = SQLModel.metadata
+else:
+    target_metadata = None
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -61,8 +81,20 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Bỏ qua các phân vùng theo tháng (risk_history_yYYYYmMM) do job tạo/tách,
+    không phải bảng trong models nên autogenerate không được đề xuất xóa chúng."""
+    if type_ == "table" and reflected and compare_to is None:
+        return not re.match(r"^risk_history_y\d{4}m\d{2}$", name)
+    return True
+
+
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
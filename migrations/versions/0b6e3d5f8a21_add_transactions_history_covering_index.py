@@ -0,0 +1,64 @@
+"""$(add_transactions_history_covering_index)
+
+Revision ID: 0b6e3d5f8a21
+Revises: f2a9c6d81b34
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e3d5f8a21'
+down_revision: Union[str, None] = 'f2a9c6d81b34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HISTORY_INCLUDE = [
+    'reference',
+    'transaction_type',
+    'direction',
+    'amount',
+    'balance_after',
+    'currency',
+    'description',
+    'status',
+    'counterparty_account_id',
+]
+
+
+def upgrade() -> None:
+    # Cùng khóa với ix_transactions_account_created, thêm INCLUDE cho index-only scan.
+    # Tạo/xóa CONCURRENTLY để không chặn ghi giao dịch trong lúc build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_history',
+            'transactions',
+            ['account_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_include=HISTORY_INCLUDE,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_transactions_account_created',
+            table_name='transactions',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_account_created',
+            'transactions',
+            ['account_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_transactions_history',
+            table_name='transactions',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,37 @@
+"""$(add_fraud_scores_table)
+
+Revision ID: 3c1f9a7d52e4
+Revises: e74da093b3e9
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a7d52e4'
+down_revision: Union[str, None] = 'e74da093b3e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fraud_scores',
+    sa.Column('transaction_id', sa.UUID(), nullable=False),
+    sa.Column('model_version', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('risk_level', sa.Enum('LOW', 'MEDIUM', 'HIGH', name='risklevelenum'), nullable=False),
+    sa.Column('decision', sa.Enum('APPROVE', 'REVIEW', 'BLOCK', name='frauddecisionenum'), nullable=False),
+    sa.Column('scored_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('transaction_id', 'model_version')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('fraud_scores')
+    sa.Enum(name='frauddecisionenum').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='risklevelenum').drop(op.get_bind(), checkfirst=True)
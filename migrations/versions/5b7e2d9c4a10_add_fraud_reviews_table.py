@@ -0,0 +1,46 @@
+"""$(add_fraud_reviews_table)
+
+Revision ID: 5b7e2d9c4a10
+Revises: 3c1f9a7d52e4
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2d9c4a10'
+down_revision: Union[str, None] = '3c1f9a7d52e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fraud_reviews',
+    sa.Column('transaction_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=True),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('decision', postgresql.ENUM('APPROVE', 'REVIEW', 'BLOCK', name='frauddecisionenum', create_type=False), nullable=False),
+    sa.Column('model_version', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'IN_REVIEW', 'APPROVED', 'CONFIRMED_FRAUD', name='reviewstatusenum'), nullable=False),
+    sa.Column('rule_hits', postgresql.ARRAY(sa.String(length=100)), server_default='{}', nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('claimed_by', sa.Uuid(), nullable=True),
+    sa.Column('claimed_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('resolved_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('note', sqlmodel.sql.sqltypes.AutoString(length=1000), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('transaction_id')
+    )
+    op.create_index('ix_fraud_reviews_queue', 'fraud_reviews', ['status', sa.text('score DESC'), 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fraud_reviews_queue', table_name='fraud_reviews')
+    op.drop_table('fraud_reviews')
+    sa.Enum(name='reviewstatusenum').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,77 @@
+"""$(add_risk_history_tables)
+
+Revision ID: 8d3f6a1b2c7e
+Revises: 5b7e2d9c4a10
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f6a1b2c7e'
+down_revision: Union[str, None] = '5b7e2d9c4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _month(offset: int) -> datetime:
+    now = datetime.now(timezone.utc)
+    index = now.year * 12 + now.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    op.create_table('risk_history',
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('decision', postgresql.ENUM('APPROVE', 'REVIEW', 'BLOCK', name='frauddecisionenum', create_type=False), nullable=False),
+    sa.Column('model_version', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('scored_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('transaction_id', sa.UUID(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'scored_at', 'transaction_id'),
+    postgresql_partition_by='RANGE (scored_at)'
+    )
+    op.create_index('ix_risk_history_scored_at', 'risk_history', ['scored_at'], unique=False, postgresql_using='brin')
+    # Phân vùng tháng hiện tại và tháng sau; các tháng tiếp theo do job
+    # maintain_risk_history_partitions tạo
+    for offset in (0, 1):
+        start, end = _month(offset), _month(offset + 1)
+        op.execute(
+            f"CREATE TABLE risk_history_y{start.year:04d}m{start.month:02d} "
+            f"PARTITION OF risk_history "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    op.create_table('risk_history_hourly',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('events', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('score_max', sa.Float(), nullable=False),
+    sa.Column('flagged', sa.Integer(), nullable=False),
+    sa.Column('bucket', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'bucket')
+    )
+    op.create_index('ix_risk_history_hourly_bucket', 'risk_history_hourly', ['bucket'], unique=False)
+    op.create_table('risk_history_daily',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('events', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('score_max', sa.Float(), nullable=False),
+    sa.Column('flagged', sa.Integer(), nullable=False),
+    sa.Column('bucket', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'bucket')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('risk_history_daily')
+    op.drop_index('ix_risk_history_hourly_bucket', table_name='risk_history_hourly')
+    op.drop_table('risk_history_hourly')
+    # Xóa bảng cha xóa luôn các phân vùng đang gắn vào
+    op.drop_index('ix_risk_history_scored_at', table_name='risk_history', postgresql_using='brin')
+    op.drop_table('risk_history')
@@ -0,0 +1,67 @@
+"""$(add_bank_account_transaction_tables)
+
+Revision ID: c4e1a7b93f25
+Revises: 8d3f6a1b2c7e
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a7b93f25'
+down_revision: Union[str, None] = '8d3f6a1b2c7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('bank_accounts',
+    sa.Column('account_name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('account_number', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('account_type', sa.Enum('Savings', 'Current', name='accounttypeenum'), nullable=False),
+    sa.Column('currency', sa.Enum('VND', 'USD', 'EUR', name='accountcurrencyenum'), nullable=False),
+    sa.Column('account_status', sa.Enum('Active', 'Inactive', 'Frozen', name='accountstatusenum'), nullable=False),
+    sa.Column('balance', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bank_accounts_account_number'), 'bank_accounts', ['account_number'], unique=True)
+    op.create_index(op.f('ix_bank_accounts_user_id'), 'bank_accounts', ['user_id'], unique=False)
+    op.create_table('transactions',
+    sa.Column('reference', sqlmodel.sql.sqltypes.AutoString(length=40), nullable=False),
+    sa.Column('transaction_type', sa.Enum('Deposit', 'Withdrawal', 'Transfer', name='transactiontypeenum'), nullable=False),
+    sa.Column('direction', sa.Enum('Debit', 'Credit', name='transactiondirectionenum'), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('balance_after', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('currency', postgresql.ENUM('VND', 'USD', 'EUR', name='accountcurrencyenum', create_type=False), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('status', sa.Enum('Pending', 'Completed', 'Failed', name='transactionstatusenum'), nullable=False),
+    sa.Column('counterparty_account_id', sa.Uuid(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('account_id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['bank_accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_account_created', 'transactions', ['account_id', 'created_at', 'id'], unique=False)
+    op.create_index(op.f('ix_transactions_reference'), 'transactions', ['reference'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transactions_reference'), table_name='transactions')
+    op.drop_index('ix_transactions_account_created', table_name='transactions')
+    op.drop_table('transactions')
+    op.drop_index(op.f('ix_bank_accounts_user_id'), table_name='bank_accounts')
+    op.drop_index(op.f('ix_bank_accounts_account_number'), table_name='bank_accounts')
+    op.drop_table('bank_accounts')
+    for name in ('transactionstatusenum', 'transactiondirectionenum', 'accountstatusenum', 'accountcurrencyenum', 'accounttypeenum'):
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,41 @@
+"""$(add_user_cleanup_indexes)
+
+Revision ID: e74da093b3e9
+Revises: a8e5294bdb79
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e74da093b3e9'
+down_revision: Union[str, None] = 'a8e5294bdb79'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Index một phần cho các job dọn dẹp OTP / lockout định kỳ
+    op.create_index(
+        'ix_users_otp_expiry_time',
+        'users',
+        ['otp_expiry_time'],
+        unique=False,
+        postgresql_where=sa.text('otp_expiry_time IS NOT NULL'),
+    )
+    op.create_index(
+        'ix_users_last_failed_login',
+        'users',
+        ['last_failed_login'],
+        unique=False,
+        postgresql_where=sa.text('last_failed_login IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_last_failed_login', table_name='users')
+    op.drop_index('ix_users_otp_expiry_time', table_name='users')
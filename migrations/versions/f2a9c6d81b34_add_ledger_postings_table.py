@@ -0,0 +1,43 @@
+"""$(add_ledger_postings_table)
+
+Revision ID: f2a9c6d81b34
+Revises: c4e1a7b93f25
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9c6d81b34'
+down_revision: Union[str, None] = 'c4e1a7b93f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ledger_postings',
+    sa.Column('reference', sqlmodel.sql.sqltypes.AutoString(length=40), nullable=False),
+    sa.Column('transaction_type', postgresql.ENUM('Deposit', 'Withdrawal', 'Transfer', name='transactiontypeenum', create_type=False), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('currency', postgresql.ENUM('VND', 'USD', 'EUR', name='accountcurrencyenum', create_type=False), nullable=False),
+    sa.Column('debit_account_id', sa.Uuid(), nullable=True),
+    sa.Column('credit_account_id', sa.Uuid(), nullable=True),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('initiated_by', sa.Uuid(), nullable=False),
+    sa.Column('idempotency_key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True),
+    sa.Column('request_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('initiated_by', 'idempotency_key', name='uq_ledger_postings_idempotency'),
+    sa.UniqueConstraint('reference')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ledger_postings')